@@ -0,0 +1,244 @@
+"""
+Background Cache Warmer
+
+Keeps current measurements and forecasts for a configurable set of hot cities
+warm in the shared cache, so the proactive tool calls made for those cities
+(QueryAnalyzer.proactively_call_tools) are served from cache instead of paying
+the AirQo -> WAQI -> OpenMeteo cascade.
+
+Each (city, kind) job replays the exact tool call a user query would make, so
+it fills the same cache keys. Jobs are rescheduled independently with jittered
+intervals (no synchronized bursts), run under a concurrency limit, respect a
+per-provider calls-per-minute budget and skip providers whose circuit breaker
+is open. With stale-while-revalidate caching a warm call on an entry past its
+soft TTL returns immediately and triggers the background refresh.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from core.agent.query_analyzer import QueryAnalyzer
+from shared.config.settings import get_settings
+from shared.utils.circuit_breaker import get_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupJob:
+    """One tool call kept warm."""
+
+    city: str
+    kind: str  # "current" or "forecast"
+    tool: str
+    args: dict[str, Any]
+    provider: str  # Primary provider, charged against its budget
+    next_run: float = 0.0
+    last_success: float | None = None
+    failures: int = 0
+
+
+class ProviderBudget:
+    """Sliding one-minute call budget for a provider."""
+
+    def __init__(self, calls_per_minute: int):
+        self.calls_per_minute = calls_per_minute
+        self._calls: deque[float] = deque()
+
+    def try_acquire(self, now: float) -> bool:
+        while self._calls and now - self._calls[0] >= 60:
+            self._calls.popleft()
+        if len(self._calls) >= self.calls_per_minute:
+            return False
+        self._calls.append(now)
+        return True
+
+
+class CacheWarmer:
+    """In-process scheduler that refreshes hot-city tool results ahead of users."""
+
+    MIN_SLEEP_SECONDS = 1.0
+    CALL_TIMEOUT_SECONDS = 60.0
+
+    def __init__(
+        self,
+        tool_executor: Any,
+        cities: list[str] | None = None,
+        interval: float | None = None,
+        jitter: float | None = None,
+        concurrency: int | None = None,
+        budgets: dict[str, int] | None = None,
+    ):
+        """
+        Initialize the warmer (call start() to begin warming).
+
+        Args:
+            tool_executor: ToolExecutor whose tools are warmed
+            cities: Hot cities (default: CACHE_WARMUP_CITIES)
+            interval: Mean seconds between refreshes of a job (default: CACHE_WARMUP_INTERVAL_SECONDS)
+            jitter: +/- fraction of the interval applied per run (default: CACHE_WARMUP_JITTER)
+            concurrency: Maximum tool calls in flight (default: CACHE_WARMUP_CONCURRENCY)
+            budgets: Provider -> calls per minute (default: CACHE_WARMUP_PROVIDER_BUDGETS)
+        """
+        settings = get_settings()
+        self.tool_executor = tool_executor
+        self.interval = interval or settings.CACHE_WARMUP_INTERVAL_SECONDS
+        self.jitter = settings.CACHE_WARMUP_JITTER if jitter is None else jitter
+        self.concurrency = concurrency or settings.CACHE_WARMUP_CONCURRENCY
+        if budgets is None:
+            budgets = self.parse_budgets(settings.CACHE_WARMUP_PROVIDER_BUDGETS)
+        self.budgets = {name: ProviderBudget(limit) for name, limit in budgets.items()}
+        if cities is None:
+            cities = [c.strip() for c in settings.CACHE_WARMUP_CITIES.split(",") if c.strip()]
+
+        self.jobs = self._build_jobs(cities)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._task: asyncio.Task | None = None
+
+        self.metrics = {
+            "cycles": 0,
+            "warmed": 0,
+            "failed": 0,
+            "skipped_budget": 0,
+            "skipped_circuit": 0,
+            "total_call_ms": 0.0,
+        }
+
+    @staticmethod
+    def parse_budgets(value: str) -> dict[str, int]:
+        """Parse "provider:calls_per_minute,..." into a dict."""
+        budgets = {}
+        for item in value.split(","):
+            name, _, limit = item.strip().partition(":")
+            if name and limit.strip().isdigit():
+                budgets[name.strip().lower()] = int(limit)
+        return budgets
+
+    def _build_jobs(self, cities: list[str]) -> list[WarmupJob]:
+        """Current-conditions and forecast jobs, with the args proactive calls use."""
+        jobs = []
+        for city in dict.fromkeys(c.lower() for c in cities):
+            name = city.title()  # QueryAnalyzer title-cases detected cities
+            if city in QueryAnalyzer.AFRICAN_CITIES:
+                current = ("get_african_city_air_quality", "airqo")
+            else:
+                current = ("get_city_air_quality", "waqi")
+            jobs.append(WarmupJob(name, "current", current[0], {"city": name}, current[1]))
+
+            # The forecast tool prefers AirQo only for African cities
+            forecast_provider = (
+                "airqo"
+                if any(i in city for i in self.tool_executor.AFRICAN_FORECAST_INDICATORS)
+                else "waqi"
+            )
+            jobs.append(
+                WarmupJob(
+                    name, "forecast", "get_air_quality_forecast", {"city": name}, forecast_provider
+                )
+            )
+        return jobs
+
+    def _next_delay(self) -> float:
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def start(self) -> None:
+        """Start warming in the background on the running event loop."""
+        if self._task is not None or not self.jobs:
+            return
+        now = time.monotonic()
+        # Spread the first round over the first interval instead of firing every job at once
+        for job in self.jobs:
+            job.next_run = now + random.uniform(0, min(self.interval, 60))
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Cache warmer started: {len(self.jobs)} jobs every ~{self.interval}s")
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_due()
+            except Exception as e:
+                logger.error(f"Cache warmup cycle failed: {e}")
+            delay = min(job.next_run for job in self.jobs) - time.monotonic()
+            await asyncio.sleep(max(delay, self.MIN_SLEEP_SECONDS))
+
+    async def run_due(self, now: float | None = None) -> int:
+        """
+        Run every job that is due.
+
+        Returns:
+            Number of jobs attempted (including those skipped by budget or circuit)
+        """
+        now = time.monotonic() if now is None else now
+        due = [job for job in self.jobs if job.next_run <= now]
+        if due:
+            self.metrics["cycles"] += 1
+            await asyncio.gather(*(self._warm(job, now) for job in due))
+        return len(due)
+
+    async def _warm(self, job: WarmupJob, now: float) -> None:
+        job.next_run = now + self._next_delay()
+
+        # Peek only: a half-open breaker's probe slot is left to user traffic
+        if get_circuit_breaker(job.provider).is_open():
+            self.metrics["skipped_circuit"] += 1
+            return
+        budget = self.budgets.get(job.provider)
+        if budget is not None and not budget.try_acquire(now):
+            self.metrics["skipped_budget"] += 1
+            # Retry sooner than a full interval once the budget window has moved on
+            job.next_run = now + min(self._next_delay(), 60 * random.uniform(1, 1 + self.jitter))
+            return
+
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    self.tool_executor.execute_async(job.tool, dict(job.args)),
+                    timeout=self.CALL_TIMEOUT_SECONDS,
+                )
+                ok = isinstance(result, dict) and result.get("success") is not False
+            except Exception as e:
+                logger.debug(f"Cache warmup {job.kind} for {job.city} failed: {e}")
+                ok = False
+            self.metrics["total_call_ms"] += (time.monotonic() - started) * 1000
+
+        if ok:
+            self.metrics["warmed"] += 1
+            job.last_success = time.time()
+            job.failures = 0
+        else:
+            self.metrics["failed"] += 1
+            job.failures += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Warmup counters and per-job freshness."""
+        calls = self.metrics["warmed"] + self.metrics["failed"]
+        now = time.time()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "jobs": len(self.jobs),
+            "interval_seconds": self.interval,
+            **{k: v for k, v in self.metrics.items() if k != "total_call_ms"},
+            "avg_call_ms": round(self.metrics["total_call_ms"] / calls, 1) if calls else 0.0,
+            "stale_jobs": [
+                f"{job.city}:{job.kind}"
+                for job in self.jobs
+                if job.last_success is None or now - job.last_success > 2 * self.interval
+            ],
+        }
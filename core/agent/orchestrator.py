@@ -24,6 +24,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+from shared.utils.circuit_breaker import get_circuit_breaker
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,6 +76,9 @@ class ToolOrchestrator:
     - Result validation and quality checks
     """
 
+    # A tool's breaker stays open this long (first use of "tool:<name>" only)
+    CIRCUIT_RESET_SECONDS = 300
+
     def __init__(
         self,
         tool_executor: Any,
@@ -98,11 +103,6 @@ class ToolOrchestrator:
         self.enable_fallbacks = enable_fallbacks
         self.timeout_per_tool = timeout_per_tool
 
-        # Circuit breaker state
-        self.circuit_breaker = {}  # {tool_name: {"failures": 0, "last_failure": timestamp}}
-        self.circuit_threshold = 5
-        self.circuit_timeout = 300  # 5 minutes
-
         # Fallback chains for tools (Audit Requirement: 5-level cascade)
         self.fallback_chains = {
             "get_african_city_air_quality": [
@@ -350,37 +350,24 @@ class ToolOrchestrator:
 
         return plan
 
+    def _breaker(self, tool_name: str):
+        """The shared circuit breaker for a tool."""
+        return get_circuit_breaker(f"tool:{tool_name}", reset_timeout=self.CIRCUIT_RESET_SECONDS)
+
     def _is_circuit_open(self, tool_name: str) -> bool:
-        """Check if circuit breaker is open for a tool."""
-        if tool_name not in self.circuit_breaker:
+        """Check if circuit breaker is open for a tool (lets one probe through when half-open)."""
+        if self._breaker(tool_name).allow_request():
             return False
-
-        breaker = self.circuit_breaker[tool_name]
-        if breaker["failures"] >= self.circuit_threshold:
-            time_since_failure = time.time() - breaker["last_failure"]
-            if time_since_failure < self.circuit_timeout:
-                logger.warning(f"Circuit breaker OPEN for {tool_name}")
-                return True
-            else:
-                # Reset circuit
-                logger.info(f"Circuit breaker RESET for {tool_name}")
-                self.circuit_breaker[tool_name] = {"failures": 0, "last_failure": 0}
-                return False
-        return False
+        logger.warning(f"Circuit breaker OPEN for {tool_name}")
+        return True
 
     def _record_failure(self, tool_name: str):
         """Record a tool failure for circuit breaker."""
-        if tool_name not in self.circuit_breaker:
-            self.circuit_breaker[tool_name] = {"failures": 0, "last_failure": 0}
-
-        self.circuit_breaker[tool_name]["failures"] += 1
-        self.circuit_breaker[tool_name]["last_failure"] = time.time()
-        logger.info(f"Tool {tool_name} failure count: {self.circuit_breaker[tool_name]['failures']}")
+        self._breaker(tool_name).record_failure()
 
-    def _record_success(self, tool_name: str):
-        """Record a tool success (resets circuit breaker)."""
-        if tool_name in self.circuit_breaker:
-            self.circuit_breaker[tool_name] = {"failures": 0, "last_failure": 0}
+    def _record_success(self, tool_name: str, latency: float | None = None):
+        """Record a tool success (resets circuit breaker unless the call was too slow)."""
+        self._breaker(tool_name).record_success(latency)
 
     async def _execute_single_tool_with_retry(
         self,
@@ -409,6 +396,7 @@ class ToolOrchestrator:
         for attempt in range(self.max_retries):
             try:
                 logger.info(f"🔧 Executing {tool_name} (attempt {attempt + 1}/{self.max_retries})")
+                attempt_start = time.time()
 
                 # Execute with timeout
                 task = asyncio.create_task(
@@ -421,7 +409,8 @@ class ToolOrchestrator:
                     tool_call.status = ToolExecutionStatus.SUCCESS
                     tool_call.result = result
                     tool_call.execution_time = time.time() - start_time
-                    self._record_success(tool_name)
+                    # Only this attempt's latency: failed attempts and backoff are not the tool's
+                    self._record_success(tool_name, time.time() - attempt_start)
                     logger.info(f"✅ {tool_name} succeeded in {tool_call.execution_time:.2f}s")
                     return tool_call
                 else:
@@ -432,6 +421,7 @@ class ToolOrchestrator:
                     else:
                         tool_call.status = ToolExecutionStatus.FAILED
                         tool_call.error = "Invalid result after all retries"
+                        self._record_failure(tool_name)
 
             except TimeoutError:
                 logger.error(f"⏱️ {tool_name} timed out after {self.timeout_per_tool}s")
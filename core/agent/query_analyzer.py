@@ -5,10 +5,16 @@ This module analyzes user queries and proactively calls tools BEFORE sending to
 This ensures that even models with weak tool-calling support get the data they need.
 """
 
+import functools
 import logging
 import re
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
+from shared.utils.concurrency import gather_bounded
+from shared.utils.keyword_matcher import KeywordMatcher
+
 # Import centralized formatters to reduce code duplication
 from shared.utils.result_formatters import (
     format_air_quality_result,
@@ -20,6 +26,38 @@ from shared.utils.result_formatters import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class MessageScan:
+    """Everything the keyword matcher found in one message (see QueryAnalyzer.scan_message)."""
+
+    # Label -> matched terms in order of first occurrence (every label present)
+    keywords: dict[str, tuple[str, ...]]
+
+    def has(self, label: str) -> bool:
+        return bool(self.keywords[label])
+
+    def first(self, label: str) -> str | None:
+        terms = self.keywords[label]
+        return terms[0] if terms else None
+
+    @property
+    def intents(self) -> frozenset[str]:
+        """Labels with at least one match."""
+        return frozenset(label for label, terms in self.keywords.items() if terms)
+
+    @property
+    def african_cities(self) -> list[str]:
+        return [city.title() for city in self.keywords["african_city"]]
+
+    @property
+    def global_cities(self) -> list[str]:
+        return [city.title() for city in self.keywords["global_city"]]
+
+    @property
+    def cities(self) -> list[str]:
+        return self.african_cities + self.global_cities
+
+
 class QueryAnalyzer:
     """
     Analyzes queries and determines which tools need to be called proactively.
@@ -28,6 +66,9 @@ class QueryAnalyzer:
     - Low-quality AI models (proactive tool calling)
     - Speed (parallel tool execution)
     - Accuracy (smart query classification)
+
+    Every keyword list below is compiled into one word-bounded matcher, so a
+    message is scanned once (scan_message) and the detectors read the result.
     """
 
     # City patterns for detection
@@ -95,23 +136,6 @@ class QueryAnalyzer:
         "praia",
         "banjul",
         "nouakchott",
-        "jinja",
-        "mbarara",
-        "gulu",
-        "nakuru",
-        "eldoret",
-        "kisumu",
-        "mombasa",
-        "dodoma",
-        "mwanza",
-        "arusha",
-        "mbeya",
-        "butare",
-        "musanze",
-        "ruhengeri",
-        "gisenyi",
-        "abuja",
-        "alexandria",
     ]
 
     GLOBAL_CITIES = [
@@ -149,6 +173,280 @@ class QueryAnalyzer:
         "sao paulo",
     ]
 
+    # Keywords are matched on word boundaries; a trailing "*" marks a stem
+    # ("trend*" also matches "trends")
+
+    # classify_query_type
+    # Atmospheric chemistry, transport modeling, dispersion, chemical reactions
+    COMPLEX_SCIENTIFIC_INDICATORS = [
+        'hysplit', 'backward trajectory', 'transport model', 'dispersion',
+        'chemical reaction', 'oxidation pathway', 'conversion', 'atmospheric chemistry',
+        'acid rain', 'acid deposition', 'sulfate aerosol', 'so2', 'so₂',
+        'volcanic emission', 'plume transport', 'long-range transport',
+        'chemical species', 'reaction mechanism', 'ph', 'rainfall ph',
+        'mineral buffer', 'neutralization', 'cation', 'ca²⁺', 'mg²⁺',
+        'oh radical', 'h2o2', 'hydroxyl', 'hydrogen peroxide',
+        'gas-to-particle', 'aerosol formation', 'secondary pollutant',
+    ]
+    DATA_INDICATORS = [
+        'statistics', 'stats', 'data', 'chart', 'graph', 'trend*',
+        'deaths', 'mortality', 'study', 'research', 'report*',
+    ]
+    RESEARCH_INDICATORS = [
+        'latest', 'recent*', 'current', 'new', 'update*',
+        'policy', 'regulation*', 'guideline*', 'standard*',
+        '2024', '2025', '2026',
+    ]
+    COMPLEX_TOPICS = ['model*', 'process*', 'mechanism*', 'pathway*', 'formation']
+    LOCATION_INDICATORS = [
+        'in kampala', 'in london', 'in nairobi', 'in paris',
+        'air quality', 'aqi', 'pollution level*', 'pm2.5', 'pm10',
+        'safe to', 'breathe', 'outdoor*', 'exercise',
+    ]
+
+    # detect_air_quality_query
+    AIR_QUALITY_KEYWORDS = [
+        "air quality",
+        "aqi",
+        "pollution",
+        "pm2.5",
+        "pm10",
+        "pollutant*",
+        "smog",
+        "air",
+        "breathe",
+        "safe to exercise",
+        "outdoor*",
+        "environment*",
+        "atmospheric",
+    ]
+
+    # detect_search_query
+    SEARCH_TEMPORAL_KEYWORDS = [
+        "latest", "recent", "new", "current", "update", "2024", "2025", "2026", "this year",
+        "last year",
+    ]
+    SEARCH_POLICY_KEYWORDS = [
+        "policy", "regulation", "legislation", "law", "government", "standard", "standards",
+    ]
+    SEARCH_RESEARCH_KEYWORDS = [
+        "research", "study", "studies", "report", "findings", "evidence", "published",
+    ]
+    SEARCH_DATA_KEYWORDS = [
+        "statistics", "stats", "data", "trends", "analysis", "deaths", "mortality", "how many",
+        "list",
+    ]
+
+    # detect_data_analysis_query
+    ANALYSIS_DATA_KEYWORDS = [
+        "statistics", "stats", "data", "chart", "graph", "plot", "visualize", "show me",
+        "generate", "create", "display", "deaths", "mortality", "trends", "analysis", "report",
+        "findings", "evidence", "burden", "prevalence", "epidemiology", "risk assessment",
+        "impact", "global", "worldwide", "international", "numbers", "figures", "metrics",
+    ]
+    VISUALIZATION_KEYWORDS = [
+        "chart", "graph", "plot", "visualize", "show me", "generate", "create", "display",
+        "diagram", "map",
+    ]
+    TIME_PERIOD_KEYWORDS = [
+        "2023", "2024", "2025", "2026", "past", "last year", "recent", "latest", "current",
+        "this year", "previous", "annual", "yearly",
+    ]
+    # First topic with a match wins
+    TOPIC_KEYWORDS = {
+        "deaths": ["deaths", "mortality", "fatalities", "died", "killed"],
+        "health": ["health", "disease", "illness", "medical", "hospital"],
+        "pollution": ["pollution", "air quality", "contamination", "emissions"],
+        "trends": ["trends", "changes", "patterns", "evolution", "over time"],
+        "statistics": ["statistics", "stats", "data", "numbers", "figures"],
+    }
+
+    # detect_forecast_query: indicator -> confidence weight
+    FORECAST_INDICATORS = {
+        # Direct forecast terms
+        "forecast": 1.0,
+        "prediction": 0.9,
+        "outlook": 0.8,
+        "projection": 0.8,
+        # Future time references
+        "tomorrow": 1.0,
+        "next day": 1.0,
+        "day after tomorrow": 0.9,
+        "next week": 0.8,
+        "this weekend": 0.9,
+        "weekend": 0.7,
+        "next month": 0.6,
+        "coming days": 0.7,
+        "upcoming": 0.6,
+        # Future tense and modal verbs
+        "will": 0.4,
+        "going to": 0.5,
+        "shall": 0.4,
+        "expect": 0.6,
+        "predict": 0.7,
+        "anticipate": 0.6,
+        "likely": 0.5,
+        # Question patterns indicating future interest
+        "should i": 0.3,
+        "can i": 0.3,
+        "is it safe": 0.4,
+        "better tomorrow": 0.8,
+        "worse tomorrow": 0.8,
+    }
+    # Time reference -> (days ahead, confidence weight); the last match sets days ahead
+    FORECAST_TIME_REFERENCES = {
+        "tomorrow": (1, 1.0),
+        "next day": (1, 1.0),
+        "day after": (2, 0.9),
+        "in 2 days": (2, 1.0),
+        "in 3 days": (3, 1.0),
+        "next week": (7, 0.8),
+        "this weekend": (3, 0.9),  # Assume current weekend
+        "weekend": (3, 0.7),  # Generic weekend reference
+        "monday": (1, 0.6),  # Could be today or next Monday
+        "tuesday": (1, 0.6),
+        "wednesday": (1, 0.6),
+        "thursday": (1, 0.6),
+        "friday": (1, 0.6),
+        "saturday": (2, 0.5),  # Often refers to upcoming weekend
+        "sunday": (2, 0.5),
+    }
+    FORECAST_AIR_QUALITY_TERMS = ["air quality", "aqi", "pollution", "pm2.5", "pm10", "smog"]
+    # Questions about future activities often imply forecasts
+    ACTIVITY_TERMS = ["exercise", "run*", "walk*", "outdoor*", "outside", "safe to"]
+    COMPARATIVE_TERMS = ["better than", "worse than", "compared to", "versus"]
+
+    # Pollutant mentions -> canonical name
+    POLLUTANT_TERMS = {
+        "pm2.5": "pm2.5",
+        "pm 2.5": "pm2.5",
+        "pm25": "pm2.5",
+        "pm10": "pm10",
+        "pm 10": "pm10",
+        "no2": "no2",
+        "nitrogen dioxide": "no2",
+        "o3": "o3",
+        "ozone": "o3",
+        "so2": "so2",
+        "sulfur dioxide": "so2",
+        "sulphur dioxide": "so2",
+        "carbon monoxide": "co",
+    }
+
+    # proactively_call_tools chart decision
+    CHART_REQUEST_KEYWORDS = ["chart", "graph", "plot", "visualize", "trend*", "show me"]
+    DEFINITIONAL_KEYWORDS = ["what is", "define", "explain", "meaning", "difference between"]
+
+    _KEYWORD_MATCHER = KeywordMatcher(
+        {
+            "african_city": AFRICAN_CITIES,
+            "global_city": GLOBAL_CITIES,
+            "complex_scientific": COMPLEX_SCIENTIFIC_INDICATORS,
+            "data_indicator": DATA_INDICATORS,
+            "research_indicator": RESEARCH_INDICATORS,
+            "complex_topic": COMPLEX_TOPICS,
+            "location_indicator": LOCATION_INDICATORS,
+            "air_quality": AIR_QUALITY_KEYWORDS,
+            "search_temporal": SEARCH_TEMPORAL_KEYWORDS,
+            "search_policy": SEARCH_POLICY_KEYWORDS,
+            "search_research": SEARCH_RESEARCH_KEYWORDS,
+            "search_data": SEARCH_DATA_KEYWORDS,
+            "analysis_data": ANALYSIS_DATA_KEYWORDS,
+            "visualization": VISUALIZATION_KEYWORDS,
+            "time_period": TIME_PERIOD_KEYWORDS,
+            **{f"topic:{topic}": terms for topic, terms in TOPIC_KEYWORDS.items()},
+            "forecast_indicator": list(FORECAST_INDICATORS),
+            "forecast_time": list(FORECAST_TIME_REFERENCES),
+            "forecast_air_quality": FORECAST_AIR_QUALITY_TERMS,
+            "activity": ACTIVITY_TERMS,
+            "comparative": COMPARATIVE_TERMS,
+            "pollutant": list(POLLUTANT_TERMS),
+            "chart_request": CHART_REQUEST_KEYWORDS,
+            "definitional": DEFINITIONAL_KEYWORDS,
+        }
+    )
+
+    # Phrase patterns that need more than keywords; each list is searched as one regex
+    # Users telling the AI about themselves (name, location for memory, preferences)
+    PERSONAL_INFO_PATTERNS = [
+        r'\bmy name is\b',
+        r'\bi am\b.*\bfrom\b',
+        r'\bi live in\b',
+        r'\bi\'m from\b',
+        r'\bi\'m in\b',
+        r'\bmy (name|city|location|hometown)\b',
+        r'\bremember (this|that|me)\b',
+        r'\bdon\'t forget\b',
+        r'\bwhat (is|was) my (name|city|location)\b',
+        r'\bwhere do i live\b',
+        r'\bwho am i\b',
+        r'\bdo you (know|remember) (my|me)\b',
+    ]
+    _PERSONAL_INFO_RE = re.compile("|".join(PERSONAL_INFO_PATTERNS))
+    # General knowledge about air pollution/health effects
+    GENERAL_KNOWLEDGE_PATTERNS = [
+        r'\bhealth effects\b',
+        r'\bhealth impacts?\b',
+        r'\bhow does.*affect\b',
+        r'\bwhat are.*effects\b',
+        r'\bcauses?\b',
+        r'\bsymptoms?\b',
+        r'\brisks?\b',
+        r'\bwho guidelines?\b',
+        r'\bepa standards?\b',
+        r'\bair pollution.*health\b',
+    ]
+    _GENERAL_KNOWLEDGE_RE = re.compile("|".join(GENERAL_KNOWLEDGE_PATTERNS))
+    EDUCATIONAL_PATTERNS = [
+        r'\bwhat is\b',
+        r'\bexplain\b',
+        r'\bdefine\b',
+        r'\bhow does\b',
+        r'\bwhy does\b',
+        r'\btell me about\b',
+        r'\bdifference between\b',
+        r'\bcompare.*and\b',  # "compare PM2.5 and PM10" (concepts, not cities)
+    ]
+    _EDUCATIONAL_RE = re.compile("|".join(EDUCATIONAL_PATTERNS))
+    # Educational/definition questions that don't need search
+    SEARCH_EDUCATIONAL_PATTERNS = [
+        r"what (is|are|does|do|means?)",
+        r"how (does|do|is|are)",
+        r"define",
+        r"explain",
+        r"tell me about",
+        r"why (is|are|does|do)",
+    ]
+    _SEARCH_EDUCATIONAL_RE = re.compile("|".join(SEARCH_EDUCATIONAL_PATTERNS))
+    # Format 1: "latitude X, longitude Y" or "lat X, lon Y"
+    _COORDINATES_VERBOSE_RE = re.compile(
+        r'(?:latitude|lat)\s+(-?\d+\.?\d*)\s*,?\s*(?:longitude|lon)\s+(-?\d+\.?\d*)', re.IGNORECASE
+    )
+    # Format 2: Simple "X, Y"
+    _COORDINATES_SIMPLE_RE = re.compile(r'(-?\d+\.?\d*)\s*,\s*(-?\d+\.?\d*)')
+
+    # Proactive tool calls run at most PROACTIVE_CONCURRENCY at a time, each
+    # bounded by PROACTIVE_CALL_TIMEOUT_SECONDS; calls still running after
+    # PROACTIVE_DEADLINE_SECONDS are dropped and the answer uses what arrived
+    PROACTIVE_CONCURRENCY = 4
+    PROACTIVE_CALL_TIMEOUT_SECONDS = 30.0
+    PROACTIVE_DEADLINE_SECONDS = 40.0
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def scan_message(message: str) -> MessageScan:
+        """
+        Match every keyword list against the message in one pass.
+
+        Cached per message, so the detectors below (and callers that run
+        several of them on the same turn) share one scan.
+
+        Returns:
+            MessageScan with the matched cities, keywords per list and intents
+        """
+        found = QueryAnalyzer._KEYWORD_MATCHER.scan(message)
+        return MessageScan({label: tuple(terms) for label, terms in found.items()})
+
     @staticmethod
     def classify_query_type(message: str) -> dict[str, Any]:
         """
@@ -164,21 +462,10 @@ class QueryAnalyzer:
                 - skip_ai_tools: bool (whether AI should call additional tools)
         """
         message_lower = message.lower()
+        scan = QueryAnalyzer.scan_message(message)
 
         # HIGHEST PRIORITY: Complex scientific/modeling questions
-        # Atmospheric chemistry, transport modeling, dispersion, chemical reactions
-        complex_scientific_indicators = [
-            'hysplit', 'backward trajectory', 'transport model', 'dispersion',
-            'chemical reaction', 'oxidation pathway', 'conversion', 'atmospheric chemistry',
-            'acid rain', 'acid deposition', 'sulfate aerosol', 'so2', 'so₂',
-            'volcanic emission', 'plume transport', 'long-range transport',
-            'chemical species', 'reaction mechanism', 'ph', 'rainfall ph',
-            'mineral buffer', 'neutralization', 'cation', 'ca²⁺', 'mg²⁺',
-            'oh radical', 'h2o2', 'hydroxyl', 'hydrogen peroxide',
-            'gas-to-particle', 'aerosol formation', 'secondary pollutant',
-        ]
-
-        if any(indicator in message_lower for indicator in complex_scientific_indicators):
+        if scan.has("complex_scientific"):
             logger.info(f"🔬 Complex scientific question detected: '{message[:100]}...'")
             return {
                 "query_type": "complex_scientific",
@@ -188,24 +475,8 @@ class QueryAnalyzer:
             }
 
         # SECOND PRIORITY: Personal information sharing/recall
-        # Users telling the AI about themselves (name, location for memory, preferences)
         # Must be checked BEFORE location detection to avoid treating "I live in Paris" as AQ query
-        personal_info_patterns = [
-            r'\bmy name is\b',
-            r'\bi am\b.*\bfrom\b',
-            r'\bi live in\b',
-            r'\bi\'m from\b',
-            r'\bi\'m in\b',
-            r'\bmy (name|city|location|hometown)\b',
-            r'\bremember (this|that|me)\b',
-            r'\bdon\'t forget\b',
-            r'\bwhat (is|was) my (name|city|location)\b',
-            r'\bwhere do i live\b',
-            r'\bwho am i\b',
-            r'\bdo you (know|remember) (my|me)\b',
-        ]
-
-        if any(re.search(pattern, message_lower) for pattern in personal_info_patterns):
+        if QueryAnalyzer._PERSONAL_INFO_RE.search(message_lower):
             logger.info(f"👤 Personal information detected: '{message[:50]}...'")
             return {
                 "query_type": "personal_info",
@@ -216,12 +487,7 @@ class QueryAnalyzer:
 
         # CRITICAL: Check data_analysis and research FIRST (higher priority than educational)
         # Data analysis queries - Need web search + visualization
-        data_indicators = [
-            'statistics', 'stats', 'data', 'chart', 'graph', 'trend',
-            'deaths', 'mortality', 'study', 'research', 'report',
-        ]
-
-        if any(indicator in message_lower for indicator in data_indicators):
+        if scan.has("data_indicator"):
             return {
                 "query_type": "data_analysis",
                 "confidence": 0.85,
@@ -230,13 +496,7 @@ class QueryAnalyzer:
             }
 
         # Research queries - Need web search only
-        research_indicators = [
-            'latest', 'recent', 'current', 'new', 'update',
-            'policy', 'regulation', 'guideline', 'standard',
-            '2024', '2025', '2026',
-        ]
-
-        if any(indicator in message_lower for indicator in research_indicators):
+        if scan.has("research_indicator"):
             return {
                 "query_type": "research",
                 "confidence": 0.8,
@@ -246,22 +506,9 @@ class QueryAnalyzer:
 
         # CRITICAL: General knowledge queries about air pollution/health effects - ALWAYS use web search
         # These need latest authoritative information from WHO, EPA, etc.
-        general_knowledge_patterns = [
-            r'\bhealth effects\b',
-            r'\bhealth impacts?\b',
-            r'\bhow does.*affect\b',
-            r'\bwhat are.*effects\b',
-            r'\bcauses?\b',
-            r'\bsymptoms?\b',
-            r'\brisks?\b',
-            r'\bwho guidelines?\b',
-            r'\bepa standards?\b',
-            r'\bair pollution.*health\b',
-        ]
-
-        if any(re.search(pattern, message_lower) for pattern in general_knowledge_patterns):
+        if QueryAnalyzer._GENERAL_KNOWLEDGE_RE.search(message_lower):
             # Verify it's not location-specific
-            if not any(city in message_lower for city in QueryAnalyzer.AFRICAN_CITIES + QueryAnalyzer.GLOBAL_CITIES):
+            if not scan.cities:
                 return {
                     "query_type": "general_knowledge",
                     "confidence": 0.9,
@@ -271,23 +518,11 @@ class QueryAnalyzer:
 
         # Educational queries - May need web search for complex topics
         # CHECKED AFTER general_knowledge to avoid false positives
-        educational_patterns = [
-            r'\bwhat is\b',
-            r'\bexplain\b',
-            r'\bdefine\b',
-            r'\bhow does\b',
-            r'\bwhy does\b',
-            r'\btell me about\b',
-            r'\bdifference between\b',
-            r'\bcompare.*and\b',  # "compare PM2.5 and PM10" (concepts, not cities)
-        ]
-
-        # Check if it's educational (no location mentions)
-        if any(re.search(pattern, message_lower) for pattern in educational_patterns):
+        if QueryAnalyzer._EDUCATIONAL_RE.search(message_lower):
             # Verify it's not location-specific
-            if not any(city in message_lower for city in QueryAnalyzer.AFRICAN_CITIES + QueryAnalyzer.GLOBAL_CITIES):
+            if not scan.cities:
                 # For complex topics, recommend web search
-                if any(term in message_lower for term in ['model', 'process', 'mechanism', 'pathway', 'formation']):
+                if scan.has("complex_topic"):
                     return {
                         "query_type": "educational",
                         "confidence": 0.85,
@@ -302,16 +537,7 @@ class QueryAnalyzer:
                 }
 
         # Location-specific queries - Need air quality tools
-        location_indicators = [
-            'in kampala', 'in london', 'in nairobi', 'in paris',
-            'air quality', 'aqi', 'pollution level', 'pm2.5', 'pm10',
-            'safe to', 'breathe', 'outdoor', 'exercise',
-        ]
-
-        has_location = any(city in message_lower for city in QueryAnalyzer.AFRICAN_CITIES + QueryAnalyzer.GLOBAL_CITIES)
-        has_aq_keyword = any(indicator in message_lower for indicator in location_indicators)
-
-        if has_location and has_aq_keyword:
+        if scan.cities and scan.has("location_indicator"):
             return {
                 "query_type": "location_specific",
                 "confidence": 0.95,
@@ -340,37 +566,13 @@ class QueryAnalyzer:
                 - global_cities: list of global cities
                 - coordinates: dict with lat/lon if detected
         """
-        message_lower = message.lower()
-
-        # Check if it's an air quality query
-        air_quality_keywords = [
-            "air quality",
-            "aqi",
-            "pollution",
-            "pm2.5",
-            "pm10",
-            "pollutant",
-            "smog",
-            "air",
-            "breathe",
-            "safe to exercise",
-            "outdoor",
-            "environment",
-            "atmospheric",
-        ]
-
-        is_air_quality = any(keyword in message_lower for keyword in air_quality_keywords)
+        scan = QueryAnalyzer.scan_message(message)
 
         # Extract coordinates (lat/lon) - handle multiple formats
         coordinates = None
-        # Format 1: "latitude X, longitude Y" or "lat X, lon Y"
-        coord_pattern_verbose = r'(?:latitude|lat)\s+(-?\d+\.?\d*)\s*,?\s*(?:longitude|lon)\s+(-?\d+\.?\d*)'
-        # Format 2: Simple "X, Y"
-        coord_pattern_simple = r'(-?\d+\.?\d*)\s*,\s*(-?\d+\.?\d*)'
-
-        coord_match = re.search(coord_pattern_verbose, message, re.IGNORECASE)
+        coord_match = QueryAnalyzer._COORDINATES_VERBOSE_RE.search(message)
         if not coord_match:
-            coord_match = re.search(coord_pattern_simple, message)
+            coord_match = QueryAnalyzer._COORDINATES_SIMPLE_RE.search(message)
 
         if coord_match:
             try:
@@ -382,24 +584,12 @@ class QueryAnalyzer:
             except ValueError:
                 pass
 
-        # Extract cities
-        african_cities = []
-        global_cities = []
-
-        for city in QueryAnalyzer.AFRICAN_CITIES:
-            if city in message_lower:
-                african_cities.append(city.title())
-
-        for city in QueryAnalyzer.GLOBAL_CITIES:
-            if city in message_lower:
-                global_cities.append(city.title())
-
-        # Remove duplicates
-        african_cities = list(set(african_cities))
-        global_cities = list(set(global_cities))
+        # Cities come back deduplicated, in the order they appear in the message
+        african_cities = scan.african_cities
+        global_cities = scan.global_cities
 
         return {
-            "is_air_quality": is_air_quality,
+            "is_air_quality": scan.has("air_quality"),
             "cities": african_cities + global_cities,
             "african_cities": african_cities,
             "global_cities": global_cities,
@@ -417,51 +607,40 @@ class QueryAnalyzer:
                 - requires_search: bool
                 - search_query: suggested search query string
         """
-        message_lower = message.lower()
-
-        # Educational/definition questions that DON'T need search
-        educational_patterns = [
-            r"what (is|are|does|do|means?)",
-            r"how (does|do|is|are)",
-            r"define",
-            r"explain",
-            r"tell me about",
-            r"why (is|are|does|do)",
-        ]
+        scan = QueryAnalyzer.scan_message(message)
 
         # Check if it's a simple educational question without location/data requests
-        is_educational = any(re.search(pattern, message_lower) for pattern in educational_patterns)
+        is_educational = bool(QueryAnalyzer._SEARCH_EDUCATIONAL_RE.search(message.lower()))
         is_short = len(message.split()) < 15  # Short questions are usually educational
 
-        # Keywords that definitely need search
-        temporal_keywords = ["latest", "recent", "new", "current", "update", "2024", "2025", "2026", "this year", "last year"]
-        policy_keywords = ["policy", "regulation", "legislation", "law", "government", "standard", "standards"]
-        research_keywords = ["research", "study", "studies", "report", "findings", "evidence", "published"]
-        data_keywords = ["statistics", "stats", "data", "trends", "analysis", "deaths", "mortality", "how many", "list"]
+        # Keywords that definitely need search: temporal, policy, research, data
+        matched_keywords = list(
+            dict.fromkeys(
+                scan.keywords["search_temporal"]
+                + scan.keywords["search_policy"]
+                + scan.keywords["search_research"]
+                + scan.keywords["search_data"]
+            )
+        )
+        has_search_keyword = bool(matched_keywords)
 
         # If it's an educational question without search triggers, skip search
-        if is_educational and is_short:
-            has_search_trigger = any(k in message_lower for k in temporal_keywords + policy_keywords + research_keywords + data_keywords)
-            if not has_search_trigger:
-                logger.info(f"🎓 Educational question detected - no search needed: '{message[:50]}...'")
-                return {
-                    "requires_search": False,
-                    "search_query": None
-                }
-
-        # Search if: temporal, policy, research, data keywords present
-        has_search_keyword = any(k in message_lower for k in temporal_keywords + policy_keywords + research_keywords + data_keywords)
+        if is_educational and is_short and not has_search_keyword:
+            logger.info(f"🎓 Educational question - no search needed: '{message[:50]}...'")
+            return {
+                "requires_search": False,
+                "search_query": None
+            }
 
         # Log detection for debugging
         if has_search_keyword:
-            matched_keywords = [k for k in temporal_keywords + policy_keywords + research_keywords + data_keywords if k in message_lower]
             logger.info(f"🔍 Search keywords detected: {matched_keywords}")
 
         requires_search = has_search_keyword
 
         # Generate focused search query
         search_query = message
-        if any(k in message_lower for k in data_keywords):
+        if scan.has("search_data"):
             search_query += " WHO EPA statistics"
 
         logger.info(f"🔍 Search detection result: requires_search={requires_search}, query='{search_query[:50] if search_query else 'None'}...'")
@@ -485,99 +664,23 @@ class QueryAnalyzer:
                 - topic: detected topic (deaths, trends, statistics, etc.)
                 - time_period: detected time period if any
         """
-        message_lower = message.lower()
-
-        # Data analysis keywords
-        data_keywords = [
-            "statistics",
-            "stats",
-            "data",
-            "chart",
-            "graph",
-            "plot",
-            "visualize",
-            "show me",
-            "generate",
-            "create",
-            "display",
-            "deaths",
-            "mortality",
-            "trends",
-            "analysis",
-            "report",
-            "findings",
-            "evidence",
-            "burden",
-            "prevalence",
-            "epidemiology",
-            "risk assessment",
-            "impact",
-            "global",
-            "worldwide",
-            "international",
-            "numbers",
-            "figures",
-            "metrics",
-        ]
-
-        # Visualization keywords
-        viz_keywords = [
-            "chart",
-            "graph",
-            "plot",
-            "visualize",
-            "show me",
-            "generate",
-            "create",
-            "display",
-            "diagram",
-            "map",
-        ]
-
-        # Time period keywords
-        time_keywords = [
-            "2023",
-            "2024",
-            "2025",
-            "2026",
-            "past",
-            "last year",
-            "recent",
-            "latest",
-            "current",
-            "this year",
-            "previous",
-            "annual",
-            "yearly",
-        ]
-
-        # Topic detection
-        topic_keywords = {
-            "deaths": ["deaths", "mortality", "fatalities", "died", "killed"],
-            "health": ["health", "disease", "illness", "medical", "hospital"],
-            "pollution": ["pollution", "air quality", "contamination", "emissions"],
-            "trends": ["trends", "changes", "patterns", "evolution", "over time"],
-            "statistics": ["statistics", "stats", "data", "numbers", "figures"],
-        }
+        scan = QueryAnalyzer.scan_message(message)
 
         # Check for data analysis intent
-        has_data_keywords = any(keyword in message_lower for keyword in data_keywords)
-        has_viz_keywords = any(keyword in message_lower for keyword in viz_keywords)
-        has_time_keywords = any(keyword in message_lower for keyword in time_keywords)
+        has_data_keywords = scan.has("analysis_data")
+        has_viz_keywords = scan.has("visualization")
+        has_time_keywords = scan.has("time_period")
 
         # Determine topic
-        detected_topic = None
-        for topic, keywords in topic_keywords.items():
-            if any(keyword in message_lower for keyword in keywords):
-                detected_topic = topic
-                break
-
-        # Determine time period
-        time_period = None
-        for time_kw in time_keywords:
-            if time_kw in message_lower:
-                time_period = time_kw
-                break
+        detected_topic = next(
+            (topic for topic in QueryAnalyzer.TOPIC_KEYWORDS if scan.has(f"topic:{topic}")), None
+        )
+
+        # Determine time period (first listed keyword that occurs)
+        time_period = next(
+            (kw for kw in QueryAnalyzer.TIME_PERIOD_KEYWORDS if kw in scan.keywords["time_period"]),
+            None,
+        )
 
         # This is data analysis if it has data keywords OR (visualization + time period)
         is_data_analysis = has_data_keywords or (has_viz_keywords and has_time_keywords)
@@ -616,99 +719,38 @@ class QueryAnalyzer:
                 - confidence: float (0.0-1.0) confidence score
                 - time_references: list of detected time expressions
         """
-        message_lower = message.lower()
-        words = message_lower.split()
-
-        # Advanced forecast detection patterns
-        forecast_indicators = {
-            # Direct forecast terms
-            "forecast": 1.0,
-            "prediction": 0.9,
-            "outlook": 0.8,
-            "projection": 0.8,
-            # Future time references
-            "tomorrow": 1.0,
-            "next day": 1.0,
-            "day after tomorrow": 0.9,
-            "next week": 0.8,
-            "this weekend": 0.9,
-            "weekend": 0.7,
-            "next month": 0.6,
-            "coming days": 0.7,
-            "upcoming": 0.6,
-            # Future tense and modal verbs
-            "will": 0.4,
-            "going to": 0.5,
-            "shall": 0.4,
-            "expect": 0.6,
-            "predict": 0.7,
-            "anticipate": 0.6,
-            "likely": 0.5,
-            # Question patterns indicating future interest
-            "should i": 0.3,
-            "can i": 0.3,
-            "is it safe": 0.4,
-            "better tomorrow": 0.8,
-            "worse tomorrow": 0.8,
-        }
-
-        # Time-specific patterns with day calculations
-        time_patterns = {
-            r"\btomorrow\b": (1, 1.0),
-            r"\bnext day\b": (1, 1.0),
-            r"\bday after\b": (2, 0.9),
-            r"\bin 2 days\b": (2, 1.0),
-            r"\bin 3 days\b": (3, 1.0),
-            r"\bnext week\b": (7, 0.8),
-            r"\bthis weekend\b": (3, 0.9),  # Assume current weekend
-            r"\bweekend\b": (3, 0.7),  # Generic weekend reference
-            r"\bmonday\b": (1, 0.6),  # Could be today or next Monday
-            r"\btuesday\b": (1, 0.6),
-            r"\bwednesday\b": (1, 0.6),
-            r"\bthursday\b": (1, 0.6),
-            r"\bfriday\b": (1, 0.6),
-            r"\bsaturday\b": (2, 0.5),  # Often refers to upcoming weekend
-            r"\bsunday\b": (2, 0.5),
-        }
-
-        # Calculate confidence score
-        confidence = 0.0
-        detected_indicators = []
-
-        # Check for forecast indicators
-        for indicator, weight in forecast_indicators.items():
-            if indicator in message_lower:
-                confidence += weight
-                detected_indicators.append(indicator)
+        scan = QueryAnalyzer.scan_message(message)
+        words = message.split()
+
+        # Calculate confidence score from forecast indicators
+        matched_indicators = scan.keywords["forecast_indicator"]
+        detected_indicators = [
+            indicator
+            for indicator in QueryAnalyzer.FORECAST_INDICATORS
+            if indicator in matched_indicators
+        ]
+        confidence = sum(QueryAnalyzer.FORECAST_INDICATORS[i] for i in detected_indicators)
 
-        # Check for time patterns
+        # Check for time references
         days_ahead = 1  # Default
+        matched_times = scan.keywords["forecast_time"]
         time_references = []
-
-        import re
-
-        for pattern, (days, weight) in time_patterns.items():
-            if re.search(pattern, message_lower):
+        for reference, (days, weight) in QueryAnalyzer.FORECAST_TIME_REFERENCES.items():
+            if reference in matched_times:
                 days_ahead = days
                 confidence += weight
-                time_references.append(pattern.strip(r"\\b"))
+                time_references.append(reference)
 
         # Boost confidence for air quality + time combinations
-        air_quality_terms = ["air quality", "aqi", "pollution", "pm2.5", "pm10", "smog"]
-        has_air_quality = any(term in message_lower for term in air_quality_terms)
-
-        if has_air_quality and (detected_indicators or time_references):
+        if scan.has("forecast_air_quality") and (detected_indicators or time_references):
             confidence += 0.3  # Boost for clear air quality + time combination
 
         # Context-aware adjustments
-        # Questions about future activities often imply forecasts
-        activity_questions = ["exercise", "run", "walk", "outdoor", "outside", "safe to"]
-        if any(activity in message_lower for activity in activity_questions) and time_references:
+        if scan.has("activity") and time_references:
             confidence += 0.2
 
         # Comparative language
-        comparative_terms = ["better than", "worse than", "compared to", "versus"]
-        if any(term in message_lower for term in comparative_terms) and time_references:
+        if scan.has("comparative") and time_references:
             confidence += 0.2
 
         # Determine if this is actually a forecast query
@@ -717,18 +759,9 @@ class QueryAnalyzer:
         # Cap confidence at 1.0
         confidence = min(confidence, 1.0)
 
-        # Extract cities with improved detection
-        cities = []
-        city_detection_boost = 0.0
-
-        # Check all known cities
-        all_cities = QueryAnalyzer.AFRICAN_CITIES + QueryAnalyzer.GLOBAL_CITIES
-        for city in all_cities:
-            if city in message_lower:
-                cities.append(city.title())
-                city_detection_boost += 0.1  # Small boost for city detection
-
         # If cities found, slightly boost confidence
+        cities = scan.cities
+        city_detection_boost = 0.1 * len(cities)  # Small boost per detected city
         confidence = min(confidence + city_detection_boost, 1.0)
 
         # Special case: Very short messages with just city + time might be forecasts
@@ -802,132 +835,77 @@ class QueryAnalyzer:
             or (aq_analysis["coordinates"] and len(aq_analysis["cities"]) >= 1)
         )
 
-        # Call air quality tools (optimized - only if location detected)
+        # Location and forecast calls are independent, so they run concurrently
+        # (bounded, with per-call and overall deadlines). Each job returns
+        # (tool results, tools called, context parts) and is merged in the
+        # order below, so the context reads the same as a serial run.
+        proactive_jobs = {}
         if aq_analysis["is_air_quality"] and (aq_analysis["cities"] or aq_analysis["coordinates"]):
-            # Call for African cities
             for city in aq_analysis["african_cities"]:
-                try:
-                    logger.info(f"🔧 PROACTIVE CALL: get_african_city_air_quality for {city}")
-                    result = await tool_executor.execute_async(
-                        "get_african_city_air_quality", {"city": city}
-                    )
-                    tool_results[f"get_african_city_air_quality_{city}"] = result
-                    tools_called.append("get_african_city_air_quality")
-
-                    # Format result for context
-                    context_parts.append(
-                        f"\n**REAL-TIME DATA from AirQo for {city}:**\n{format_air_quality_result(result)}\n"
-                    )
-                except Exception as e:
-                    logger.error(f"Proactive tool call failed for {city}: {e}")
-
-            # Call for global cities
+                proactive_jobs[f"AirQo data for {city}"] = functools.partial(
+                    QueryAnalyzer._proactive_call,
+                    tool_executor,
+                    "get_african_city_air_quality",
+                    {"city": city},
+                    f"get_african_city_air_quality_{city}",
+                    f"REAL-TIME DATA from AirQo for {city}",
+                    format_air_quality_result,
+                )
             for city in aq_analysis["global_cities"]:
-                try:
-                    logger.info(f"🔧 PROACTIVE CALL: get_city_air_quality for {city}")
-                    result = await tool_executor.execute_async(
-                        "get_city_air_quality", {"city": city}
-                    )
-                    tool_results[f"get_city_air_quality_{city}"] = result
-                    tools_called.append("get_city_air_quality")
-
-                    # Format result for context
-                    context_parts.append(
-                        f"\n**REAL-TIME DATA from WAQI for {city}:**\n{format_air_quality_result(result)}\n"
-                    )
-                except Exception as e:
-                    logger.error(f"Proactive tool call failed for {city}: {e}")
-
-            # Call for coordinates (CRITICAL: Enhanced with reverse geocoding and nearby station search)
+                proactive_jobs[f"WAQI data for {city}"] = functools.partial(
+                    QueryAnalyzer._proactive_call,
+                    tool_executor,
+                    "get_city_air_quality",
+                    {"city": city},
+                    f"get_city_air_quality_{city}",
+                    f"REAL-TIME DATA from WAQI for {city}",
+                    format_air_quality_result,
+                )
             if aq_analysis["coordinates"]:
-                try:
-                    coords = aq_analysis["coordinates"]
-                    logger.info(f"🔧 PROACTIVE CALL: Enhanced coordinate handling for {coords}")
-
-                    # Step 1: Get OpenMeteo data for exact coordinates
-                    openmeteo_result = await tool_executor.execute_async(
-                        "get_openmeteo_current_air_quality", coords
-                    )
-                    tool_results["get_openmeteo_air_quality"] = openmeteo_result
-                    tools_called.append("get_openmeteo_current_air_quality")
-
-                    # Step 2: Reverse geocode to find nearby city/location name
-                    try:
-                        reverse_geo_result = await tool_executor.execute_async(
-                            "reverse_geocode_location",
-                            {"latitude": coords["latitude"], "longitude": coords["longitude"]}
-                        )
-
-                        if reverse_geo_result.get("success"):
-                            location_name = reverse_geo_result.get("location_name", "Unknown")
-                            city_name = reverse_geo_result.get("city")
-                            country = reverse_geo_result.get("country")
-
-                            logger.info(f"📍 Reverse geocoded: {location_name} ({city_name}, {country})")
-
-                            # Step 3: Try to find nearby monitoring stations using detected city
-                            if city_name:
-                                # Try WAQI for nearby stations
-                                try:
-                                    nearby_result = await tool_executor.execute_async(
-                                        "get_city_air_quality", {"city": city_name}
-                                    )
-                                    if nearby_result.get("success"):
-                                        tool_results[f"nearby_station_{city_name}"] = nearby_result
-                                        tools_called.append("get_city_air_quality")
-                                        logger.info(f"✅ Found nearby station in {city_name}")
-                                except Exception as e:
-                                    logger.debug(f"No nearby WAQI station found for {city_name}: {e}")
-
-                    except Exception as e:
-                        logger.debug(f"Reverse geocoding failed: {e}")
-
-                    # Format comprehensive result for context
-                    context_parts.append(
-                        f"\n**LOCATION-BASED AIR QUALITY DATA**\n"
-                        f"Coordinates: {coords['latitude']:.4f}, {coords['longitude']:.4f}\n"
-                        f"Location: {location_name if 'location_name' in locals() else 'coordinates provided'}\n\n"
-                        f"**Model Data (OpenMeteo):**\n{format_air_quality_result(openmeteo_result)}\n"
-                    )
-
-                    # Add nearby station data if available
-                    if f"nearby_station_{city_name}" in tool_results and 'city_name' in locals():
-                        nearby_data = tool_results[f"nearby_station_{city_name}"]
-                        context_parts.append(
-                            f"\n**Nearby Monitoring Station ({city_name}):**\n"
-                            f"{format_air_quality_result(nearby_data)}\n"
-                            f"_Note: This is the closest official monitoring station to your coordinates._\n"
-                        )
-
-                except Exception as e:
-                    logger.error(f"Proactive coordinate handling failed: {e}")
-
-            # Log composite query detection
-            if has_and_keyword and has_multiple_locations:
-                logger.info(f"🔗 COMPOSITE QUERY DETECTED: Called {len(tools_called)} tools for multiple locations")
+                proactive_jobs["coordinate data"] = functools.partial(
+                    QueryAnalyzer._proactive_coordinate_calls,
+                    aq_analysis["coordinates"],
+                    tool_executor,
+                )
 
-        # Call forecast tools
         if (
             forecast_analysis["is_forecast"]
             and aq_analysis["is_air_quality"]
             and forecast_analysis["cities"]
         ):
+            days = forecast_analysis["days_ahead"]
             for city in forecast_analysis["cities"]:
-                try:
-                    logger.info(f"🔧 PROACTIVE CALL: get_air_quality_forecast for {city}")
-                    result = await tool_executor.execute_async(
-                        "get_air_quality_forecast",
-                        {"city": city, "days": forecast_analysis["days_ahead"]},
-                    )
-                    tool_results[f"get_air_quality_forecast_{city}"] = result
-                    tools_called.append("get_air_quality_forecast")
+                proactive_jobs[f"forecast for {city}"] = functools.partial(
+                    QueryAnalyzer._proactive_call,
+                    tool_executor,
+                    "get_air_quality_forecast",
+                    {"city": city, "days": days},
+                    f"get_air_quality_forecast_{city}",
+                    f"FORECAST DATA for {city} ({days} day{'s' if days != 1 else ''})",
+                    format_forecast_result,
+                )
 
-                    # Format result for context
-                    context_parts.append(
-                        f"\n**FORECAST DATA for {city} ({forecast_analysis['days_ahead']} day{'s' if forecast_analysis['days_ahead'] != 1 else ''}):**\n{format_forecast_result(result)}\n"
-                    )
-                except Exception as e:
-                    logger.error(f"Proactive forecast call failed for {city}: {e}")
+        outcomes = await gather_bounded(
+            proactive_jobs,
+            QueryAnalyzer.PROACTIVE_CONCURRENCY,
+            QueryAnalyzer.PROACTIVE_CALL_TIMEOUT_SECONDS,
+            QueryAnalyzer.PROACTIVE_DEADLINE_SECONDS,
+        )
+        for label in proactive_jobs:
+            outcome = outcomes.get(label)
+            if outcome is None:
+                logger.warning(f"Proactive call for {label} missed the deadline, continuing without it")
+            elif isinstance(outcome, BaseException):
+                logger.error(f"Proactive tool call failed for {label}: {outcome}")
+            else:
+                results, called, contexts = outcome
+                tool_results.update(results)
+                tools_called.extend(called)
+                context_parts.extend(contexts)
+
+        # Log composite query detection
+        if has_and_keyword and has_multiple_locations:
+            logger.info(f"🔗 COMPOSITE QUERY DETECTED: Called {len(tools_called)} tools for multiple locations")
 
         # Call search tool intelligently (optimized to supplement, not overwhelm)
         # CRITICAL FIX: Ensure research, data_analysis, and general_knowledge queries ALWAYS trigger search
@@ -1033,12 +1011,11 @@ class QueryAnalyzer:
         has_air_quality_data = tools_called and any("air_quality" in tool for tool in tools_called)
 
         # Explicit visualization keywords
-        viz_keywords = ["chart", "graph", "plot", "visualize", "trend", "show me"]
-        explicit_viz_request = any(keyword in message.lower() for keyword in viz_keywords)
+        scan = QueryAnalyzer.scan_message(message)
+        explicit_viz_request = scan.has("chart_request")
 
         # Auto-chart for simple air quality requests (unless it's just definitional)
-        definitional_keywords = ["what is", "define", "explain", "meaning", "difference between"]
-        is_definitional = any(keyword in message.lower() for keyword in definitional_keywords)
+        is_definitional = scan.has("definitional")
 
         should_generate_chart = has_air_quality_data and (
             explicit_viz_request or
@@ -1125,6 +1102,91 @@ class QueryAnalyzer:
             "query_classification": classification,
         }
 
+    @staticmethod
+    async def _proactive_call(
+        tool_executor: Any,
+        tool_name: str,
+        args: dict[str, Any],
+        result_key: str,
+        heading: str,
+        formatter: Callable[[dict[str, Any]], str],
+    ) -> tuple[dict[str, Any], list[str], list[str]]:
+        """Call one tool and format its result for the context."""
+        logger.info(f"🔧 PROACTIVE CALL: {tool_name} for {args}")
+        result = await tool_executor.execute_async(tool_name, args)
+        return {result_key: result}, [tool_name], [f"\n**{heading}:**\n{formatter(result)}\n"]
+
+    @staticmethod
+    async def _proactive_coordinate_calls(
+        coords: dict[str, float], tool_executor: Any
+    ) -> tuple[dict[str, Any], list[str], list[str]]:
+        """
+        OpenMeteo data for exact coordinates, plus the nearest monitoring station
+        found by reverse geocoding them.
+        """
+        tool_results = {}
+        tools_called = []
+        logger.info(f"🔧 PROACTIVE CALL: Enhanced coordinate handling for {coords}")
+
+        # Step 1: Get OpenMeteo data for exact coordinates
+        openmeteo_result = await tool_executor.execute_async(
+            "get_openmeteo_current_air_quality", coords
+        )
+        tool_results["get_openmeteo_air_quality"] = openmeteo_result
+        tools_called.append("get_openmeteo_current_air_quality")
+
+        # Step 2: Reverse geocode to find nearby city/location name
+        location_name = "coordinates provided"
+        city_name = None
+        try:
+            reverse_geo_result = await tool_executor.execute_async(
+                "reverse_geocode_location",
+                {"latitude": coords["latitude"], "longitude": coords["longitude"]}
+            )
+
+            if reverse_geo_result.get("success"):
+                location_name = reverse_geo_result.get("location_name", "Unknown")
+                city_name = reverse_geo_result.get("city")
+                country = reverse_geo_result.get("country")
+
+                logger.info(f"📍 Reverse geocoded: {location_name} ({city_name}, {country})")
+
+                # Step 3: Try to find nearby monitoring stations using detected city
+                if city_name:
+                    # Try WAQI for nearby stations
+                    try:
+                        nearby_result = await tool_executor.execute_async(
+                            "get_city_air_quality", {"city": city_name}
+                        )
+                        if nearby_result.get("success"):
+                            tool_results[f"nearby_station_{city_name}"] = nearby_result
+                            tools_called.append("get_city_air_quality")
+                            logger.info(f"✅ Found nearby station in {city_name}")
+                    except Exception as e:
+                        logger.debug(f"No nearby WAQI station found for {city_name}: {e}")
+
+        except Exception as e:
+            logger.debug(f"Reverse geocoding failed: {e}")
+
+        # Format comprehensive result for context
+        context_parts = [
+            f"\n**LOCATION-BASED AIR QUALITY DATA**\n"
+            f"Coordinates: {coords['latitude']:.4f}, {coords['longitude']:.4f}\n"
+            f"Location: {location_name}\n\n"
+            f"**Model Data (OpenMeteo):**\n{format_air_quality_result(openmeteo_result)}\n"
+        ]
+
+        # Add nearby station data if available
+        if f"nearby_station_{city_name}" in tool_results:
+            nearby_data = tool_results[f"nearby_station_{city_name}"]
+            context_parts.append(
+                f"\n**Nearby Monitoring Station ({city_name}):**\n"
+                f"{format_air_quality_result(nearby_data)}\n"
+                f"_Note: This is the closest official monitoring station to your coordinates._\n"
+            )
+
+        return tool_results, tools_called, context_parts
+
     @staticmethod
     async def _generate_chart_from_aq_data(
         tool_results: dict, message: str, tool_executor: Any
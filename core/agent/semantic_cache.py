@@ -0,0 +1,224 @@
+"""
+Semantic response cache.
+
+The exact response cache (`AgentService._generate_cache_key`) only hits on
+identical text, so "air quality in Kampala?" and "what's the AQI in kampala
+now" both pay for a full LLM call. This layer maps paraphrases onto a response
+that is already cached:
+
+- QueryAnalyzer's extraction turns a message into a frame of entities that
+  must match exactly (intent, forecast days, cities, coordinates, pollutants,
+  plus the provider/model/style context) and a set of tokens (what is asked
+  for: query type, chart, health advice, definition; plus the content words
+  no keyword accounts for).
+- Each frame keeps a short list of recently answered variants in the shared
+  cache. A new message is compared with them by Jaccard similarity, and the
+  best one at or above SEMANTIC_CACHE_THRESHOLD gives the exact cache key of
+  its response.
+
+Only messages naming a city or coordinates take part; anything else (a
+pollutant alone included: "Is PM2.5 high where I am?") depends on the client's
+location or the conversation.
+
+The caller still loads that response through its freshness rules, so a
+semantic hit is never staler than an exact one. Concurrent writers to one
+frame may drop a variant; that only costs a future miss.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from core.agent.query_analyzer import QueryAnalyzer
+from shared.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+(?:[.'’]\w+)*")
+
+# Words that never distinguish one air quality question from another
+_STOPWORDS = frozenset(
+    """
+    a about an and any are as at be can could do does for from give get how i in is it
+    its it's me my now of on please right show tell than that the there this to today
+    what what's whats which with would you your
+    """.split()
+)
+
+# Query types that change how a question is answered (location_specific and general
+# are both plain lookups, told apart only by keyword coverage)
+_DISTINCT_QUERY_TYPES = frozenset(
+    {"data_analysis", "research", "general_knowledge", "educational", "complex_scientific"}
+)
+
+
+@dataclass(frozen=True)
+class QuerySignature:
+    """Normalized form of a chat message for paraphrase matching."""
+
+    frame: tuple
+    tokens: frozenset[str]
+
+    @property
+    def names_place(self) -> bool:
+        """Whether the message names a city or coordinates."""
+        _, _, cities, coordinates, _ = self.frame
+        return bool(cities or coordinates)
+
+
+def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class SemanticResponseCache:
+    """Paraphrase index over the exact agent response cache."""
+
+    NAMESPACE = "agent:semantic"
+    # Answered variants kept per frame (most recent first)
+    MAX_VARIANTS = 16
+
+    def __init__(self, cache: Any, threshold: float | None = None, enabled: bool | None = None):
+        """
+        Initialize the index.
+
+        Args:
+            cache: RedisCache holding the variant lists
+            threshold: Minimum similarity for a hit (default: SEMANTIC_CACHE_THRESHOLD)
+            enabled: Default: SEMANTIC_CACHE_ENABLED
+        """
+        settings = get_settings()
+        self.cache = cache
+        self.threshold = settings.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.enabled = settings.SEMANTIC_CACHE_ENABLED if enabled is None else enabled
+        self.metrics = {"lookups": 0, "hits": 0, "stored": 0}
+
+    @staticmethod
+    def signature(message: str) -> QuerySignature | None:
+        """
+        Frame and tokens of a message, or None if there is nothing to match on.
+        """
+        scan = QueryAnalyzer.scan_message(message)
+        aq = QueryAnalyzer.detect_air_quality_query(message)
+        forecast = QueryAnalyzer.detect_forecast_query(message)
+
+        if forecast["is_forecast"]:
+            intent, days = "forecast", forecast["days_ahead"]
+        else:
+            intent, days = ("air_quality" if aq["is_air_quality"] else "general"), 0
+        coordinates = aq["coordinates"]
+        frame = (
+            intent,
+            days,
+            tuple(sorted(city.lower() for city in scan.cities)),
+            (
+                (round(coordinates["latitude"], 2), round(coordinates["longitude"], 2))
+                if coordinates
+                else ()
+            ),
+            tuple(sorted({QueryAnalyzer.POLLUTANT_TERMS[t] for t in scan.keywords["pollutant"]})),
+        )
+
+        # Words covered by a matched keyword or city are represented by its label / the frame
+        covered = {
+            word
+            for terms in scan.keywords.values()
+            for term in terms
+            for word in _WORD.findall(term)
+        }
+        words = {
+            word
+            for word in _WORD.findall(message.lower())
+            if word not in _STOPWORDS and word not in covered and not word.isdigit()
+        }
+        tokens = SemanticResponseCache._intents(message, aq, scan) | frozenset(words)
+        if not tokens:
+            return None
+        return QuerySignature(frame, tokens)
+
+    @staticmethod
+    def _intents(message: str, aq: dict[str, Any], scan: Any) -> frozenset[str]:
+        """What the user wants done, independent of wording."""
+        intents = set()
+        query_type = QueryAnalyzer.classify_query_type(message)["query_type"]
+        if query_type in _DISTINCT_QUERY_TYPES:
+            intents.add(f"type:{query_type}")
+        if aq["is_air_quality"]:
+            intents.add("air_quality")
+        if QueryAnalyzer.detect_data_analysis_query(message)["requires_visualization"]:
+            intents.add("chart")
+        if scan.has("activity"):
+            intents.add("health")
+        if scan.has("definitional"):
+            intents.add("definition")
+        return frozenset(intents)
+
+    def _bucket(self, signature: QuerySignature, context: str) -> str:
+        raw = json.dumps([context, signature.frame], default=str)
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    @staticmethod
+    def eligible(signature: QuerySignature | None) -> bool:
+        """
+        Only messages naming their place are shared: without a city or
+        coordinates the answer depends on the client's location (even when a
+        pollutant is named) or on earlier turns.
+        """
+        return signature is not None and signature.names_place
+
+    async def find(self, message: str, context: str) -> str | None:
+        """
+        Exact cache key of the most similar answered paraphrase, if any.
+
+        Args:
+            message: User message
+            context: Provider, model and generation settings the answer must share
+        """
+        if not self.enabled:
+            return None
+        signature = self.signature(message)
+        if not self.eligible(signature):
+            return None
+
+        self.metrics["lookups"] += 1
+        variants = await self.cache.get_async(self.NAMESPACE, self._bucket(signature, context))
+        best_key, best_score = None, self.threshold
+        for variant in variants or []:
+            score = similarity(signature.tokens, frozenset(variant["tokens"]))
+            if score >= best_score:
+                best_key, best_score = variant["key"], score
+        if best_key is not None:
+            self.metrics["hits"] += 1
+            logger.info(f"Semantic cache match (similarity {best_score:.2f}): '{message[:60]}'")
+        return best_key
+
+    async def remember(self, message: str, context: str, cache_key: str, ttl: int) -> None:
+        """Record that `cache_key` holds the answer to `message` (for `ttl` seconds)."""
+        if not self.enabled:
+            return
+        signature = self.signature(message)
+        if not self.eligible(signature):
+            return
+
+        bucket = self._bucket(signature, context)
+        variants = await self.cache.get_async(self.NAMESPACE, bucket) or []
+        variants = [v for v in variants if v["key"] != cache_key]
+        variants.insert(0, {"tokens": sorted(signature.tokens), "key": cache_key})
+        await self.cache.set_async(
+            self.NAMESPACE, bucket, variants[: self.MAX_VARIANTS], ttl=ttl
+        )
+        self.metrics["stored"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.metrics["lookups"]
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            **self.metrics,
+            "hit_rate": round(self.metrics["hits"] / lookups, 3) if lookups else 0.0,
+        }
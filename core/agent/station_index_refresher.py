@@ -0,0 +1,188 @@
+"""
+Background Station Index Refresher
+
+Loads the monitoring-site lists of AirQo, WAQI, UBA and NSW and rebuilds the
+nearest-station index (shared.utils.spatial_index) from them on a fixed
+interval, so coordinate queries resolve to nearby stations without a
+reverse-geocoding call or a site search.
+
+Sources load concurrently; a source that fails keeps the stations of the
+previous build, so one provider outage never empties the index.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from shared.config.settings import get_settings
+from shared.utils.spatial_index import (
+    Station,
+    StationIndex,
+    get_station_index,
+    set_station_index,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _station(source: str, station_id: Any, name: Any, lat: Any, lon: Any) -> Station | None:
+    try:
+        latitude, longitude = float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None
+    if station_id in (None, "") or (latitude == 0 and longitude == 0):
+        return None
+    return Station(source, str(station_id), str(name or station_id), latitude, longitude)
+
+
+def airqo_stations(response: dict[str, Any]) -> list[Station]:
+    """Stations from an AirQo sites summary."""
+    stations = []
+    for site in response.get("sites") or []:
+        lat, lon = site.get("latitude"), site.get("longitude")
+        if lat is None or lon is None:
+            lat, lon = site.get("approximate_latitude"), site.get("approximate_longitude")
+        name = site.get("search_name") or site.get("name")
+        station = _station("airqo", site.get("_id"), name, lat, lon)
+        if station:
+            stations.append(station)
+    return stations
+
+
+def waqi_stations(response: dict[str, Any]) -> list[Station]:
+    """Stations from a WAQI map-bounds response."""
+    stations = []
+    for item in response.get("data") or []:
+        name = (item.get("station") or {}).get("name")
+        station = _station("waqi", item.get("uid"), name, item.get("lat"), item.get("lon"))
+        if station:
+            stations.append(station)
+    return stations
+
+
+def uba_stations(response: dict[str, Any]) -> list[Station]:
+    """Stations from the formatted UBA stations list."""
+    stations = []
+    for item in response.get("stations") or []:
+        station = _station(
+            "uba", item.get("id"), item.get("name"), item.get("latitude"), item.get("longitude")
+        )
+        if station:
+            stations.append(station)
+    return stations
+
+
+def nsw_stations(sites: list[dict[str, Any]]) -> list[Station]:
+    """Stations from NSW site details."""
+    stations = []
+    for site in sites or []:
+        station = _station(
+            "nsw",
+            site.get("Site_Id"),
+            site.get("SiteName"),
+            site.get("Latitude"),
+            site.get("Longitude"),
+        )
+        if station:
+            stations.append(station)
+    return stations
+
+
+class StationIndexRefresher:
+    """In-process scheduler that rebuilds the station index from the providers' site lists."""
+
+    def __init__(self, tool_executor: Any, interval: float | None = None):
+        """
+        Initialize the refresher (call start() to begin refreshing).
+
+        Args:
+            tool_executor: ToolExecutor whose data-source services are read
+            interval: Seconds between rebuilds (default: STATION_INDEX_REFRESH_SECONDS)
+        """
+        self.tool_executor = tool_executor
+        self.interval = interval or get_settings().STATION_INDEX_REFRESH_SECONDS
+        self._task: asyncio.Task | None = None
+        self.metrics: dict[str, Any] = {"refreshes": 0, "failed_sources": {}, "last_build_ms": 0.0}
+
+    def _loaders(self) -> dict[str, Callable[[], Awaitable[list[Station]]]]:
+        executor = self.tool_executor
+        loaders = {}
+        if executor.airqo is not None:
+
+            async def load_airqo() -> list[Station]:
+                return airqo_stations(await executor.airqo.get_sites_summary_async())
+
+            loaders["airqo"] = load_airqo
+        if executor.waqi is not None:
+
+            async def load_waqi() -> list[Station]:
+                return waqi_stations(await executor.waqi.get_map_bounds_async(-90, -180, 90, 180))
+
+            loaders["waqi"] = load_waqi
+        if executor.uba is not None:
+
+            async def load_uba() -> list[Station]:
+                return uba_stations(await executor.uba.get_stations_async())
+
+            loaders["uba"] = load_uba
+        if executor.nsw is not None:
+
+            async def load_nsw() -> list[Station]:
+                return nsw_stations(await executor.nsw.get_site_details_async())
+
+            loaders["nsw"] = load_nsw
+        return loaders
+
+    async def refresh(self) -> StationIndex:
+        """Reload every source and swap in the rebuilt index."""
+        loaders = self._loaders()
+        results = await asyncio.gather(
+            *(loader() for loader in loaders.values()), return_exceptions=True
+        )
+        previous = get_station_index()
+        stations: list[Station] = []
+        for source, result in zip(loaders, results):
+            if isinstance(result, BaseException) or not result:
+                logger.warning(f"Station list refresh failed for {source}: {str(result)[:200]}")
+                failed = self.metrics["failed_sources"]
+                failed[source] = failed.get(source, 0) + 1
+                stations.extend(previous.stations(source))
+            else:
+                stations.extend(result)
+
+        started = time.perf_counter()
+        index = StationIndex(stations)
+        self.metrics["last_build_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.metrics["refreshes"] += 1
+        set_station_index(index)
+        logger.info(f"Station index rebuilt: {index.stats()['stations']}")
+        return index
+
+    def start(self) -> None:
+        """Start refreshing in the background on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Station index refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict[str, Any]:
+        return {**get_station_index().stats(), **self.metrics}
@@ -4,19 +4,136 @@ Tool execution module for AI agent.
 Handles execution of various data source and utility tools with intelligent fallbacks and retry logic.
 """
 
+import asyncio
 import logging
 import time
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any
 
-logger = logging.getLogger(__name__)
-
+from core.agent.tool_memo import get_tool_memo
+from shared.utils.circuit_breaker import get_circuit_breaker
+from shared.utils.concurrency import gather_bounded, run_bounded
 from shared.utils.provider_errors import ProviderServiceError, aeris_unavailable_message
+from shared.utils.rate_limiter import is_local_rejection
+
+logger = logging.getLogger(__name__)
 
 
 class ToolExecutor:
     """Executes tools for the AI agent with intelligent fallbacks and error handling."""
 
+    # Cities where AirQo has better coverage than the global networks
+    AFRICAN_CITY_INDICATORS = [
+        "kampala", "nairobi", "lagos", "accra", "kigali", "dar es salaam", "addis ababa",
+        "cairo", "johannesburg", "cape town", "kinshasa", "luanda", "abidjan", "dakar",
+        "casablanca", "algiers", "tunis", "khartoum", "mogadishu", "harare", "lusaka",
+        "maputo", "windhoek", "gaborone", "lilongwe", "blantyre", "bujumbura", "bamako",
+        "ouagadougou", "niamey", "ndjamena", "bangui", "libreville", "brazzaville",
+        "yaoundé", "douala", "malabo", "monrovia", "freetown", "conakry", "bissau",
+        "praia", "banjul", "nouakchott", "kampala", "jinja", "mbarara", "gulu"
+    ]
+
+    # African countries/cities whose forecasts should come from AirQo
+    AFRICAN_FORECAST_INDICATORS = [
+        "africa",
+        "kenya",
+        "uganda",
+        "tanzania",
+        "rwanda",
+        "ghana",
+        "nigeria",
+        "ethiopia",
+        "south africa",
+        "egypt",
+        "morocco",
+        "algeria",
+        "tunisia",
+        "nairobi",
+        "kampala",
+        "dar es salaam",
+        "kigali",
+        "accra",
+        "lagos",
+        "addis ababa",
+        "cape town",
+        "cairo",
+        "casablanca",
+        "algiers",
+        "tunis",
+    ]
+
+    # UK cities for which the carbon intensity feed is a meaningful fallback
+    UK_CARBON_INTENSITY_CITIES = [
+        "london",
+        "manchester",
+        "birmingham",
+        "leeds",
+        "glasgow",
+        "sheffield",
+        "bradford",
+        "liverpool",
+        "edinburgh",
+        "leicester",
+    ]
+
+    # Per-city results of get_multiple_african_cities_air_quality, read and
+    # written as one batch. Fallback (non-AirQo) results expire sooner so the
+    # primary source is retried quickly.
+    CITY_RESULT_CACHE_NAMESPACE = "tool:african_city"
+    CITY_RESULT_CACHE_TTL = 1800
+    CITY_FALLBACK_CACHE_TTL = 300
+    # Cities missing from the cache are fetched concurrently; whatever has not
+    # answered by the deadline is reported as unavailable (partial result)
+    MULTI_CITY_CONCURRENCY = 4
+    MULTI_CITY_CALL_TIMEOUT_SECONDS = 30.0
+    MULTI_CITY_DEADLINE_SECONDS = 40.0
+
+    # Hedged city lookup: the top-ranked source starts at once and the next one
+    # joins after SOURCE_HEDGE_DELAY_SECONDS (or as soon as one fails), with at
+    # most SOURCE_HEDGE_MAX_IN_FLIGHT calls running for a city
+    SOURCE_HEDGE_DELAY_SECONDS = 2.0
+    SOURCE_HEDGE_MAX_IN_FLIGHT = 3
+    # Weight of the latest outcome in a source's win score (scores start at 0.5)
+    SOURCE_SCORE_ALPHA = 0.2
+    # A source scoring below this ranks behind the rest of its tier; scores drift
+    # back to 0.5 with this half-life, so a demoted source gets to lead again
+    SOURCE_DEMOTE_BELOW = 0.45
+    SOURCE_SCORE_HALF_LIFE_SECONDS = 600.0
+    # Ranking never crosses tiers: ground monitoring networks (tier 0) always go
+    # before modeled data
+    SOURCE_TIERS = {"openmeteo": 1}
+
+    # Tools served directly on the event loop by the async-native HTTP clients.
+    # Everything else (search, scraping, documents, charts, carbon intensity,
+    # AirQo history/metadata) runs through ``execute`` on a worker thread.
+    NATIVE_ASYNC_TOOLS = frozenset(
+        {
+            "get_city_air_quality",
+            "search_waqi_stations",
+            "get_african_city_air_quality",
+            "get_multiple_african_cities_air_quality",
+            "get_air_quality_forecast",
+            "get_air_quality_by_location",
+            "search_airqo_sites",
+            "get_openmeteo_current_air_quality",
+            "get_openmeteo_forecast",
+            "get_openmeteo_historical",
+            "get_uba_measures",
+            "get_nsw_air_quality",
+            "get_nsw_sites",
+            "get_nsw_pollutant_data",
+            "get_city_weather",
+            "get_weather_forecast",
+            "geocode_address",
+            "reverse_geocode",
+            "get_location_from_ip",
+        }
+    )
+
+    # Tools with side effects or per-call inputs, never served from the turn's memo
+    UNMEMOIZED_TOOLS = frozenset({"scan_document", "generate_chart"})
+
     def __init__(
         self,
         waqi_service,
@@ -71,13 +188,14 @@ class ToolExecutor:
         )  # Store uploaded documents temporarily for fallback access: {filename: content_dict}
         self.session_id = None  # Will be set by agent service for chart organization
 
-        # Lazy-load visualization service
+        # Lazy-load visualization service and cache
         self._visualization_service = None
+        self._cache = None
 
-        # Circuit breaker for failing services
-        self.service_failures = {}  # Track failures per service
-        self.circuit_breaker_threshold = 5  # Failures before circuit opens
-        self.circuit_breaker_timeout = 300  # 5 minutes before retry
+        # Win scores of the city sources, per region ("africa"/"global"), and
+        # when each was last updated, used to rank the hedged lookup
+        self.source_scores: dict[str, dict[str, float]] = {}
+        self.source_score_times: dict[str, dict[str, float]] = {}
 
     @property
     def visualization_service(self):
@@ -88,40 +206,314 @@ class ToolExecutor:
             self._visualization_service = get_visualization_service()
         return self._visualization_service
 
+    @property
+    def cache(self):
+        """Lazy-load the shared cache."""
+        if self._cache is None:
+            from infrastructure.cache.cache_service import get_cache
+
+            self._cache = get_cache()
+        return self._cache
+
     def _is_circuit_open(self, service_name: str) -> bool:
-        """Check if circuit breaker is open for a service."""
-        if service_name not in self.service_failures:
+        """
+        Check if circuit breaker is open for a service.
+
+        Call once right before calling the service: when the breaker is
+        half-open this lets exactly one probe call through.
+        """
+        if get_circuit_breaker(service_name).allow_request():
             return False
+        logger.warning(f"Circuit breaker OPEN for {service_name}")
+        return True
+
+    def _record_failure(self, service_name: str, error: Exception | None = None):
+        """Record a service failure (a local rate-limit rejection or a 4xx is not one)."""
+        if is_local_rejection(error):
+            logger.info(f"{service_name} call rejected by the local rate limit")
+            return
+        status = getattr(error, "http_status", None)
+        if status is not None and 400 <= status < 500 and status != 429:
+            # The provider answered; this request was bad, the service is not down
+            return
+        get_circuit_breaker(service_name).record_failure()
+
+    def _record_success(self, service_name: str, latency: float | None = None):
+        """Record a successful service call (slower than the slow-call limit counts as failed)."""
+        get_circuit_breaker(service_name).record_success(latency)
+
+    @classmethod
+    def _is_african_city(cls, city: str) -> bool:
+        """Detect if a city name is likely an African city."""
+        return any(indicator in city.lower() for indicator in cls.AFRICAN_CITY_INDICATORS)
+
+    @classmethod
+    def _is_uk_city(cls, city: str) -> bool:
+        """Detect if a city name is one covered by the UK carbon intensity feed."""
+        return any(uk_city in city.lower() for uk_city in cls.UK_CARBON_INTENSITY_CITIES)
+
+    @staticmethod
+    def _coordinates_from_geocode(geocode_result: dict[str, Any]) -> tuple[Any, Any]:
+        """Extract (lat, lon) from a geocoding result (flat or `results` list shape)."""
+        if not geocode_result.get("success"):
+            return None, None
+        if geocode_result.get("results"):
+            location = geocode_result["results"][0]
+        else:
+            location = geocode_result
+        return location.get("latitude"), location.get("longitude")
+
+    @staticmethod
+    def _annotate_airqo_location(result: dict[str, Any]) -> dict[str, Any]:
+        """Enrich a successful AirQo GPS lookup with monitor metadata."""
+        result["data_source"] = "AirQo monitoring network"
+        result["data_source_type"] = "ground_sensor"
+        result["confidence_level"] = "high"
+        result["spatial_resolution"] = "local (<5km)"
+        result["measurement_method"] = "low-cost optical particle counter"
+
+        # Add monitor count if multiple sites in response
+        if "measurements" in result and isinstance(result["measurements"], list):
+            monitor_count = len(result["measurements"])
+            if monitor_count > 1:
+                result["multiple_monitors"] = True
+                result["monitor_count"] = monitor_count
+                result["note_to_ai"] = (
+                    f"IMPORTANT: This location has {monitor_count} AirQo monitors. "
+                    "You must explain which monitor(s) you're using and why. "
+                    "Consider spatial variation when advising users."
+                )
 
-        failure_data = self.service_failures[service_name]
-        if failure_data["count"] >= self.circuit_breaker_threshold:
-            # Check if timeout has passed
-            if time.time() - failure_data["last_failure"] < self.circuit_breaker_timeout:
-                logger.warning(f"Circuit breaker OPEN for {service_name}")
-                return True
-            else:
-                # Reset circuit breaker
-                self.service_failures[service_name] = {"count": 0, "last_failure": 0}
-                logger.info(f"Circuit breaker RESET for {service_name}")
-                return False
-        return False
-
-    def _record_failure(self, service_name: str):
-        """Record a service failure."""
-        if service_name not in self.service_failures:
-            self.service_failures[service_name] = {"count": 0, "last_failure": 0}
-
-        self.service_failures[service_name]["count"] += 1
-        self.service_failures[service_name]["last_failure"] = time.time()
-        logger.warning(
-            f"Service failure recorded for {service_name}: {self.service_failures[service_name]['count']} failures"
+        return result
+
+    @staticmethod
+    def _annotate_waqi_location(
+        result: dict[str, Any], latitude: float, longitude: float, is_african: bool
+    ) -> dict[str, Any]:
+        """Enrich a successful WAQI GPS lookup with station distance and confidence."""
+        result["data_source"] = "World Air Quality Index monitoring network"
+        result["data_source_type"] = "ground_sensor"
+        result["spatial_resolution"] = "local (<15km)"
+
+        # Extract station distance if available
+        if "data" in result and isinstance(result["data"], dict):
+            station_data = result["data"]
+            if "city" in station_data and isinstance(station_data["city"], dict):
+                city_info = station_data["city"]
+                station_name = city_info.get("name", "Unknown station")
+                result["station_name"] = station_name
+
+                # Check for geo data to calculate distance
+                if "geo" in city_info and isinstance(city_info["geo"], list) and len(city_info["geo"]) == 2:
+                    station_lat, station_lon = city_info["geo"]
+                    # Calculate approximate distance in km
+                    from math import atan2, cos, radians, sin, sqrt
+                    lat1, lon1 = radians(latitude), radians(longitude)
+                    lat2, lon2 = radians(station_lat), radians(station_lon)
+                    dlat = lat2 - lat1
+                    dlon = lon2 - lon1
+                    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+                    c = 2 * atan2(sqrt(a), sqrt(1-a))
+                    distance_km = 6371 * c  # Earth radius in km
+                    result["distance_from_query_km"] = round(distance_km, 1)
+
+                    # Set confidence based on distance
+                    if distance_km < 1:
+                        result["confidence_level"] = "high"
+                        result["note_to_ai"] = f"Monitor is {distance_km:.1f}km from user's coordinates - very close, high confidence."
+                    elif distance_km < 5:
+                        result["confidence_level"] = "high"
+                        result["note_to_ai"] = f"Monitor is {distance_km:.1f}km from user's coordinates - close enough for high confidence."
+                    elif distance_km < 15:
+                        result["confidence_level"] = "medium"
+                        result["note_to_ai"] = f"Monitor is {distance_km:.1f}km from user's coordinates - moderate distance, local conditions may vary."
+                    else:
+                        result["confidence_level"] = "low"
+                        result["note_to_ai"] = f"⚠️ Monitor is {distance_km:.1f}km from user's coordinates - significant distance, lower confidence."
+
+        if is_african:
+            result["regional_note"] = "AirQo data unavailable for this African location. Using WAQI global network."
+
+        return result
+
+    @staticmethod
+    def _annotate_openmeteo_location(result: dict[str, Any]) -> dict[str, Any]:
+        """Flag a GPS lookup answered by modeled (satellite) data."""
+        result["data_source"] = "OpenMeteo atmospheric modeling (CAMS satellite)"
+        result["data_source_type"] = "satellite_model"
+        result["confidence_level"] = "medium"
+        result["spatial_resolution"] = "regional (25km grid)"
+        result["measurement_method"] = "ECMWF CAMS atmospheric chemistry model"
+        result["note_to_ai"] = (
+            "⚠️ Ground station data unavailable. Using satellite/model data with 25km resolution. "
+            "This is less precise than ground sensors - actual local conditions may vary by ±30-50%. "
+            "Good for general area assessment, not suitable for micro-scale queries."
+        )
+        return result
+
+    @staticmethod
+    def _no_location_data(latitude: float, longitude: float) -> dict[str, Any]:
+        """Result returned when no source has data for the coordinates."""
+        return {
+            "success": False,
+            "message": f"Unable to retrieve air quality data for coordinates ({latitude}, {longitude}). No monitoring stations found in this area.",
+            "suggestion": "search_web",
+            "search_query": f"air quality near {latitude} {longitude}",
+            "fallback_advice": "This location may not have active monitoring coverage. Try nearby major cities.",
+        }
+
+    @staticmethod
+    def _gps_location_result(
+        latitude: float,
+        longitude: float,
+        reverse_result: dict[str, Any],
+        air_quality_result: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Combine a GPS fix, its reverse geocode and air quality into one result."""
+        if reverse_result.get("success"):
+            location_name = reverse_result.get("display_name", "Unknown location")
+            city = reverse_result.get("address", {}).get("city", "Unknown city")
+        else:
+            location_name = f"{latitude:.4f}, {longitude:.4f}"
+            city = "Unknown city"
+
+        return {
+            "success": True,
+            "message": "Location determined from GPS coordinates (precise)",
+            "location": {
+                "latitude": latitude,
+                "longitude": longitude,
+                "city": city,
+                "display_name": location_name,
+                "source": "gps",
+                "accuracy": "precise",
+            },
+            "air_quality": air_quality_result,
+        }
+
+    @staticmethod
+    def _ip_location_result(
+        location_result: dict[str, Any], air_quality_result: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Combine an IP geolocation with air quality for those coordinates."""
+        return {
+            "success": True,
+            "message": "Location and air quality data retrieved from IP address (approximate)",
+            "location": {
+                "latitude": location_result["latitude"],
+                "longitude": location_result["longitude"],
+                "country": location_result.get("country_name"),
+                "city": location_result.get("city"),
+                "region": location_result.get("region"),
+                "source": "ip",
+                "accuracy": "approximate",
+            },
+            "air_quality": air_quality_result,
+        }
+
+    @staticmethod
+    def _no_city_data(city: str, tried_services: list[str]) -> dict[str, Any]:
+        """Result returned when every source in the city fallback chain failed."""
+        return {
+            "success": False,
+            "message": f"Unable to retrieve air quality data for {city} from any available monitoring networks. Tried {len(tried_services)} different services: {', '.join(tried_services)}.",
+            "tried_services": tried_services,
+            "suggestion": "search_web",
+            "search_query": f"current air quality {city} site:epa.gov OR site:airnow.gov OR site:who.int",
+            "fallback_advice": f"No monitoring station data found for {city} from {len(tried_services)} services. Try searching official environmental agency websites or nearby major cities.",
+        }
+
+    @staticmethod
+    def _no_african_city_data(city: str) -> dict[str, Any]:
+        """Result returned when AirQo, WAQI and OpenMeteo all failed for an African city."""
+        return {
+            "success": False,
+            "message": f"Unable to retrieve air quality data for {city}. This location may not have active monitoring coverage.",
+            "suggestion": "search_web",
+            "search_query": f"air quality {city} Africa",
+            "fallback_advice": "Consider checking local environmental agencies or nearby cities with monitoring stations.",
+        }
+
+    @staticmethod
+    def _city_cache_key(city: str) -> str:
+        """Cache key for a city's multi-city tool result."""
+        return city.strip().lower()
+
+    def _get_cached_city_results(self, cities: list[str]) -> dict[str, dict[str, Any]]:
+        """Look up per-city results in one cache read. Returns city -> result for hits."""
+        keys = {city: self._city_cache_key(city) for city in cities}
+        found = self.cache.get_many(self.CITY_RESULT_CACHE_NAMESPACE, list(keys.values()))
+        return {city: found[key] for city, key in keys.items() if key in found}
+
+    async def _get_cached_city_results_async(self, cities: list[str]) -> dict[str, dict[str, Any]]:
+        """Async variant of `_get_cached_city_results`."""
+        keys = {city: self._city_cache_key(city) for city in cities}
+        found = await self.cache.get_many_async(
+            self.CITY_RESULT_CACHE_NAMESPACE, list(keys.values())
+        )
+        return {city: found[key] for city, key in keys.items() if key in found}
+
+    def _cache_city_results(self, results: dict[str, dict[str, Any]]) -> None:
+        """Cache successful per-city results in one pipelined write."""
+        self.cache.set_many(self.CITY_RESULT_CACHE_NAMESPACE, *self._city_cache_items(results))
+
+    async def _cache_city_results_async(self, results: dict[str, dict[str, Any]]) -> None:
+        """Async variant of `_cache_city_results`."""
+        await self.cache.set_many_async(
+            self.CITY_RESULT_CACHE_NAMESPACE, *self._city_cache_items(results)
         )
 
-    def _record_success(self, service_name: str):
-        """Record a successful service call."""
-        if service_name in self.service_failures:
-            # Reset failure count on success
-            self.service_failures[service_name] = {"count": 0, "last_failure": 0}
+    def _city_cache_items(
+        self, results: dict[str, dict[str, Any]]
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, int]]:
+        """Cache entries and per-key TTLs for the successful results."""
+        items, ttls = {}, {}
+        for city, result in results.items():
+            if not result.get("success"):
+                continue
+            key = self._city_cache_key(city)
+            items[key] = result
+            # Fallback sources annotate their results with a note
+            ttls[key] = self.CITY_FALLBACK_CACHE_TTL if "note" in result else self.CITY_RESULT_CACHE_TTL
+        return items, ttls
+
+    def _fresh_city_results(
+        self, missing: list[str], outcomes: dict[str, Any]
+    ) -> dict[str, dict[str, Any]]:
+        """Per-city results of a bounded fan-out, logging the cities that failed or timed out."""
+        fresh = {}
+        for city in missing:
+            outcome = outcomes.get(city)
+            if outcome is None:
+                logger.warning(f"No air quality result for {city} within the multi-city deadline")
+            elif isinstance(outcome, BaseException):
+                logger.error(f"Air quality lookup failed for {city}: {str(outcome)[:200]}")
+            else:
+                fresh[city] = outcome
+        return fresh
+
+    def _multiple_cities_result(
+        self, cities: list[str], results: dict[str, dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Result of the multi-city tool, in the requested city order."""
+        unavailable = {"success": False, "message": aeris_unavailable_message()}
+        result = {
+            "success": True,
+            "data": {city: results.get(city, unavailable) for city in cities},
+            "cities_count": len(cities),
+        }
+        if any(city not in results for city in cities):
+            result["partial"] = True
+        return result
+
+    @staticmethod
+    def _tool_failure(function_name: str) -> dict[str, Any]:
+        """Result returned when a tool raised an unexpected exception."""
+        return {
+            "error": aeris_unavailable_message(),
+            "function_name": function_name,
+            "guidance": "This data source is currently unavailable or the requested location was not found. Please inform the user and suggest they try a different location or data source.",
+        }
 
     def _get_city_air_quality_with_fallback(self, city: str) -> dict[str, Any]:
         """
@@ -146,16 +538,7 @@ class ToolExecutor:
         tried_services = []
 
         # Detect if this is likely an African city
-        african_indicators = [
-            "kampala", "nairobi", "lagos", "accra", "kigali", "dar es salaam", "addis ababa",
-            "cairo", "johannesburg", "cape town", "kinshasa", "luanda", "abidjan", "dakar",
-            "casablanca", "algiers", "tunis", "khartoum", "mogadishu", "harare", "lusaka",
-            "maputo", "windhoek", "gaborone", "lilongwe", "blantyre", "bujumbura", "bamako",
-            "ouagadougou", "niamey", "ndjamena", "bangui", "libreville", "brazzaville",
-            "yaoundé", "douala", "malabo", "monrovia", "freetown", "conakry", "bissau",
-            "praia", "banjul", "nouakchott", "kampala", "jinja", "mbarara", "gulu"
-        ]
-        is_african_city = any(indicator in city.lower() for indicator in african_indicators)
+        is_african_city = self._is_african_city(city)
 
         # 1. Try AirQo FIRST if African city (better African coverage)
         if is_african_city and self.airqo and not self._is_circuit_open("airqo"):
@@ -173,7 +556,7 @@ class ToolExecutor:
             except Exception as e:
                 # Log exception internally but don't expose to user
                 logger.error(f"AirQo error for {city}: {str(e)[:200]}")
-                self._record_failure("airqo")
+                self._record_failure("airqo", e)
 
         # 2. Try WAQI (global coverage)
         if self.waqi and not self._is_circuit_open("waqi"):
@@ -191,7 +574,7 @@ class ToolExecutor:
             except Exception as e:
                 # Log exception internally but don't expose to user
                 logger.error(f"WAQI error for {city}: {str(e)[:200]}")
-                self._record_failure("waqi")
+                self._record_failure("waqi", e)
 
         # 3. Try AirQo if not tried yet (for non-African cities, try as fallback)
         if not is_african_city and self.airqo and not self._is_circuit_open("airqo"):
@@ -207,7 +590,7 @@ class ToolExecutor:
                 self._record_failure("airqo")
             except Exception as e:
                 logger.error(f"AirQo error for {city}: {e}")
-                self._record_failure("airqo")
+                self._record_failure("airqo", e)
 
         # 4. Try Geocode + OpenMeteo (works anywhere with coordinates)
         if self.geocoding and self.openmeteo and not self._is_circuit_open("openmeteo"):
@@ -215,24 +598,21 @@ class ToolExecutor:
                 logger.info(f"Trying Geocoding + OpenMeteo for {city}")
                 tried_services.append("OpenMeteo")
                 geocode_result = self.geocoding.geocode_address(city, limit=1)
-                if geocode_result.get("success") and geocode_result.get("results"):
-                    location = geocode_result["results"][0]
-                    lat = location.get("latitude")
-                    lon = location.get("longitude")
-                    if lat and lon:
-                        aq_result = self.openmeteo.get_current_air_quality(lat, lon)
-                        if aq_result.get("success"):
-                            self._record_success("openmeteo")
-                            # Enhance result to indicate fallback was used
-                            aq_result["data_source"] = "meteorological services"
-                            aq_result["location_name"] = city
-                            aq_result["note"] = f"Data retrieved using coordinates for {city}"
-                            return aq_result
+                lat, lon = self._coordinates_from_geocode(geocode_result)
+                if lat and lon:
+                    aq_result = self.openmeteo.get_current_air_quality(lat, lon)
+                    if aq_result.get("success"):
+                        self._record_success("openmeteo")
+                        # Enhance result to indicate fallback was used
+                        aq_result["data_source"] = "meteorological services"
+                        aq_result["location_name"] = city
+                        aq_result["note"] = f"Data retrieved using coordinates for {city}"
+                        return aq_result
                 logger.info(f"Geocoding + OpenMeteo failed for {city}")
                 self._record_failure("openmeteo")
             except Exception as e:
                 logger.error(f"Geocoding + OpenMeteo error for {city}: {e}")
-                self._record_failure("openmeteo")
+                self._record_failure("openmeteo", e)
 
         # 5. Try DEFRA (UK cities)
         if self.defra and not self._is_circuit_open("defra"):
@@ -248,7 +628,7 @@ class ToolExecutor:
                 self._record_failure("defra")
             except Exception as e:
                 logger.error(f"DEFRA error for {city}: {e}")
-                self._record_failure("defra")
+                self._record_failure("defra", e)
 
         # 6. Try UBA (German cities)
         if self.uba and not self._is_circuit_open("uba"):
@@ -264,7 +644,7 @@ class ToolExecutor:
                 self._record_failure("uba")
             except Exception as e:
                 logger.error(f"UBA error for {city}: {e}")
-                self._record_failure("uba")
+                self._record_failure("uba", e)
 
         # 7. Try NSW (Australian cities)
         if self.nsw and not self._is_circuit_open("nsw"):
@@ -280,7 +660,7 @@ class ToolExecutor:
                 self._record_failure("nsw")
             except Exception as e:
                 logger.error(f"NSW error for {city}: {e}")
-                self._record_failure("nsw")
+                self._record_failure("nsw", e)
 
         # 8. Try Carbon Intensity (UK only, but worth a try)
         if self.carbon_intensity and not self._is_circuit_open("carbon_intensity"):
@@ -288,19 +668,7 @@ class ToolExecutor:
                 logger.info(f"Trying Carbon Intensity for {city}")
                 tried_services.append("Carbon Intensity")
                 # This is UK-specific, so only try if city might be in UK
-                uk_cities = [
-                    "london",
-                    "manchester",
-                    "birmingham",
-                    "leeds",
-                    "glasgow",
-                    "sheffield",
-                    "bradford",
-                    "liverpool",
-                    "edinburgh",
-                    "leicester",
-                ]
-                if any(uk_city in city.lower() for uk_city in uk_cities):
+                if self._is_uk_city(city):
                     result = self.carbon_intensity.get_current_intensity()
                     if result.get("success"):
                         self._record_success("carbon_intensity")
@@ -311,18 +679,11 @@ class ToolExecutor:
                 self._record_failure("carbon_intensity")
             except Exception as e:
                 logger.error(f"Carbon Intensity error for {city}: {e}")
-                self._record_failure("carbon_intensity")
+                self._record_failure("carbon_intensity", e)
 
         # Last resort: web search with comprehensive query
         logger.info(f"All services failed for {city}. Tried: {', '.join(tried_services)}")
-        return {
-            "success": False,
-            "message": f"Unable to retrieve air quality data for {city} from any available monitoring networks. Tried {len(tried_services)} different services: {', '.join(tried_services)}.",
-            "tried_services": tried_services,
-            "suggestion": "search_web",
-            "search_query": f"current air quality {city} site:epa.gov OR site:airnow.gov OR site:who.int",
-            "fallback_advice": f"No monitoring station data found for {city} from {len(tried_services)} services. Try searching official environmental agency websites or nearby major cities.",
-        }
+        return self._no_city_data(city, tried_services)
 
     def _get_african_city_with_fallback(self, city: str, site_id: str = None) -> dict[str, Any]:
         """
@@ -347,7 +708,7 @@ class ToolExecutor:
                 self._record_failure("airqo")
             except Exception as e:
                 logger.error(f"AirQo error for {city}: {e}")
-                self._record_failure("airqo")
+                self._record_failure("airqo", e)
 
         # Fallback to WAQI
         if self.waqi and not self._is_circuit_open("waqi"):
@@ -362,39 +723,30 @@ class ToolExecutor:
                 self._record_failure("waqi")
             except Exception as e:
                 logger.error(f"WAQI fallback error for {city}: {e}")
-                self._record_failure("waqi")
+                self._record_failure("waqi", e)
 
         # Fallback to Geocode + OpenMeteo
         if self.geocoding and self.openmeteo and not self._is_circuit_open("openmeteo"):
             try:
                 logger.info(f"Trying Geocoding + OpenMeteo fallback for {city}")
                 geocode_result = self.geocoding.geocode_address(city, limit=1)
-                if geocode_result.get("success") and geocode_result.get("results"):
-                    location = geocode_result["results"][0]
-                    lat = location.get("latitude")
-                    lon = location.get("longitude")
-                    if lat and lon:
-                        aq_result = self.openmeteo.get_current_air_quality(lat, lon)
-                        if aq_result.get("success"):
-                            self._record_success("openmeteo")
-                            aq_result["data_source"] = "meteorological services"
-                            aq_result["location_name"] = city
-                            aq_result["note"] = (
-                                f"Local monitoring data unavailable. Using modeled data for {city}"
-                            )
-                            return aq_result
+                lat, lon = self._coordinates_from_geocode(geocode_result)
+                if lat and lon:
+                    aq_result = self.openmeteo.get_current_air_quality(lat, lon)
+                    if aq_result.get("success"):
+                        self._record_success("openmeteo")
+                        aq_result["data_source"] = "meteorological services"
+                        aq_result["location_name"] = city
+                        aq_result["note"] = (
+                            f"Local monitoring data unavailable. Using modeled data for {city}"
+                        )
+                        return aq_result
                 self._record_failure("openmeteo")
             except Exception as e:
                 logger.error(f"Geocoding + OpenMeteo fallback error for {city}: {e}")
-                self._record_failure("openmeteo")
+                self._record_failure("openmeteo", e)
 
-        return {
-            "success": False,
-            "message": f"Unable to retrieve air quality data for {city}. This location may not have active monitoring coverage.",
-            "suggestion": "search_web",
-            "search_query": f"air quality {city} Africa",
-            "fallback_advice": "Consider checking local environmental agencies or nearby cities with monitoring stations.",
-        }
+        return self._no_african_city_data(city)
 
     def execute(self, function_name: str, args: dict[str, Any]) -> dict[str, Any]:
         """
@@ -427,10 +779,10 @@ class ToolExecutor:
                     self._record_success("waqi")
                     return result
                 except ProviderServiceError as e:
-                    self._record_failure("waqi")
+                    self._record_failure("waqi", e)
                     return {"success": False, "message": e.public_message}
                 except Exception as e:
-                    self._record_failure("waqi")
+                    self._record_failure("waqi", e)
                     logger.error(f"WAQI search stations error: {str(e)[:200]}")
                     return {"success": False, "message": aeris_unavailable_message()}
 
@@ -446,10 +798,19 @@ class ToolExecutor:
                 if self.airqo is None and self.waqi is None and self.openmeteo is None:
                     return {"success": False, "message": "Air quality services are not enabled."}
                 cities = args.get("cities", [])
-                results = {}
-                for city in cities:
-                    results[city] = self._get_african_city_with_fallback(city)
-                return {"success": True, "data": results, "cities_count": len(cities)}
+                results = self._get_cached_city_results(cities)
+                missing = [city for city in dict.fromkeys(cities) if city not in results]
+                outcomes = run_bounded(
+                    {
+                        city: lambda city=city: self._get_african_city_with_fallback(city)
+                        for city in missing
+                    },
+                    self.MULTI_CITY_CONCURRENCY,
+                    self.MULTI_CITY_DEADLINE_SECONDS,
+                )
+                fresh = self._fresh_city_results(missing, outcomes)
+                self._cache_city_results(fresh)
+                return self._multiple_cities_result(cities, {**results, **fresh})
 
             elif function_name == "get_airqo_history":
                 if self.airqo is None:
@@ -493,36 +854,7 @@ class ToolExecutor:
                 # Intelligent routing: Use AirQo for African cities, WAQI for others
                 city = args.get("city", "").lower()
 
-                # List of African countries/cities that should use AirQo
-                african_indicators = [
-                    "africa",
-                    "kenya",
-                    "uganda",
-                    "tanzania",
-                    "rwanda",
-                    "ghana",
-                    "nigeria",
-                    "ethiopia",
-                    "south africa",
-                    "egypt",
-                    "morocco",
-                    "algeria",
-                    "tunisia",
-                    "nairobi",
-                    "kampala",
-                    "dar es salaam",
-                    "kigali",
-                    "accra",
-                    "lagos",
-                    "addis ababa",
-                    "cape town",
-                    "cairo",
-                    "casablanca",
-                    "algiers",
-                    "tunis",
-                ]
-
-                is_african = any(indicator in city for indicator in african_indicators)
+                is_african = any(indicator in city for indicator in self.AFRICAN_FORECAST_INDICATORS)
 
                 if is_african and self.airqo is not None:
                     # Use AirQo for African cities
@@ -585,30 +917,12 @@ class ToolExecutor:
                         )
                         if result.get("success"):
                             self._record_success("airqo")
-                            result["data_source"] = "AirQo monitoring network"
-                            result["data_source_type"] = "ground_sensor"
-                            result["confidence_level"] = "high"
-                            result["spatial_resolution"] = "local (<5km)"
-                            result["measurement_method"] = "low-cost optical particle counter"
-                            
-                            # Add monitor count if multiple sites in response
-                            if "measurements" in result and isinstance(result["measurements"], list):
-                                monitor_count = len(result["measurements"])
-                                if monitor_count > 1:
-                                    result["multiple_monitors"] = True
-                                    result["monitor_count"] = monitor_count
-                                    result["note_to_ai"] = (
-                                        f"IMPORTANT: This location has {monitor_count} AirQo monitors. "
-                                        "You must explain which monitor(s) you're using and why. "
-                                        "Consider spatial variation when advising users."
-                                    )
-                            
-                            return result
+                            return self._annotate_airqo_location(result)
                         logger.info(f"AirQo returned no data for coordinates ({latitude}, {longitude})")
                         self._record_failure("airqo")
                     except Exception as e:
                         logger.error(f"AirQo error for GPS ({latitude}, {longitude}): {e}")
-                        self._record_failure("airqo")
+                        self._record_failure("airqo", e)
                 
                 # Try WAQI (works globally)
                 if self.waqi and not self._is_circuit_open("waqi"):
@@ -618,54 +932,13 @@ class ToolExecutor:
                         result = self.waqi.get_city_feed(f"geo:{latitude};{longitude}")
                         if result.get("success"):
                             self._record_success("waqi")
-                            result["data_source"] = "World Air Quality Index monitoring network"
-                            result["data_source_type"] = "ground_sensor"
-                            result["spatial_resolution"] = "local (<15km)"
-                            
-                            # Extract station distance if available
-                            if "data" in result and isinstance(result["data"], dict):
-                                station_data = result["data"]
-                                if "city" in station_data and isinstance(station_data["city"], dict):
-                                    city_info = station_data["city"]
-                                    station_name = city_info.get("name", "Unknown station")
-                                    result["station_name"] = station_name
-                                    
-                                    # Check for geo data to calculate distance
-                                    if "geo" in city_info and isinstance(city_info["geo"], list) and len(city_info["geo"]) == 2:
-                                        station_lat, station_lon = city_info["geo"]
-                                        # Calculate approximate distance in km
-                                        from math import atan2, cos, radians, sin, sqrt
-                                        lat1, lon1 = radians(latitude), radians(longitude)
-                                        lat2, lon2 = radians(station_lat), radians(station_lon)
-                                        dlat = lat2 - lat1
-                                        dlon = lon2 - lon1
-                                        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-                                        c = 2 * atan2(sqrt(a), sqrt(1-a))
-                                        distance_km = 6371 * c  # Earth radius in km
-                                        result["distance_from_query_km"] = round(distance_km, 1)
-                                        
-                                        # Set confidence based on distance
-                                        if distance_km < 1:
-                                            result["confidence_level"] = "high"
-                                            result["note_to_ai"] = f"Monitor is {distance_km:.1f}km from user's coordinates - very close, high confidence."
-                                        elif distance_km < 5:
-                                            result["confidence_level"] = "high"
-                                            result["note_to_ai"] = f"Monitor is {distance_km:.1f}km from user's coordinates - close enough for high confidence."
-                                        elif distance_km < 15:
-                                            result["confidence_level"] = "medium"
-                                            result["note_to_ai"] = f"Monitor is {distance_km:.1f}km from user's coordinates - moderate distance, local conditions may vary."
-                                        else:
-                                            result["confidence_level"] = "low"
-                                            result["note_to_ai"] = f"⚠️ Monitor is {distance_km:.1f}km from user's coordinates - significant distance, lower confidence."
-                            
-                            if is_african:
-                                result["regional_note"] = "AirQo data unavailable for this African location. Using WAQI global network."
-                            
-                            return result
+                            return self._annotate_waqi_location(
+                                result, latitude, longitude, is_african
+                            )
                         self._record_failure("waqi")
                     except Exception as e:
                         logger.error(f"WAQI error for GPS ({latitude}, {longitude}): {e}")
-                        self._record_failure("waqi")
+                        self._record_failure("waqi", e)
                 
                 # Fallback to OpenMeteo (satellite/model data)
                 if self.openmeteo and not self._is_circuit_open("openmeteo"):
@@ -674,29 +947,13 @@ class ToolExecutor:
                         result = self.openmeteo.get_current_air_quality(latitude, longitude)
                         if result.get("success"):
                             self._record_success("openmeteo")
-                            result["data_source"] = "OpenMeteo atmospheric modeling (CAMS satellite)"
-                            result["data_source_type"] = "satellite_model"
-                            result["confidence_level"] = "medium"
-                            result["spatial_resolution"] = "regional (25km grid)"
-                            result["measurement_method"] = "ECMWF CAMS atmospheric chemistry model"
-                            result["note_to_ai"] = (
-                                "⚠️ Ground station data unavailable. Using satellite/model data with 25km resolution. "
-                                "This is less precise than ground sensors - actual local conditions may vary by ±30-50%. "
-                                "Good for general area assessment, not suitable for micro-scale queries."
-                            )
-                            return result
+                            return self._annotate_openmeteo_location(result)
                         self._record_failure("openmeteo")
                     except Exception as e:
                         logger.error(f"OpenMeteo error for GPS ({latitude}, {longitude}): {e}")
-                        self._record_failure("openmeteo")
+                        self._record_failure("openmeteo", e)
                 
-                return {
-                    "success": False,
-                    "message": f"Unable to retrieve air quality data for coordinates ({latitude}, {longitude}). No monitoring stations found in this area.",
-                    "suggestion": "search_web",
-                    "search_query": f"air quality near {latitude} {longitude}",
-                    "fallback_advice": "This location may not have active monitoring coverage. Try nearby major cities.",
-                }
+                return self._no_location_data(latitude, longitude)
 
             elif function_name == "search_airqo_sites":
                 if self.airqo is None:
@@ -940,32 +1197,14 @@ class ToolExecutor:
 
                     # Get location name using reverse geocoding
                     reverse_result = self.geocoding.reverse_geocode(latitude, longitude)
-                    if reverse_result.get("success"):
-                        location_name = reverse_result.get("display_name", "Unknown location")
-                        city = reverse_result.get("address", {}).get("city", "Unknown city")
-                    else:
-                        location_name = f"{latitude:.4f}, {longitude:.4f}"
-                        city = "Unknown city"
 
                     # Automatically call air quality API with GPS coordinates
                     air_quality_result = self.openmeteo.get_current_air_quality(
                         latitude=latitude, longitude=longitude, timezone="auto"
                     )
-
-                    combined_result = {
-                        "success": True,
-                        "message": "Location determined from GPS coordinates (precise)",
-                        "location": {
-                            "latitude": latitude,
-                            "longitude": longitude,
-                            "city": city,
-                            "display_name": location_name,
-                            "source": "gps",
-                            "accuracy": "precise",
-                        },
-                        "air_quality": air_quality_result,
-                    }
-                    return combined_result
+                    return self._gps_location_result(
+                        latitude, longitude, reverse_result, air_quality_result
+                    )
                 else:
                     # Fall back to IP geolocation
                     location_result = self.geocoding.get_location_from_ip(self.client_ip)
@@ -984,22 +1223,7 @@ class ToolExecutor:
                             longitude=location_result["longitude"],
                             timezone="auto",
                         )
-                        # Combine the results
-                        combined_result = {
-                            "success": True,
-                            "message": "Location and air quality data retrieved from IP address (approximate)",
-                            "location": {
-                                "latitude": location_result["latitude"],
-                                "longitude": location_result["longitude"],
-                                "country": location_result.get("country_name"),
-                                "city": location_result.get("city"),
-                                "region": location_result.get("region"),
-                                "source": "ip",
-                                "accuracy": "approximate",
-                            },
-                            "air_quality": air_quality_result,
-                        }
-                        return combined_result
+                        return self._ip_location_result(location_result, air_quality_result)
                     else:
                         # Location retrieval failed, return the error
                         return location_result
@@ -1073,18 +1297,553 @@ class ToolExecutor:
 
         except Exception as e:
             logger.error(f"Tool execution failed for {function_name}: {e}", exc_info=True)
+            return self._tool_failure(function_name)
+
+    async def _try_source_async(
+        self, service_name: str, label: str, call: Awaitable[dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        """
+        Await one data-source attempt and update its circuit breaker.
+
+        Returns the result on success, or None so the caller moves on to the
+        next source in its fallback chain. Only errors reach the breaker: a
+        source with no data for this place (AirQo hedged in for London) just
+        loses the race, since shared breakers would open it for every city.
+        """
+        started = time.monotonic()
+        try:
+            result = await call
+            if result.get("success"):
+                self._record_success(service_name, time.monotonic() - started)
+                return result
+            logger.info(f"{label} returned no data")
+        except Exception as e:
+            logger.error(f"{label} error: {str(e)[:200]}")
+            self._record_failure(service_name, e)
+        return None
+
+    async def _openmeteo_for_city_async(self, city: str) -> dict[str, Any]:
+        """Geocode a city and fetch modeled air quality for its coordinates."""
+        geocode_result = await self.geocoding.geocode_address_async(city, limit=1)
+        lat, lon = self._coordinates_from_geocode(geocode_result)
+        if not (lat and lon):
+            return {"success": False, "message": f"Could not geocode {city}"}
+        return await self.openmeteo.get_current_air_quality_async(lat, lon)
+
+    def _source_score(self, region: str, service_name: str) -> float:
+        """A source's win score, decayed towards 0.5 since its last update."""
+        score = self.source_scores.get(region, {}).get(service_name, 0.5)
+        updated = self.source_score_times.get(region, {}).get(service_name)
+        if updated is None:
+            return score
+        age = time.monotonic() - updated
+        return 0.5 + (score - 0.5) * 0.5 ** (age / self.SOURCE_SCORE_HALF_LIFE_SECONDS)
+
+    def _record_source_outcome(self, region: str, service_name: str, won: bool) -> None:
+        """Move a source's win score towards 1 (won the race) or 0 (failed or lost it)."""
+        previous = self._source_score(region, service_name)
+        self.source_scores.setdefault(region, {})[service_name] = previous + (
+            self.SOURCE_SCORE_ALPHA * (float(won) - previous)
+        )
+        self.source_score_times.setdefault(region, {})[service_name] = time.monotonic()
+
+    def _rank_sources(self, region: str, candidates: list[tuple]) -> list[tuple]:
+        """
+        Order candidates for the hedged lookup.
+
+        The static order is kept, except that within a tier the sources whose
+        score has dropped below SOURCE_DEMOTE_BELOW go last. As scores decay
+        back towards 0.5, a demoted source is promoted again after a while and
+        the next race re-measures it.
+        """
+
+        def key(candidate: tuple) -> tuple[int, bool]:
+            service_name = candidate[0]
+            demoted = self._source_score(region, service_name) < self.SOURCE_DEMOTE_BELOW
+            return self.SOURCE_TIERS.get(service_name, 0), demoted
+
+        return sorted(candidates, key=key)
+
+    def _city_source_candidates(self, city: str, is_african_city: bool) -> list[tuple]:
+        """
+        City sources in static priority order.
+
+        Each candidate is (service_name, label, call factory, fields added to a
+        winning result).
+        """
+        candidates = []
+        airqo = (
+            "airqo",
+            "AirQo",
+            lambda: self.airqo.get_recent_measurements_async(city=city),
+            {"data_source": "AirQo"},
+        )
+        if is_african_city and self.airqo:
+            candidates.append(airqo)
+        if self.waqi:
+            candidates.append(
+                (
+                    "waqi",
+                    "WAQI",
+                    lambda: self.waqi.get_city_feed_async(city),
+                    {"data_source": "WAQI"},
+                )
+            )
+        if not is_african_city and self.airqo:
+            candidates.append(airqo)
+        # Regional networks, only where a city lookup exists
+        regional_sources = [
+            ("defra", "DEFRA", self.defra, "DEFRA UK environmental monitoring"),
+            ("uba", "UBA", self.uba, "UBA Germany environmental monitoring"),
+            ("nsw", "NSW", self.nsw, "NSW Australia environmental monitoring"),
+        ]
+        for service_name, label, service, data_source in regional_sources:
+            lookup = getattr(service, "get_city_air_quality_async", None)
+            if lookup is not None:
+                call = lambda lookup=lookup: lookup(city)  # noqa: E731
+                candidates.append((service_name, label, call, {"data_source": data_source}))
+        if self.geocoding and self.openmeteo:
+            candidates.append(
+                (
+                    "openmeteo",
+                    "OpenMeteo",
+                    lambda: self._openmeteo_for_city_async(city),
+                    {
+                        "data_source": "meteorological services",
+                        "location_name": city,
+                        "note": f"Data retrieved using coordinates for {city}",
+                    },
+                )
+            )
+        return candidates
+
+    async def _race_sources_async(
+        self,
+        city: str,
+        region: str,
+        candidates: list[tuple[str, str, Callable[[], Awaitable[dict[str, Any]]], dict]],
+        tried_services: list[str],
+    ) -> dict[str, Any] | None:
+        """
+        Hedged lookup over ranked sources.
+
+        Launches the first source, then the next one every
+        SOURCE_HEDGE_DELAY_SECONDS or as soon as a call fails. The first valid
+        result wins (by rank when several finish together); the remaining calls
+        are cancelled. Returns None when every source failed.
+        """
+        queue = list(enumerate(candidates))
+        running: dict[asyncio.Task, int] = {}
+        winner = None
+        try:
+            while (queue or running) and winner is None:
+                while queue and len(running) < self.SOURCE_HEDGE_MAX_IN_FLIGHT:
+                    rank, (service_name, label, call, _) = queue.pop(0)
+                    if self._is_circuit_open(service_name):
+                        continue
+                    logger.info(f"Trying {label} for {city}")
+                    tried_services.append(label)
+                    running[
+                        asyncio.create_task(
+                            self._try_source_async(service_name, f"{label} for {city}", call())
+                        )
+                    ] = rank
+                    break  # Hedge: the next source waits for the delay or a failure
+                if not running:
+                    continue
+
+                can_hedge = queue and len(running) < self.SOURCE_HEDGE_MAX_IN_FLIGHT
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=self.SOURCE_HEDGE_DELAY_SECONDS if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in sorted(done, key=running.get):
+                    rank = running.pop(task)
+                    service_name = candidates[rank][0]
+                    if task.cancelled():
+                        # Cancelled from inside the source, not by us: a failed source
+                        logger.info(f"{candidates[rank][1]} for {city} was cancelled")
+                        result = None
+                    else:
+                        result = task.result()
+                    if not result:
+                        self._record_source_outcome(region, service_name, False)
+                    elif winner is None:
+                        self._record_source_outcome(region, service_name, True)
+                        winner = (rank, result)
+            # Sources still running have lost the race
+            for rank in running.values():
+                self._record_source_outcome(region, candidates[rank][0], False)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if winner is None:
+            return None
+        rank, result = winner
+        _, label, _, fields = candidates[rank]
+        logger.info(f"{label} won the source race for {city}")
+        result.update(fields)
+        return result
+
+    async def _get_city_air_quality_with_fallback_async(self, city: str) -> dict[str, Any]:
+        """
+        Async twin of `_get_city_air_quality_with_fallback`.
+
+        Instead of trying sources one after another, races them with hedging
+        (see `_race_sources_async`) in static order, except that sources that
+        keep losing for the city's region drop behind the rest of their tier.
+        DEFRA, UBA and NSW have no city-level lookup, so they are only tried
+        when the client exposes `get_city_air_quality_async`.
+
+        Args:
+            city: City name
+
+        Returns:
+            Result dictionary with success flag and data/message
+        """
+        tried_services = []
+        is_african_city = self._is_african_city(city)
+        region = "africa" if is_african_city else "global"
+
+        candidates = self._rank_sources(
+            region, self._city_source_candidates(city, is_african_city)
+        )
+        result = await self._race_sources_async(city, region, candidates, tried_services)
+        if result:
+            return result
+
+        # Carbon Intensity (UK only) is not a pollutant reading, so it stays out of
+        # the race as a last resort - no async client, so run it on a thread
+        if (
+            self.carbon_intensity
+            and self._is_uk_city(city)
+            and not self._is_circuit_open("carbon_intensity")
+        ):
+            logger.info(f"Trying Carbon Intensity for {city}")
+            tried_services.append("Carbon Intensity")
+            result = await self._try_source_async(
+                "carbon_intensity",
+                f"Carbon Intensity for {city}",
+                asyncio.to_thread(self.carbon_intensity.get_current_intensity),
+            )
+            if result:
+                result["data_source"] = "UK Carbon Intensity monitoring"
+                result["note"] = "UK carbon intensity data (not specific air quality)"
+                return result
+
+        logger.info(f"All services failed for {city}. Tried: {', '.join(tried_services)}")
+        return self._no_city_data(city, tried_services)
+
+    async def _get_african_city_with_fallback_async(
+        self, city: str, site_id: str = None
+    ) -> dict[str, Any]:
+        """Async twin of `_get_african_city_with_fallback`."""
+        if self.airqo and not self._is_circuit_open("airqo"):
+            logger.info(f"Trying AirQo for {city}")
+            result = await self._try_source_async(
+                "airqo",
+                f"AirQo for {city}",
+                self.airqo.get_recent_measurements_async(city=city, site_id=site_id),
+            )
+            if result:
+                return result
+
+        if self.waqi and not self._is_circuit_open("waqi"):
+            logger.info(f"Trying WAQI fallback for {city}")
+            result = await self._try_source_async(
+                "waqi", f"WAQI fallback for {city}", self.waqi.get_city_feed_async(city)
+            )
+            if result:
+                result["data_source"] = "World Air Quality Index monitoring network"
+                result["note"] = f"AirQo data unavailable. Using WAQI station data for {city}"
+                return result
+
+        if self.geocoding and self.openmeteo and not self._is_circuit_open("openmeteo"):
+            logger.info(f"Trying Geocoding + OpenMeteo fallback for {city}")
+            result = await self._try_source_async(
+                "openmeteo",
+                f"Geocoding + OpenMeteo fallback for {city}",
+                self._openmeteo_for_city_async(city),
+            )
+            if result:
+                result["data_source"] = "meteorological services"
+                result["location_name"] = city
+                result["note"] = f"Local monitoring data unavailable. Using modeled data for {city}"
+                return result
+
+        return self._no_african_city_data(city)
+
+    async def _get_air_quality_by_location_async(
+        self, latitude: float, longitude: float
+    ) -> dict[str, Any]:
+        """Async twin of the `get_air_quality_by_location` tool."""
+        # Africa: Latitude -35 to 37, Longitude -17 to 52
+        is_african = (-35 <= latitude <= 37) and (-17 <= longitude <= 52)
+        label = f"GPS ({latitude}, {longitude})"
+
+        if is_african and self.airqo and not self._is_circuit_open("airqo"):
+            logger.info(f"Trying AirQo for {label}")
+            result = await self._try_source_async(
+                "airqo",
+                f"AirQo for {label}",
+                self.airqo.get_air_quality_by_location_async(latitude=latitude, longitude=longitude),
+            )
+            if result:
+                return self._annotate_airqo_location(result)
+
+        if self.waqi and not self._is_circuit_open("waqi"):
+            logger.info(f"Trying WAQI for {label}")
+            result = await self._try_source_async(
+                "waqi", f"WAQI for {label}", self.waqi.get_city_feed_async(f"geo:{latitude};{longitude}")
+            )
+            if result:
+                return self._annotate_waqi_location(result, latitude, longitude, is_african)
+
+        if self.openmeteo and not self._is_circuit_open("openmeteo"):
+            logger.info(f"Trying OpenMeteo for {label}")
+            result = await self._try_source_async(
+                "openmeteo",
+                f"OpenMeteo for {label}",
+                self.openmeteo.get_current_air_quality_async(latitude, longitude),
+            )
+            if result:
+                return self._annotate_openmeteo_location(result)
+
+        return self._no_location_data(latitude, longitude)
+
+    async def _get_forecast_async(self, city: str) -> dict[str, Any]:
+        """Async twin of the `get_air_quality_forecast` tool."""
+        city = city.lower()
+        is_african = any(indicator in city for indicator in self.AFRICAN_FORECAST_INDICATORS)
+
+        if is_african and self.airqo is not None:
+            try:
+                result = await self.airqo.get_forecast_async(city=city, frequency="daily")
+                if isinstance(result, dict) and result.get("success"):
+                    result["data_source"] = "AirQo monitoring network"
+                    result["source_type"] = "airqo"
+                return result
+            except Exception as e:
+                logger.warning(f"AirQo forecast failed for {city}, falling back to WAQI: {e}")
+
+        if self.waqi is None:
             return {
-                "error": aeris_unavailable_message(),
-                "function_name": function_name,
-                "guidance": "This data source is currently unavailable or the requested location was not found. Please inform the user and suggest they try a different location or data source.",
+                "success": False,
+                "message": "Air quality forecast services are not available.",
             }
+        try:
+            result = await self.waqi.get_station_forecast_async(city)
+            if isinstance(result, dict) and result.get("success"):
+                result["data_source"] = "World Air Quality Index (WAQI) network"
+                result["source_type"] = "waqi"
+            return result
+        except Exception as e:
+            logger.error(f"WAQI forecast failed for {city}: {e}")
+            return {
+                "success": False,
+                "message": f"Unable to get forecast for {city}. No monitoring stations found or service unavailable.",
+            }
+
+    async def _get_location_from_ip_async(self) -> dict[str, Any]:
+        """Async twin of the `get_location_from_ip` tool."""
+        if self.client_location and self.client_location.get("source") == "gps":
+            latitude = self.client_location["latitude"]
+            longitude = self.client_location["longitude"]
+            # Reverse geocoding and air quality are independent - fetch both at once
+            reverse_result, air_quality_result = await asyncio.gather(
+                self.geocoding.reverse_geocode_async(latitude, longitude),
+                self.openmeteo.get_current_air_quality_async(
+                    latitude=latitude, longitude=longitude, timezone="auto"
+                ),
+            )
+            return self._gps_location_result(latitude, longitude, reverse_result, air_quality_result)
+
+        location_result = await self.geocoding.get_location_from_ip_async(self.client_ip)
+        if not (
+            location_result.get("success")
+            and location_result.get("latitude")
+            and location_result.get("longitude")
+        ):
+            return location_result
+
+        logger.info(
+            f"Location retrieved from IP: {location_result.get('latitude')}, {location_result.get('longitude')}"
+        )
+        air_quality_result = await self.openmeteo.get_current_air_quality_async(
+            latitude=location_result["latitude"],
+            longitude=location_result["longitude"],
+            timezone="auto",
+        )
+        return self._ip_location_result(location_result, air_quality_result)
+
+    async def _execute_native_async(self, function_name: str, args: dict[str, Any]) -> dict[str, Any]:
+        """Run a tool from `NATIVE_ASYNC_TOOLS` on the async HTTP clients."""
+        if function_name == "get_city_air_quality":
+            if self.waqi is None and self.openmeteo is None:
+                return {"success": False, "message": "Air quality services are not enabled."}
+            return await self._get_city_air_quality_with_fallback_async(args.get("city"))
+
+        elif function_name == "search_waqi_stations":
+            if self.waqi is None or self._is_circuit_open("waqi"):
+                return {"success": False, "message": aeris_unavailable_message()}
+            try:
+                result = await self.waqi.search_stations_async(args.get("keyword"))
+                self._record_success("waqi")
+                return result
+            except ProviderServiceError as e:
+                self._record_failure("waqi", e)
+                return {"success": False, "message": e.public_message}
+            except Exception as e:
+                self._record_failure("waqi", e)
+                logger.error(f"WAQI search stations error: {str(e)[:200]}")
+                return {"success": False, "message": aeris_unavailable_message()}
+
+        elif function_name == "get_african_city_air_quality":
+            if self.airqo is None and self.waqi is None and self.openmeteo is None:
+                return {"success": False, "message": "Air quality services are not enabled."}
+            return await self._get_african_city_with_fallback_async(
+                args.get("city"), args.get("site_id")
+            )
+
+        elif function_name == "get_multiple_african_cities_air_quality":
+            if self.airqo is None and self.waqi is None and self.openmeteo is None:
+                return {"success": False, "message": "Air quality services are not enabled."}
+            cities = args.get("cities", [])
+            results = await self._get_cached_city_results_async(cities)
+            missing = [city for city in dict.fromkeys(cities) if city not in results]
+            outcomes = await gather_bounded(
+                {
+                    city: lambda city=city: self._get_african_city_with_fallback_async(city)
+                    for city in missing
+                },
+                self.MULTI_CITY_CONCURRENCY,
+                self.MULTI_CITY_CALL_TIMEOUT_SECONDS,
+                self.MULTI_CITY_DEADLINE_SECONDS,
+            )
+            fresh = self._fresh_city_results(missing, outcomes)
+            await self._cache_city_results_async(fresh)
+            return self._multiple_cities_result(cities, {**results, **fresh})
+
+        elif function_name == "get_air_quality_forecast":
+            return await self._get_forecast_async(args.get("city", ""))
+
+        elif function_name == "get_air_quality_by_location":
+            latitude = args.get("latitude")
+            longitude = args.get("longitude")
+            if latitude is None or longitude is None:
+                return {"success": False, "message": "Latitude and longitude are required."}
+            return await self._get_air_quality_by_location_async(latitude, longitude)
+
+        elif function_name == "search_airqo_sites":
+            if self.airqo is None:
+                return {"success": False, "message": "AirQo service is not enabled."}
+            return await self.airqo.search_sites_by_location_async(
+                location=args.get("location"), limit=args.get("limit", 50)
+            )
+
+        elif function_name == "get_openmeteo_current_air_quality":
+            if self.openmeteo is None:
+                return {"success": False, "message": "OpenMeteo service is not enabled."}
+            return await self.openmeteo.get_current_air_quality_async(
+                latitude=args.get("latitude"),
+                longitude=args.get("longitude"),
+                timezone=args.get("timezone", "auto"),
+            )
+
+        elif function_name == "get_openmeteo_forecast":
+            if self.openmeteo is None:
+                return {"success": False, "message": "OpenMeteo service is not enabled."}
+            return await self.openmeteo.get_hourly_forecast_async(
+                latitude=args.get("latitude"),
+                longitude=args.get("longitude"),
+                forecast_days=args.get("forecast_days", 5),
+                timezone=args.get("timezone", "auto"),
+            )
+
+        elif function_name == "get_openmeteo_historical":
+            if self.openmeteo is None:
+                return {"success": False, "message": "OpenMeteo service is not enabled."}
+            start_date_str = args.get("start_date")
+            end_date_str = args.get("end_date")
+            return await self.openmeteo.get_historical_data_async(
+                latitude=args.get("latitude"),
+                longitude=args.get("longitude"),
+                start_date=(
+                    datetime.strptime(start_date_str, "%Y-%m-%d")
+                    if isinstance(start_date_str, str)
+                    else None
+                ),
+                end_date=(
+                    datetime.strptime(end_date_str, "%Y-%m-%d")
+                    if isinstance(end_date_str, str)
+                    else None
+                ),
+                timezone=args.get("timezone", "auto"),
+            )
+
+        elif function_name == "get_uba_measures":
+            if self.uba is None:
+                return {"success": False, "message": "UBA service is not enabled."}
+            return await self.uba.get_measures_async(
+                component=args.get("component"), scope=args.get("scope", "1h")
+            )
+
+        elif function_name == "get_nsw_air_quality":
+            if self.nsw is None:
+                return {"success": False, "message": "NSW service is not enabled."}
+            return await self.nsw.get_current_air_quality_async(args.get("location"))
+
+        elif function_name == "get_nsw_sites":
+            if self.nsw is None:
+                return {"success": False, "message": "NSW service is not enabled."}
+            sites = await self.nsw.get_site_details_async()
+            return {"success": True, "data": sites, "count": len(sites)}
+
+        elif function_name == "get_nsw_pollutant_data":
+            if self.nsw is None:
+                return {"success": False, "message": "NSW service is not enabled."}
+            return await self.nsw.get_pollutant_data_async(
+                args.get("pollutant"), args.get("hours", 24)
+            )
+
+        elif function_name == "get_city_weather":
+            return await self.weather.get_current_weather_async(args.get("city"))
+
+        elif function_name == "get_weather_forecast":
+            return await self.weather.get_weather_forecast_async(
+                args.get("city"), args.get("days", 7)
+            )
+
+        elif function_name == "geocode_address":
+            return await self.geocoding.geocode_address_async(
+                args.get("address"), args.get("limit", 1)
+            )
+
+        elif function_name == "reverse_geocode":
+            return await self.geocoding.reverse_geocode_async(
+                args.get("latitude"), args.get("longitude")
+            )
+
+        elif function_name == "get_location_from_ip":
+            return await self._get_location_from_ip_async()
+
+        raise ValueError(f"{function_name} is not a native async tool")
 
     async def execute_async(self, function_name: str, args: dict[str, Any]) -> dict[str, Any]:
         """
         Execute a tool asynchronously.
 
-        For now, this wraps the synchronous execution. Can be extended for
-        truly async implementations in the future.
+        Data-source tools in `NATIVE_ASYNC_TOOLS` run directly on the event loop
+        through the shared pooled httpx client. The remaining tools (search,
+        scraping, document scanning, charts, carbon intensity) still wrap the
+        synchronous `execute` in a worker thread.
+
+        Inside a chat turn, repeated calls with the same (normalized) arguments
+        are served from the turn's `ToolMemo`.
 
         Args:
             function_name: Name of the tool/function to execute
@@ -1093,9 +1852,24 @@ class ToolExecutor:
         Returns:
             Result dictionary from the tool execution
         """
-        import asyncio
+        memo = get_tool_memo()
+        if memo is not None and function_name not in self.UNMEMOIZED_TOOLS:
+            return await memo.get_or_call(
+                function_name, args, lambda: self._execute_unmemoized_async(function_name, args)
+            )
+        return await self._execute_unmemoized_async(function_name, args)
+
+    async def _execute_unmemoized_async(
+        self, function_name: str, args: dict[str, Any]
+    ) -> dict[str, Any]:
+        if function_name not in self.NATIVE_ASYNC_TOOLS:
+            return await asyncio.to_thread(self.execute, function_name, args)
 
-        return await asyncio.to_thread(self.execute, function_name, args)
+        try:
+            return await self._execute_native_async(function_name, args)
+        except Exception as e:
+            logger.error(f"Tool execution failed for {function_name}: {e}", exc_info=True)
+            return self._tool_failure(function_name)
 
     async def execute_parallel(
         self, tool_calls: list[tuple[str, dict[str, Any]]]
@@ -1121,8 +1895,6 @@ class ToolExecutor:
                 ("get_openmeteo_current_air_quality", {"latitude": 0.3, "longitude": 32.5})
             ])
         """
-        import asyncio
-
         if not tool_calls:
             return []
 
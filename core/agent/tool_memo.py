@@ -0,0 +1,110 @@
+"""
+Request-scoped tool result memo.
+
+One chat turn often runs the same tool twice: `QueryAnalyzer.proactively_call_tools`
+fetches, say, Kampala's air quality, then the provider's tool loop asks for it
+again. `AgentService.process_message` opens a `ToolMemo` for the turn and
+`ToolExecutor.execute_async` looks it up with `get_tool_memo()`, so every
+execution path of that turn shares one table keyed by (tool name, normalized
+args). Duplicates, including concurrent ones, await the first call instead of
+hitting the upstream API again. Outside a chat turn nothing changes.
+"""
+
+import asyncio
+import contextvars
+import copy
+import json
+import logging
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_current_memo: contextvars.ContextVar["ToolMemo | None"] = contextvars.ContextVar(
+    "tool_memo", default=None
+)
+
+# Place-name arguments compared case-insensitively
+_CASE_INSENSITIVE_ARGS = frozenset({"city", "cities", "location", "country", "address"})
+# Coordinates are compared at ~10 m precision
+_COORDINATE_DECIMALS = 4
+
+
+def _normalize(name: str | None, value: Any) -> Any:
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value.casefold() if name in _CASE_INSENSITIVE_ARGS else value
+    if isinstance(value, float):
+        return round(value, _COORDINATE_DECIMALS)
+    if isinstance(value, dict):
+        return {k: _normalize(k, v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(name, v) for v in value]
+    return value
+
+
+class ToolMemo:
+    """Tool results of one chat turn, with single-flight for duplicate calls."""
+
+    def __init__(self):
+        self._entries: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(tool_name: str, args: dict[str, Any]) -> str:
+        """Memo key: tool name plus args with whitespace, case and precision normalized."""
+        normalized = _normalize(None, args or {})
+        return f"{tool_name}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+    async def get_or_call(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        call: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """
+        Return the memoized result for this call, running `call` on the first request.
+
+        Failed results are returned to the callers already waiting on them but
+        not kept, so a later call in the same turn retries. Each caller gets its
+        own copy of the result.
+        """
+        key = self.key(tool_name, args)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = asyncio.ensure_future(call())
+            entry.add_done_callback(lambda task: self._forget_failure(key, task))
+            self._entries[key] = entry
+        else:
+            self.hits += 1
+            logger.info(f"♻️ Tool memo hit: {tool_name}")
+        # Shielded so a caller giving up (e.g. a proactive deadline) leaves the
+        # call running for the other callers of this turn
+        result = await asyncio.shield(entry)
+        return copy.deepcopy(result)
+
+    def _forget_failure(self, key: str, task: asyncio.Task) -> None:
+        result = None if task.cancelled() or task.exception() else task.result()
+        if not isinstance(result, dict) or result.get("success") is False or "error" in result:
+            if self._entries.get(key) is task:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    @contextmanager
+    def bind(self) -> Iterator["ToolMemo"]:
+        """Make this memo the current one for the enclosed code (and tasks it spawns)."""
+        token = _current_memo.set(self)
+        try:
+            yield self
+        finally:
+            _current_memo.reset(token)
+
+
+def get_tool_memo() -> ToolMemo | None:
+    """Return the tool memo of the current chat turn, if one is open."""
+    return _current_memo.get()
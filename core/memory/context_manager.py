@@ -148,16 +148,25 @@ class SessionContextManager:
 
         context["message_count"] = len(recent_messages)
 
-    def get_context_summary(self, session_id: str) -> str:
+    def get_context_summary(self, session_id: str, stored_summary: str | None = None) -> str:
         """
         Get conversation summary for context injection.
 
         Args:
             session_id: Session identifier
+            stored_summary: Rolling summary stored with the session (see
+                ConversationSummarizer); replaces the keyword topics when present
 
         Returns:
             Summary string
         """
+        if stored_summary:
+            return (
+                "\n\n=== SESSION CONTEXT ===\n"
+                f"Summary of the earlier conversation: {stored_summary}\n"
+                "=== END SESSION CONTEXT ===\n"
+            )
+
         if session_id not in self.session_contexts:
             return ""
 
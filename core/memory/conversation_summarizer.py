@@ -0,0 +1,196 @@
+"""
+Conversation Summarizer - rolling LLM summaries of long sessions, off the request path
+
+Chat turns send a session's recent messages verbatim. Once more than
+CONVERSATION_SUMMARY_TRIGGER_MESSAGES messages are not yet covered by the
+session's summary, a background task folds all but the newest
+CONVERSATION_SUMMARY_KEEP_RECENT of them into the running summary with one
+LLM call. The summary is stored with the session (`session_summaries`) along
+with a watermark, the id of the last message it covers. Later turns load only
+the messages after the watermark and send the summary as session context, so
+the prompt stays bounded however long the conversation runs.
+
+Runs start after the response is saved, so a turn never waits for them. A
+failed run leaves the previous summary and watermark in place; history just
+stays longer until the next run succeeds.
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Any
+
+from infrastructure.database.database import SessionLocal
+from infrastructure.database.repository import (
+    get_session_messages_after,
+    get_session_summary,
+    save_session_summary,
+)
+from shared.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationSummarizer:
+    """Keeps a running summary per session, updated in background tasks."""
+
+    SYSTEM_INSTRUCTION = (
+        "You maintain the running summary of a conversation between a user and Aeris-AQ, "
+        "an air quality assistant. Merge the new turns into the existing summary. Keep what "
+        "later answers may depend on: the user's name, location and preferences, places, "
+        "dates and readings discussed, documents analysed, advice given and open questions. "
+        "Drop greetings and repetition. Write plain sentences, at most 200 words, with no "
+        "headings, lists or code."
+    )
+    # Characters of each message included in the summarization prompt
+    MAX_MESSAGE_CHARS = 2000
+    SUMMARY_MAX_TOKENS = 400
+
+    def __init__(
+        self,
+        provider: Any,
+        session_factory: Any = SessionLocal,
+        trigger_messages: int | None = None,
+        keep_recent: int | None = None,
+        enabled: bool | None = None,
+    ):
+        """
+        Initialize the summarizer.
+
+        Args:
+            provider: AI provider (its `complete_text` writes the summaries)
+            session_factory: Database session factory
+            trigger_messages: Default: CONVERSATION_SUMMARY_TRIGGER_MESSAGES
+            keep_recent: Default: CONVERSATION_SUMMARY_KEEP_RECENT
+            enabled: Default: CONVERSATION_SUMMARY_ENABLED
+        """
+        settings = get_settings()
+        self.provider = provider
+        self.session_factory = session_factory
+        self.trigger_messages = (
+            settings.CONVERSATION_SUMMARY_TRIGGER_MESSAGES
+            if trigger_messages is None
+            else trigger_messages
+        )
+        self.keep_recent = (
+            settings.CONVERSATION_SUMMARY_KEEP_RECENT if keep_recent is None else keep_recent
+        )
+        self.enabled = settings.CONVERSATION_SUMMARY_ENABLED if enabled is None else enabled
+        self._tasks: dict[str, asyncio.Task] = {}
+        # Sessions that saved more turns while their summary was being written
+        self._rerun: set[str] = set()
+        self.metrics = {"runs": 0, "messages_folded": 0, "failures": 0}
+
+    def schedule(self, session_id: str | None) -> None:
+        """
+        Update the session's summary in the background if it has grown enough.
+
+        Call after a turn's messages are saved. At most one run per session is
+        in flight; a call during a run queues one more after it.
+        """
+        if not self.enabled or not session_id:
+            return
+        if session_id in self._tasks:
+            self._rerun.add(session_id)
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        # Fresh context: the run must not inherit the turn's token stream or tool memo
+        task = loop.create_task(self._run(session_id), context=contextvars.Context())
+        self._tasks[session_id] = task
+        task.add_done_callback(lambda _: self._finished(session_id))
+
+    def _finished(self, session_id: str) -> None:
+        self._tasks.pop(session_id, None)
+        if session_id in self._rerun:
+            self._rerun.discard(session_id)
+            self.schedule(session_id)
+
+    async def _run(self, session_id: str) -> None:
+        try:
+            await self.summarize(session_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.metrics["failures"] += 1
+            logger.warning(f"Conversation summary failed for session {session_id[:8]}: {e}")
+
+    async def summarize(self, session_id: str) -> bool:
+        """
+        Fold the session's older unsummarized messages into its summary.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            True if a new summary was written
+        """
+        summary, messages = await asyncio.to_thread(self._load, session_id)
+        if len(messages) <= self.trigger_messages:
+            return False
+
+        folded = messages[: len(messages) - self.keep_recent]
+        updated = await self.provider.complete_text(
+            self._prompt(summary, folded),
+            self.SYSTEM_INSTRUCTION,
+            max_tokens=self.SUMMARY_MAX_TOKENS,
+        )
+        updated = (updated or "").strip()
+        if not updated:
+            return False
+
+        await asyncio.to_thread(self._store, session_id, updated, folded[-1]["id"])
+        self.metrics["runs"] += 1
+        self.metrics["messages_folded"] += len(folded)
+        logger.info(
+            f"📝 Summarized {len(folded)} messages of session {session_id[:8]} "
+            f"({len(messages) - len(folded)} kept verbatim)"
+        )
+        return True
+
+    def _prompt(self, summary: str, messages: list[dict[str, Any]]) -> str:
+        turns = "\n".join(
+            f"{'User' if m['role'] == 'user' else 'Assistant'}: "
+            f"{m['content'][: self.MAX_MESSAGE_CHARS]}"
+            for m in messages
+        )
+        return (
+            f"Summary so far:\n{summary or '(none yet)'}\n\n"
+            f"New conversation turns:\n{turns}\n\n"
+            "Write the updated summary."
+        )
+
+    def _load(self, session_id: str) -> tuple[str, list[dict[str, Any]]]:
+        """Current summary and the messages after its watermark."""
+        db = self.session_factory()
+        try:
+            existing = get_session_summary(db, session_id)
+            after_id = existing.summarized_until if existing else 0
+            messages = [
+                {"id": m.id, "role": str(m.role), "content": str(m.content or "")}
+                for m in get_session_messages_after(db, session_id, after_id)
+            ]
+            return (existing.summary if existing else ""), messages
+        finally:
+            db.close()
+
+    def _store(self, session_id: str, summary: str, summarized_until: int) -> None:
+        db = self.session_factory()
+        try:
+            save_session_summary(db, session_id, summary, summarized_until)
+        finally:
+            db.close()
+
+    async def stop(self) -> None:
+        """Cancel in-flight runs (shutdown)."""
+        tasks = list(self._tasks.values())
+        self._rerun.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {"enabled": self.enabled, "in_flight": len(self._tasks), **self.metrics}
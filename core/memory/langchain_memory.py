@@ -6,26 +6,39 @@ Provides advanced memory features:
 - Conversation summarization
 - Redis persistence
 - Entity extraction
+
+Redis persistence goes through the shared cache's connection pools and circuit
+breaker, using the key layout of LangChain's RedisChatMessageHistory
+(``message_store:<session_id>``, newest message first). Use the ``a*`` methods
+from async code; the sync methods block on the sync Redis client.
 """
 
+import json
 import logging
 
 try:
-    from langchain_community.chat_message_histories import RedisChatMessageHistory
     from langchain_core.chat_history import BaseChatMessageHistory, InMemoryChatMessageHistory
-    from langchain_core.messages import AIMessage, HumanMessage
+    from langchain_core.messages import (
+        AIMessage,
+        BaseMessage,
+        HumanMessage,
+        message_to_dict,
+        messages_from_dict,
+    )
     LANGCHAIN_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"LangChain imports failed: {e}. Memory features will be limited.")
     LANGCHAIN_AVAILABLE = False
     # Fallback implementations
     BaseChatMessageHistory = object
+    BaseMessage = object
     InMemoryChatMessageHistory = None
     AIMessage = None
     HumanMessage = None
-    RedisChatMessageHistory = None
 
+from infrastructure.cache.cache_service import get_cache
 from shared.config.settings import get_settings
+from shared.utils.token_counter import get_token_counter
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +53,9 @@ class LangChainSessionMemory:
     - Message history tracking
     """
 
+    KEY_PREFIX = "message_store:"  # Same layout as RedisChatMessageHistory
+    TTL_SECONDS = 3600  # 1 hour
+
     def __init__(
         self,
         session_id: str,
@@ -62,57 +78,72 @@ class LangChainSessionMemory:
         self.max_messages = max_messages
         self.max_tokens = max_tokens
 
-        # Try Redis first, fallback to in-memory
-        self.chat_history: BaseChatMessageHistory = None
+        # Local copy of the conversation; the only copy when Redis is unavailable
+        self.chat_history: BaseChatMessageHistory = InMemoryChatMessageHistory()
+        self.cache = get_cache()
+        self.key = f"{self.KEY_PREFIX}{session_id}"
+
+        if not self.cache.enabled:
+            logger.info(f"Redis disabled or unreachable. Using in-memory chat history for session {session_id}")
+
+        logger.info(f"Initialized LangChain memory for session {session_id}")
+
+    def _remember(self, messages: list[BaseMessage]) -> None:
+        """Append to the local history, keeping the last max_messages."""
+        self.chat_history.add_messages(messages)
+        if len(self.chat_history.messages) > self.max_messages:
+            self.chat_history.messages = self.chat_history.messages[-self.max_messages:]
+
+    def _persist_ops(self, messages: list[BaseMessage], pipe) -> None:
+        """Queue the Redis writes for new messages on a pipeline."""
+        for msg in messages:
+            pipe.lpush(self.key, json.dumps(message_to_dict(msg)))
+        pipe.ltrim(self.key, 0, self.max_messages - 1)
+        pipe.expire(self.key, self.TTL_SECONDS)
 
-        # Check if Redis is enabled in settings
-        if not self.settings.REDIS_ENABLED:
-            logger.info(f"Redis disabled in settings (REDIS_ENABLED={self.settings.REDIS_ENABLED}). Using in-memory chat history for session {session_id}")
-            self.chat_history = InMemoryChatMessageHistory()
+    def _load(self, raw: list[bytes] | None) -> None:
+        """Replace the local history with what Redis holds (None: Redis unavailable)."""
+        if raw is None:
             return
+        items = [json.loads(m) for m in reversed(raw)]
+        self.chat_history.messages = messages_from_dict(items)
 
-        redis_url = f"redis://{self.settings.REDIS_HOST}:{self.settings.REDIS_PORT}"
-
-        try:
-            # Test Redis connection
-            import redis
-            redis_client = redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=2)
-            redis_client.ping()
-
-            # Redis is available
-            self.chat_history = RedisChatMessageHistory(
-                session_id=session_id,
-                url=redis_url,
-                ttl=3600  # 1 hour TTL
-            )
-            logger.info(f"Initialized Redis chat history for session {session_id}")
-        except Exception as e:
-            logger.warning(f"Redis unavailable ({e}). Using in-memory chat history.")
-            # In-memory fallback
-            self.chat_history = InMemoryChatMessageHistory()
+    def add_messages(self, messages: list[BaseMessage]) -> None:
+        """Add messages to memory."""
+        self._remember(messages)
 
-        logger.info(f"Initialized LangChain memory for session {session_id}")
+        def op(r):
+            pipe = r.pipeline(transaction=False)
+            self._persist_ops(messages, pipe)
+            return pipe.execute()
+
+        self.cache.run(op)
+
+    async def aadd_messages(self, messages: list[BaseMessage]) -> None:
+        """Async variant of `add_messages`."""
+        self._remember(messages)
+
+        async def op(r):
+            async with r.pipeline(transaction=False) as pipe:
+                self._persist_ops(messages, pipe)
+                return await pipe.execute()
+
+        await self.cache.run_async(op)
 
     def add_user_message(self, message: str) -> None:
         """Add a user message to memory."""
-        self.chat_history.add_user_message(message)
-        self._trim_messages()
+        self.add_messages([HumanMessage(content=message)])
         logger.info(f"Added user message to LangChain memory (session: {self.session_id[:8]}...): {message[:50]}...")
 
     def add_ai_message(self, message: str) -> None:
         """Add an AI message to memory."""
-        self.chat_history.add_ai_message(message)
-        self._trim_messages()
+        self.add_messages([AIMessage(content=message)])
         logger.info(f"Added AI message to LangChain memory (session: {self.session_id[:8]}...): {message[:50]}...")
 
-    def _trim_messages(self) -> None:
-        """Trim messages to stay within limits."""
-        messages = self.chat_history.messages
-        if len(messages) > self.max_messages:
-            # Keep only the last max_messages
-            self.chat_history.clear()
-            for msg in messages[-self.max_messages:]:
-                self.chat_history.add_message(msg)
+    async def aadd_exchange(self, user_message: str, ai_message: str) -> None:
+        """Add a user message and the AI reply in one Redis round trip."""
+        await self.aadd_messages([HumanMessage(content=user_message), AIMessage(content=ai_message)])
+        logger.info(f"Added exchange to LangChain memory (session: {self.session_id[:8]}...): {user_message[:50]}...")
 
     def get_history(self) -> list[dict[str, str]]:
         """
@@ -121,6 +152,17 @@ class LangChainSessionMemory:
         Returns:
             List of message dicts with 'role' and 'content'
         """
+        self._load(self.cache.run(lambda r: r.lrange(self.key, 0, self.max_messages - 1)))
+        return self._format_history()
+
+    async def aget_history(self) -> list[dict[str, str]]:
+        """Async variant of `get_history`."""
+        self._load(
+            await self.cache.run_async(lambda r: r.lrange(self.key, 0, self.max_messages - 1))
+        )
+        return self._format_history()
+
+    def _format_history(self) -> list[dict[str, str]]:
         messages = self.chat_history.messages
         history = []
 
@@ -144,14 +186,15 @@ class LangChainSessionMemory:
     def clear(self) -> None:
         """Clear conversation history."""
         self.chat_history.clear()
+        self.cache.run(lambda r: r.delete(self.key))
         logger.info(f"Cleared memory for session {self.session_id}")
 
     def get_token_count(self) -> int | None:
-        """Get approximate token count."""
-        messages = self.chat_history.messages
-        # Approximate: 1 token ≈ 0.75 words
-        total_tokens = sum(len(msg.content.split()) * 1.3 for msg in messages)
-        return int(total_tokens)
+        """Get approximate token count (of the local copy; no Redis I/O)."""
+        counter = get_token_counter(self.settings.AI_MODEL)
+        return counter.count_messages_tokens(
+            [{"role": msg.type, "content": str(msg.content)} for msg in self.chat_history.messages]
+        )
 
 
 def create_session_memory(
@@ -1,9 +1,19 @@
 """Prompts and system instructions for the AI agent."""
 
-from .system_instructions import STYLE_PRESETS, get_response_parameters, get_system_instruction
+from .system_instructions import (
+    STYLE_PRESETS,
+    StaticInstruction,
+    get_response_parameters,
+    get_static_instruction,
+    get_system_instruction,
+    precompile_system_instructions,
+)
 
 __all__ = [
     "STYLE_PRESETS",
+    "StaticInstruction",
     "get_system_instruction",
+    "get_static_instruction",
     "get_response_parameters",
+    "precompile_system_instructions",
 ]
@@ -10,7 +10,11 @@ Author: Production AI Engineering Team
 Date: January 2026
 """
 
+from dataclasses import dataclass
+from functools import lru_cache
+
 from shared.config.settings import get_settings
+from shared.utils.token_counter import count_tokens
 
 settings = get_settings()
 
@@ -1879,37 +1883,35 @@ Regulatory context: Uganda's national air quality standards (2019) are less stri
 # MASTER SYSTEM INSTRUCTION BUILDER
 # =============================================================================
 
-def get_system_instruction(
-    style: str = "general",
-    model_tier: str = "standard",
-    custom_prefix: str = "",
-    custom_suffix: str = "",
-) -> str:
-    """
-    Build complete system instruction with style-specific modifications.
-    
-    Args:
-        style: One of 'executive', 'technical', 'general', 'simple', 'policy'
-        model_tier: 'large' (>20B), 'medium' (7-20B), 'small' (<7B)
-        custom_prefix: Content to prepend (e.g., session context)
-        custom_suffix: Content to append (e.g., specific constraints)
-    
-    Returns:
-        Complete system instruction string optimized for model tier
-    """
+# Tiers with the full prompt; any other tier ("small", the "standard" default) gets
+# the condensed one
+_FULL_PROMPT_TIERS = ("large", "medium")
+
+
+@dataclass(frozen=True)
+class StaticInstruction:
+    """The per-(style, tier) part of the system instruction, built once."""
+
+    text: str
+    tokens: int
+
+
+def _tier_key(model_tier: str) -> str:
+    return model_tier if model_tier in _FULL_PROMPT_TIERS else "small"
+
+
+@lru_cache(maxsize=None)
+def _build_static_instruction(style_key: str, tier_key: str) -> StaticInstruction:
     parts = []
 
     # 🚨 CRITICAL - This MUST be first so model sees it immediately
     parts.append(CRITICAL_NO_CODE_RULE)
 
-    if custom_prefix:
-        parts.append(custom_prefix.strip())
-
     # Core identity (always include)
     parts.append(AGENT_IDENTITY)
 
     # Add components based on model tier
-    if model_tier in ["large", "medium"]:
+    if tier_key in _FULL_PROMPT_TIERS:
         # Full reasoning framework for capable models
         parts.append(REASONING_FRAMEWORK)
         parts.append(MULTIPLE_MONITORS_HANDLING)
@@ -1938,15 +1940,76 @@ def get_system_instruction(
     parts.append(DATA_PRESENTATION_RULES)
 
     # Apply style-specific persona modifier
-    style_key = style.lower()
     if style_key in STYLE_PRESETS:
         modifier = STYLE_PRESETS[style_key].get("persona_modifier", "")
         if modifier:
             parts.append(modifier)
 
-    # 🚨 CRITICAL - Repeat the no-code rule at the END so it's the last thing model sees
+    # 🚨 CRITICAL - Repeat the no-code rule at the END of the static prompt
     parts.append(CRITICAL_NO_CODE_RULE)
 
+    text = "\n\n".join(parts)
+    return StaticInstruction(text=text, tokens=count_tokens(text, settings.AI_MODEL))
+
+
+def get_static_instruction(
+    style: str = "general", model_tier: str = "standard"
+) -> StaticInstruction:
+    """
+    Static system instruction for a style and model tier (built and token-counted once).
+
+    Args:
+        style: One of 'executive', 'technical', 'general', 'simple', 'policy'
+        model_tier: 'large' (>20B), 'medium' (7-20B), 'small' (<7B)
+
+    Returns:
+        StaticInstruction with the prompt text and its token count
+    """
+    return _build_static_instruction(style.lower(), _tier_key(model_tier))
+
+
+def precompile_system_instructions() -> dict[str, int]:
+    """
+    Build every style/tier static prompt ahead of the first chat turn.
+
+    Returns:
+        Token count per "style/tier"
+    """
+    return {
+        f"{style}/{tier}": get_static_instruction(style, tier).tokens
+        for style in STYLE_PRESETS
+        for tier in (*_FULL_PROMPT_TIERS, "small")
+    }
+
+
+def get_system_instruction(
+    style: str = "general",
+    model_tier: str = "standard",
+    custom_prefix: str = "",
+    custom_suffix: str = "",
+) -> str:
+    """
+    Build complete system instruction with style-specific modifications.
+
+    The static prompt for the style and tier always comes first, byte-identical
+    across requests, and per-request content follows it: OpenAI and Gemini
+    cache prompts by prefix, so the static part is reused across turns and
+    sessions.
+    
+    Args:
+        style: One of 'executive', 'technical', 'general', 'simple', 'policy'
+        model_tier: 'large' (>20B), 'medium' (7-20B), 'small' (<7B)
+        custom_prefix: First per-request content after the static prompt (e.g., documents)
+        custom_suffix: Content to append (e.g., session context, location)
+    
+    Returns:
+        Complete system instruction string optimized for model tier
+    """
+    parts = [get_static_instruction(style, model_tier).text]
+
+    if custom_prefix:
+        parts.append(custom_prefix.strip())
+
     if custom_suffix:
         parts.append(custom_suffix.strip())
 
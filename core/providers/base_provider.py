@@ -4,9 +4,14 @@ Base provider abstraction for AI model providers.
 Defines the interface that all provider implementations must follow.
 """
 
+import logging
 from abc import ABC, abstractmethod
 from typing import Any
 
+from shared.utils.prompt_budget import get_prompt_budget
+
+logger = logging.getLogger(__name__)
+
 
 class BaseAIProvider(ABC):
     """Abstract base class for AI providers."""
@@ -74,6 +79,28 @@ class BaseAIProvider(ABC):
         """
         pass
 
+    async def complete_text(
+        self, prompt: str, system_instruction: str, max_tokens: int = 512
+    ) -> str:
+        """
+        One-shot text completion without tools or streaming.
+
+        Used for background work such as conversation summaries, so it never
+        publishes to the turn's token stream.
+
+        Args:
+            prompt: User prompt
+            system_instruction: System instruction/prompt
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Generated text
+
+        Raises:
+            NotImplementedError: If the provider does not support it
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support plain completions")
+
     def cleanup(self) -> None:
         """
         Clean up resources (optional).
@@ -86,14 +113,12 @@ class BaseAIProvider(ABC):
         self, messages: list[dict], system_instruction: str
     ) -> list[dict]:
         """
-        Intelligently truncate conversation context when token limit is exceeded.
+        Shrink the conversation after the provider rejected it as too long.
 
-        Strategy:
-        1. Keep system instruction (required)
-        2. Keep most recent user message (required)
-        3. Keep most recent 2-3 exchanges
-        4. Summarize or remove older messages
-        5. Keep tool results from recent exchanges
+        Keeps the system instruction and the current message, and refits the
+        history into half the rejected prompt's size with the shared prompt
+        budget (recent exchanges first, then the most important older messages,
+        tool results together with the call that produced them).
 
         This is a shared method that all providers can use.
 
@@ -104,59 +129,11 @@ class BaseAIProvider(ABC):
         Returns:
             Truncated list of messages
         """
-        import logging
-
-        logger = logging.getLogger(__name__)
-
-        try:
-            # Separate system, user, assistant, and tool messages
-            system_msgs = [m for m in messages if m.get("role") == "system"]
-            user_msgs = [m for m in messages if m.get("role") == "user"]
-            assistant_msgs = [m for m in messages if m.get("role") == "assistant"]
-            tool_msgs = [m for m in messages if m.get("role") in ["tool", "function"]]
-
-            # Keep system instruction (always first)
-            truncated = (
-                system_msgs[:1]
-                if system_msgs
-                else [{"role": "system", "content": system_instruction}]
-            )
-
-            # Keep last 3 user-assistant exchanges (6 messages)
-            recent_exchanges = []
-            min_keep = min(3, len(user_msgs))
-
-            for i in range(min_keep):
-                # Add user message
-                if len(user_msgs) > i:
-                    recent_exchanges.append(user_msgs[-(i + 1)])
-
-                # Add corresponding assistant message if exists
-                if len(assistant_msgs) > i:
-                    recent_exchanges.append(assistant_msgs[-(i + 1)])
-
-            # Reverse to maintain chronological order
-            recent_exchanges.reverse()
-
-            # Add recent tool messages (last 3)
-            recent_tools = tool_msgs[-3:] if len(tool_msgs) > 0 else []
-
-            # Combine: system + recent exchanges + recent tools + current user message
-            truncated.extend(recent_exchanges)
-            truncated.extend(recent_tools)
-
-            # Ensure the very last user message is included (if not already)
-            if user_msgs and user_msgs[-1] not in truncated:
-                truncated.append(user_msgs[-1])
-
-            logger.info(f"Context truncated from {len(messages)} to {len(truncated)} messages")
-            return truncated
-
-        except Exception as e:
-            logger.error(f"Error truncating context: {e}")
-            # Fallback: keep system + last 2 messages
-            return [
-                {"role": "system", "content": system_instruction},
-                messages[-2] if len(messages) >= 2 else messages[0],
-                messages[-1],
-            ]
+        budget = get_prompt_budget(self.settings.AI_MODEL)
+        if not messages or messages[0].get("role") != "system":
+            messages = [{"role": "system", "content": system_instruction}, *messages]
+
+        rejected_tokens = sum(budget.message_tokens(m) for m in messages)
+        truncated = budget.fit_messages(messages, budget=rejected_tokens // 2)
+        logger.info(f"Context truncated from {len(messages)} to {len(truncated)} messages")
+        return truncated
@@ -16,6 +16,7 @@ from core.tools.definitions import gemini_tools
 from shared.utils.markdown_formatter import MarkdownFormatter
 
 from .base_provider import BaseAIProvider
+from .token_stream import get_token_stream
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,53 @@ class GeminiProvider(BaseAIProvider):
             logger.error(f"Failed to setup Gemini: {e}")
             raise ConnectionError(f"Failed to initialize Gemini client: {e}") from e
 
+    async def complete_text(
+        self, prompt: str, system_instruction: str, max_tokens: int = 512
+    ) -> str:
+        """One-shot completion without tools or streaming (see BaseAIProvider)."""
+        response = await self.client.aio.models.generate_content(
+            model=self.settings.AI_MODEL,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                system_instruction=system_instruction,
+                max_output_tokens=max_tokens,
+                temperature=0.2,
+            ),
+        )
+        return response.text or ""
+
+    async def _send_message(self, chat, message) -> types.GenerateContentResponse:
+        """
+        Send a chat message, streaming text deltas if a token stream is open.
+
+        Returns a single aggregated response either way, so callers handle
+        function calls and finish reasons identically in both modes.
+        """
+        token_stream = get_token_stream()
+        if token_stream is None:
+            return await chat.send_message(message)
+
+        parts: list[types.Part] = []
+        finish_reason = None
+        async for chunk in await chat.send_message_stream(message):
+            if not chunk.candidates:
+                continue
+            candidate = chunk.candidates[0]
+            finish_reason = candidate.finish_reason or finish_reason
+            for part in (candidate.content.parts if candidate.content else None) or []:
+                if part.text and not part.thought:
+                    token_stream.publish(part.text)
+                parts.append(part)
+
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(role="model", parts=parts),
+                    finish_reason=finish_reason,
+                )
+            ]
+        )
+
     @staticmethod
     def _sanitize_text(text: str) -> str:
         """
@@ -185,14 +233,14 @@ class GeminiProvider(BaseAIProvider):
 
         for attempt in range(max_retries):
             try:
-                chat = self.client.chats.create(
+                chat = self.client.aio.chats.create(
                     model=self.settings.AI_MODEL,
                     config=types.GenerateContentConfig(**config_params),
                     history=chat_history,
                 )
 
                 # Send message
-                response = chat.send_message(message)
+                response = await self._send_message(chat, message)
                 reasoning.add_step(
                     "Response Received",
                     "Successfully received response from AI model",
@@ -241,12 +289,12 @@ class GeminiProvider(BaseAIProvider):
                         logger.info(
                             f"Retrying with truncated context ({len(chat_history)} messages)..."
                         )
-                        chat = self.client.chats.create(
+                        chat = self.client.aio.chats.create(
                             model=self.settings.AI_MODEL,
                             config=types.GenerateContentConfig(**config_params),
                             history=chat_history,
                         )
-                        response = chat.send_message(message)
+                        response = await self._send_message(chat, message)
                         logger.info("✅ Successfully processed with truncated context")
                         break  # Success, exit retry loop
                     except Exception as retry_error:
@@ -264,9 +312,7 @@ class GeminiProvider(BaseAIProvider):
                 if attempt < max_retries - 1:
                     delay = base_delay * (2**attempt)
                     logger.info(f"Retrying in {delay} seconds...")
-                    import time
-
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                 else:
                     error_msg = str(e)
                     if "connection" in error_msg.lower() or "network" in error_msg.lower():
@@ -391,7 +437,7 @@ class GeminiProvider(BaseAIProvider):
                     "processing",
                 )
 
-                response = chat.send_message(function_results_text)
+                response = await self._send_message(chat, function_results_text)
 
         # Get final response text
         final_response = response.text if response.text else ""
@@ -53,3 +53,11 @@ class MockProvider(BaseAIProvider):
             "response": text,
             "tools_used": [],
         }
+
+    async def complete_text(
+        self, prompt: str, system_instruction: str, max_tokens: int = 512
+    ) -> str:
+        # Deterministic stand-in: the last lines of the prompt, bounded in size
+        _ = (system_instruction, max_tokens)
+        lines = [line for line in prompt.strip().splitlines() if line.strip()]
+        return "(Mock summary) " + " ".join(lines[-4:])[:500]
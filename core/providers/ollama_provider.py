@@ -5,16 +5,20 @@ Handles local Ollama deployment for air quality agent with enhanced error handli
 Now includes ModelAdapter support for models with weak or no tool-calling capabilities.
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime
 from typing import Any
 
+import httpx
 import ollama
 
 from core.agent.model_adapter import ModelAdapter
+from shared.utils.http_client import LLM_POOL_LIMITS
 
 from .base_provider import BaseAIProvider
+from .token_stream import get_token_stream
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +26,9 @@ logger = logging.getLogger(__name__)
 class OllamaProvider(BaseAIProvider):
     """Ollama local AI provider implementation."""
 
+    # Connection pool of the async client, created in setup
+    transport: httpx.AsyncHTTPTransport | None = None
+
     def setup(self) -> None:
         """
         Set up Ollama client.
@@ -32,22 +39,80 @@ class OllamaProvider(BaseAIProvider):
         api_key = self.settings.OLLAMA_API_KEY
         base_url = self.settings.OLLAMA_BASE_URL
 
+        # Async client so chat calls never block the event loop; one pooled
+        # client per provider keeps many requests in flight on one worker.
+        # The provider owns the connection pool (httpx ignores `limits` when a
+        # transport is passed, so the limits are set on the transport)
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+        self.transport = httpx.AsyncHTTPTransport(limits=LLM_POOL_LIMITS)
+        self.client = ollama.AsyncClient(host=base_url, headers=headers, transport=self.transport)
+
         if api_key:
-            # Use client for cloud with authentication
-            self.client = ollama.Client(
-                host=base_url,
-                headers={'Authorization': f'Bearer {api_key}'}
-            )
             logger.info(
                 f"Initialized Ollama cloud provider. Host: {base_url}, Model: {self.settings.AI_MODEL}"
             )
         else:
-            # Local setup, use global client
-            self.client = None
             logger.info(
                 f"Initialized Ollama local provider. Host: {base_url}, Model: {self.settings.AI_MODEL}"
             )
 
+    async def cleanup(self) -> None:
+        """Close the pooled HTTP connections held by the async client."""
+        if self.transport is not None:
+            await self.transport.aclose()
+
+    async def complete_text(
+        self, prompt: str, system_instruction: str, max_tokens: int = 512
+    ) -> str:
+        """One-shot completion without tools or streaming (see BaseAIProvider)."""
+        response = await self.client.chat(
+            model=self.settings.AI_MODEL,
+            messages=[
+                {"role": "system", "content": self._sanitize_text(system_instruction)},
+                {"role": "user", "content": self._sanitize_text(prompt)},
+            ],
+            options={"temperature": 0.2, "num_predict": max_tokens},
+        )
+        return response.message.content or ""
+
+    async def _chat(self, **chat_params) -> ollama.ChatResponse | None:
+        """
+        Call Ollama chat, streaming text deltas if a token stream is open.
+
+        Returns a complete ChatResponse either way, so callers handle tool
+        calls and done reasons identically in both modes.
+        """
+        token_stream = get_token_stream()
+        if token_stream is None:
+            return await self.client.chat(**chat_params)
+
+        content_parts: list[str] = []
+        tool_calls = []
+        last_chunk = None
+        try:
+            async for chunk in await self.client.chat(stream=True, **chat_params):
+                last_chunk = chunk
+                if chunk.message.content:
+                    token_stream.publish(chunk.message.content)
+                    content_parts.append(chunk.message.content)
+                if chunk.message.tool_calls:
+                    tool_calls.extend(chunk.message.tool_calls)
+        except BaseException:
+            if content_parts:
+                # Callers retry failed calls; the retry's text replaces this partial one
+                token_stream.reset()
+            raise
+
+        if last_chunk is None:
+            return None
+        return last_chunk.model_copy(
+            update={
+                "message": ollama.Message(
+                    role="assistant", content="".join(content_parts), tool_calls=tool_calls or None
+                )
+            }
+        )
+
     @staticmethod
     def _sanitize_text(text: str) -> str:
         """
@@ -77,79 +142,6 @@ class OllamaProvider(BaseAIProvider):
             # Fallback: remove any characters that can't be encoded
             return text.encode("utf-8", errors="ignore").decode("utf-8")
 
-    def _truncate_context_intelligently(
-        self, messages: list[dict], system_instruction: str
-    ) -> list[dict]:
-        """
-        Intelligently truncate conversation context when token limit is exceeded.
-
-        Strategy:
-        1. Keep system instruction (required)
-        2. Keep most recent user message (required)
-        3. Keep most recent 2-3 exchanges
-        4. Summarize or remove older messages
-        5. Keep tool results from recent exchanges
-
-        Args:
-            messages: List of message dictionaries
-            system_instruction: System instruction text
-
-        Returns:
-            Truncated list of messages
-        """
-        try:
-            # Separate system, user, assistant, and tool messages
-            system_msgs = [m for m in messages if m.get("role") == "system"]
-            user_msgs = [m for m in messages if m.get("role") == "user"]
-            assistant_msgs = [m for m in messages if m.get("role") == "assistant"]
-            tool_msgs = [m for m in messages if m.get("role") == "tool"]
-
-            # Keep system instruction (always first)
-            truncated = (
-                system_msgs[:1]
-                if system_msgs
-                else [{"role": "system", "content": system_instruction}]
-            )
-
-            # Keep last 3 user-assistant exchanges (6 messages)
-            recent_exchanges = []
-            min_keep = min(3, len(user_msgs))
-
-            for i in range(min_keep):
-                # Add user message
-                if len(user_msgs) > i:
-                    recent_exchanges.append(user_msgs[-(i + 1)])
-
-                # Add corresponding assistant message if exists
-                if len(assistant_msgs) > i:
-                    recent_exchanges.append(assistant_msgs[-(i + 1)])
-
-            # Reverse to maintain chronological order
-            recent_exchanges.reverse()
-
-            # Add recent tool messages (last 3)
-            recent_tools = tool_msgs[-3:] if len(tool_msgs) > 0 else []
-
-            # Combine: system + recent exchanges + recent tools + current user message
-            truncated.extend(recent_exchanges)
-            truncated.extend(recent_tools)
-
-            # Ensure the very last user message is included (if not already)
-            if user_msgs and user_msgs[-1] not in truncated:
-                truncated.append(user_msgs[-1])
-
-            logger.info(f"Context truncated from {len(messages)} to {len(truncated)} messages")
-            return truncated
-
-        except Exception as e:
-            logger.error(f"Error truncating context: {e}")
-            # Fallback: keep system + last 2 messages
-            return [
-                {"role": "system", "content": system_instruction},
-                messages[-2] if len(messages) >= 2 else messages[0],
-                messages[-1],
-            ]
-
     def get_tool_definitions(self) -> list[dict[str, Any]]:
         """
         Get Ollama tool definitions.
@@ -251,20 +243,12 @@ class OllamaProvider(BaseAIProvider):
                 tools = self.get_tool_definitions()
                 logger.info(f"Ollama calling with {len(tools)} tools available")
 
-                if self.client:
-                    response = self.client.chat(
-                        model=self.settings.AI_MODEL,
-                        messages=messages,
-                        tools=tools,  # CRITICAL: Pass tools to Ollama
-                        options=options,
-                    )
-                else:
-                    response = ollama.chat(
-                        model=self.settings.AI_MODEL,
-                        messages=messages,
-                        tools=tools,  # CRITICAL: Pass tools to Ollama
-                        options=options,
-                    )
+                response = await self._chat(
+                    model=self.settings.AI_MODEL,
+                    messages=messages,
+                    tools=tools,  # CRITICAL: Pass tools to Ollama
+                    options=options,
+                )
 
                 # Only log response details in development, not the full response
                 if self.settings.ENVIRONMENT == "development":
@@ -298,7 +282,6 @@ class OllamaProvider(BaseAIProvider):
                 if attempt < max_retries - 1:
                     delay = base_delay * (2**attempt)  # Exponential backoff
                     logger.info(f"Retrying in {delay} seconds...")
-                    import asyncio
                     await asyncio.sleep(delay)
                 else:
                     return {
@@ -314,7 +297,6 @@ class OllamaProvider(BaseAIProvider):
                 if attempt < max_retries - 1:
                     delay = base_delay * (2**attempt)
                     logger.info(f"Retrying in {delay} seconds...")
-                    import asyncio
                     await asyncio.sleep(delay)
                 else:
                     return {
@@ -346,7 +328,7 @@ class OllamaProvider(BaseAIProvider):
                         logger.info(
                             f"Retrying with truncated context ({len(messages)} messages)..."
                         )
-                        response = ollama.chat(
+                        response = await self._chat(
                             model=self.settings.AI_MODEL,
                             messages=messages,
                             tools=tools,
@@ -413,7 +395,6 @@ class OllamaProvider(BaseAIProvider):
                 if attempt < max_retries - 1:
                     delay = base_delay * (2**attempt)
                     logger.info(f"Retrying in {delay} seconds...")
-                    import asyncio
                     await asyncio.sleep(delay)
                 else:
                     # Return user-friendly errors
@@ -503,7 +484,7 @@ class OllamaProvider(BaseAIProvider):
 
                 # Execute tool
                 try:
-                    tool_result = self.tool_executor.execute(function_name, function_args)
+                    tool_result = await self.tool_executor.execute_async(function_name, function_args)
 
                     # CRITICAL: Capture chart result if generate_chart was called
                     if function_name == "generate_chart" and isinstance(tool_result, dict):
@@ -543,7 +524,7 @@ class OllamaProvider(BaseAIProvider):
 
             # Get final response with tool results
             try:
-                final_response = ollama.chat(
+                final_response = await self._chat(
                     model=self.settings.AI_MODEL,
                     messages=messages,
                     options={
@@ -1132,6 +1113,11 @@ class OllamaProvider(BaseAIProvider):
             # No tool calls found, return original response
             return response_text, tools_used
 
+        token_stream = get_token_stream()
+        if token_stream is not None:
+            # The streamed text was a tool request; the final answer replaces it
+            token_stream.reset()
+
         logger.info(f"🔍 Extracted {len(extracted_calls)} tool calls from text response")
 
         # Execute extracted tool calls
@@ -1139,7 +1125,7 @@ class OllamaProvider(BaseAIProvider):
         for call in extracted_calls:
             try:
                 logger.info(f"🔧 Executing extracted tool: {call.name}")
-                result = self.tool_executor.execute(call.name, call.arguments)
+                result = await self.tool_executor.execute_async(call.name, call.arguments)
                 tool_results.append(result)
                 tools_used.append(call.name)
 
@@ -1167,7 +1153,7 @@ class OllamaProvider(BaseAIProvider):
         # Get final response with tool results
         try:
             logger.info("🔄 Generating final response with tool results...")
-            final_response = ollama.chat(
+            final_response = await self._chat(
                 model=self.settings.AI_MODEL,
                 messages=messages,
                 options={
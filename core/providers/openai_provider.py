@@ -11,11 +11,14 @@ from datetime import datetime
 from typing import Any
 
 import openai
+from openai.types.chat import ChatCompletion
 
 from core.tools.definitions import openai_tools
+from shared.utils.http_client import LLM_POOL_LIMITS
 from shared.utils.result_formatters import format_tool_result_as_json
 
 from .base_provider import BaseAIProvider
+from .token_stream import get_token_stream
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +26,9 @@ logger = logging.getLogger(__name__)
 class OpenAIProvider(BaseAIProvider):
     """OpenAI-compatible AI provider implementation."""
 
+    # Request usage chunks when streaming (set in setup for the official API)
+    stream_usage = False
+
     def setup(self) -> None:
         """
         Set up OpenAI client and tools.
@@ -38,7 +44,16 @@ class OpenAIProvider(BaseAIProvider):
             raise ValueError("AI_API_KEY is required for OpenAI provider")
 
         try:
-            self.client = openai.OpenAI(api_key=api_key, base_url=base_url)
+            # Async client so completions never block the event loop; one pooled
+            # client per provider keeps many requests in flight on one worker.
+            self.client = openai.AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=openai.DefaultAsyncHttpxClient(limits=LLM_POOL_LIMITS),
+            )
+            # Usage chunks in streams are an OpenAI extension that some
+            # compatible backends reject, so only ask the official API for them
+            self.stream_usage = not base_url or "api.openai.com" in base_url
             logger.info(
                 f"Initialized OpenAI provider with model: {self.settings.AI_MODEL}, base_url: {base_url}"
             )
@@ -46,6 +61,95 @@ class OpenAIProvider(BaseAIProvider):
             logger.error(f"Failed to setup OpenAI: {e}")
             raise ConnectionError(f"Failed to initialize OpenAI client: {e}") from e
 
+    async def cleanup(self) -> None:
+        """Close the pooled HTTP connections held by the async client."""
+        if self.client is not None:
+            await self.client.close()
+
+    async def complete_text(
+        self, prompt: str, system_instruction: str, max_tokens: int = 512
+    ) -> str:
+        """One-shot completion without tools or streaming (see BaseAIProvider)."""
+        response = await self.client.chat.completions.create(
+            model=self.settings.AI_MODEL,
+            messages=[
+                {"role": "system", "content": self._sanitize_text(system_instruction)},
+                {"role": "user", "content": self._sanitize_text(prompt)},
+            ],
+            max_tokens=max_tokens,
+            temperature=0.2,
+        )
+        return response.choices[0].message.content or ""
+
+    async def _create_completion(self, **api_params) -> ChatCompletion:
+        """
+        Create a chat completion, streaming text deltas if a token stream is open.
+
+        Returns the complete ChatCompletion either way, so callers handle tool
+        calls and finish reasons identically in both modes.
+        """
+        token_stream = get_token_stream()
+        if token_stream is None:
+            return await self.client.chat.completions.create(**api_params)
+
+        content_parts: list[str] = []
+        tool_calls: dict[int, dict[str, Any]] = {}
+        finish_reason = None
+        completion_id, created, model, usage = "", 0, api_params.get("model"), None
+
+        if self.stream_usage:
+            api_params["stream_options"] = {"include_usage": True}
+        try:
+            stream = await self.client.chat.completions.create(stream=True, **api_params)
+            async for chunk in stream:
+                completion_id, created, model = chunk.id, chunk.created, chunk.model
+                usage = chunk.usage or usage
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                if choice.delta.content:
+                    token_stream.publish(choice.delta.content)
+                    content_parts.append(choice.delta.content)
+                # Tool call ids/names arrive once; arguments arrive in fragments
+                for delta_call in choice.delta.tool_calls or []:
+                    call = tool_calls.setdefault(
+                        delta_call.index,
+                        {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+                    )
+                    if delta_call.id:
+                        call["id"] = delta_call.id
+                    if delta_call.function and delta_call.function.name:
+                        call["function"]["name"] = delta_call.function.name
+                    if delta_call.function and delta_call.function.arguments:
+                        call["function"]["arguments"] += delta_call.function.arguments
+        except BaseException:
+            if content_parts:
+                # Callers retry failed calls; the retry's text replaces this partial one
+                token_stream.reset()
+            raise
+
+        return ChatCompletion.model_validate(
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": finish_reason or "stop",
+                        "message": {
+                            "role": "assistant",
+                            "content": "".join(content_parts) or None,
+                            "tool_calls": [tool_calls[i] for i in sorted(tool_calls)] or None,
+                        },
+                    }
+                ],
+                "usage": usage.model_dump() if usage else None,
+            }
+        )
+
     @staticmethod
     def _sanitize_text(text: str) -> str:
         """
@@ -371,16 +475,14 @@ class OpenAIProvider(BaseAIProvider):
                 }
 
                 # Create completion
-                response = self.client.chat.completions.create(**api_params)
+                response = await self._create_completion(**api_params)
                 break  # Success, exit retry loop
             except openai.APIConnectionError as e:
                 logger.error(f"API connection error (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
                     delay = base_delay * (2**attempt)  # Exponential backoff
                     logger.info(f"Retrying in {delay} seconds...")
-                    import time
-
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                 else:
                     return {
                         "response": "I'm having trouble connecting to the AI service. Please check your internet connection and try again in a moment.",
@@ -391,9 +493,7 @@ class OpenAIProvider(BaseAIProvider):
                 if attempt < max_retries - 1:
                     delay = base_delay * (2**attempt)
                     logger.info(f"Retrying in {delay} seconds...")
-                    import time
-
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                 else:
                     return {
                         "response": "The AI service is taking too long to respond. Please try again with a simpler question or check back in a moment.",
@@ -467,7 +567,7 @@ class OpenAIProvider(BaseAIProvider):
                             f"Retrying with truncated context ({len(messages)} messages)..."
                         )
                         api_params["messages"] = messages
-                        response = self.client.chat.completions.create(**api_params)
+                        response = await self._create_completion(**api_params)
                         logger.info("✅ Successfully processed with truncated context")
                         break  # Success, exit retry loop
                     except Exception as retry_error:
@@ -488,9 +588,7 @@ class OpenAIProvider(BaseAIProvider):
                 if attempt < max_retries - 1:
                     delay = base_delay * (2**attempt)
                     logger.info(f"Retrying in {delay} seconds...")
-                    import time
-
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                 else:
                     # Log the full error for developers but provide user-friendly message
                     logger.error(f"Unexpected error (attempt {attempt + 1}/{max_retries}): {e}")
@@ -585,7 +683,7 @@ class OpenAIProvider(BaseAIProvider):
             # Get final response from model after tool execution
             for attempt in range(3):
                 try:
-                    final_response = self.client.chat.completions.create(
+                    final_response = await self._create_completion(
                         model=self.settings.AI_MODEL,
                         messages=messages,
                         max_tokens=effective_max_tokens,
@@ -616,9 +714,7 @@ class OpenAIProvider(BaseAIProvider):
                 except (openai.APIConnectionError, openai.APITimeoutError) as e:
                     logger.error(f"Final API call error (attempt {attempt + 1}/3): {e}")
                     if attempt < 2:
-                        import time
-
-                        time.sleep(1 * (2**attempt))  # Exponential backoff
+                        await asyncio.sleep(1 * (2**attempt))  # Exponential backoff
                     else:
                         return {
                             "response": "I successfully gathered the information but encountered a network error generating the response. Please try asking again.",
@@ -1248,7 +1344,7 @@ Please provide a helpful response that:
 
 Be professional, empathetic, and solution-oriented."""
 
-            response = self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=self.settings.AI_MODEL,
                 messages=[
                     {
@@ -0,0 +1,70 @@
+"""
+Token streaming for AI providers.
+
+The streaming chat endpoint opens a `TokenStream` for the duration of one agent
+call. Providers look it up with `get_token_stream()`: when one is open they
+issue their LLM calls in streaming mode and publish text deltas as they arrive,
+while still returning the same aggregated result as a non-streaming call.
+Outside a streaming request nothing changes.
+
+If an LLM call fails after some of its text was published, the provider
+resets the stream before retrying, so the consumer can drop the partial text
+instead of showing it twice.
+"""
+
+import asyncio
+import contextvars
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+
+_current_stream: contextvars.ContextVar["TokenStream | None"] = contextvars.ContextVar(
+    "token_stream", default=None
+)
+
+
+class TokenStream:
+    """Single-consumer queue of text deltas produced during one agent call."""
+
+    # Yielded by iteration when the text published so far must be discarded
+    RESET = object()
+
+    def __init__(self):
+        self._queue: asyncio.Queue[str | object | None] = asyncio.Queue()
+        self._closed = False
+
+    def publish(self, text: str | None) -> None:
+        """Publish a text delta (empty deltas are ignored)."""
+        if text and not self._closed:
+            self._queue.put_nowait(text)
+
+    def reset(self) -> None:
+        """Discard the text published so far (a failed call is being retried)."""
+        if not self._closed:
+            self._queue.put_nowait(self.RESET)
+
+    def close(self) -> None:
+        """Signal that no more deltas will be published."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put_nowait(None)
+
+    async def __aiter__(self) -> AsyncIterator[str | object]:
+        while True:
+            text = await self._queue.get()
+            if text is None:
+                return
+            yield text
+
+    @contextmanager
+    def bind(self) -> Iterator["TokenStream"]:
+        """Make this stream the current one for the enclosed code (and tasks it spawns)."""
+        token = _current_stream.set(self)
+        try:
+            yield self
+        finally:
+            _current_stream.reset(token)
+
+
+def get_token_stream() -> TokenStream | None:
+    """Return the token stream for the current request, if one is open."""
+    return _current_stream.get()
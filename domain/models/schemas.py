@@ -43,6 +43,9 @@ class ChatResponse(BaseModel):
     tools_used: list[str] | None = Field(None, description="Tools/APIs called during this response")
     tokens_used: int | None = Field(None, description="Approximate tokens used (for cost tracking)")
     cached: bool = Field(False, description="Whether response was served from cache")
+    tool_memo_hits: int | None = Field(
+        None, description="Duplicate tool calls in this turn served from the turn's tool memo"
+    )
     message_count: int | None = Field(None, description="Total messages in this session")
     document_processed: bool = Field(
         False, description="Whether a document was uploaded and processed"
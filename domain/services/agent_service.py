@@ -17,12 +17,19 @@ from typing import Any
 from core.agent.cost_tracker import CostTracker
 from core.agent.orchestrator import ResponseValidator, ToolOrchestrator
 from core.agent.query_analyzer import QueryAnalyzer
+from core.agent.semantic_cache import SemanticResponseCache
 
 # ThoughtStream removed - use logging and observability tools instead
 from core.agent.tool_executor import ToolExecutor
+from core.agent.tool_memo import ToolMemo
 from core.memory.context_manager import SessionContextManager
+from core.memory.conversation_summarizer import ConversationSummarizer
 from core.memory.langchain_memory import LangChainSessionMemory, create_session_memory
-from core.memory.prompts.system_instructions import get_response_parameters, get_system_instruction
+from core.memory.prompts.system_instructions import (
+    get_response_parameters,
+    get_static_instruction,
+    get_system_instruction,
+)
 from core.providers.base_provider import BaseAIProvider
 from core.providers.gemini_provider import GeminiProvider
 from core.providers.mock_provider import MockProvider
@@ -43,6 +50,7 @@ from infrastructure.api.weather import WeatherService
 from infrastructure.cache.cache_service import get_cache
 from interfaces.mcp.client import MCPClient
 from shared.config.settings import get_settings
+from shared.utils.prompt_budget import get_prompt_budget
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +71,8 @@ class AgentService:
         """Initialize agent with all required services and providers."""
         self.settings = get_settings()
         self.cache = get_cache()
+        # Paraphrase index over the "agent" response cache
+        self.semantic_cache = SemanticResponseCache(self.cache)
         self.mcp_clients: dict[str, MCPClient] = {}
 
         # Initialize SessionContextManager for better long-conversation handling
@@ -157,6 +167,9 @@ class AgentService:
             # swallow provider setup errors here; provider will raise on use
             logger.exception("Provider setup failed during AgentService init")
 
+        # Rolling summaries of long sessions, written after responses are saved
+        self.summarizer = ConversationSummarizer(self.provider)
+
         logger.info(f"AgentService initialized with provider: {self.settings.AI_PROVIDER}")
 
         # Memory management and loop prevention (per-session)
@@ -925,7 +938,23 @@ class AgentService:
             # Fallback: simple hash of message only
             return hashlib.md5(message.encode()).hexdigest()
 
-    def _get_fresh_cached_response(self, cache_key: str, message: str) -> dict[str, Any] | None:
+    def _semantic_cache_context(
+        self, style: str | None, temperature: float | None, top_p: float | None
+    ) -> str:
+        """Generation settings a semantically matched response must share."""
+        return "|".join(
+            [
+                self.settings.AI_PROVIDER,
+                self.settings.AI_MODEL,
+                style or "general",
+                str(temperature) if temperature is not None else "default",
+                str(top_p) if top_p is not None else "default",
+            ]
+        )
+
+    async def _get_fresh_cached_response(
+        self, cache_key: str, message: str
+    ) -> dict[str, Any] | None:
         """
         Get cached response only if it's still fresh and appropriate to return.
 
@@ -948,7 +977,7 @@ class AgentService:
         from datetime import datetime
 
         # Get cached data with metadata
-        cached_data = self.cache.get("agent", cache_key)
+        cached_data = await self.cache.get_async("agent", cache_key)
         if cached_data is None:
             return None
 
@@ -1059,29 +1088,12 @@ class AgentService:
 
         self._last_cache_cleanup = current_time
 
-        # For Redis cache, we rely on TTL expiration
-        # For memory cache, we need manual cleanup
-        if hasattr(self.cache, "_memory_cache"):
-            cleaned_count = 0
-            max_age_seconds = 14400  # 4 hours max age for any cache entry
-
-            keys_to_delete = []
-            for key, value in self.cache._memory_cache.items():
-                if isinstance(value, dict) and "_cache_timestamp" in value:
-                    cache_age = current_time - value["_cache_timestamp"]
-                    if cache_age > max_age_seconds:
-                        keys_to_delete.append(key)
-
-            for key in keys_to_delete:
-                del self.cache._memory_cache[key]
-                cleaned_count += 1
-
-            if cleaned_count > 0:
-                logger.info(f"Cleaned up {cleaned_count} stale cache entries")
-
-            return cleaned_count
-
-        return 0
+        # Redis and the in-process tier both honor per-entry TTLs; this just
+        # reclaims memory from expired entries nobody has read since
+        cleaned_count = self.cache.purge_expired()
+        if cleaned_count > 0:
+            logger.info(f"Cleaned up {cleaned_count} stale cache entries")
+        return cleaned_count
 
     async def process_message(
         self,
@@ -1094,6 +1106,7 @@ class AgentService:
         client_ip: str | None = None,
         location_data: dict[str, Any] | None = None,
         session_id: str | None = None,
+        conversation_summary: str | None = None,
     ) -> dict[str, Any]:
         """
         Process a user message and generate a response.
@@ -1118,6 +1131,7 @@ class AgentService:
                 {"source": "gps", "latitude": float, "longitude": float} or
                 {"source": "ip", "ip_address": str}
             session_id: Session identifier for document accumulation
+            conversation_summary: Stored summary of the session's messages before `history`
 
         Returns:
             Dict containing:
@@ -1125,7 +1139,42 @@ class AgentService:
                 - tokens_used: Token count (if available)
                 - cost_estimate: Estimated cost in USD
                 - cached: Whether response was from cache
+                - tool_memo_hits: Duplicate tool calls served from this turn's memo (if any)
         """
+        # One memo per turn, shared by proactive calls and the provider's tool loop
+        with ToolMemo().bind() as tool_memo:
+            response = await self._process_message(
+                message,
+                history,
+                document_data,
+                style,
+                temperature,
+                top_p,
+                client_ip,
+                location_data,
+                session_id,
+                conversation_summary,
+            )
+        if tool_memo.hits and isinstance(response, dict):
+            # New dict: the original may be held by the response cache
+            response = {**response, "tool_memo_hits": tool_memo.hits}
+            logger.info(f"♻️ Tool memo saved {tool_memo.hits} duplicate tool call(s) this turn")
+        return response
+
+    async def _process_message(
+        self,
+        message: str,
+        history: list[dict[str, Any]] | None = None,
+        document_data: list[dict[str, Any]] | None = None,
+        style: str | None = None,
+        temperature: float | None = None,
+        top_p: float | None = None,
+        client_ip: str | None = None,
+        location_data: dict[str, Any] | None = None,
+        session_id: str | None = None,
+        conversation_summary: str | None = None,
+    ) -> dict[str, Any]:
+        """Body of `process_message`, run with the turn's tool memo bound."""
         history = history or []
 
         # CRITICAL FIX: Merge LangChain memory history with incoming history
@@ -1134,7 +1183,7 @@ class AgentService:
             try:
                 lc_memory = self._get_or_create_langchain_memory(session_id)
                 if lc_memory:  # Check if LangChain memory is available
-                    langchain_history = lc_memory.get_history()
+                    langchain_history = await lc_memory.aget_history()
                     if langchain_history:
                         logger.info(f"📚 Loaded {len(langchain_history)} messages from LangChain memory for session {session_id}")
                         logger.debug(f"LangChain history content: {langchain_history}")
@@ -1315,7 +1364,31 @@ class AgentService:
         )
 
         # Check for cached response with freshness validation (skip for personal info)
-        cached_response = None if is_personal_info else self._get_fresh_cached_response(cache_key, message)
+        cached_response = (
+            None if is_personal_info else await self._get_fresh_cached_response(cache_key, message)
+        )
+
+        # Paraphrases of an answered question reuse its response, under the same freshness
+        # rules. Documents, precise GPS coordinates and the conversation so far shape the
+        # answer beyond the text, so only first turns without them take part. (The semantic
+        # cache only takes messages naming a city or coordinates, so an IP-derived location
+        # does not change the answer.)
+        use_semantic_cache = not (
+            is_personal_info
+            or document_data
+            or (location_data and location_data.get("source") == "gps")
+            or history
+            or conversation_summary
+        )
+        semantic_context = self._semantic_cache_context(style, temperature, top_p)
+        semantic_message = message
+        if cached_response is None and use_semantic_cache:
+            similar_key = await self.semantic_cache.find(message, semantic_context)
+            if similar_key is not None and similar_key != cache_key:
+                cached_response = await self._get_fresh_cached_response(similar_key, message)
+                if cached_response is not None:
+                    cached_response["semantic_cache_hit"] = True
+
         if cached_response is not None:
             logger.info(f"Cache hit for key: {cache_key[:16]}... (fresh data)")
             cached_response["cached"] = True
@@ -1411,7 +1484,9 @@ class AgentService:
         # Add session summary for better long-conversation context
         session_summary = ""
         if session_id:
-            session_summary = self.session_manager.get_context_summary(session_id)
+            session_summary = self.session_manager.get_context_summary(
+                session_id, conversation_summary
+            )
 
         # Fallback safety net: If multiple documents and issues occur, prioritize the newest document
         if len(accumulated_docs) > 1 and document_data:
@@ -1427,14 +1502,8 @@ class AgentService:
                 accumulated_docs = [newest_doc]
                 document_context = self._build_document_context(accumulated_docs, history)
 
-        # CRITICAL: Put document context at the BEGINNING (custom_prefix) so AI sees it FIRST
-        # This ensures document content has highest priority in the context window
-        system_instruction = get_system_instruction(
-            style=style or "general",
-            custom_prefix=document_context,  # Documents FIRST
-            custom_suffix=location_context + session_summary,  # Other context after
-        )
-        
+        session_context = location_context + session_summary
+
         # Add continuation instruction if this is a resume request
         if is_continuation:
             # Get the last assistant message to show where it ended
@@ -1629,8 +1698,7 @@ class AgentService:
                         try:
                             lc_memory = self._get_or_create_langchain_memory(session_id)
                             if lc_memory:
-                                lc_memory.add_user_message(message)
-                                lc_memory.add_ai_message(ai_response)
+                                await lc_memory.aadd_exchange(message, ai_response)
                                 token_count = lc_memory.get_token_count()
                                 logger.info(f"📚 Stored personal info in LangChain memory ({token_count} tokens)")
                         except Exception as e:
@@ -1660,20 +1728,41 @@ class AgentService:
                 f"✅ Proactively called {len(tools_called_proactively)} tool(s): {tools_called_proactively}"
             )
 
-            # Inject tool results into system instruction
             if context_injection:
-                system_instruction += context_injection
-                logger.info("📝 Injected tool results into context")
+                logger.info("📝 Injecting tool results into context")
         else:
             # For general knowledge queries, ALWAYS use web search for latest information
             logger.info(f"ℹ️ No air quality tools needed (query type: {query_type}) - will use web search for latest information")
+            context_injection = ""
+
+        # Fit documents, tool results and history into the model's context window
+        # (static prompt, session context and the message itself are always sent;
+        # the static prompt's tokens were counted when it was built)
+        prompt = get_prompt_budget(self.settings.AI_MODEL).assemble(
+            system=session_context,
+            message=message,
+            history=history,
+            documents=document_context,
+            tool_results=context_injection,
+            response_tokens=response_params.get("max_tokens"),
+            static_tokens=get_static_instruction(style or "general").tokens,
+        )
+        # Documents directly after the static prompt, then other context, then tool results
+        system_instruction = (
+            get_system_instruction(
+                style=style or "general",
+                custom_prefix=prompt.documents,
+                custom_suffix=session_context,
+            )
+            + prompt.tool_results
+        )
 
         # Process with provider
 
         try:
             response_data = await self.provider.process_message(
                 message=message,
-                history=history,
+                history=prompt.history,
                 system_instruction=system_instruction,
                 temperature=response_params.get("temperature"),
                 top_p=response_params.get("top_p"),
@@ -1784,8 +1873,12 @@ class AgentService:
             else:
                 cache_ttl = 7200  # 2 hours for general queries
 
-            # cache.set expects (namespace, key, value, ttl)
-            self.cache.set("agent", cache_key, response_data, ttl=cache_ttl)
+            # cache.set_async expects (namespace, key, value, ttl)
+            await self.cache.set_async("agent", cache_key, response_data, ttl=cache_ttl)
+            if use_semantic_cache and not is_continuation:
+                await self.semantic_cache.remember(
+                    semantic_message, semantic_context, cache_key, cache_ttl
+                )
 
             # SECURITY: Filter out any sensitive information from response
             response_data = self._filter_sensitive_info(response_data)
@@ -1943,8 +2036,7 @@ class AgentService:
                 try:
                     lc_memory = self._get_or_create_langchain_memory(session_id)
                     if lc_memory:  # Check if LangChain memory is available
-                        lc_memory.add_user_message(message)
-                        lc_memory.add_ai_message(ai_response)
+                        await lc_memory.aadd_exchange(message, ai_response)
 
                         # Add memory stats to response (optional)
                         token_count = lc_memory.get_token_count()
@@ -2363,6 +2455,8 @@ class AgentService:
 
     async def cleanup(self):
         """Clean up resources (MCP clients, provider connections)."""
+        await self.summarizer.stop()
+
         # Disconnect all MCP clients
         for server_name, client in self.mcp_clients.items():
             try:
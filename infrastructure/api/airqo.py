@@ -13,15 +13,21 @@ Notes:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any
 
+import httpx
 import requests
 
 from infrastructure.cache.cache_service import get_cache
+from infrastructure.cache.geocode_cache import get_reverse_geocode_cache
 from shared.utils.data_formatter import format_air_quality_data
+from shared.utils.http_client import get_shared_client
 from shared.utils.provider_errors import ProviderServiceError, provider_unavailable_message
+from shared.utils.rate_limiter import is_local_rejection, rate_limited_session
+from shared.utils.spatial_index import Station, get_station_index
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +36,8 @@ class AirQoService:
     """Service for interacting with the AirQo Analytics API"""
 
     BASE_URL = "https://api.airqo.net/api/v2"
+    # Nearest indexed sites tried one by one (sync) before falling back to site search
+    NEAREST_SITE_MAX_MISSES = 2
 
     def __init__(self, api_token: str | None = None):
         """
@@ -42,9 +50,11 @@ class AirQoService:
 
         settings = get_settings()
         self.api_token = api_token or settings.AIRQO_API_TOKEN
-        self.session = requests.Session()
+        self.session = rate_limited_session()
         self.cache_service = get_cache()
-        self.cache_ttl = settings.CACHE_TTL_SECONDS
+        # Past the soft TTL cached responses are served stale while they refresh
+        self.cache_ttl, self.cache_hard_ttl = settings.cache_ttls("airqo")
+        self.nearest_site_max_km = settings.STATION_INDEX_MAX_DISTANCE_KM
 
     def _get_headers(self) -> dict[str, str]:
         """Get request headers"""
@@ -71,6 +81,31 @@ class AirQoService:
             return data.replace(self.api_token, "[REDACTED]")
         return data
 
+    def _build_request(self, endpoint: str, params: dict | None) -> tuple[str, dict[str, Any]]:
+        """Build the request URL and authenticated query params for an endpoint."""
+        url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
+
+        # Add authentication token to params
+        request_params = params.copy() if params else {}
+        if self.api_token:
+            request_params["token"] = self.api_token
+        return url, request_params
+
+    def _request_error(self, endpoint: str, e: Exception) -> ProviderServiceError:
+        """Wrap a transport error in a non-leaky ProviderServiceError."""
+        status = getattr(getattr(e, "response", None), "status_code", None)
+        body = getattr(getattr(e, "response", None), "text", None)
+        logger.warning(
+            "AirQo request failed",
+            extra={"endpoint": endpoint, "status": status},
+        )
+        return ProviderServiceError(
+            provider="airqo",
+            public_message=provider_unavailable_message("AirQo"),
+            internal_message=f"{type(e).__name__}: {e}; status={status}; body={body}",
+            http_status=status,
+        )
+
     def _make_request(self, endpoint: str, params: dict | None = None) -> dict[str, Any]:
         """
         Make authenticated request to AirQo API
@@ -82,49 +117,60 @@ class AirQoService:
         Returns:
             JSON response data
         """
+        url, request_params = self._build_request(endpoint, params)
 
-        url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
+        def fetch() -> Any:
+            try:
+                response = self.session.get(
+                    url, headers=self._get_headers(), params=request_params, timeout=30
+                )
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                raise self._request_error(endpoint, e) from e
+            # Sanitize token from response before caching and returning
+            return self._sanitize_token(response.json())
 
-        # Add authentication token to params
-        request_params = params.copy() if params else {}
-        if self.api_token:
-            request_params["token"] = self.api_token
+        # Cached response, or one upstream fetch shared by concurrent callers
+        data = self.cache_service.get_or_fetch_api_response(
+            "airqo", endpoint, request_params, fetch, self.cache_ttl, self.cache_hard_ttl
+        )
+        # Ensure cached data is also sanitized (in case it was cached before sanitization was added)
+        return self._sanitize_token(data)
 
-        # Check Redis cache
-        cached_data = self.cache_service.get_api_response("airqo", endpoint, request_params)
-        if cached_data is not None:
-            # Ensure cached data is also sanitized (in case it was cached before sanitization was added)
-            return self._sanitize_token(cached_data)
+    async def _make_request_async(
+        self, endpoint: str, params: dict | None = None
+    ) -> dict[str, Any]:
+        """
+        Async variant of `_make_request` using the shared pooled httpx client.
 
-        try:
-            response = self.session.get(
-                url, headers=self._get_headers(), params=request_params, timeout=30
-            )
-            response.raise_for_status()
-            data = response.json()
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
 
-            # Sanitize token from response before caching and returning
-            sanitized_data = self._sanitize_token(data)
+        Returns:
+            JSON response data
+        """
+        url, request_params = self._build_request(endpoint, params)
 
-            # Cache the sanitized result in Redis
-            self.cache_service.set_api_response(
-                "airqo", endpoint, request_params, sanitized_data, self.cache_ttl
-            )
-            return sanitized_data
-
-        except requests.exceptions.RequestException as e:
-            status = getattr(getattr(e, "response", None), "status_code", None)
-            body = getattr(getattr(e, "response", None), "text", None)
-            logger.warning(
-                "AirQo request failed",
-                extra={"endpoint": endpoint, "status": status},
-            )
-            raise ProviderServiceError(
-                provider="airqo",
-                public_message=provider_unavailable_message("AirQo"),
-                internal_message=f"RequestException: {e}; status={status}; body={body}",
-                http_status=status,
-            ) from e
+        async def fetch() -> Any:
+            try:
+                response = await get_shared_client().get(
+                    url, headers=self._get_headers(), params=request_params, timeout=30
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                raise self._request_error(endpoint, e) from e
+            return self._sanitize_token(response.json())
+
+        data = await self.cache_service.get_or_fetch_api_response_async(
+            "airqo", endpoint, request_params, fetch, self.cache_ttl, self.cache_hard_ttl
+        )
+        return self._sanitize_token(data)
+
+    @staticmethod
+    def _page_total(meta: dict[str, Any], default: Any) -> Any:
+        """Extract the total result count from AirQo pagination meta."""
+        return meta.get("total") or meta.get("totalResults") or meta.get("total_results") or default
 
     def _paginate_skip_limit(
         self,
@@ -150,12 +196,7 @@ class AirQoService:
         items = list(first.get(items_key, []) or [])
         meta = first.get("meta", {}) or {}
 
-        total = (
-            meta.get("total")
-            or meta.get("totalResults")
-            or meta.get("total_results")
-            or len(items)
-        )
+        total = self._page_total(meta, len(items))
 
         pages_fetched = 1
         while pages_fetched < max_pages:
@@ -178,12 +219,60 @@ class AirQoService:
 
             items.extend(next_items)
             meta = next_page.get("meta", meta) or meta
-            total = (
-                meta.get("total")
-                or meta.get("totalResults")
-                or meta.get("total_results")
-                or total
-            )
+            total = self._page_total(meta, total)
+            pages_fetched += 1
+
+        first[items_key] = items if max_items is None else items[:max_items]
+        first.setdefault("meta", {})
+        first["meta"]["totalResults"] = len(first[items_key])
+        first["meta"]["pagesFetched"] = pages_fetched
+        return first
+
+    async def _paginate_skip_limit_async(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        items_key: str,
+        max_pages: int = 50,
+        max_items: int | None = None,
+    ) -> dict[str, Any]:
+        """Async variant of `_paginate_skip_limit`."""
+
+        page_params = params.copy()
+        page_params.setdefault("skip", 0)
+        page_params.setdefault("limit", 100)
+
+        first = await self._make_request_async(endpoint, page_params)
+        if not first.get("success"):
+            return first
+
+        items = list(first.get(items_key, []) or [])
+        meta = first.get("meta", {}) or {}
+
+        total = self._page_total(meta, len(items))
+
+        pages_fetched = 1
+        while pages_fetched < max_pages:
+            if max_items is not None and len(items) >= max_items:
+                break
+
+            skip = int(page_params.get("skip", 0))
+            limit = int(page_params.get("limit", 0))
+            if skip + limit >= int(total):
+                break
+
+            page_params["skip"] = skip + limit
+            next_page = await self._make_request_async(endpoint, page_params)
+            if not next_page.get("success"):
+                break
+
+            next_items = next_page.get(items_key, []) or []
+            if not next_items:
+                break
+
+            items.extend(next_items)
+            meta = next_page.get("meta", meta) or meta
+            total = self._page_total(meta, total)
             pages_fetched += 1
 
         first[items_key] = items if max_items is None else items[:max_items]
@@ -364,10 +453,7 @@ class AirQoService:
                     else:
                         params["site_id"] = found_site_id
                 else:
-                    return {
-                        "success": False,
-                        "message": f"No monitoring sites found for '{search_query}' to generate forecast.",
-                    }
+                    return self._no_forecast_sites(search_query)
             else:
                 raise ValueError(
                     "Either site_id, device_id, city, or search must be provided for forecast."
@@ -376,6 +462,52 @@ class AirQoService:
         data = self._make_request(f"predict/{endpoint_type}", params)
         return format_air_quality_data(data, source="airqo")
 
+    async def get_forecast_async(
+        self,
+        site_id: str | None = None,
+        device_id: str | None = None,
+        city: str | None = None,
+        search: str | None = None,
+        frequency: str = "daily",
+    ) -> dict[str, Any]:
+        """Async variant of `get_forecast`."""
+        if frequency not in ["daily", "hourly"]:
+            raise ValueError("Frequency must be 'daily' or 'hourly'")
+
+        endpoint_type = "daily-forecast" if frequency == "daily" else "hourly-forecast"
+        params = {}
+
+        if site_id:
+            params["site_id"] = site_id
+        elif device_id:
+            params["device_id"] = device_id
+        else:
+            search_query = search or city
+            if search_query:
+                found_site_id = await self.get_site_id_by_name_async(search_query)
+                if found_site_id:
+                    if isinstance(found_site_id, list):
+                        params["site_id"] = found_site_id[0]
+                    else:
+                        params["site_id"] = found_site_id
+                else:
+                    return self._no_forecast_sites(search_query)
+            else:
+                raise ValueError(
+                    "Either site_id, device_id, city, or search must be provided for forecast."
+                )
+
+        data = await self._make_request_async(f"predict/{endpoint_type}", params)
+        return format_air_quality_data(data, source="airqo")
+
+    @staticmethod
+    def _no_forecast_sites(search_query: str) -> dict[str, Any]:
+        """Result returned when no site matches a forecast search."""
+        return {
+            "success": False,
+            "message": f"No monitoring sites found for '{search_query}' to generate forecast.",
+        }
+
     def get_metadata(self, entity_type: str = "grids", search: str | None = None) -> dict[str, Any]:
         """
         Get metadata for grids, cohorts, devices, or sites.
@@ -473,6 +605,42 @@ class AirQoService:
             max_pages=50,
         )
 
+    async def get_sites_summary_async(
+        self, search: str | None = None, limit: int = 80, fetch_all: bool = True
+    ) -> dict[str, Any]:
+        """Async variant of `get_sites_summary`."""
+        params: dict[str, Any] = {"limit": limit, "skip": 0, "tenant": "airqo", "detailLevel": "summary"}
+        if search:
+            params["search"] = search
+
+        if not fetch_all:
+            return await self._make_request_async("devices/sites/summary", params)
+
+        return await self._paginate_skip_limit_async(
+            "devices/sites/summary",
+            params,
+            items_key="sites",
+            max_pages=50,
+        )
+
+    async def get_grids_summary_async(
+        self, search: str | None = None, limit: int = 80, fetch_all: bool = True
+    ) -> dict[str, Any]:
+        """Async variant of `get_grids_summary`."""
+        params: dict[str, Any] = {"limit": limit, "skip": 0, "tenant": "airqo", "detailLevel": "summary"}
+        if search:
+            params["search"] = search
+
+        if not fetch_all:
+            return await self._make_request_async("devices/grids/summary", params)
+
+        return await self._paginate_skip_limit_async(
+            "devices/grids/summary",
+            params,
+            items_key="grids",
+            max_pages=50,
+        )
+
     def get_site_id_by_name(self, name: str, limit: int = 80) -> str | list[str] | None:
         """
         Helper to find Site ID(s) by searching for a name using sites/summary endpoint.
@@ -510,6 +678,31 @@ class AirQoService:
             logger.exception("Error finding site ID", extra={"name": name})
             return None
 
+    async def get_site_id_by_name_async(
+        self, name: str, limit: int = 80
+    ) -> str | list[str] | None:
+        """Async variant of `get_site_id_by_name`."""
+        try:
+            cache_key = f"site_id_map:{name.lower()}"
+            cached_id = await self.cache_service.get_async("airqo", cache_key)
+            if cached_id:
+                return cached_id
+
+            response = await self.get_sites_summary_async(search=name, limit=limit)
+
+            if response.get("success") and response.get("sites"):
+                sites = response["sites"]
+                site_ids = [site.get("_id") for site in sites if site.get("_id")]
+
+                if site_ids:
+                    await self.cache_service.set_async("airqo", cache_key, site_ids[0], 3600)
+                    return site_ids[0] if len(site_ids) == 1 else site_ids
+
+            return None
+        except Exception:
+            logger.exception("Error finding site ID", extra={"name": name})
+            return None
+
     def get_grid_id_by_name(self, name: str, limit: int = 80) -> str | list[str] | None:
         """Helper to find Grid ID(s) by searching grids summary (grids[*]._id)."""
 
@@ -558,11 +751,12 @@ class AirQoService:
         """
         Enhanced method to get air quality data for coordinates using AirQo's site-based approach.
         This method prioritizes AirQo data for African locations by:
-        1. First reverse geocode to get city name, then search for sites
-        2. If sites found, get measurements using site IDs
-        3. If no sites, try coordinate-based search
-        4. If still no sites, try grid-based data for the region
-        5. Return formatted data with location context
+        1. Look up the nearest sites in the local station index (no network call)
+        2. Otherwise reverse geocode to get city name, then search for sites
+        3. If sites found, get measurements using site IDs
+        4. If no sites, try coordinate-based search
+        5. If still no sites, try grid-based data for the region
+        6. Return formatted data with location context
 
         Args:
             latitude: Latitude coordinate
@@ -581,7 +775,24 @@ class AirQoService:
             }
 
         try:
-            # Step 1: Reverse geocode to get city name first
+            # Step 1: Nearest indexed sites, straight to their measurements. Sites
+            # without recent data are usually offline, so stop after a few misses
+            nearest = self._nearest_sites(latitude, longitude, limit_sites)
+            for station, distance_km in nearest[: self.NEAREST_SITE_MAX_MISSES]:
+                try:
+                    measurements_data = self.get_recent_measurements(site_id=station.station_id)
+                except ProviderServiceError as e:
+                    if is_local_rejection(e):
+                        raise
+                    # One failing site is a miss; the searches below may still answer
+                    logger.warning(f"AirQo site {station.station_id} failed: {e}")
+                    continue
+                if measurements_data.get("success"):
+                    return self._with_nearest_site(
+                        measurements_data, latitude, longitude, station, distance_km
+                    )
+
+            # Step 2: Reverse geocode to get city name
             city_name = self._reverse_geocode(latitude, longitude)
 
             if city_name:
@@ -640,17 +851,116 @@ class AirQoService:
                     return format_air_quality_data(grid_data, source="airqo")
 
             # Step 4: No sites or grids found
+            return self._no_coverage_result(latitude, longitude, city_name)
+
+        except ProviderServiceError as e:
             return {
                 "success": False,
-                "message": (
-                    f"No AirQo monitoring sites or grids found near coordinates ({latitude:.4f}, {longitude:.4f}). "
-                    "AirQo primarily covers East African countries; the coordinates may be outside coverage."
-                ),
-                "coordinates": {"lat": latitude, "lon": longitude},
-                "city_attempted": city_name,
-                "search_method": "none_found",
+                "message": e.public_message,
+            }
+        except Exception:
+            return {
+                "success": False,
+                "message": provider_unavailable_message("AirQo"),
             }
 
+    async def get_air_quality_by_location_async(
+        self, latitude: float, longitude: float, limit_sites: int = 3
+    ) -> dict[str, Any]:
+        """Async variant of `get_air_quality_by_location`."""
+        if latitude is None or longitude is None:
+            return {
+                "success": False,
+                "message": "Invalid coordinates: latitude and longitude are required",
+                "error": "missing_coordinates",
+            }
+
+        try:
+            # The nearest sites are fetched concurrently; the nearest one with data wins
+            nearest = self._nearest_sites(latitude, longitude, limit_sites)
+            site_results = await asyncio.gather(
+                *(
+                    self.get_recent_measurements_async(site_id=station.station_id)
+                    for station, _ in nearest
+                ),
+                return_exceptions=True,
+            )
+            for (station, distance_km), measurements_data in zip(nearest, site_results):
+                if isinstance(measurements_data, dict) and measurements_data.get("success"):
+                    return self._with_nearest_site(
+                        measurements_data, latitude, longitude, station, distance_km
+                    )
+            for (station, _), error in zip(nearest, site_results):
+                if isinstance(error, BaseException):
+                    if not isinstance(error, ProviderServiceError) or is_local_rejection(error):
+                        raise error
+                    logger.warning(f"AirQo site {station.station_id} failed: {error}")
+
+            city_name = await self._reverse_geocode_async(latitude, longitude)
+
+            if city_name:
+                sites_response = await self.get_sites_summary_async(
+                    search=city_name, limit=limit_sites
+                )
+
+                if sites_response.get("success") and sites_response.get("sites"):
+                    sites = sites_response["sites"]
+                    site_ids = [site.get("_id") for site in sites if site.get("_id")]
+
+                    if site_ids:
+                        best_site_id = site_ids[0]
+                        measurements_data = await self.get_recent_measurements_async(
+                            site_id=best_site_id
+                        )
+                        if measurements_data.get("success"):
+                            measurements_data["coordinates"] = {"lat": latitude, "lon": longitude}
+                            measurements_data["city_found"] = city_name
+                            measurements_data["site_id_used"] = best_site_id
+                        return measurements_data
+
+            location_query = f"{latitude:.4f},{longitude:.4f}"
+            sites_response = await self.get_sites_summary_async(
+                search=location_query, limit=limit_sites
+            )
+
+            if sites_response.get("success") and sites_response.get("sites"):
+                sites = sites_response["sites"]
+                site_ids = [site.get("_id") for site in sites if site.get("_id")]
+
+                if site_ids:
+                    best_site_id = site_ids[0]
+                    measurements_data = await self.get_recent_measurements_async(
+                        site_id=best_site_id
+                    )
+                    if measurements_data.get("success"):
+                        measurements_data["coordinates"] = {"lat": latitude, "lon": longitude}
+                        measurements_data["site_id_used"] = best_site_id
+                        measurements_data["search_method"] = "coordinates"
+                    return measurements_data
+
+            grids_response = await self.get_grids_summary_async(
+                search=city_name or location_query, limit=80
+            )
+
+            if grids_response.get("success") and grids_response.get("grids"):
+                grids = grids_response["grids"]
+                grid_ids = [grid.get("_id") for grid in grids if grid.get("_id")]
+
+                if grid_ids:
+                    grid_data = await self._make_request_async(
+                        f"devices/measurements/grids/{grid_ids[0]}/recent"
+                    )
+
+                    if grid_data.get("success"):
+                        grid_data["coordinates"] = {"lat": latitude, "lon": longitude}
+                        grid_data["city_searched"] = city_name
+                        grid_data["grid_used"] = grid_ids[0]
+                        grid_data["search_method"] = "grid_fallback"
+
+                    return format_air_quality_data(grid_data, source="airqo")
+
+            return self._no_coverage_result(latitude, longitude, city_name)
+
         except ProviderServiceError as e:
             return {
                 "success": False,
@@ -662,6 +972,50 @@ class AirQoService:
                 "message": provider_unavailable_message("AirQo"),
             }
 
+    def _nearest_sites(
+        self, latitude: float, longitude: float, limit_sites: int
+    ) -> list[tuple[Station, float]]:
+        """Indexed AirQo sites within STATION_INDEX_MAX_DISTANCE_KM, nearest first."""
+        return get_station_index().nearest(
+            latitude,
+            longitude,
+            k=limit_sites,
+            sources=("airqo",),
+            max_distance_km=self.nearest_site_max_km,
+        )
+
+    @staticmethod
+    def _with_nearest_site(
+        measurements_data: dict[str, Any],
+        latitude: float,
+        longitude: float,
+        station: Station,
+        distance_km: float,
+    ) -> dict[str, Any]:
+        """Add location context to measurements of a site found through the station index."""
+        measurements_data["coordinates"] = {"lat": latitude, "lon": longitude}
+        measurements_data["site_id_used"] = station.station_id
+        measurements_data["site_name"] = station.name
+        measurements_data["distance_from_query_km"] = round(distance_km, 1)
+        measurements_data["search_method"] = "nearest_site"
+        return measurements_data
+
+    @staticmethod
+    def _no_coverage_result(
+        latitude: float, longitude: float, city_name: str | None
+    ) -> dict[str, Any]:
+        """Result returned when no AirQo sites or grids cover the coordinates."""
+        return {
+            "success": False,
+            "message": (
+                f"No AirQo monitoring sites or grids found near coordinates ({latitude:.4f}, {longitude:.4f}). "
+                "AirQo primarily covers East African countries; the coordinates may be outside coverage."
+            ),
+            "coordinates": {"lat": latitude, "lon": longitude},
+            "city_attempted": city_name,
+            "search_method": "none_found",
+        }
+
     def get_recent_measurements(
         self,
         site_id: str | None = None,
@@ -696,35 +1050,8 @@ class AirQoService:
         params: dict[str, Any] = {"limit": limit, "skip": 0}
 
         # 1) Direct entity IDs (documented endpoints)
-        if site_id:
-            endpoint = f"devices/measurements/sites/{site_id}/recent"
-            data = (
-                self._paginate_skip_limit(endpoint, params, "measurements")
-                if fetch_all
-                else self._make_request(endpoint, params)
-            )
-            return format_air_quality_data(data, source="airqo")
-
-        if device_id:
-            endpoint = f"devices/measurements/devices/{device_id}/recent"
-            data = (
-                self._paginate_skip_limit(endpoint, params, "measurements")
-                if fetch_all
-                else self._make_request(endpoint, params)
-            )
-            return format_air_quality_data(data, source="airqo")
-
-        if grid_id:
-            endpoint = f"devices/measurements/grids/{grid_id}/recent"
-            data = (
-                self._paginate_skip_limit(endpoint, params, "measurements")
-                if fetch_all
-                else self._make_request(endpoint, params)
-            )
-            return format_air_quality_data(data, source="airqo")
-
-        if cohort_id:
-            endpoint = f"devices/measurements/cohorts/{cohort_id}/recent"
+        endpoint = self._recent_measurements_endpoint(site_id, device_id, grid_id, cohort_id)
+        if endpoint:
             data = (
                 self._paginate_skip_limit(endpoint, params, "measurements")
                 if fetch_all
@@ -763,26 +1090,132 @@ class AirQoService:
                             if site_data.get("success") and site_data.get("measurements"):
                                 aggregated.extend(site_data.get("measurements", []))
 
-                        result = {
-                            "success": bool(aggregated),
-                            "message": "successfully returned the measurements" if aggregated else "No measurements found",
-                            "meta": {"sitesQueried": len(selected_sites), "totalResults": len(aggregated)},
-                            "measurements": aggregated,
-                            "search_location": search_query,
-                        }
-                        return format_air_quality_data(result, source="airqo")
+                        return self._format_site_search_result(
+                            aggregated, len(selected_sites), search_query
+                        )
 
                 # If no sites found, return helpful error with coverage info
+                return self._no_sites_found(search_query)
+            except Exception as e:
+                if is_local_rejection(e):
+                    raise  # Our own budget, not an AirQo failure
+                logger.error(f"Error searching AirQo sites for {search_query}: {e}")
                 return {
                     "success": False,
-                    "message": (
-                        f"No AirQo monitoring sites found for '{search_query}'. "
-                        "Try WAQI or OpenMeteo for wider geographic coverage."
-                    ),
+                    "message": provider_unavailable_message("AirQo"),
                     "location_searched": search_query,
-                    "sites": [],
                 }
+
+        raise ValueError(
+            "Must provide site_id, device_id, grid_id, cohort_id, city, or search parameter."
+        )
+
+    @staticmethod
+    def _recent_measurements_endpoint(
+        site_id: str | None,
+        device_id: str | None,
+        grid_id: str | None,
+        cohort_id: str | None,
+    ) -> str | None:
+        """Resolve the recent-measurements endpoint for a directly known entity ID."""
+        if site_id:
+            return f"devices/measurements/sites/{site_id}/recent"
+        if device_id:
+            return f"devices/measurements/devices/{device_id}/recent"
+        if grid_id:
+            return f"devices/measurements/grids/{grid_id}/recent"
+        if cohort_id:
+            return f"devices/measurements/cohorts/{cohort_id}/recent"
+        return None
+
+    @staticmethod
+    def _format_site_search_result(
+        aggregated: list[dict[str, Any]], sites_queried: int, search_query: str
+    ) -> dict[str, Any]:
+        """Format measurements aggregated across the sites matching a search."""
+        result = {
+            "success": bool(aggregated),
+            "message": "successfully returned the measurements" if aggregated else "No measurements found",
+            "meta": {"sitesQueried": sites_queried, "totalResults": len(aggregated)},
+            "measurements": aggregated,
+            "search_location": search_query,
+        }
+        return format_air_quality_data(result, source="airqo")
+
+    @staticmethod
+    def _no_sites_found(search_query: str) -> dict[str, Any]:
+        """Helpful error with coverage info when a site search has no matches."""
+        return {
+            "success": False,
+            "message": (
+                f"No AirQo monitoring sites found for '{search_query}'. "
+                "Try WAQI or OpenMeteo for wider geographic coverage."
+            ),
+            "location_searched": search_query,
+            "sites": [],
+        }
+
+    async def get_recent_measurements_async(
+        self,
+        site_id: str | None = None,
+        device_id: str | None = None,
+        grid_id: str | None = None,
+        cohort_id: str | None = None,
+        country: str = "UG",
+        city: str | None = None,
+        search: str | None = None,
+        limit: int = 1000,
+        fetch_all: bool = True,
+        max_sites: int = 3,
+    ) -> dict[str, Any]:
+        """
+        Async variant of `get_recent_measurements`.
+
+        Matching sites are fetched concurrently on the shared HTTP pool rather
+        than one after another.
+        """
+        params: dict[str, Any] = {"limit": limit, "skip": 0}
+
+        async def fetch(endpoint: str) -> dict[str, Any]:
+            if fetch_all:
+                return await self._paginate_skip_limit_async(endpoint, params, "measurements")
+            return await self._make_request_async(endpoint, params)
+
+        endpoint = self._recent_measurements_endpoint(site_id, device_id, grid_id, cohort_id)
+        if endpoint:
+            return format_air_quality_data(await fetch(endpoint), source="airqo")
+
+        search_query = search or city
+        if search_query:
+            try:
+                sites_response = await self.get_sites_summary_async(search=search_query, limit=80)
+
+                if sites_response.get("success") and sites_response.get("sites"):
+                    sites = sites_response["sites"]
+                    site_ids = [site.get("_id") for site in sites if site.get("_id")]
+
+                    if site_ids:
+                        selected_sites = sites[: max(1, min(max_sites, 10))]
+                        site_results = await asyncio.gather(
+                            *(
+                                fetch(f"devices/measurements/sites/{site['_id']}/recent")
+                                for site in selected_sites
+                                if site.get("_id")
+                            )
+                        )
+                        aggregated: list[dict[str, Any]] = []
+                        for site_data in site_results:
+                            if site_data.get("success") and site_data.get("measurements"):
+                                aggregated.extend(site_data.get("measurements", []))
+
+                        return self._format_site_search_result(
+                            aggregated, len(selected_sites), search_query
+                        )
+
+                return self._no_sites_found(search_query)
             except Exception as e:
+                if is_local_rejection(e):
+                    raise  # Our own budget, not an AirQo failure
                 logger.error(f"Error searching AirQo sites for {search_query}: {e}")
                 return {
                     "success": False,
@@ -828,6 +1261,28 @@ class AirQoService:
 
         return {"success": True, "cities": results, "count": len(results), "source": "airqo"}
 
+    async def get_multiple_cities_air_quality_async(self, cities: list[str]) -> dict[str, Any]:
+        """
+        Async variant of `get_multiple_cities_air_quality`.
+
+        Runs on the event loop with at most 5 cities in flight at once.
+        """
+        cities_limited = cities[:50]  # safety cap
+        semaphore = asyncio.Semaphore(5)
+
+        async def fetch_city(city_name: str) -> dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.get_recent_measurements_async(city=city_name)
+                except ProviderServiceError as e:
+                    return {"success": False, "message": e.public_message}
+                except Exception:
+                    return {"success": False, "message": provider_unavailable_message("AirQo")}
+
+        fetched = await asyncio.gather(*(fetch_city(c) for c in cities_limited))
+        results = dict(zip(cities_limited, fetched))
+        return {"success": True, "cities": results, "count": len(results), "source": "airqo"}
+
     def search_sites_by_location(self, location: str, limit: int = 80) -> dict[str, Any]:
         """
         Search for monitoring sites by location name.
@@ -858,6 +1313,28 @@ class AirQoService:
                 "sites": [],
             }
 
+    async def search_sites_by_location_async(
+        self, location: str, limit: int = 80
+    ) -> dict[str, Any]:
+        """Async variant of `search_sites_by_location`."""
+        try:
+            response = await self.get_sites_summary_async(search=location, limit=limit)
+
+            if response.get("success") and response.get("sites"):
+                return response
+
+            return {
+                "success": False,
+                "message": f"No monitoring sites found for '{location}'",
+                "sites": [],
+            }
+        except Exception:
+            return {
+                "success": False,
+                "message": provider_unavailable_message("AirQo"),
+                "sites": [],
+            }
+
     def get_sites(self, country: str | None = None, city: str | None = None) -> dict[str, Any]:
         """
         Get list of monitoring sites
@@ -893,36 +1370,81 @@ class AirQoService:
 
         return self._make_request("devices", params)
 
+    # Nominatim reverse geocoding at city level (zoom 10)
+    NOMINATIM_REVERSE_URL = "https://nominatim.openstreetmap.org/reverse"
+    NOMINATIM_HEADERS = {"User-Agent": "AirQoAgent/1.0"}
+
+    @staticmethod
+    def _city_from_nominatim(data: Any) -> str | None:
+        """Extract a clean city name from a Nominatim reverse geocoding payload."""
+        if data and "address" in data:
+            address = data["address"]
+            # Try to get city name from various possible fields, preferring cleaner names
+            city = (
+                address.get("city")
+                or address.get("town")
+                or address.get("village")
+                or address.get("municipality")
+                or address.get("county")
+            )
+            # Clean up the city name by removing qualifiers like "Capital City"
+            if city:
+                city = city.replace(" Capital City", "").replace(" City", "").strip()
+            return city
+        return None
+
     def _reverse_geocode(self, latitude: float, longitude: float) -> str | None:
         """
         Reverse geocode coordinates to get city name using OpenStreetMap Nominatim API
+
+        City names are cached per ~5 km geohash cell, so nearby GPS fixes share one lookup.
         """
+        params: dict[str, Any] = {
+            "lat": latitude,
+            "lon": longitude,
+            "format": "json",
+            "zoom": 10,
+        }  # City level
+
+        def fetch() -> str | None:
+            response = self.session.get(
+                self.NOMINATIM_REVERSE_URL,
+                params=params,
+                headers=self.NOMINATIM_HEADERS,
+                timeout=10,
+            )
+            response.raise_for_status()
+            return self._city_from_nominatim(response.json())
+
         try:
-            url = "https://nominatim.openstreetmap.org/reverse"
-            params: dict[str, Any] = {
-                "lat": latitude,
-                "lon": longitude,
-                "format": "json",
-                "zoom": 10,
-            }  # City level
-            headers = {"User-Agent": "AirQoAgent/1.0"}
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data and "address" in data:
-                    address = data["address"]
-                    # Try to get city name from various possible fields, preferring cleaner names
-                    city = (
-                        address.get("city")
-                        or address.get("town")
-                        or address.get("village")
-                        or address.get("municipality")
-                        or address.get("county")
-                    )
-                    # Clean up the city name by removing qualifiers like "Capital City"
-                    if city:
-                        city = city.replace(" Capital City", "").replace(" City", "").strip()
-                    return city
+            return get_reverse_geocode_cache().get_or_fetch("city", latitude, longitude, fetch)
+        except Exception as e:
+            print(f"Error reverse geocoding coordinates ({latitude}, {longitude}): {e}")
+        return None
+
+    async def _reverse_geocode_async(self, latitude: float, longitude: float) -> str | None:
+        """Async variant of `_reverse_geocode`."""
+        params: dict[str, Any] = {
+            "lat": latitude,
+            "lon": longitude,
+            "format": "json",
+            "zoom": 10,
+        }
+
+        async def fetch() -> str | None:
+            response = await get_shared_client().get(
+                self.NOMINATIM_REVERSE_URL,
+                params=params,
+                headers=self.NOMINATIM_HEADERS,
+                timeout=10,
+            )
+            response.raise_for_status()
+            return self._city_from_nominatim(response.json())
+
+        try:
+            return await get_reverse_geocode_cache().get_or_fetch_async(
+                "city", latitude, longitude, fetch
+            )
         except Exception as e:
             print(f"Error reverse geocoding coordinates ({latitude}, {longitude}): {e}")
         return None
@@ -22,6 +22,7 @@ from typing import Any
 import requests
 
 from infrastructure.cache.cache_service import get_cache
+from shared.utils.rate_limiter import rate_limited_session
 
 
 class CarbonIntensityService:
@@ -35,17 +36,14 @@ class CarbonIntensityService:
 
         Note: No API key required for access
         """
-        from requests.adapters import HTTPAdapter
         from urllib3.util.retry import Retry
 
         from shared.config.settings import get_settings
 
         settings = get_settings()
-        self.session = requests.Session()
-
         # Configure retries
         retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
-        self.session.mount("https://", HTTPAdapter(max_retries=retries))
+        self.session = rate_limited_session(max_retries=retries)
 
         self.cache_service = get_cache()
         self.cache_ttl = settings.CACHE_TTL_SECONDS
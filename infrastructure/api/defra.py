@@ -1,12 +1,16 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Any
 
-import requests
-
 from infrastructure.cache.cache_service import get_cache
 from shared.config.settings import Settings
-from shared.utils.provider_errors import provider_unavailable_message
+from shared.utils.http_client import get_shared_client
+from shared.utils.provider_errors import (
+    ProviderServiceError,
+    provider_unavailable_message,
+)
+from shared.utils.rate_limiter import rate_limited_session
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +25,9 @@ class DefraService:
 
     def __init__(self):
         self.settings = Settings()
-        self.session = requests.Session()
+        self.session = rate_limited_session()
         self.cache = get_cache()
+        self.cache_ttl, self.cache_hard_ttl = self.settings.cache_ttls("defra")
 
     def get_station_data(
         self,
@@ -43,61 +48,173 @@ class DefraService:
         Returns:
             Formatted air quality data
         """
+        cache_params = self._cache_params(species_code, start_date, end_date)
+        try:
+            return self.cache.get_or_fetch_api_response(
+                "defra",
+                f"site-data/{site_id}",
+                cache_params,
+                lambda: self._cacheable(self._fetch_station(site_id, species_code, cache_params)),
+                self.cache_ttl,
+                self.cache_hard_ttl,
+            )
+        except ProviderServiceError as e:
+            return {"error": e.public_message}
+
+    async def get_station_data_async(
+        self,
+        site_id: str,
+        species_code: str = "PM25",
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict[str, Any]:
+        """Async variant of `get_station_data` using the shared pooled httpx client."""
+        cache_params = self._cache_params(species_code, start_date, end_date)
+
+        async def fetch() -> dict[str, Any]:
+            return self._cacheable(
+                await self._fetch_station_async(site_id, species_code, cache_params)
+            )
+
+        try:
+            return await self.cache.get_or_fetch_api_response_async(
+                "defra",
+                f"site-data/{site_id}",
+                cache_params,
+                fetch,
+                self.cache_ttl,
+                self.cache_hard_ttl,
+            )
+        except ProviderServiceError as e:
+            return {"error": e.public_message}
+
+    @staticmethod
+    def _cacheable(data: dict[str, Any]) -> dict[str, Any]:
+        """Pass station data through to the cache; error results raise so they are never cached."""
+        if "error" in data:
+            raise ProviderServiceError(provider="defra", public_message=data["error"])
+        return data
+
+    def _fetch_station(
+        self, site_id: str, species_code: str, cache_params: dict[str, str]
+    ) -> dict[str, Any]:
+        """Fetch and format one station's data, bypassing the cache."""
+        try:
+            response = self.session.get(
+                f"{self.BASE_URL}/data/site-data",
+                params={"site_id": site_id, **cache_params},
+                timeout=30,
+            )
+            response.raise_for_status()
+            return self._process_station_response(response, site_id, species_code)
+
+        except Exception as e:
+            logger.error(f"Error fetching DEFRA data for site {site_id}: {e}")
+            return {"error": provider_unavailable_message("DEFRA")}
+
+    async def _fetch_station_async(
+        self, site_id: str, species_code: str, cache_params: dict[str, str]
+    ) -> dict[str, Any]:
+        """Async variant of `_fetch_station`."""
+        try:
+            response = await get_shared_client().get(
+                f"{self.BASE_URL}/data/site-data",
+                params={"site_id": site_id, **cache_params},
+                timeout=30,
+            )
+            response.raise_for_status()
+            return self._process_station_response(response, site_id, species_code)
+
+        except Exception as e:
+            logger.error(f"Error fetching DEFRA data for site {site_id}: {e}")
+            return {"error": provider_unavailable_message("DEFRA")}
+
+    @staticmethod
+    def _cache_params(
+        species_code: str, start_date: str | None, end_date: str | None
+    ) -> dict[str, str]:
+        """Query params (and cache key params) for a site-data request."""
+        # Default the query window to yesterday through today
         if not start_date:
             start_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
         if not end_date:
             end_date = datetime.now().strftime("%Y-%m-%d")
+        return {"species_code": species_code, "start_date": start_date, "end_date": end_date}
 
-        cache_key = f"defra_{site_id}_{species_code}_{start_date}_{end_date}"
-
-        # Check cache first
-        cached_data = self.cache.get_api_response(
-            "defra",
-            f"site-data/{site_id}",
-            {"species_code": species_code, "start_date": start_date, "end_date": end_date},
-        )
-        if cached_data:
-            logger.info(f"Retrieved DEFRA data from cache for site {site_id}")
-            return cached_data
-
+    def _process_station_response(
+        self, response: Any, site_id: str, species_code: str
+    ) -> dict[str, Any]:
+        """Parse and format a site-data response (requests or httpx)."""
         try:
-            url = f"{self.BASE_URL}/data/site-data"
-            params = {
-                "site_id": site_id,
-                "species_code": species_code,
-                "start_date": start_date,
-                "end_date": end_date,
+            data = response.json()
+        except ValueError:
+            logger.error(f"DEFRA API returned non-JSON response for site {site_id}")
+            return {
+                "error": "DEFRA API returned invalid data. Please try OpenMeteoService for UK data."
             }
 
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
+        # Format the data
+        formatted_data = self._format_station_data(data, site_id, species_code)
 
-            try:
-                data = response.json()
-            except ValueError:
-                logger.error(f"DEFRA API returned non-JSON response for site {site_id}")
-                return {
-                    "error": "DEFRA API returned invalid data. Please try OpenMeteoService for UK data."
-                }
+        logger.info(f"Successfully retrieved DEFRA data for site {site_id}")
+        return formatted_data
 
-            # Format the data
-            formatted_data = self._format_station_data(data, site_id, species_code)
+    def _get_cached_stations(
+        self, site_ids: list[str], cache_params: dict[str, str]
+    ) -> dict[str, dict[str, Any]]:
+        """Look up several stations in one cache read. Returns site_id -> data for hits."""
+        species_code = cache_params["species_code"]
+        cached = self.cache.get_api_responses(
+            "defra",
+            [(f"site-data/{site_id}", cache_params) for site_id in site_ids],
+            lambda endpoint, params: self._cacheable(
+                self._fetch_station(endpoint.removeprefix("site-data/"), species_code, params)
+            ),
+            self.cache_ttl,
+            self.cache_hard_ttl,
+        )
+        return {site_id: data for site_id, data in zip(site_ids, cached) if data}
 
-            # Cache for 1 hour
-            self.cache.set_api_response(
-                "defra",
-                f"site-data/{site_id}",
-                {"species_code": species_code, "start_date": start_date, "end_date": end_date},
-                formatted_data,
-                ttl=3600,
-            )
+    def _cache_stations(
+        self, stations: dict[str, dict[str, Any]], cache_params: dict[str, str]
+    ) -> None:
+        """Cache freshly fetched stations in one pipelined write."""
+        self.cache.set_api_responses(
+            "defra",
+            [(f"site-data/{site_id}", cache_params, data) for site_id, data in stations.items()],
+            self.cache_ttl,
+            self.cache_hard_ttl,
+        )
 
-            logger.info(f"Successfully retrieved DEFRA data for site {site_id}")
-            return formatted_data
+    async def _get_cached_stations_async(
+        self, site_ids: list[str], cache_params: dict[str, str]
+    ) -> dict[str, dict[str, Any]]:
+        """Async variant of `_get_cached_stations`."""
+        species_code = cache_params["species_code"]
 
-        except Exception as e:
-            logger.error(f"Error fetching DEFRA data for site {site_id}: {e}")
-            return {"error": provider_unavailable_message("DEFRA")}
+        async def fetch(endpoint: str, params: dict[str, str]) -> dict[str, Any]:
+            site_id = endpoint.removeprefix("site-data/")
+            return self._cacheable(await self._fetch_station_async(site_id, species_code, params))
+
+        cached = await self.cache.get_api_responses_async(
+            "defra",
+            [(f"site-data/{site_id}", cache_params) for site_id in site_ids],
+            fetch,
+            self.cache_ttl,
+            self.cache_hard_ttl,
+        )
+        return {site_id: data for site_id, data in zip(site_ids, cached) if data}
+
+    async def _cache_stations_async(
+        self, stations: dict[str, dict[str, Any]], cache_params: dict[str, str]
+    ) -> None:
+        """Async variant of `_cache_stations`."""
+        await self.cache.set_api_responses_async(
+            "defra",
+            [(f"site-data/{site_id}", cache_params, data) for site_id, data in stations.items()],
+            self.cache_ttl,
+            self.cache_hard_ttl,
+        )
 
     def get_multiple_stations(
         self,
@@ -118,16 +235,65 @@ class DefraService:
         Returns:
             Combined data from multiple stations
         """
+        # One batched cache read for every station, one pipelined write for the misses
+        cache_params = self._cache_params(species_code, start_date, end_date)
+        cached = self._get_cached_stations(site_ids, cache_params)
+
         results = {}
         for site_id in site_ids:
+            if site_id in cached:
+                results[site_id] = cached[site_id]
+                continue
             try:
-                data = self.get_station_data(site_id, species_code, start_date, end_date)
+                data = self._fetch_station(site_id, species_code, cache_params)
                 if data and "error" not in data:
                     results[site_id] = data
             except Exception as e:
                 logger.warning(f"Failed to get data for site {site_id}: {e}")
                 continue
 
+        self._cache_stations(
+            {site_id: data for site_id, data in results.items() if site_id not in cached},
+            cache_params,
+        )
+        return {
+            "source": "UK DEFRA",
+            "timestamp": datetime.now().isoformat(),
+            "stations": results,
+            "total_stations": len(results),
+        }
+
+    async def get_multiple_stations_async(
+        self,
+        site_ids: list[str],
+        species_code: str = "PM25",
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict[str, Any]:
+        """Async variant of `get_multiple_stations`; stations are fetched concurrently."""
+        cache_params = self._cache_params(species_code, start_date, end_date)
+        cached = await self._get_cached_stations_async(site_ids, cache_params)
+        missing = [site_id for site_id in dict.fromkeys(site_ids) if site_id not in cached]
+
+        fetched = await asyncio.gather(
+            *(
+                self._fetch_station_async(site_id, species_code, cache_params)
+                for site_id in missing
+            ),
+            return_exceptions=True,
+        )
+
+        fresh = {}
+        for site_id, data in zip(missing, fetched):
+            if isinstance(data, Exception):
+                logger.warning(f"Failed to get data for site {site_id}: {data}")
+                continue
+            if data and "error" not in data:
+                fresh[site_id] = data
+
+        await self._cache_stations_async(fresh, cache_params)
+        found = {**cached, **fresh}
+        results = {site_id: found[site_id] for site_id in site_ids if site_id in found}
         return {
             "source": "UK DEFRA",
             "timestamp": datetime.now().isoformat(),
@@ -3,15 +3,25 @@ Geocoding Service
 
 Provides geocoding functionality using OpenStreetMap Nominatim API.
 Free geocoding service with no API key required.
+
+Known cities are resolved from the bundled gazetteer without a network call;
+Nominatim search results are cached for GEOCODE_CACHE_TTL_SECONDS, and reverse
+lookups share one entry per ~150 m geohash cell (infrastructure.cache.geocode_cache).
 """
 
 import logging
 from typing import Any
 
+import httpx
 import requests
 
 from infrastructure.cache.cache_service import get_cache
+from infrastructure.cache.geocode_cache import get_reverse_geocode_cache
+from shared.config.settings import get_settings
+from shared.utils.gazetteer import GazetteerMatch, get_gazetteer
+from shared.utils.http_client import get_shared_client
 from shared.utils.provider_errors import aeris_unavailable_message
+from shared.utils.rate_limiter import rate_limited_session
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +31,16 @@ class GeocodingService:
 
     BASE_URL = "https://nominatim.openstreetmap.org"
 
+    # User agent required by Nominatim
+    HEADERS = {"User-Agent": "Aeris-AQ-AirQualityAgent/1.0"}
+    IP_GEOLOCATION_URL = "https://freeipapi.com/api/json"
+
     def __init__(self):
         """Initialize geocoding service."""
-        self.session = requests.Session()
-        # Set user agent as required by Nominatim
-        self.session.headers.update({"User-Agent": "Aeris-AQ-AirQualityAgent/1.0"})
+        self.session = rate_limited_session()
+        self.session.headers.update(self.HEADERS)
         self.cache_service = get_cache()
+        self.geocode_cache_ttl = get_settings().GEOCODE_CACHE_TTL_SECONDS
 
     def geocode(self, address: str, limit: int = 1) -> dict[str, Any]:
         """Alias for geocode_address"""
@@ -43,44 +57,109 @@ class GeocodingService:
         Returns:
             Dict containing geocoding results with success/message format
         """
-        try:
-            params = {
-                "q": address,
-                "format": "json",
-                "limit": limit,
-                "addressdetails": 1,
-                "extratags": 1,
-            }
+        match = get_gazetteer().lookup(address)
+        if match:
+            return self._format_gazetteer(match)
 
+        params = self._search_params(address, limit)
+
+        def fetch() -> Any:
             response = self.session.get(f"{self.BASE_URL}/search", params=params, timeout=10)
             response.raise_for_status()
+            return response.json()
 
-            data = response.json()
+        try:
+            data = self.cache_service.get_or_fetch_api_response(
+                "nominatim", "search", params, fetch, self.geocode_cache_ttl
+            )
+            return self._format_geocode(data)
 
-            if not data:
-                return {"success": False, "message": "No results found for the given address"}
+        except requests.RequestException as e:
+            logger.error(f"Geocoding request failed: {e}", exc_info=True)
+            return {"success": False, "message": "Geocoding service is currently unavailable. Please try again in a few minutes."}
+        except Exception as e:
+            logger.error(f"Geocoding error: {e}", exc_info=True)
+            return {"success": False, "message": aeris_unavailable_message()}
 
-            # Return the first result
-            result = data[0]
-            return {
-                "success": True,
-                "message": "Address geocoded successfully",
-                "latitude": float(result.get("lat", 0)),
-                "longitude": float(result.get("lon", 0)),
-                "display_name": result.get("display_name", ""),
-                "address": result.get("address", {}),
-                "importance": result.get("importance", 0),
-                "type": result.get("type", ""),
-                "class": result.get("class", ""),
-            }
+    async def geocode_address_async(self, address: str, limit: int = 1) -> dict[str, Any]:
+        """Async variant of `geocode_address` using the shared pooled httpx client."""
+        match = get_gazetteer().lookup(address)
+        if match:
+            return self._format_gazetteer(match)
 
-        except requests.RequestException as e:
+        params = self._search_params(address, limit)
+
+        async def fetch() -> Any:
+            response = await get_shared_client().get(
+                f"{self.BASE_URL}/search", params=params, headers=self.HEADERS, timeout=10
+            )
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            data = await self.cache_service.get_or_fetch_api_response_async(
+                "nominatim", "search", params, fetch, self.geocode_cache_ttl
+            )
+            return self._format_geocode(data)
+
+        except httpx.HTTPError as e:
             logger.error(f"Geocoding request failed: {e}", exc_info=True)
             return {"success": False, "message": "Geocoding service is currently unavailable. Please try again in a few minutes."}
         except Exception as e:
             logger.error(f"Geocoding error: {e}", exc_info=True)
             return {"success": False, "message": aeris_unavailable_message()}
 
+    @staticmethod
+    def _search_params(address: str, limit: int) -> dict[str, Any]:
+        """Build Nominatim search params."""
+        return {
+            "q": address,
+            "format": "json",
+            "limit": limit,
+            "addressdetails": 1,
+            "extratags": 1,
+        }
+
+    @staticmethod
+    def _format_gazetteer(match: GazetteerMatch) -> dict[str, Any]:
+        """Format a gazetteer match like a Nominatim city result."""
+        return {
+            "success": True,
+            "message": "Address geocoded successfully",
+            "latitude": match.latitude,
+            "longitude": match.longitude,
+            "display_name": f"{match.name}, {match.country}",
+            "address": {
+                "city": match.name,
+                "country": match.country,
+                "country_code": match.country_code.lower(),
+            },
+            "importance": 0.8 if match.fuzzy else 1.0,
+            "type": "city",
+            "class": "place",
+            "source": "gazetteer",
+        }
+
+    @staticmethod
+    def _format_geocode(data: Any) -> dict[str, Any]:
+        """Format the first Nominatim search match."""
+        if not data:
+            return {"success": False, "message": "No results found for the given address"}
+
+        # Return the first result
+        result = data[0]
+        return {
+            "success": True,
+            "message": "Address geocoded successfully",
+            "latitude": float(result.get("lat", 0)),
+            "longitude": float(result.get("lon", 0)),
+            "display_name": result.get("display_name", ""),
+            "address": result.get("address", {}),
+            "importance": result.get("importance", 0),
+            "type": result.get("type", ""),
+            "class": result.get("class", ""),
+        }
+
     def reverse_geocode(self, latitude: float, longitude: float) -> dict[str, Any]:
         """
         Reverse geocode coordinates to address.
@@ -92,41 +171,75 @@ class GeocodingService:
         Returns:
             Dict containing reverse geocoding results with success/message format
         """
-        try:
-            params = {
-                "lat": latitude,
-                "lon": longitude,
-                "format": "json",
-                "addressdetails": 1,
-                "extratags": 1,
-            }
-
-            response = self.session.get(f"{self.BASE_URL}/reverse", params=params, timeout=10)
+        def fetch() -> dict[str, Any]:
+            response = self.session.get(
+                f"{self.BASE_URL}/reverse", params=self._reverse_params(latitude, longitude), timeout=10
+            )
             response.raise_for_status()
+            return self._format_reverse(response.json(), latitude, longitude)
 
-            data = response.json()
+        try:
+            return get_reverse_geocode_cache().get_or_fetch("address", latitude, longitude, fetch)
+
+        except requests.RequestException as e:
+            logger.error(f"Reverse geocoding request failed: {e}", exc_info=True)
+            return {"success": False, "message": "Reverse geocoding service is currently unavailable. Please try again in a few minutes."}
+        except Exception as e:
+            logger.error(f"Reverse geocoding error: {e}", exc_info=True)
+            return {"success": False, "message": aeris_unavailable_message()}
 
-            if not data or "error" in data:
-                return {"success": False, "message": "No address found for the given coordinates"}
+    async def reverse_geocode_async(self, latitude: float, longitude: float) -> dict[str, Any]:
+        """Async variant of `reverse_geocode`."""
+        async def fetch() -> dict[str, Any]:
+            response = await get_shared_client().get(
+                f"{self.BASE_URL}/reverse",
+                params=self._reverse_params(latitude, longitude),
+                headers=self.HEADERS,
+                timeout=10,
+            )
+            response.raise_for_status()
+            return self._format_reverse(response.json(), latitude, longitude)
 
-            return {
-                "success": True,
-                "message": "Coordinates reverse geocoded successfully",
-                "display_name": data.get("display_name", ""),
-                "address": data.get("address", {}),
-                "latitude": float(data.get("lat", latitude)),
-                "longitude": float(data.get("lon", longitude)),
-                "type": data.get("type", ""),
-                "class": data.get("class", ""),
-            }
+        try:
+            return await get_reverse_geocode_cache().get_or_fetch_async(
+                "address", latitude, longitude, fetch
+            )
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Reverse geocoding request failed: {e}", exc_info=True)
             return {"success": False, "message": "Reverse geocoding service is currently unavailable. Please try again in a few minutes."}
         except Exception as e:
             logger.error(f"Reverse geocoding error: {e}", exc_info=True)
             return {"success": False, "message": aeris_unavailable_message()}
 
+    @staticmethod
+    def _reverse_params(latitude: float, longitude: float) -> dict[str, Any]:
+        """Build Nominatim reverse params."""
+        return {
+            "lat": latitude,
+            "lon": longitude,
+            "format": "json",
+            "addressdetails": 1,
+            "extratags": 1,
+        }
+
+    @staticmethod
+    def _format_reverse(data: Any, latitude: float, longitude: float) -> dict[str, Any]:
+        """Format a Nominatim reverse payload."""
+        if not data or "error" in data:
+            return {"success": False, "message": "No address found for the given coordinates"}
+
+        return {
+            "success": True,
+            "message": "Coordinates reverse geocoded successfully",
+            "display_name": data.get("display_name", ""),
+            "address": data.get("address", {}),
+            "latitude": float(data.get("lat", latitude)),
+            "longitude": float(data.get("lon", longitude)),
+            "type": data.get("type", ""),
+            "class": data.get("class", ""),
+        }
+
     def get_location_from_ip(self, ip_address: str | None = None) -> dict[str, Any]:
         """
         Get location information from IP address using free IP geolocation API.
@@ -139,60 +252,79 @@ class GeocodingService:
         """
         try:
             # Using freeipapi.com for IP geolocation
-            url = "https://freeipapi.com/api/json"
-            if ip_address:
-                url += f"/{ip_address}"
-
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(self._ip_url(ip_address), timeout=10)
             response.raise_for_status()
+            return self._format_ip_location(response.json())
 
-            data = response.json()
-
-            # Validate the response
-            latitude = data.get("latitude")
-            longitude = data.get("longitude")
-            country_name = data.get("countryName")
-            city = data.get("city")
-
-            # Check if we got valid coordinates
-            if not latitude or not longitude:
-                return {"success": False, "message": "Unable to determine location from IP address"}
-
-            # Check if coordinates are reasonable (not null island or obviously wrong)
-            if latitude == 0.0 and longitude == 0.0:
-                return {
-                    "success": False,
-                    "message": "IP address does not provide valid location data",
-                }
-
-            # Check if this looks like a datacenter/server location
-            # Many cloud providers have specific IP ranges that might not represent user location
-            if not city and not country_name:
-                return {
-                    "success": False,
-                    "message": "IP address location data is incomplete or from a server",
-                }
-
-            result = {
-                "success": True,
-                "message": "Location determined from IP address (approximate)",
-                "ip": data.get("ip"),
-                "country_name": country_name,
-                "country_code": data.get("countryCode"),
-                "city": city,
-                "region": data.get("regionName"),
-                "latitude": latitude,
-                "longitude": longitude,
-                "zip_code": data.get("zipCode"),
-                "time_zone": data.get("timeZone"),
-                "isp": data.get("isp"),
-            }
+        except requests.RequestException as e:
+            logger.error(f"IP geolocation request failed: {e}", exc_info=True)
+            return {"success": False, "message": "IP geolocation service is currently unavailable. Please try again in a few minutes."}
+        except Exception as e:
+            logger.error(f"IP geolocation error: {e}", exc_info=True)
+            return {"success": False, "message": aeris_unavailable_message()}
 
-            return result
+    async def get_location_from_ip_async(self, ip_address: str | None = None) -> dict[str, Any]:
+        """Async variant of `get_location_from_ip`."""
+        try:
+            response = await get_shared_client().get(
+                self._ip_url(ip_address), headers=self.HEADERS, timeout=10
+            )
+            response.raise_for_status()
+            return self._format_ip_location(response.json())
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"IP geolocation request failed: {e}", exc_info=True)
             return {"success": False, "message": "IP geolocation service is currently unavailable. Please try again in a few minutes."}
         except Exception as e:
             logger.error(f"IP geolocation error: {e}", exc_info=True)
             return {"success": False, "message": aeris_unavailable_message()}
+
+    def _ip_url(self, ip_address: str | None) -> str:
+        """IP geolocation URL, scoped to an address when one is given."""
+        url = self.IP_GEOLOCATION_URL
+        if ip_address:
+            url += f"/{ip_address}"
+        return url
+
+    @staticmethod
+    def _format_ip_location(data: dict[str, Any]) -> dict[str, Any]:
+        """Validate and format an IP geolocation payload."""
+        # Validate the response
+        latitude = data.get("latitude")
+        longitude = data.get("longitude")
+        country_name = data.get("countryName")
+        city = data.get("city")
+
+        # Check if we got valid coordinates
+        if not latitude or not longitude:
+            return {"success": False, "message": "Unable to determine location from IP address"}
+
+        # Check if coordinates are reasonable (not null island or obviously wrong)
+        if latitude == 0.0 and longitude == 0.0:
+            return {
+                "success": False,
+                "message": "IP address does not provide valid location data",
+            }
+
+        # Check if this looks like a datacenter/server location
+        # Many cloud providers have specific IP ranges that might not represent user location
+        if not city and not country_name:
+            return {
+                "success": False,
+                "message": "IP address location data is incomplete or from a server",
+            }
+
+        return {
+            "success": True,
+            "message": "Location determined from IP address (approximate)",
+            "ip": data.get("ip"),
+            "country_name": country_name,
+            "country_code": data.get("countryCode"),
+            "city": city,
+            "region": data.get("regionName"),
+            "latitude": latitude,
+            "longitude": longitude,
+            "zip_code": data.get("zipCode"),
+            "time_zone": data.get("timeZone"),
+            "isp": data.get("isp"),
+        }
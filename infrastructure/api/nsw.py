@@ -9,10 +9,13 @@ Data License: Creative Commons Attribution 4.0 International (CC BY 4.0)
 from datetime import datetime, timedelta
 from typing import Any
 
+import httpx
 import requests
 
 from infrastructure.cache.cache_service import get_cache
 from shared.utils.data_formatter import format_air_quality_data
+from shared.utils.http_client import get_shared_client
+from shared.utils.rate_limiter import rate_limited_session
 
 
 class NSWService:
@@ -29,7 +32,7 @@ class NSWService:
         from shared.config.settings import get_settings
 
         settings = get_settings()
-        self.session = requests.Session()
+        self.session = rate_limited_session()
         self.cache_service = get_cache()
         self.cache_ttl = settings.CACHE_TTL_SECONDS
 
@@ -67,23 +70,73 @@ class NSWService:
                 response = self.session.get(url, params=params, timeout=30)
 
             response.raise_for_status()
-            data_response = response.json()
+            data_response = self._check_response(response.json())
 
-            # NSW API doesn't have a standard status field, but we can check for error responses
-            if isinstance(data_response, dict) and "error" in data_response:
-                raise Exception(f"NSW API error: {data_response['error']}")
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"NSW API request failed: {str(e)}") from e
 
-            # Cache GET responses
-            if method == "GET":
-                self.cache_service.set_api_response(
-                    "nsw", endpoint, params or {}, data_response, self.cache_ttl
-                )
+        # Cache GET responses
+        if method == "GET":
+            self.cache_service.set_api_response(
+                "nsw", endpoint, params or {}, data_response, self.cache_ttl
+            )
+        return data_response
+
+    async def _make_request_async(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        params: dict | None = None,
+        data: dict | None = None,
+    ) -> dict[str, Any]:
+        """
+        Async variant of `_make_request` using the shared pooled httpx client.
 
-            return data_response
+        Args:
+            endpoint: API endpoint path
+            method: HTTP method (GET or POST)
+            params: Query parameters for GET requests
+            data: JSON data for POST requests
 
-        except requests.exceptions.RequestException as e:
+        Returns:
+            JSON response data
+        """
+        url = f"{self.BASE_URL}/{endpoint}"
+
+        if method == "GET":
+            cached_data = await self.cache_service.get_api_response_async(
+                "nsw", endpoint, params or {}
+            )
+            if cached_data is not None:
+                return cached_data
+
+        try:
+            client = get_shared_client()
+            if method == "POST":
+                response = await client.post(url, json=data, timeout=30)
+            else:
+                response = await client.get(url, params=params, timeout=30)
+
+            response.raise_for_status()
+            data_response = self._check_response(response.json())
+
+        except httpx.HTTPError as e:
             raise Exception(f"NSW API request failed: {str(e)}") from e
 
+        if method == "GET":
+            await self.cache_service.set_api_response_async(
+                "nsw", endpoint, params or {}, data_response, self.cache_ttl
+            )
+        return data_response
+
+    @staticmethod
+    def _check_response(data_response: Any) -> Any:
+        """Reject error payloads."""
+        # NSW API doesn't have a standard status field, but we can check for error responses
+        if isinstance(data_response, dict) and "error" in data_response:
+            raise Exception(f"NSW API error: {data_response['error']}")
+        return data_response
+
     def get_air_quality(self, region: str | None = None) -> dict[str, Any]:
         """
         Get current air quality observations.
@@ -113,6 +166,11 @@ class NSWService:
         data = self._make_request("api/Data/get_SiteDetails")
         return data if isinstance(data, list) else []
 
+    async def get_site_details_async(self) -> list[dict[str, Any]]:
+        """Async variant of `get_site_details`."""
+        data = await self._make_request_async("api/Data/get_SiteDetails")
+        return data if isinstance(data, list) else []
+
     def get_parameter_details(self) -> list[dict[str, Any]]:
         """
         Get details of all air quality parameters measured
@@ -145,38 +203,55 @@ class NSWService:
         """
         try:
             data = self._make_request("api/Data/get_Observations", method="POST", data=request_data)
+            return self._format_observations(data)
+        except Exception as e:
+            return self._observations_unavailable(e)
 
-            # NSW API returns different formats - handle both
-            if isinstance(data, list):
-                # Convert list to expected dict format
-                formatted_data = {"Values": data}
-            else:
-                formatted_data = data
-
-            # Format the data using our standard formatter
-            formatted = format_air_quality_data(formatted_data, source="nsw")
-
-            # Add important notes about NSW data
-            if "data" in formatted:
-                formatted["data"]["_important_note"] = (
-                    "NSW provides raw pollutant concentrations in µg/m³ and Air Quality Categories (AQC). "
-                    "AQCs are: Good, Fair, Poor, Very Poor, Extremely Poor. "
-                    "Data is quality-assured and updated hourly."
-                )
-
-            return formatted
-
+    async def get_observations_async(self, request_data: dict[str, Any]) -> dict[str, Any]:
+        """Async variant of `get_observations`."""
+        try:
+            data = await self._make_request_async(
+                "api/Data/get_Observations", method="POST", data=request_data
+            )
+            return self._format_observations(data)
         except Exception as e:
-            # Return a structured error response
-            return {
-                "success": False,
-                "error": f"NSW API unavailable: {str(e)}",
-                "message": "NSW air quality data is currently unavailable via API. Data is openly available at https://www.airquality.nsw.gov.au/",
-                "source": "nsw",
-                "data": {
-                    "_important_note": "NSW air quality monitoring data is openly available under Creative Commons Attribution 4.0 International license. Visit https://www.airquality.nsw.gov.au/ for current data."
-                },
-            }
+            return self._observations_unavailable(e)
+
+    @staticmethod
+    def _format_observations(data: Any) -> dict[str, Any]:
+        """Format an observations payload with NSW-specific notes."""
+        # NSW API returns different formats - handle both
+        if isinstance(data, list):
+            # Convert list to expected dict format
+            formatted_data = {"Values": data}
+        else:
+            formatted_data = data
+
+        # Format the data using our standard formatter
+        formatted = format_air_quality_data(formatted_data, source="nsw")
+
+        # Add important notes about NSW data
+        if "data" in formatted:
+            formatted["data"]["_important_note"] = (
+                "NSW provides raw pollutant concentrations in µg/m³ and Air Quality Categories (AQC). "
+                "AQCs are: Good, Fair, Poor, Very Poor, Extremely Poor. "
+                "Data is quality-assured and updated hourly."
+            )
+
+        return formatted
+
+    @staticmethod
+    def _observations_unavailable(e: Exception) -> dict[str, Any]:
+        """Structured error response when observations cannot be fetched."""
+        return {
+            "success": False,
+            "error": f"NSW API unavailable: {str(e)}",
+            "message": "NSW air quality data is currently unavailable via API. Data is openly available at https://www.airquality.nsw.gov.au/",
+            "source": "nsw",
+            "data": {
+                "_important_note": "NSW air quality monitoring data is openly available under Creative Commons Attribution 4.0 International license. Visit https://www.airquality.nsw.gov.au/ for current data."
+            },
+        }
 
     def get_current_air_quality(self, location: str | None = None) -> dict[str, Any]:
         """
@@ -189,44 +264,70 @@ class NSWService:
             Current air quality data with concentrations and AQCs
         """
         try:
-            from datetime import datetime, timedelta
-
-            # Get data for the last hour
-            end_date = datetime.now()
-            start_date = end_date - timedelta(hours=1)
-
-            request_data = {
-                "Parameters": ["PM2.5", "PM10", "O3", "NO2", "SO2", "CO"],
-                "StartDate": start_date.strftime("%Y-%m-%d"),
-                "EndDate": end_date.strftime("%Y-%m-%d"),
-                "StartTimeLocal": start_date.strftime("%H:%M"),
-                "EndTimeLocal": end_date.strftime("%H:%M"),
-            }
+            request_data = self._current_request_data()
 
             # If location is specified, try to find matching sites
             if location:
-                sites = self.get_site_details()
-                matching_sites = []
-                location_lower = location.lower()
+                matching_sites = self._match_sites(self.get_site_details(), location)
+                if matching_sites:
+                    request_data["Sites"] = matching_sites[:5]  # Limit to 5 sites
 
-                for site in sites:
-                    site_name = site.get("SiteName", "").lower()
-                    region = site.get("Region", "").lower()
+            return self.get_observations(request_data)
+        except Exception as e:
+            return self._current_unavailable(e)
 
-                    if location_lower in site_name or location_lower in region:
-                        matching_sites.append(site.get("Site_Id"))
+    async def get_current_air_quality_async(self, location: str | None = None) -> dict[str, Any]:
+        """Async variant of `get_current_air_quality`."""
+        try:
+            request_data = self._current_request_data()
 
+            if location:
+                matching_sites = self._match_sites(await self.get_site_details_async(), location)
                 if matching_sites:
-                    request_data["Sites"] = matching_sites[:5]  # Limit to 5 sites
+                    request_data["Sites"] = matching_sites[:5]
 
-            return self.get_observations(request_data)
+            return await self.get_observations_async(request_data)
         except Exception as e:
-            return {
-                "success": False,
-                "error": f"Unable to retrieve current NSW data: {str(e)}",
-                "message": "NSW air quality data is openly available at https://www.airquality.nsw.gov.au/",
-                "source": "nsw",
-            }
+            return self._current_unavailable(e)
+
+    @staticmethod
+    def _current_request_data() -> dict[str, Any]:
+        """Observation request covering the last hour for all major pollutants."""
+        # Get data for the last hour
+        end_date = datetime.now()
+        start_date = end_date - timedelta(hours=1)
+
+        return {
+            "Parameters": ["PM2.5", "PM10", "O3", "NO2", "SO2", "CO"],
+            "StartDate": start_date.strftime("%Y-%m-%d"),
+            "EndDate": end_date.strftime("%Y-%m-%d"),
+            "StartTimeLocal": start_date.strftime("%H:%M"),
+            "EndTimeLocal": end_date.strftime("%H:%M"),
+        }
+
+    @staticmethod
+    def _match_sites(sites: list[dict[str, Any]], location: str) -> list[Any]:
+        """Return IDs of sites whose name or region contains the location."""
+        matching_sites = []
+        location_lower = location.lower()
+
+        for site in sites:
+            site_name = site.get("SiteName", "").lower()
+            region = site.get("Region", "").lower()
+
+            if location_lower in site_name or location_lower in region:
+                matching_sites.append(site.get("Site_Id"))
+        return matching_sites
+
+    @staticmethod
+    def _current_unavailable(e: Exception) -> dict[str, Any]:
+        """Structured error response when current data cannot be fetched."""
+        return {
+            "success": False,
+            "error": f"Unable to retrieve current NSW data: {str(e)}",
+            "message": "NSW air quality data is openly available at https://www.airquality.nsw.gov.au/",
+            "source": "nsw",
+        }
 
     def get_sites_by_region(self, region: str) -> list[dict[str, Any]]:
         """
@@ -260,15 +361,20 @@ class NSWService:
         Returns:
             Pollutant data across all sites
         """
-        from datetime import datetime
+        return self.get_observations(self._pollutant_request_data(pollutant, hours))
 
+    async def get_pollutant_data_async(self, pollutant: str, hours: int = 24) -> dict[str, Any]:
+        """Async variant of `get_pollutant_data`."""
+        return await self.get_observations_async(self._pollutant_request_data(pollutant, hours))
+
+    @staticmethod
+    def _pollutant_request_data(pollutant: str, hours: int) -> dict[str, Any]:
+        """Observation request for one pollutant over the last `hours` hours."""
         end_date = datetime.now()
         start_date = end_date - timedelta(hours=hours)
 
-        request_data = {
+        return {
             "Parameters": [pollutant],
             "StartDate": start_date.strftime("%Y-%m-%d"),
             "EndDate": end_date.strftime("%Y-%m-%d"),
         }
-
-        return self.get_observations(request_data)
@@ -16,10 +16,13 @@ Features:
 from datetime import datetime
 from typing import Any
 
+import httpx
 import requests
 
 from infrastructure.cache.cache_service import get_cache
 from shared.utils.data_formatter import format_air_quality_data
+from shared.utils.http_client import get_shared_client
+from shared.utils.rate_limiter import rate_limited_session
 
 
 class OpenMeteoService:
@@ -36,9 +39,18 @@ class OpenMeteoService:
         from shared.config.settings import get_settings
 
         settings = get_settings()
-        self.session = requests.Session()
+        self.session = rate_limited_session()
         self.cache_service = get_cache()
-        self.cache_ttl = settings.CACHE_TTL_SECONDS
+        # Past the soft TTL cached responses are served stale while they refresh
+        self.cache_ttl, self.cache_hard_ttl = settings.cache_ttls("openmeteo")
+
+    @staticmethod
+    def _check_response(data: dict[str, Any]) -> dict[str, Any]:
+        """Raise on Open-Meteo API errors, otherwise return the payload for caching."""
+        # Check for API errors
+        if data.get("error"):
+            raise Exception(f"Open-Meteo API error: {data.get('reason', 'Unknown error')}")
+        return data
 
     def _make_request(self, params: dict) -> dict[str, Any]:
         """
@@ -50,31 +62,46 @@ class OpenMeteoService:
         Returns:
             JSON response data
         """
-        # Check Redis cache
-        cached_data = self.cache_service.get_api_response("openmeteo", "air-quality", params)
-        if cached_data is not None:
-            return cached_data
-
-        try:
-            response = self.session.get(self.BASE_URL, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-
-            # Check for API errors
-            if data.get("error"):
-                raise Exception(f"Open-Meteo API error: {data.get('reason', 'Unknown error')}")
-
-            # Cache the result in Redis
-            self.cache_service.set_api_response(
-                "openmeteo", "air-quality", params, data, self.cache_ttl
-            )
-            return data
+        def fetch() -> dict[str, Any]:
+            try:
+                response = self.session.get(self.BASE_URL, params=params, timeout=30)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                error_msg = f"Open-Meteo API request failed: {str(e)}"
+                if hasattr(e, "response") and e.response is not None:
+                    error_msg += f" Response: {e.response.text}"
+                raise Exception(error_msg) from e
+            return self._check_response(response.json())
+
+        # Cached response, or one upstream fetch shared by concurrent callers
+        return self.cache_service.get_or_fetch_api_response(
+            "openmeteo", "air-quality", params, fetch, self.cache_ttl, self.cache_hard_ttl
+        )
+
+    async def _make_request_async(self, params: dict) -> dict[str, Any]:
+        """
+        Async variant of `_make_request` using the shared pooled httpx client.
 
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Open-Meteo API request failed: {str(e)}"
-            if hasattr(e, "response") and e.response is not None:
-                error_msg += f" Response: {e.response.text}"
-            raise Exception(error_msg) from e
+        Args:
+            params: Query parameters
+
+        Returns:
+            JSON response data
+        """
+        async def fetch() -> dict[str, Any]:
+            try:
+                response = await get_shared_client().get(self.BASE_URL, params=params, timeout=30)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                error_msg = f"Open-Meteo API request failed: {str(e)}"
+                if isinstance(e, httpx.HTTPStatusError):
+                    error_msg += f" Response: {e.response.text}"
+                raise Exception(error_msg) from e
+            return self._check_response(response.json())
+
+        return await self.cache_service.get_or_fetch_api_response_async(
+            "openmeteo", "air-quality", params, fetch, self.cache_ttl, self.cache_hard_ttl
+        )
 
     def get_current_air_quality(
         self,
@@ -95,6 +122,29 @@ class OpenMeteoService:
         Returns:
             Current air quality measurements with AQI
         """
+        data = self._make_request(
+            self._current_params(latitude, longitude, timezone, include_aqi)
+        )
+        return self._format_current(data)
+
+    async def get_current_air_quality_async(
+        self,
+        latitude: float,
+        longitude: float,
+        timezone: str = "auto",
+        include_aqi: bool = True,
+    ) -> dict[str, Any]:
+        """Async variant of `get_current_air_quality`."""
+        data = await self._make_request_async(
+            self._current_params(latitude, longitude, timezone, include_aqi)
+        )
+        return self._format_current(data)
+
+    @staticmethod
+    def _current_params(
+        latitude: float, longitude: float, timezone: str, include_aqi: bool
+    ) -> dict[str, Any]:
+        """Build query params for current conditions."""
         # Define current parameters - all major pollutants plus AQI
         current_params = [
             "pm10",
@@ -111,14 +161,16 @@ class OpenMeteoService:
         if include_aqi:
             current_params.extend(["european_aqi", "us_aqi"])
 
-        params = {
+        return {
             "latitude": latitude,
             "longitude": longitude,
             "current": ",".join(current_params),
             "timezone": timezone,
         }
 
-        data = self._make_request(params)
+    @staticmethod
+    def _format_current(data: dict[str, Any]) -> dict[str, Any]:
+        """Format a current-conditions payload with a success flag."""
         formatted = format_air_quality_data(data, source="openmeteo")
 
         # Add success flag based on presence of current data
@@ -151,6 +203,34 @@ class OpenMeteoService:
         Returns:
             Hourly forecast data
         """
+        data = self._make_request(
+            self._forecast_params(latitude, longitude, forecast_days, timezone, variables)
+        )
+        return format_air_quality_data(data, source="openmeteo")
+
+    async def get_hourly_forecast_async(
+        self,
+        latitude: float,
+        longitude: float,
+        forecast_days: int = 5,
+        timezone: str = "auto",
+        variables: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Async variant of `get_hourly_forecast`."""
+        data = await self._make_request_async(
+            self._forecast_params(latitude, longitude, forecast_days, timezone, variables)
+        )
+        return format_air_quality_data(data, source="openmeteo")
+
+    @staticmethod
+    def _forecast_params(
+        latitude: float,
+        longitude: float,
+        forecast_days: int,
+        timezone: str,
+        variables: list[str] | None,
+    ) -> dict[str, Any]:
+        """Build query params for the hourly forecast."""
         if variables is None:
             # Default comprehensive set of variables
             variables = [
@@ -166,7 +246,7 @@ class OpenMeteoService:
                 "us_aqi",
             ]
 
-        params = {
+        return {
             "latitude": latitude,
             "longitude": longitude,
             "hourly": ",".join(variables),
@@ -174,9 +254,6 @@ class OpenMeteoService:
             "timezone": timezone,
         }
 
-        data = self._make_request(params)
-        return format_air_quality_data(data, source="openmeteo")
-
     def get_historical_data(
         self,
         latitude: float,
@@ -200,6 +277,36 @@ class OpenMeteoService:
         Returns:
             Historical air quality data
         """
+        data = self._make_request(
+            self._historical_params(latitude, longitude, start_date, end_date, timezone, variables)
+        )
+        return format_air_quality_data(data, source="openmeteo")
+
+    async def get_historical_data_async(
+        self,
+        latitude: float,
+        longitude: float,
+        start_date: datetime,
+        end_date: datetime,
+        timezone: str = "auto",
+        variables: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Async variant of `get_historical_data`."""
+        data = await self._make_request_async(
+            self._historical_params(latitude, longitude, start_date, end_date, timezone, variables)
+        )
+        return format_air_quality_data(data, source="openmeteo")
+
+    @staticmethod
+    def _historical_params(
+        latitude: float,
+        longitude: float,
+        start_date: datetime,
+        end_date: datetime,
+        timezone: str,
+        variables: list[str] | None,
+    ) -> dict[str, Any]:
+        """Build query params for historical data."""
         if variables is None:
             variables = [
                 "pm10",
@@ -212,7 +319,7 @@ class OpenMeteoService:
                 "us_aqi",
             ]
 
-        params = {
+        return {
             "latitude": latitude,
             "longitude": longitude,
             "hourly": ",".join(variables),
@@ -221,9 +328,6 @@ class OpenMeteoService:
             "timezone": timezone,
         }
 
-        data = self._make_request(params)
-        return format_air_quality_data(data, source="openmeteo")
-
     def get_comprehensive_data(
         self,
         latitude: float,
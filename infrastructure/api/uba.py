@@ -2,11 +2,11 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
-import requests
-
 from infrastructure.cache.cache_service import get_cache
 from shared.config.settings import Settings
+from shared.utils.http_client import get_shared_client
 from shared.utils.provider_errors import provider_unavailable_message
+from shared.utils.rate_limiter import rate_limited_session
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +18,12 @@ class UbaService:
     """
 
     BASE_URL = "https://www.umweltbundesamt.de/api/air_data/v2"
+    MEASURES_CACHE_TTL = 1800  # 30 minutes
+    STATIONS_CACHE_TTL = 86400  # 24 hours (stations don't change often)
 
     def __init__(self):
         self.settings = Settings()
-        self.session = requests.Session()
+        self.session = rate_limited_session()
         self.cache = get_cache()
 
     def get_measures(self, component: str | None = None, scope: str = "24h") -> dict[str, Any]:
@@ -35,63 +37,49 @@ class UbaService:
         Returns:
             Formatted air quality data
         """
-        # Map scope parameter to UBA API scope
-        scope_map = {"1h": 1, "24h": 2, "d": 3}  # 1 hour  # 24 hours  # daily
-
-        api_scope = scope_map.get(scope, 2)  # Default to 24 hours
-
-        cache_key = f"uba_measures_{component or 'all'}_{scope}"
+        cache_params = {"component": component, "scope": scope}
 
         # Check cache first
-        cached_data = self.cache.get_api_response(
-            "uba", "measures", {"component": component, "scope": scope}
-        )
+        cached_data = self.cache.get_api_response("uba", "measures", cache_params)
         if cached_data:
             logger.info("Retrieved UBA data from cache")
             return cached_data
 
         try:
-            url = f"{self.BASE_URL}/measures/json"
-            # UBA API requires date parameters
-            now = datetime.now()
-            date_from = (now - timedelta(days=1)).strftime("%Y-%m-%d")
-            time_from = "00:00"
-            date_to = now.strftime("%Y-%m-%d")
-            time_to = now.strftime("%H:%M")
-
-            params = {
-                "scope": api_scope,
-                "date_from": date_from,
-                "time_from": time_from,
-                "date_to": date_to,
-                "time_to": time_to,
-                "lang": "en",
-            }
-
-            # Add component filter if specified
-            if component:
-                # Map component names to UBA component IDs
-                component_map = {"NO2": 2, "PM10": 6, "O3": 3, "SO2": 1, "CO": 4}
-                if component.upper() in component_map:
-                    params["component"] = component_map[component.upper()]
-
-            response = self.session.get(url, params=params, timeout=30)
+            response = self.session.get(
+                f"{self.BASE_URL}/measures/json",
+                params=self._measures_params(component, scope),
+                timeout=30,
+            )
             response.raise_for_status()
+            return self._store_measures(response.json(), cache_params)
+
+        except Exception as e:
+            logger.error(f"Error fetching UBA measures data: {e}")
+            return {"error": provider_unavailable_message("UBA")}
 
-            data = response.json()
+    async def get_measures_async(
+        self, component: str | None = None, scope: str = "24h"
+    ) -> dict[str, Any]:
+        """Async variant of `get_measures` using the shared pooled httpx client."""
+        cache_params = {"component": component, "scope": scope}
 
-            # Format the data
-            formatted_data = self._format_measures_data(data)
+        cached_data = await self.cache.get_api_response_async("uba", "measures", cache_params)
+        if cached_data:
+            logger.info("Retrieved UBA data from cache")
+            return cached_data
 
-            # Cache for 30 minutes
-            self.cache.set_api_response(
-                "uba",
-                "measures",
-                {"component": component, "scope": scope},
-                formatted_data,
-                ttl=1800,
+        try:
+            response = await get_shared_client().get(
+                f"{self.BASE_URL}/measures/json",
+                params=self._measures_params(component, scope),
+                timeout=30,
+            )
+            response.raise_for_status()
+            formatted_data = self._format_measures_data(response.json())
+            await self.cache.set_api_response_async(
+                "uba", "measures", cache_params, formatted_data, ttl=self.MEASURES_CACHE_TTL
             )
-
             logger.info("Successfully retrieved UBA measures data")
             return formatted_data
 
@@ -99,6 +87,44 @@ class UbaService:
             logger.error(f"Error fetching UBA measures data: {e}")
             return {"error": provider_unavailable_message("UBA")}
 
+    @staticmethod
+    def _measures_params(component: str | None, scope: str) -> dict[str, Any]:
+        """Build query params for the measures endpoint."""
+        # Map scope parameter to UBA API scope
+        scope_map = {"1h": 1, "24h": 2, "d": 3}  # 1 hour  # 24 hours  # daily
+
+        api_scope = scope_map.get(scope, 2)  # Default to 24 hours
+
+        # UBA API requires date parameters
+        now = datetime.now()
+        params: dict[str, Any] = {
+            "scope": api_scope,
+            "date_from": (now - timedelta(days=1)).strftime("%Y-%m-%d"),
+            "time_from": "00:00",
+            "date_to": now.strftime("%Y-%m-%d"),
+            "time_to": now.strftime("%H:%M"),
+            "lang": "en",
+        }
+
+        # Add component filter if specified
+        if component:
+            # Map component names to UBA component IDs
+            component_map = {"NO2": 2, "PM10": 6, "O3": 3, "SO2": 1, "CO": 4}
+            if component.upper() in component_map:
+                params["component"] = component_map[component.upper()]
+        return params
+
+    def _store_measures(self, data: dict, cache_params: dict[str, Any]) -> dict[str, Any]:
+        """Format and cache a measures payload."""
+        formatted_data = self._format_measures_data(data)
+
+        self.cache.set_api_response(
+            "uba", "measures", cache_params, formatted_data, ttl=self.MEASURES_CACHE_TTL
+        )
+
+        logger.info("Successfully retrieved UBA measures data")
+        return formatted_data
+
     def get_stations(self) -> dict[str, Any]:
         """
         Get list of available monitoring stations.
@@ -106,8 +132,6 @@ class UbaService:
         Returns:
             List of monitoring stations
         """
-        cache_key = "uba_stations"
-
         # Check cache first
         cached_data = self.cache.get_api_response("uba", "stations", {})
         if cached_data:
@@ -115,20 +139,32 @@ class UbaService:
             return cached_data
 
         try:
-            url = f"{self.BASE_URL}/stations/json"
-            params = {"lang": "en"}
-
-            response = self.session.get(url, params=params, timeout=30)
+            response = self.session.get(
+                f"{self.BASE_URL}/stations/json", params={"lang": "en"}, timeout=30
+            )
             response.raise_for_status()
+            return self._store_stations(response.json())
 
-            data = response.json()
-
-            # Format the data
-            formatted_data = self._format_stations_data(data)
+        except Exception as e:
+            logger.error(f"Error fetching UBA stations data: {e}")
+            return {"error": provider_unavailable_message("UBA")}
 
-            # Cache for 24 hours (stations don't change often)
-            self.cache.set_api_response("uba", "stations", {}, formatted_data, ttl=86400)
+    async def get_stations_async(self) -> dict[str, Any]:
+        """Async variant of `get_stations`."""
+        cached_data = await self.cache.get_api_response_async("uba", "stations", {})
+        if cached_data:
+            logger.info("Retrieved UBA stations from cache")
+            return cached_data
 
+        try:
+            response = await get_shared_client().get(
+                f"{self.BASE_URL}/stations/json", params={"lang": "en"}, timeout=30
+            )
+            response.raise_for_status()
+            formatted_data = self._format_stations_data(response.json())
+            await self.cache.set_api_response_async(
+                "uba", "stations", {}, formatted_data, ttl=self.STATIONS_CACHE_TTL
+            )
             logger.info("Successfully retrieved UBA stations data")
             return formatted_data
 
@@ -136,6 +172,17 @@ class UbaService:
             logger.error(f"Error fetching UBA stations data: {e}")
             return {"error": provider_unavailable_message("UBA")}
 
+    def _store_stations(self, data: dict) -> dict[str, Any]:
+        """Format and cache a stations payload."""
+        formatted_data = self._format_stations_data(data)
+
+        self.cache.set_api_response(
+            "uba", "stations", {}, formatted_data, ttl=self.STATIONS_CACHE_TTL
+        )
+
+        logger.info("Successfully retrieved UBA stations data")
+        return formatted_data
+
     def _format_measures_data(self, raw_data: dict) -> dict[str, Any]:
         """
         Format raw UBA measures API response.
@@ -12,15 +12,19 @@ Important:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 from urllib.parse import quote
 
+import httpx
 import requests
 
 from infrastructure.cache.cache_service import get_cache
 from shared.utils.data_formatter import format_air_quality_data
+from shared.utils.http_client import get_shared_client
 from shared.utils.provider_errors import ProviderServiceError, provider_unavailable_message
+from shared.utils.rate_limiter import rate_limited_session
 
 logger = logging.getLogger(__name__)
 
@@ -41,9 +45,10 @@ class WAQIService:
 
         settings = get_settings()
         self.api_key = api_token or settings.WAQI_API_KEY
-        self.session = requests.Session()
+        self.session = rate_limited_session()
         self.cache_service = get_cache()
-        self.cache_ttl = settings.CACHE_TTL_SECONDS
+        # Past the soft TTL cached responses are served stale while they refresh
+        self.cache_ttl, self.cache_hard_ttl = settings.cache_ttls("waqi")
 
     def _sanitize_token(self, data: Any) -> Any:
         """Remove API tokens from response data to prevent leakage"""
@@ -66,6 +71,61 @@ class WAQIService:
             return data.replace(self.api_key, "[REDACTED]")
         return data
 
+    def _build_request(self, endpoint: str, params: dict | None) -> tuple[str, dict[str, Any]]:
+        """Build the request URL and authenticated query params for an endpoint."""
+        url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
+
+        # Build request params without mutating caller-owned dict
+        request_params: dict[str, Any] = dict(params or {})
+        request_params["token"] = self.api_key
+        return url, request_params
+
+    def _process_response(self, data: Any, status_code: int) -> dict[str, Any]:
+        """Validate a WAQI payload and return a sanitized copy fit for caching."""
+        if data.get("status") != "ok":
+            # Don't leak provider's reason to callers.
+            raise ProviderServiceError(
+                provider="waqi",
+                public_message=provider_unavailable_message("WAQI"),
+                internal_message=f"WAQI status={data.get('status')} data={data.get('data')}",
+                http_status=status_code,
+            )
+
+        # Sanitize token from response before caching and returning
+        return self._sanitize_token(data)
+
+    def _request_error(self, endpoint: str, e: Exception) -> ProviderServiceError:
+        """Wrap a transport error in a non-leaky ProviderServiceError."""
+        status = getattr(getattr(e, "response", None), "status_code", None)
+        body = getattr(getattr(e, "response", None), "text", None)
+        logger.warning("WAQI request failed", extra={"endpoint": endpoint, "status": status})
+        return ProviderServiceError(
+            provider="waqi",
+            public_message=provider_unavailable_message("WAQI"),
+            internal_message=f"{type(e).__name__}: {e}; status={status}; body={body}",
+            http_status=status,
+        )
+
+    def _fetch(self, endpoint: str, url: str, request_params: dict[str, Any]) -> dict[str, Any]:
+        """Fetch and validate one WAQI response, bypassing the cache."""
+        try:
+            response = self.session.get(url, params=request_params, timeout=30)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise self._request_error(endpoint, e) from e
+        return self._process_response(response.json(), response.status_code)
+
+    async def _fetch_async(
+        self, endpoint: str, url: str, request_params: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Async variant of `_fetch` using the shared pooled httpx client."""
+        try:
+            response = await get_shared_client().get(url, params=request_params, timeout=30)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise self._request_error(endpoint, e) from e
+        return self._process_response(response.json(), response.status_code)
+
     def _make_request(self, endpoint: str, params: dict | None = None) -> dict[str, Any]:
         """
         Make request to WAQI API
@@ -77,53 +137,44 @@ class WAQIService:
         Returns:
             JSON response data
         """
-        url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
-
-        # Build request params without mutating caller-owned dict
-        request_params: dict[str, Any] = dict(params or {})
-        request_params["token"] = self.api_key
-
-        # Check Redis cache
-        cached_data = self.cache_service.get_api_response("waqi", endpoint, request_params)
-        if cached_data is not None:
-            # Ensure cached data is also sanitized
-            return self._sanitize_token(cached_data)
+        url, request_params = self._build_request(endpoint, params)
+
+        # Cached response, or one upstream fetch shared by concurrent callers
+        data = self.cache_service.get_or_fetch_api_response(
+            "waqi",
+            endpoint,
+            request_params,
+            lambda: self._fetch(endpoint, url, request_params),
+            self.cache_ttl,
+            self.cache_hard_ttl,
+        )
+        # Ensure cached data is also sanitized
+        return self._sanitize_token(data)
+
+    async def _make_request_async(
+        self, endpoint: str, params: dict | None = None
+    ) -> dict[str, Any]:
+        """
+        Async variant of `_make_request` using the shared pooled httpx client.
 
-        try:
-            response = self.session.get(url, params=request_params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") != "ok":
-                # Don't leak provider's reason to callers.
-                raise ProviderServiceError(
-                    provider="waqi",
-                    public_message=provider_unavailable_message("WAQI"),
-                    internal_message=f"WAQI status={data.get('status')} data={data.get('data')}",
-                    http_status=response.status_code,
-                )
-
-            # Sanitize token from response before caching and returning
-            sanitized_data = self._sanitize_token(data)
-
-            # Cache the sanitized result in Redis
-            self.cache_service.set_api_response(
-                "waqi", endpoint, request_params, sanitized_data, self.cache_ttl
-            )
-            return sanitized_data
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
 
-        except ProviderServiceError:
-            raise
-        except requests.exceptions.RequestException as e:
-            status = getattr(getattr(e, "response", None), "status_code", None)
-            body = getattr(getattr(e, "response", None), "text", None)
-            logger.warning("WAQI request failed", extra={"endpoint": endpoint, "status": status})
-            raise ProviderServiceError(
-                provider="waqi",
-                public_message=provider_unavailable_message("WAQI"),
-                internal_message=f"RequestException: {e}; status={status}; body={body}",
-                http_status=status,
-            ) from e
+        Returns:
+            JSON response data
+        """
+        url, request_params = self._build_request(endpoint, params)
+
+        data = await self.cache_service.get_or_fetch_api_response_async(
+            "waqi",
+            endpoint,
+            request_params,
+            lambda: self._fetch_async(endpoint, url, request_params),
+            self.cache_ttl,
+            self.cache_hard_ttl,
+        )
+        return self._sanitize_token(data)
 
     def get_city_feed(self, city: str) -> dict[str, Any]:
         """
@@ -144,10 +195,23 @@ class WAQIService:
             AQI data with pollutants, time, location info.
             Includes both AQI values and estimated concentrations in µg/m³.
         """
+        data = self._make_request(self._city_feed_endpoint(city))
+        return self._format_city_feed(data, city)
+
+    async def get_city_feed_async(self, city: str) -> dict[str, Any]:
+        """Async variant of `get_city_feed`."""
+        data = await self._make_request_async(self._city_feed_endpoint(city))
+        return self._format_city_feed(data, city)
+
+    @staticmethod
+    def _city_feed_endpoint(city: str) -> str:
+        """Feed endpoint for a city name."""
         # City can contain spaces or unicode; keep it safe in the URL path.
         # WAQI API format: /feed/{city}/ with token as query param
-        safe_city = quote(city.strip(), safe="")
-        data = self._make_request(f"feed/{safe_city}/")
+        return f"feed/{quote(city.strip(), safe='')}/"
+
+    def _format_city_feed(self, data: dict[str, Any], city: str) -> dict[str, Any]:
+        """Format a raw WAQI city feed, adding top-level AQI and concentration fields."""
         formatted = format_air_quality_data(data, source="waqi")
 
         # Add success flag based on WAQI API status
@@ -287,6 +351,10 @@ class WAQIService:
         # WAQI v2 endpoint (matches official demo)
         return self._make_request("v2/search/", {"keyword": keyword})
 
+    async def search_stations_async(self, keyword: str) -> dict[str, Any]:
+        """Async variant of `search_stations`."""
+        return await self._make_request_async("v2/search/", {"keyword": keyword})
+
     def get_map_bounds(self, lat1: float, lng1: float, lat2: float, lng2: float) -> dict[str, Any]:
         """
         Get all stations within map bounds
@@ -304,6 +372,13 @@ class WAQIService:
         latlng = f"{lat1},{lng1},{lat2},{lng2}"
         return self._make_request("v2/map/bounds/", {"latlng": latlng})
 
+    async def get_map_bounds_async(
+        self, lat1: float, lng1: float, lat2: float, lng2: float
+    ) -> dict[str, Any]:
+        """Async variant of `get_map_bounds`."""
+        latlng = f"{lat1},{lng1},{lat2},{lng2}"
+        return await self._make_request_async("v2/map/bounds/", {"latlng": latlng})
+
     def get_station_forecast(self, city: str) -> dict[str, Any]:
         """
         Get air quality forecast for a city (3-8 days)
@@ -318,6 +393,54 @@ class WAQIService:
         feed_data = self.get_city_feed(city)
         return feed_data.get("data", {}).get("forecast", {})
 
+    async def get_station_forecast_async(self, city: str) -> dict[str, Any]:
+        """Async variant of `get_station_forecast`."""
+        feed_data = await self.get_city_feed_async(city)
+        return feed_data.get("data", {}).get("forecast", {})
+
+    def _city_feed_requests(self, cities: list[str]) -> dict[str, tuple[str, str, dict[str, Any]]]:
+        """Build feed requests for several cities: city -> (endpoint, url, request_params)."""
+        feeds = {}
+        for city in cities:
+            endpoint = self._city_feed_endpoint(city)
+            feeds[city] = (endpoint, *self._build_request(endpoint, None))
+        return feeds
+
+    def _cached_city_feeds(
+        self, cities: list[str]
+    ) -> tuple[dict[str, tuple[str, str, dict[str, Any]]], list[Any]]:
+        """
+        Build feed requests for several cities and look them all up in one cache read.
+
+        Returns:
+            (city -> (endpoint, url, request_params), cached raw feeds in the same order)
+        """
+        feeds = self._city_feed_requests(cities)
+        urls = {endpoint: url for endpoint, url, _ in feeds.values()}
+        cached = self.cache_service.get_api_responses(
+            "waqi",
+            [(endpoint, params) for endpoint, _, params in feeds.values()],
+            lambda endpoint, params: self._fetch(endpoint, urls[endpoint], params),
+            self.cache_ttl,
+            self.cache_hard_ttl,
+        )
+        return feeds, cached
+
+    async def _cached_city_feeds_async(
+        self, cities: list[str]
+    ) -> tuple[dict[str, tuple[str, str, dict[str, Any]]], list[Any]]:
+        """Async variant of `_cached_city_feeds`."""
+        feeds = self._city_feed_requests(cities)
+        urls = {endpoint: url for endpoint, url, _ in feeds.values()}
+        cached = await self.cache_service.get_api_responses_async(
+            "waqi",
+            [(endpoint, params) for endpoint, _, params in feeds.values()],
+            lambda endpoint, params: self._fetch_async(endpoint, urls[endpoint], params),
+            self.cache_ttl,
+            self.cache_hard_ttl,
+        )
+        return feeds, cached
+
     def get_multiple_cities(self, cities: list[str]) -> dict[str, dict[str, Any]]:
         """
         Get data for multiple cities
@@ -328,10 +451,17 @@ class WAQIService:
         Returns:
             Dictionary mapping city name to AQI data
         """
+        # One batched cache read for every city, one pipelined write for the misses
+        feeds, cached = self._cached_city_feeds(cities)
+
         results = {}
-        for city in cities:
+        fresh = []
+        for (city, (endpoint, url, request_params)), data in zip(feeds.items(), cached):
             try:
-                results[city] = self.get_city_feed(city)
+                if data is None:
+                    data = self._fetch(endpoint, url, request_params)
+                    fresh.append((endpoint, request_params, data))
+                results[city] = self._format_city_feed(self._sanitize_token(data), city)
             except ProviderServiceError as e:
                 # Non-leaky; keep service usable for agent even when one city fails.
                 results[city] = {"success": False, "message": e.public_message}
@@ -340,8 +470,46 @@ class WAQIService:
                     "success": False,
                     "message": provider_unavailable_message("WAQI"),
                 }
+
+        self.cache_service.set_api_responses("waqi", fresh, self.cache_ttl, self.cache_hard_ttl)
         return results
 
+    async def get_multiple_cities_async(self, cities: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Async variant of `get_multiple_cities`; all city feeds are fetched concurrently.
+
+        Args:
+            cities: List of city names
+
+        Returns:
+            Dictionary mapping city name to AQI data
+        """
+        feeds, cached = await self._cached_city_feeds_async(cities)
+        fresh = []
+
+        async def fetch_city(city: str, data: dict[str, Any] | None) -> dict[str, Any]:
+            endpoint, url, request_params = feeds[city]
+            try:
+                if data is None:
+                    data = await self._fetch_async(endpoint, url, request_params)
+                    fresh.append((endpoint, request_params, data))
+                return self._format_city_feed(self._sanitize_token(data), city)
+            except ProviderServiceError as e:
+                return {"success": False, "message": e.public_message}
+            except Exception:
+                return {
+                    "success": False,
+                    "message": provider_unavailable_message("WAQI"),
+                }
+
+        fetched = await asyncio.gather(
+            *(fetch_city(city, data) for city, data in zip(feeds, cached))
+        )
+        await self.cache_service.set_api_responses_async(
+            "waqi", fresh, self.cache_ttl, self.cache_hard_ttl
+        )
+        return dict(zip(feeds, fetched))
+
     def interpret_aqi(self, aqi: int) -> dict[str, str]:
         """
         Interpret AQI value into health implications
@@ -3,6 +3,10 @@ from typing import Any
 
 import requests
 
+from infrastructure.cache.cache_service import get_cache
+from shared.config.settings import get_settings
+from shared.utils.gazetteer import get_gazetteer
+from shared.utils.http_client import get_shared_client
 from shared.utils.provider_errors import provider_unavailable_message
 
 logger = logging.getLogger(__name__)
@@ -20,28 +24,81 @@ class WeatherService:
     BASE_URL = "https://api.open-meteo.com/v1/forecast"
     GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
 
+    def __init__(self):
+        self.cache_service = get_cache()
+        self.geocode_cache_ttl = get_settings().GEOCODE_CACHE_TTL_SECONDS
+
     def get_coordinates(self, city: str) -> dict[str, float] | None:
-        """Get coordinates for a city name."""
-        try:
-            params = {"name": city, "count": 1, "language": "en", "format": "json"}
+        """Get coordinates for a city name (bundled gazetteer first, then cached Open-Meteo)."""
+        coords = self._gazetteer_coordinates(city)
+        if coords:
+            return coords
+
+        params = {"name": city, "count": 1, "language": "en", "format": "json"}
+
+        def fetch() -> dict[str, Any]:
             response = requests.get(self.GEOCODING_URL, params=params, timeout=10)  # type: ignore
             response.raise_for_status()
-            data = response.json()
-
-            if not data.get("results"):
-                return None
-
-            result = data["results"][0]
-            return {
-                "latitude": result["latitude"],
-                "longitude": result["longitude"],
-                "name": result["name"],
-                "country": result.get("country", ""),
-            }
+            return response.json()
+
+        try:
+            data = self.cache_service.get_or_fetch_api_response(
+                "openmeteo", "geocoding", params, fetch, self.geocode_cache_ttl
+            )
+            return self._coordinates_from(data)
         except Exception as e:
             logger.error(f"Error fetching coordinates for {city}: {e}")
             return None
 
+    async def get_coordinates_async(self, city: str) -> dict[str, float] | None:
+        """Async variant of `get_coordinates` using the shared pooled httpx client."""
+        coords = self._gazetteer_coordinates(city)
+        if coords:
+            return coords
+
+        params = {"name": city, "count": 1, "language": "en", "format": "json"}
+
+        async def fetch() -> dict[str, Any]:
+            response = await get_shared_client().get(self.GEOCODING_URL, params=params, timeout=10)
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            data = await self.cache_service.get_or_fetch_api_response_async(
+                "openmeteo", "geocoding", params, fetch, self.geocode_cache_ttl
+            )
+            return self._coordinates_from(data)
+        except Exception as e:
+            logger.error(f"Error fetching coordinates for {city}: {e}")
+            return None
+
+    @staticmethod
+    def _gazetteer_coordinates(city: str) -> dict[str, Any] | None:
+        """Coordinates of a bundled city, in the `_coordinates_from` shape."""
+        match = get_gazetteer().lookup(city)
+        if match is None:
+            return None
+        return {
+            "latitude": match.latitude,
+            "longitude": match.longitude,
+            "name": match.name,
+            "country": match.country,
+        }
+
+    @staticmethod
+    def _coordinates_from(data: dict[str, Any]) -> dict[str, Any] | None:
+        """Extract the best geocoding match from an Open-Meteo search payload."""
+        if not data.get("results"):
+            return None
+
+        result = data["results"][0]
+        return {
+            "latitude": result["latitude"],
+            "longitude": result["longitude"],
+            "name": result["name"],
+            "country": result.get("country", ""),
+        }
+
     def get_current_weather(self, city: str) -> dict[str, Any]:
         """Get current weather for a city."""
         coords = self.get_coordinates(city)
@@ -49,42 +106,65 @@ class WeatherService:
             return {"error": f"Could not find coordinates for city: {city}"}
 
         try:
-            params = {
-                "latitude": coords["latitude"],
-                "longitude": coords["longitude"],
-                "current": [
-                    "temperature_2m",
-                    "relative_humidity_2m",
-                    "apparent_temperature",
-                    "precipitation",
-                    "rain",
-                    "weather_code",
-                    "wind_speed_10m",
-                ],
-                "timezone": "auto",
-            }
-
-            response = requests.get(self.BASE_URL, params=params, timeout=10)  # type: ignore
+            response = requests.get(self.BASE_URL, params=self._current_params(coords), timeout=10)  # type: ignore
             response.raise_for_status()
-            data = response.json()
+            return self._format_current(coords, response.json())
 
-            current = data.get("current", {})
-            units = data.get("current_units", {})
+        except Exception as e:
+            logger.error(f"Error fetching weather for {city}: {e}")
+            return {"error": provider_unavailable_message("Open-Meteo")}
+
+    async def get_current_weather_async(self, city: str) -> dict[str, Any]:
+        """Async variant of `get_current_weather`."""
+        coords = await self.get_coordinates_async(city)
+        if not coords:
+            return {"error": f"Could not find coordinates for city: {city}"}
 
-            return {
-                "location": f"{coords['name']}, {coords['country']}",
-                "temperature": f"{current.get('temperature_2m')} {units.get('temperature_2m')}",
-                "feels_like": f"{current.get('apparent_temperature')} {units.get('apparent_temperature')}",
-                "humidity": f"{current.get('relative_humidity_2m')} {units.get('relative_humidity_2m')}",
-                "wind_speed": f"{current.get('wind_speed_10m')} {units.get('wind_speed_10m')}",
-                "precipitation": f"{current.get('precipitation')} {units.get('precipitation')}",
-                "condition_code": current.get("weather_code"),
-            }
+        try:
+            response = await get_shared_client().get(
+                self.BASE_URL, params=self._current_params(coords), timeout=10
+            )
+            response.raise_for_status()
+            return self._format_current(coords, response.json())
 
         except Exception as e:
             logger.error(f"Error fetching weather for {city}: {e}")
             return {"error": provider_unavailable_message("Open-Meteo")}
 
+    @staticmethod
+    def _current_params(coords: dict[str, Any]) -> dict[str, Any]:
+        """Build query params for current conditions."""
+        return {
+            "latitude": coords["latitude"],
+            "longitude": coords["longitude"],
+            "current": [
+                "temperature_2m",
+                "relative_humidity_2m",
+                "apparent_temperature",
+                "precipitation",
+                "rain",
+                "weather_code",
+                "wind_speed_10m",
+            ],
+            "timezone": "auto",
+        }
+
+    @staticmethod
+    def _format_current(coords: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+        """Format a current-conditions payload into display strings."""
+        current = data.get("current", {})
+        units = data.get("current_units", {})
+
+        return {
+            "location": f"{coords['name']}, {coords['country']}",
+            "temperature": f"{current.get('temperature_2m')} {units.get('temperature_2m')}",
+            "feels_like": f"{current.get('apparent_temperature')} {units.get('apparent_temperature')}",
+            "humidity": f"{current.get('relative_humidity_2m')} {units.get('relative_humidity_2m')}",
+            "wind_speed": f"{current.get('wind_speed_10m')} {units.get('wind_speed_10m')}",
+            "precipitation": f"{current.get('precipitation')} {units.get('precipitation')}",
+            "condition_code": current.get("weather_code"),
+        }
+
     def get_weather_forecast(self, city: str, days: int = 7) -> dict[str, Any]:
         """Get weather forecast for a city."""
         coords = self.get_coordinates(city)
@@ -92,59 +172,82 @@ class WeatherService:
             return {"error": f"Could not find coordinates for city: {city}"}
 
         try:
-            params = {
-                "latitude": coords["latitude"],
-                "longitude": coords["longitude"],
-                "current": [
-                    "temperature_2m",
-                    "relative_humidity_2m",
-                    "apparent_temperature",
-                    "precipitation",
-                    "weather_code",
-                    "wind_speed_10m",
-                ],
-                "hourly": [
-                    "temperature_2m",
-                    "relative_humidity_2m",
-                    "precipitation_probability",
-                    "precipitation",
-                    "weather_code",
-                    "wind_speed_10m",
-                ],
-                "daily": [
-                    "temperature_2m_max",
-                    "temperature_2m_min",
-                    "precipitation_sum",
-                    "precipitation_probability_max",
-                    "weather_code",
-                    "wind_speed_10m_max",
-                    "sunrise",
-                    "sunset",
-                ],
-                "forecast_days": min(days, 16),  # Max 16 days
-                "timezone": "auto",
-            }
-
-            response = requests.get(self.BASE_URL, params=params, timeout=10)  # type: ignore
+            response = requests.get(self.BASE_URL, params=self._forecast_params(coords, days), timeout=10)  # type: ignore
+            response.raise_for_status()
+            return self._format_forecast(coords, response.json())
+
+        except Exception as e:
+            logger.error(f"Error fetching weather forecast for {city}: {e}")
+            return {"error": provider_unavailable_message("Open-Meteo"), "success": False}
+
+    async def get_weather_forecast_async(self, city: str, days: int = 7) -> dict[str, Any]:
+        """Async variant of `get_weather_forecast`."""
+        coords = await self.get_coordinates_async(city)
+        if not coords:
+            return {"error": f"Could not find coordinates for city: {city}"}
+
+        try:
+            response = await get_shared_client().get(
+                self.BASE_URL, params=self._forecast_params(coords, days), timeout=10
+            )
             response.raise_for_status()
-            data = response.json()
-
-            return {
-                "success": True,
-                "location": f"{coords['name']}, {coords['country']}",
-                "coordinates": {
-                    "latitude": coords["latitude"],
-                    "longitude": coords["longitude"],
-                },
-                "current": data.get("current", {}),
-                "current_units": data.get("current_units", {}),
-                "hourly": data.get("hourly", {}),
-                "hourly_units": data.get("hourly_units", {}),
-                "daily": data.get("daily", {}),
-                "daily_units": data.get("daily_units", {}),
-                "timezone": data.get("timezone", "UTC"),
-            }
+            return self._format_forecast(coords, response.json())
 
         except Exception as e:
             logger.error(f"Error fetching weather forecast for {city}: {e}")
             return {"error": provider_unavailable_message("Open-Meteo"), "success": False}
+
+    @staticmethod
+    def _forecast_params(coords: dict[str, Any], days: int) -> dict[str, Any]:
+        """Build query params for the multi-day forecast."""
+        return {
+            "latitude": coords["latitude"],
+            "longitude": coords["longitude"],
+            "current": [
+                "temperature_2m",
+                "relative_humidity_2m",
+                "apparent_temperature",
+                "precipitation",
+                "weather_code",
+                "wind_speed_10m",
+            ],
+            "hourly": [
+                "temperature_2m",
+                "relative_humidity_2m",
+                "precipitation_probability",
+                "precipitation",
+                "weather_code",
+                "wind_speed_10m",
+            ],
+            "daily": [
+                "temperature_2m_max",
+                "temperature_2m_min",
+                "precipitation_sum",
+                "precipitation_probability_max",
+                "weather_code",
+                "wind_speed_10m_max",
+                "sunrise",
+                "sunset",
+            ],
+            "forecast_days": min(days, 16),  # Max 16 days
+            "timezone": "auto",
+        }
+
+    @staticmethod
+    def _format_forecast(coords: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+        """Format a forecast payload."""
+        return {
+            "success": True,
+            "location": f"{coords['name']}, {coords['country']}",
+            "coordinates": {
+                "latitude": coords["latitude"],
+                "longitude": coords["longitude"],
+            },
+            "current": data.get("current", {}),
+            "current_units": data.get("current_units", {}),
+            "hourly": data.get("hourly", {}),
+            "hourly_units": data.get("hourly_units", {}),
+            "daily": data.get("daily", {}),
+            "daily_units": data.get("daily_units", {}),
+            "timezone": data.get("timezone", "UTC"),
+        }
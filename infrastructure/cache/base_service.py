@@ -8,10 +8,9 @@ All API-based services should inherit from this class.
 import logging
 from typing import Any
 
-import requests
-
 from infrastructure.cache.cache_service import get_cache
 from shared.config.settings import get_settings
+from shared.utils.rate_limiter import rate_limited_session
 
 logger = logging.getLogger(__name__)
 
@@ -50,8 +49,8 @@ class BaseAPIService:
         self.api_key = getattr(settings, api_key_setting, None) if api_key_setting else None
         self.base_url = base_url
 
-        # HTTP session for connection pooling
-        self.session = requests.Session()
+        # HTTP session for connection pooling, rate limited per upstream provider
+        self.session = rate_limited_session()
 
         # Cache configuration
         self.cache_service = get_cache()
@@ -121,34 +120,28 @@ class BaseAPIService:
         cache_key: str,
         request_func,
         cache_ttl: int | None = None,
+        hard_ttl: int | None = None,
     ) -> Any:
         """
         Make a request with caching support.
+
+        Concurrent misses share one request. With a `hard_ttl` above the TTL,
+        responses past the TTL are returned immediately (flagged with
+        cache_stale/cache_age_seconds) while they refresh in the background.
         
         Args:
             namespace: Cache namespace (e.g., 'waqi', 'airqo')
             cache_key: Unique key for caching this request
             request_func: Function that performs the actual request
-            cache_ttl: Cache TTL in seconds (uses default if None)
+            cache_ttl: Cache TTL in seconds (uses default if None); the soft TTL with hard_ttl
+            hard_ttl: Maximum age in seconds at which a stale response is still served
             
         Returns:
             Response data (from cache or fresh request)
         """
-        # Try cache first
-        cached = self.cache_service.get(namespace, cache_key)
-        if cached is not None:
-            self.logger.debug(f"Cache hit for {namespace}:{cache_key}")
-            return cached
-
-        # Make fresh request
-        self.logger.debug(f"Cache miss for {namespace}:{cache_key}")
-        result = request_func()
-
-        # Cache the result
-        ttl = cache_ttl or self.cache_ttl
-        self.cache_service.set(namespace, cache_key, result, ttl=ttl)
-
-        return result
+        return self.cache_service.get_or_fetch(
+            namespace, cache_key, request_func, cache_ttl or self.cache_ttl, hard_ttl
+        )
 
     def __del__(self):
         """Clean up session on destruction."""
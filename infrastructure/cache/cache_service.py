@@ -3,35 +3,96 @@ Redis Cache Service for AI Agent
 
 Provides high-performance caching with Redis for API responses,
 analysis results, and session data.
+
+When Redis is enabled a short-TTL in-process L1 tier sits in front of it, and
+get_or_fetch() collapses concurrent misses for the same key into a single
+upstream fetch and a single Redis write (single-flight).
+
+get_or_fetch() can also serve stale-while-revalidate: past a soft TTL the cached
+value is returned at once, flagged with its age, while one background refresh
+replaces it; only past the hard TTL does a caller wait for the upstream.
+
+Every blocking method has an ``*_async`` twin backed by ``redis.asyncio`` with a
+bounded, health-checked connection pool, for use on the event loop. Both sides
+share a circuit breaker: after repeated Redis failures the cache degrades to
+misses (plus L1) instead of stalling each caller for a socket timeout.
 """
 
+import asyncio
 import hashlib
 import json
-import pickle
-from typing import Any
+import re
+import threading
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
 
 import redis
+import redis.asyncio as aioredis
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialBackoff
 
+from infrastructure.cache.codec import CacheCodec, CodecError
+from infrastructure.cache.memory_cache import MemoryCache
 from shared.config.settings import get_settings
 
+T = TypeVar("T")
+
+# Stale-while-revalidate entries are stored wrapped with their write time
+_SWR_VALUE = "__swr_value__"
+_SWR_STORED_AT = "__swr_stored_at__"
+
+
+class _Flight:
+    """An in-progress fetch that concurrent callers for the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class _AsyncFlight:
+    """An in-progress fetch task shared by the concurrent async callers of one key."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
 
 class RedisCache:
     """Redis-based cache for AI agent data"""
 
+    # Keys per SCAN page and per UNLINK call when clearing a namespace
+    SCAN_BATCH_SIZE = 500
+    # Threads running stale-while-revalidate refreshes for sync callers
+    REFRESH_WORKERS = 4
+
     def __init__(self):
         """Initialize Redis connection"""
         settings = get_settings()
         self.enabled = settings.REDIS_ENABLED
         self.ttl = settings.CACHE_TTL_SECONDS  # Always set TTL
+        self.codec = CacheCodec(
+            serializer=settings.CACHE_SERIALIZER,
+            compress_min_bytes=settings.CACHE_COMPRESSION_MIN_BYTES,
+        )
+
+        connection_kwargs = {
+            "host": settings.REDIS_HOST,
+            "port": settings.REDIS_PORT,
+            "db": settings.REDIS_DB,
+            "password": settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+            "decode_responses": False,  # We'll handle encoding
+            "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+        }
 
         if self.enabled:
             try:
                 self.client = redis.Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB,
-                    password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
-                    decode_responses=False,  # We'll handle encoding
+                    **connection_kwargs,
                     socket_connect_timeout=5,
                     socket_timeout=5,
                 )
@@ -40,14 +101,157 @@ class RedisCache:
             except (redis.ConnectionError, redis.TimeoutError) as e:
                 print(f"Redis connection failed: {e}. Falling back to memory cache.")
                 self.enabled = False
-                self._memory_cache = {}
+
+        if not self.enabled:
+            self._memory_cache = MemoryCache(
+                max_entries=settings.CACHE_MEMORY_MAX_ENTRIES,
+                max_bytes=settings.CACHE_MEMORY_MAX_BYTES,
+            )
+
+        # L1 only makes sense in front of Redis; the memory fallback is already local
+        self.l1_ttl = settings.CACHE_L1_TTL_SECONDS
+        self._l1: MemoryCache | None = None
+        if self.enabled and self.l1_ttl > 0:
+            self._l1 = MemoryCache(
+                max_entries=settings.CACHE_L1_MAX_ENTRIES,
+                max_bytes=settings.CACHE_MEMORY_MAX_BYTES,
+            )
+
+        # Single-flight bookkeeping: cache key -> in-progress fetch
+        self._flights: dict[str, _Flight] = {}
+        self._async_flights: dict[str, _AsyncFlight] = {}
+        self._flights_lock = threading.Lock()
+
+        # Stale-while-revalidate: keys being refreshed, and the refresh workers
+        self._refreshing: set[str] = set()
+        self._refresh_executor: ThreadPoolExecutor | None = None
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+        # Async client: created lazily per event loop from a bounded pool.
+        # Short timeouts plus one retry with reconnect; idle connections are
+        # PINGed before reuse (health_check_interval).
+        self._async_pool_kwargs = {
+            **connection_kwargs,
+            "max_connections": settings.REDIS_MAX_CONNECTIONS,
+            "timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,  # Wait for a free connection
+            "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            "socket_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            "retry": AsyncRetry(ExponentialBackoff(cap=0.5, base=0.05), retries=1),
+        }
+        self._async_client: aioredis.Redis | None = None
+        self._async_client_loop: asyncio.AbstractEventLoop | None = None
+
+        # Circuit breaker shared by the sync and async clients
+        self.circuit_failure_threshold = settings.REDIS_CIRCUIT_FAILURE_THRESHOLD
+        self.circuit_reset_seconds = settings.REDIS_CIRCUIT_RESET_SECONDS
+        self._redis_failures = 0
+        self._circuit_open_until = 0.0
+
+    def _redis_available(self) -> bool:
+        """False while the circuit is open (a trial call is let through after the reset delay)."""
+        if self._redis_failures < self.circuit_failure_threshold:
+            return True
+        return time.monotonic() >= self._circuit_open_until
+
+    def _record_redis_failure(self, e: Exception) -> None:
+        self._redis_failures += 1
+        if self._redis_failures >= self.circuit_failure_threshold:
+            self._circuit_open_until = time.monotonic() + self.circuit_reset_seconds
+            print(
+                f"Redis error: {e}. Circuit open for {self.circuit_reset_seconds}s "
+                f"after {self._redis_failures} consecutive failures."
+            )
         else:
-            self._memory_cache = {}
+            print(f"Redis error: {e}")
+
+    def run(self, op: Callable[[redis.Redis], T], default: T = None) -> T:
+        """
+        Run a command on the sync client behind the circuit breaker.
+
+        Args:
+            op: Function taking the client, e.g. ``lambda r: r.get(key)``
+            default: Returned when Redis is disabled, the circuit is open or the call fails
+
+        Returns:
+            The command's result, or `default`
+        """
+        if not self.enabled or not self._redis_available():
+            return default
+        try:
+            result = op(self.client)
+        except Exception as e:
+            self._record_redis_failure(e)
+            return default
+        self._redis_failures = 0
+        return result
+
+    def _async_redis(self) -> aioredis.Redis:
+        """Pooled async client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            pool = aioredis.BlockingConnectionPool(**self._async_pool_kwargs)
+            self._async_client = aioredis.Redis.from_pool(pool)
+            self._async_client_loop = loop
+        return self._async_client
+
+    async def run_async(
+        self, op: Callable[[aioredis.Redis], Awaitable[T]], default: T = None
+    ) -> T:
+        """
+        Run a command on the pooled async client behind the circuit breaker.
+
+        Args:
+            op: Coroutine function taking the client, e.g. ``lambda r: r.get(key)``
+            default: Returned when Redis is disabled, the circuit is open or the call fails
+
+        Returns:
+            The command's result, or `default`
+        """
+        if not self.enabled or not self._redis_available():
+            return default
+        try:
+            result = await op(self._async_redis())
+        except Exception as e:
+            self._record_redis_failure(e)
+            return default
+        self._redis_failures = 0
+        return result
+
+    def _l1_get(self, cache_key: str) -> Any | None:
+        return self._l1.get(cache_key) if self._l1 is not None else None
+
+    def _l1_set(self, cache_key: str, value: Any, ttl: int) -> None:
+        if self._l1 is not None:
+            self._l1.set(cache_key, value, min(ttl, self.l1_ttl))
+
+    def _load(self, cache_key: str, payload: Any) -> Any | None:
+        """Decode a Redis payload and remember it in L1. None for misses and stale formats."""
+        # Redis returns bytes when decode_responses=False; anything else is unexpected
+        if not isinstance(payload, bytes):
+            return None
+        try:
+            value = self.codec.decode(payload)
+        except CodecError:
+            # Written by an older codec version: treat as a miss
+            return None
+        self._l1_set(cache_key, value, self.l1_ttl)
+        return value
+
+    def _ttl_for(self, ttl: int | Mapping[str, int] | None, key: str) -> int:
+        key_ttl = ttl.get(key) if isinstance(ttl, Mapping) else ttl
+        return key_ttl or self.ttl
 
     def _make_key(self, namespace: str, key: str) -> str:
         """Create namespaced cache key"""
         return f"airquality:{namespace}:{key}"
 
+    @staticmethod
+    def _unwrap(entry: Any) -> tuple[Any, float | None]:
+        """Split a stored entry into (value, stored_at); stored_at is None for plain entries."""
+        if isinstance(entry, dict) and _SWR_VALUE in entry:
+            return entry[_SWR_VALUE], entry.get(_SWR_STORED_AT)
+        return entry, None
+
     def get(self, namespace: str, key: str) -> Any | None:
         """
         Get value from cache
@@ -59,24 +263,34 @@ class RedisCache:
         Returns:
             Cached value or None
         """
+        return self._unwrap(self._get_entry(namespace, key))[0]
+
+    async def get_async(self, namespace: str, key: str) -> Any | None:
+        """Async twin of get"""
+        return self._unwrap(await self._get_entry_async(namespace, key))[0]
+
+    def _get_entry(self, namespace: str, key: str) -> Any | None:
+        """Stored entry as written (stale-while-revalidate entries still wrapped)."""
         cache_key = self._make_key(namespace, key)
 
-        if self.enabled:
-            try:
-                value = self.client.get(cache_key)
-                if value is not None:
-                    # Redis returns bytes when decode_responses=False
-                    if isinstance(value, bytes):
-                        return pickle.loads(value)
-                    else:
-                        # Fallback for unexpected types
-                        return None
-            except Exception as e:
-                print(f"Redis get error: {e}")
-        else:
+        if not self.enabled:
+            return self._memory_cache.get(cache_key)
+
+        value = self._l1_get(cache_key)
+        if value is not None:
+            return value
+        return self._load(cache_key, self.run(lambda r: r.get(cache_key)))
+
+    async def _get_entry_async(self, namespace: str, key: str) -> Any | None:
+        cache_key = self._make_key(namespace, key)
+
+        if not self.enabled:
             return self._memory_cache.get(cache_key)
 
-        return None
+        value = self._l1_get(cache_key)
+        if value is not None:
+            return value
+        return self._load(cache_key, await self.run_async(lambda r: r.get(cache_key)))
 
     def set(self, namespace: str, key: str, value: Any, ttl: int | None = None) -> bool:
         """
@@ -94,55 +308,497 @@ class RedisCache:
         cache_key = self._make_key(namespace, key)
         ttl = ttl or self.ttl
 
-        if self.enabled:
-            try:
-                serialized = pickle.dumps(value)
-                self.client.setex(cache_key, ttl, serialized)
-                return True
-            except Exception as e:
-                print(f"Redis set error: {e}")
-                return False
-        else:
-            self._memory_cache[cache_key] = value
+        if not self.enabled:
+            return self._memory_cache.set(cache_key, value, ttl)
+
+        payload = self.codec.encode(value)
+        stored = self.run(lambda r: r.setex(cache_key, ttl, payload), False)
+        if stored:
+            self._l1_set(cache_key, value, ttl)
+        return bool(stored)
+
+    async def set_async(self, namespace: str, key: str, value: Any, ttl: int | None = None) -> bool:
+        """Async twin of set"""
+        cache_key = self._make_key(namespace, key)
+        ttl = ttl or self.ttl
+
+        if not self.enabled:
+            return self._memory_cache.set(cache_key, value, ttl)
+
+        payload = self.codec.encode(value)
+        stored = await self.run_async(lambda r: r.setex(cache_key, ttl, payload), False)
+        if stored:
+            self._l1_set(cache_key, value, ttl)
+        return bool(stored)
+
+    def get_many(
+        self,
+        namespace: str,
+        keys: list[str],
+        fetch: Callable[[str], Any] | None = None,
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Get several values in one round trip (L1 first, then a single MGET)
+
+        With `fetch` and a `hard_ttl` above `ttl`, stale-while-revalidate entries
+        past their soft TTL are served as get_or_fetch serves them: flagged stale,
+        with one background `fetch(key)` refresh per key.
+
+        Args:
+            namespace: Cache namespace
+            keys: Cache keys
+            fetch: Callable producing a fresh value for one key
+            ttl: Soft TTL in seconds (default: from config)
+            hard_ttl: Maximum age in seconds at which a stale value is still served
+
+        Returns:
+            Mapping of key -> value for the keys that were found
+        """
+        found, missing = self._get_many_local(namespace, keys)
+        if missing:
+            cache_keys = [self._make_key(namespace, key) for key in missing]
+            payloads = self.run(lambda r: r.mget(cache_keys), [])
+            self._load_many(found, missing, cache_keys, payloads)
+
+        values = {}
+        for key, (value, age) in self._unwrap_many(found, ttl, hard_ttl).items():
+            if age is not None and fetch is not None:
+                self._refresh_in_background(
+                    namespace, key, partial(fetch, key), ttl or self.ttl, hard_ttl
+                )
+            values[key] = value
+        return values
+
+    async def get_many_async(
+        self,
+        namespace: str,
+        keys: list[str],
+        fetch: Callable[[str], Awaitable[Any]] | None = None,
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> dict[str, Any]:
+        """Async twin of get_many"""
+        found, missing = self._get_many_local(namespace, keys)
+        if missing:
+            cache_keys = [self._make_key(namespace, key) for key in missing]
+            payloads = await self.run_async(lambda r: r.mget(cache_keys), [])
+            self._load_many(found, missing, cache_keys, payloads)
+
+        values = {}
+        for key, (value, age) in self._unwrap_many(found, ttl, hard_ttl).items():
+            if age is not None and fetch is not None:
+                self._refresh_in_background_async(
+                    namespace, key, partial(fetch, key), ttl or self.ttl, hard_ttl
+                )
+            values[key] = value
+        return values
+
+    def _unwrap_many(
+        self, entries: dict[str, Any], ttl: int | None, hard_ttl: int | None
+    ) -> dict[str, tuple[Any, float | None]]:
+        """key -> (value, stale age); stale dicts are flagged as in get_or_fetch."""
+        unwrapped = {}
+        for key, entry in entries.items():
+            value, stored_at = self._unwrap(entry)
+            age = self._stale_age(stored_at, ttl or self.ttl, hard_ttl)
+            unwrapped[key] = (value if age is None else self._mark_stale(value, age), age)
+        return unwrapped
+
+    def _get_many_local(self, namespace: str, keys: list[str]) -> tuple[dict[str, Any], list[str]]:
+        """Serve what we can in-process. Returns (found, keys still to ask Redis for)."""
+        store = self._l1 if self.enabled else self._memory_cache
+        found: dict[str, Any] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = store.get(self._make_key(namespace, key)) if store is not None else None
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        # The memory fallback is authoritative: nothing more to look up
+        return found, missing if self.enabled else []
+
+    def _load_many(
+        self, found: dict[str, Any], keys: list[str], cache_keys: list[str], payloads: list[Any]
+    ) -> None:
+        for key, cache_key, payload in zip(keys, cache_keys, payloads):
+            value = self._load(cache_key, payload)
+            if value is not None:
+                found[key] = value
+
+    def set_many(
+        self,
+        namespace: str,
+        items: Mapping[str, Any],
+        ttl: int | Mapping[str, int] | None = None,
+        hard_ttl: int | None = None,
+    ) -> bool:
+        """
+        Set several values in one pipelined round trip
+
+        Args:
+            namespace: Cache namespace
+            items: Mapping of key -> value
+            ttl: One TTL for every key, or a per-key mapping (missing keys use the default)
+            hard_ttl: With a single `ttl` below it, store stale-while-revalidate
+                entries that get_or_fetch and get_many serve until `hard_ttl`
+
+        Returns:
+            True if successful
+        """
+        if not items:
+            return True
+        items, ttl = self._swr_items(items, ttl, hard_ttl)
+        if not self.enabled:
+            for key, value in items.items():
+                cache_key = self._make_key(namespace, key)
+                self._memory_cache.set(cache_key, value, self._ttl_for(ttl, key))
+            return True
+
+        commands = self._setex_commands(namespace, items, ttl)
+
+        def op(r: redis.Redis) -> bool:
+            pipe = r.pipeline(transaction=False)
+            for cache_key, key_ttl, payload in commands:
+                pipe.setex(cache_key, key_ttl, payload)
+            pipe.execute()
+            return True
+
+        stored = self.run(op, False)
+        if stored:
+            self._remember_many(namespace, items, ttl)
+        return stored
+
+    async def set_many_async(
+        self,
+        namespace: str,
+        items: Mapping[str, Any],
+        ttl: int | Mapping[str, int] | None = None,
+        hard_ttl: int | None = None,
+    ) -> bool:
+        """Async twin of set_many"""
+        if not items:
+            return True
+        items, ttl = self._swr_items(items, ttl, hard_ttl)
+        if not self.enabled:
+            return self.set_many(namespace, items, ttl)
+
+        commands = self._setex_commands(namespace, items, ttl)
+
+        async def op(r: aioredis.Redis) -> bool:
+            async with r.pipeline(transaction=False) as pipe:
+                for cache_key, key_ttl, payload in commands:
+                    pipe.setex(cache_key, key_ttl, payload)
+                await pipe.execute()
             return True
 
+        stored = await self.run_async(op, False)
+        if stored:
+            self._remember_many(namespace, items, ttl)
+        return stored
+
+    def _swr_items(
+        self,
+        items: Mapping[str, Any],
+        ttl: int | Mapping[str, int] | None,
+        hard_ttl: int | None,
+    ) -> tuple[Mapping[str, Any], int | Mapping[str, int] | None]:
+        """(items, ttl) to write: wrapped and kept until `hard_ttl` when it applies."""
+        if isinstance(ttl, Mapping) or not self._swr(ttl or self.ttl, hard_ttl):
+            return items, ttl
+        stored_at = time.time()
+        entries = {key: {_SWR_VALUE: value, _SWR_STORED_AT: stored_at} for key, value in items.items()}
+        return entries, hard_ttl
+
+    def _setex_commands(
+        self, namespace: str, items: Mapping[str, Any], ttl: int | Mapping[str, int] | None
+    ) -> list[tuple[str, int, bytes]]:
+        return [
+            (self._make_key(namespace, key), self._ttl_for(ttl, key), self.codec.encode(value))
+            for key, value in items.items()
+        ]
+
+    def _remember_many(
+        self, namespace: str, items: Mapping[str, Any], ttl: int | Mapping[str, int] | None
+    ) -> None:
+        for key, value in items.items():
+            self._l1_set(self._make_key(namespace, key), value, self._ttl_for(ttl, key))
+
     def delete(self, namespace: str, key: str) -> bool:
         """Delete key from cache"""
         cache_key = self._make_key(namespace, key)
 
-        if self.enabled:
-            try:
-                self.client.delete(cache_key)
-                return True
-            except Exception as e:
-                print(f"Redis delete error: {e}")
-                return False
-        else:
-            self._memory_cache.pop(cache_key, None)
+        if not self.enabled:
+            self._memory_cache.delete(cache_key)
+            return True
+
+        if self._l1 is not None:
+            self._l1.delete(cache_key)
+        return self.run(lambda r: r.delete(cache_key) >= 0, False)
+
+    async def delete_async(self, namespace: str, key: str) -> bool:
+        """Async twin of delete"""
+        cache_key = self._make_key(namespace, key)
+
+        if not self.enabled:
+            self._memory_cache.delete(cache_key)
+            return True
+
+        if self._l1 is not None:
+            self._l1.delete(cache_key)
+
+        async def op(r: aioredis.Redis) -> bool:
+            await r.delete(cache_key)
             return True
 
+        return await self.run_async(op, False)
+
     def clear_namespace(self, namespace: str) -> bool:
-        """Clear all keys in a namespace"""
+        """
+        Clear all keys in a namespace
+
+        Walks the namespace with incremental SCAN and frees keys with batched
+        UNLINK, so Redis is never blocked the way KEYS/DEL would block it.
+        """
         if self.enabled:
-            try:
-                pattern = self._make_key(namespace, "*")
-                keys = self.client.keys(pattern)
-                if keys and isinstance(keys, list):
-                    # Ensure all keys are bytes (as expected with decode_responses=False)
-                    valid_keys = [k for k in keys if isinstance(k, (str, bytes))]
-                    if valid_keys:
-                        self.client.delete(*valid_keys)
+            if self._l1 is not None:
+                self._l1.delete_prefix(self._make_key(namespace, ""))
+            # Escape glob characters so a namespace can never match outside itself
+            prefix = re.sub(r"([*?\[\]\\])", r"\\\1", self._make_key(namespace, ""))
+
+            def op(r: redis.Redis) -> bool:
+                batch = []
+                for key in r.scan_iter(match=f"{prefix}*", count=self.SCAN_BATCH_SIZE):
+                    batch.append(key)
+                    if len(batch) >= self.SCAN_BATCH_SIZE:
+                        r.unlink(*batch)
+                        batch.clear()
+                if batch:
+                    r.unlink(*batch)
                 return True
-            except Exception as e:
-                print(f"Redis clear error: {e}")
-                return False
+
+            return self.run(op, False)
         else:
-            prefix = self._make_key(namespace, "")
-            keys_to_delete = [k for k in self._memory_cache.keys() if k.startswith(prefix)]
-            for key in keys_to_delete:
-                del self._memory_cache[key]
+            self._memory_cache.delete_prefix(self._make_key(namespace, ""))
+            return True
+
+    def get_or_fetch(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Any],
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> Any:
+        """
+        Get a cached value, or compute it with `fetch` and cache it.
+
+        Concurrent callers missing on the same key share one `fetch` call: the
+        first becomes the leader, the rest wait for its result (or exception).
+        Exceptions are never cached.
+
+        With a `hard_ttl` above `ttl` the entry is served stale-while-revalidate:
+        once older than `ttl` it is still returned immediately (dicts are flagged
+        with cache_stale/cache_age_seconds) while a single background refresh
+        replaces it. Entries older than `hard_ttl` are gone and fetched inline.
+
+        Args:
+            namespace: Cache namespace
+            key: Cache key
+            fetch: Zero-argument callable producing the value to cache
+            ttl: Time to live (soft TTL with `hard_ttl`) in seconds (default: from config)
+            hard_ttl: Maximum age in seconds at which a stale value is still served
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        ttl = ttl or self.ttl
+        value, stored_at = self._unwrap(self._get_entry(namespace, key))
+        if value is not None:
+            age = self._stale_age(stored_at, ttl, hard_ttl)
+            if age is not None:
+                self._refresh_in_background(namespace, key, fetch, ttl, hard_ttl)
+                return self._mark_stale(value, age)
+            return value
+
+        cache_key = self._make_key(namespace, key)
+        with self._flights_lock:
+            flight = self._flights.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[cache_key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = fetch()
+            self._store(namespace, key, flight.value, ttl, hard_ttl)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(cache_key, None)
+            flight.done.set()
+
+    async def get_or_fetch_async(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> Any:
+        """Async twin of get_or_fetch: concurrent tasks share one awaited `fetch`."""
+        ttl = ttl or self.ttl
+        value, stored_at = self._unwrap(await self._get_entry_async(namespace, key))
+        if value is not None:
+            age = self._stale_age(stored_at, ttl, hard_ttl)
+            if age is not None:
+                self._refresh_in_background_async(namespace, key, fetch, ttl, hard_ttl)
+                return self._mark_stale(value, age)
+            return value
+
+        cache_key = self._make_key(namespace, key)
+        loop = asyncio.get_running_loop()
+        flight = self._async_flights.get(cache_key)
+        if flight is None or flight.task.get_loop() is not loop:
+            # The fetch runs in its own task, so cancelling one caller (a hedged
+            # source losing its race, a deadline) does not fail the others
+            flight = self._async_flights[cache_key] = _AsyncFlight(
+                loop.create_task(self._fetch_and_store_async(namespace, key, fetch, ttl, hard_ttl))
+            )
+            flight.task.add_done_callback(lambda task: self._end_async_flight(cache_key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller gave up: stop the upstream call
+                flight.task.cancel()
+
+    async def _fetch_and_store_async(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: int,
+        hard_ttl: int | None,
+    ) -> Any:
+        value = await fetch()
+        await self._store_async(namespace, key, value, ttl, hard_ttl)
+        return value
+
+    def _end_async_flight(self, cache_key: str, flight: _AsyncFlight) -> None:
+        if self._async_flights.get(cache_key) is flight:
+            del self._async_flights[cache_key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # Mark retrieved; the callers (if any) still receive it
+
+    @staticmethod
+    def _swr(ttl: int, hard_ttl: int | None) -> bool:
+        return hard_ttl is not None and hard_ttl > ttl
+
+    def _stale_age(self, stored_at: float | None, ttl: int, hard_ttl: int | None) -> float | None:
+        """Age in seconds of an entry past its soft TTL, else None (fresh or plain entry)."""
+        if stored_at is None or not self._swr(ttl, hard_ttl):
+            return None
+        age = time.time() - stored_at
+        return age if age >= ttl else None
+
+    @staticmethod
+    def _mark_stale(value: Any, age: float) -> Any:
+        """Flag a stale dict result with its age; other values are returned as-is."""
+        if isinstance(value, dict):
+            return {**value, "cache_stale": True, "cache_age_seconds": int(age)}
+        return value
+
+    def _store(
+        self, namespace: str, key: str, value: Any, ttl: int, hard_ttl: int | None
+    ) -> bool:
+        if self._swr(ttl, hard_ttl):
+            # Wall-clock write time, so every process agrees on the entry's age
+            entry = {_SWR_VALUE: value, _SWR_STORED_AT: time.time()}
+            return self.set(namespace, key, entry, hard_ttl)
+        return self.set(namespace, key, value, ttl)
+
+    async def _store_async(
+        self, namespace: str, key: str, value: Any, ttl: int, hard_ttl: int | None
+    ) -> bool:
+        if self._swr(ttl, hard_ttl):
+            entry = {_SWR_VALUE: value, _SWR_STORED_AT: time.time()}
+            return await self.set_async(namespace, key, entry, hard_ttl)
+        return await self.set_async(namespace, key, value, ttl)
+
+    def _claim_refresh(self, cache_key: str) -> bool:
+        """True if the caller should refresh `cache_key` (no refresh already running)."""
+        with self._flights_lock:
+            if cache_key in self._refreshing:
+                return False
+            self._refreshing.add(cache_key)
             return True
 
+    def _refresh_done(self, cache_key: str) -> None:
+        with self._flights_lock:
+            self._refreshing.discard(cache_key)
+
+    def _refresh_in_background(
+        self, namespace: str, key: str, fetch: Callable[[], Any], ttl: int, hard_ttl: int | None
+    ) -> None:
+        cache_key = self._make_key(namespace, key)
+        if not self._claim_refresh(cache_key):
+            return
+
+        def refresh() -> None:
+            try:
+                self._store(namespace, key, fetch(), ttl, hard_ttl)
+            except Exception as e:
+                # The stale entry stays until hard_ttl; the next stale hit retries
+                print(f"Cache refresh error for {cache_key}: {e}")
+            finally:
+                self._refresh_done(cache_key)
+
+        with self._flights_lock:
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=self.REFRESH_WORKERS, thread_name_prefix="cache-refresh"
+                )
+        self._refresh_executor.submit(refresh)
+
+    def _refresh_in_background_async(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: int,
+        hard_ttl: int | None,
+    ) -> None:
+        cache_key = self._make_key(namespace, key)
+        if not self._claim_refresh(cache_key):
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._store_async(namespace, key, await fetch(), ttl, hard_ttl)
+            except Exception as e:
+                print(f"Cache refresh error for {cache_key}: {e}")
+            finally:
+                self._refresh_done(cache_key)
+
+        # Keep a reference so the task is not garbage collected mid-refresh
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
     def clear(self, namespace: str) -> bool:
         """Alias for clear_namespace for backward compatibility"""
         return self.clear_namespace(namespace)
@@ -166,6 +822,119 @@ class RedisCache:
         key = self.hash_params(endpoint=endpoint, **params)
         return self.set(f"api:{service}", key, response, ttl)
 
+    async def get_api_response_async(
+        self, service: str, endpoint: str, params: dict
+    ) -> Any | None:
+        """Async twin of get_api_response"""
+        key = self.hash_params(endpoint=endpoint, **params)
+        return await self.get_async(f"api:{service}", key)
+
+    async def set_api_response_async(
+        self, service: str, endpoint: str, params: dict, response: Any, ttl: int | None = None
+    ) -> bool:
+        """Async twin of set_api_response"""
+        key = self.hash_params(endpoint=endpoint, **params)
+        return await self.set_async(f"api:{service}", key, response, ttl)
+
+    def get_api_responses(
+        self,
+        service: str,
+        requests: list[tuple[str, dict]],
+        fetch: Callable[[str, dict], Any] | None = None,
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> list[Any | None]:
+        """
+        Batch get_api_response: one lookup per (endpoint, params), None on a miss.
+        Stale entries are refreshed with `fetch(endpoint, params)` (see get_many).
+        """
+        keys = [self.hash_params(endpoint=endpoint, **params) for endpoint, params in requests]
+        found = self.get_many(
+            f"api:{service}", keys, self._api_fetch(fetch, keys, requests), ttl, hard_ttl
+        )
+        return [found.get(key) for key in keys]
+
+    def set_api_responses(
+        self,
+        service: str,
+        responses: list[tuple[str, dict, Any]],
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> bool:
+        """Batch set_api_response for (endpoint, params, response) entries"""
+        items = {
+            self.hash_params(endpoint=endpoint, **params): response
+            for endpoint, params, response in responses
+        }
+        return self.set_many(f"api:{service}", items, ttl, hard_ttl)
+
+    async def get_api_responses_async(
+        self,
+        service: str,
+        requests: list[tuple[str, dict]],
+        fetch: Callable[[str, dict], Awaitable[Any]] | None = None,
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> list[Any | None]:
+        """Async twin of get_api_responses"""
+        keys = [self.hash_params(endpoint=endpoint, **params) for endpoint, params in requests]
+        found = await self.get_many_async(
+            f"api:{service}", keys, self._api_fetch(fetch, keys, requests), ttl, hard_ttl
+        )
+        return [found.get(key) for key in keys]
+
+    async def set_api_responses_async(
+        self,
+        service: str,
+        responses: list[tuple[str, dict, Any]],
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> bool:
+        """Async twin of set_api_responses"""
+        items = {
+            self.hash_params(endpoint=endpoint, **params): response
+            for endpoint, params, response in responses
+        }
+        return await self.set_many_async(f"api:{service}", items, ttl, hard_ttl)
+
+    @staticmethod
+    def _api_fetch(
+        fetch: Callable[[str, dict], Any] | None,
+        keys: list[str],
+        requests: list[tuple[str, dict]],
+    ) -> Callable[[str], Any] | None:
+        """Per-key fetch for get_many from a per-(endpoint, params) one."""
+        if fetch is None:
+            return None
+        by_key = dict(zip(keys, requests, strict=True))
+        return lambda key: fetch(*by_key[key])
+
+    def get_or_fetch_api_response(
+        self,
+        service: str,
+        endpoint: str,
+        params: dict,
+        fetch: Callable[[], Any],
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> Any:
+        """Cached API response, fetched once across concurrent callers on a miss"""
+        key = self.hash_params(endpoint=endpoint, **params)
+        return self.get_or_fetch(f"api:{service}", key, fetch, ttl, hard_ttl)
+
+    async def get_or_fetch_api_response_async(
+        self,
+        service: str,
+        endpoint: str,
+        params: dict,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: int | None = None,
+        hard_ttl: int | None = None,
+    ) -> Any:
+        """Async twin of get_or_fetch_api_response"""
+        key = self.hash_params(endpoint=endpoint, **params)
+        return await self.get_or_fetch_async(f"api:{service}", key, fetch, ttl, hard_ttl)
+
     def get_analysis(self, analysis_type: str, data_hash: str) -> Any | None:
         """Get cached analysis result"""
         return self.get("analysis", f"{analysis_type}:{data_hash}")
@@ -176,14 +945,47 @@ class RedisCache:
         """Cache analysis result"""
         return self.set("analysis", f"{analysis_type}:{data_hash}", result, ttl)
 
+    def purge_expired(self) -> int:
+        """Drop expired in-process entries (Redis expires its own keys)."""
+        if self.enabled:
+            return self._l1.purge_expired() if self._l1 is not None else 0
+        return self._memory_cache.purge_expired()
+
+    def stats(self) -> dict[str, Any]:
+        """Cache backend and, for the in-process tier, hit/miss/eviction counters"""
+        if self.enabled:
+            stats: dict[str, Any] = {
+                "backend": "redis",
+                "circuit_open": not self._redis_available(),
+                "consecutive_failures": self._redis_failures,
+            }
+            if self._l1 is not None:
+                stats["l1"] = self._l1.stats()
+            return stats
+        return {"backend": "memory", **self._memory_cache.stats()}
+
     def close(self):
         """Close Redis connection"""
+        if self._refresh_executor is not None:
+            self._refresh_executor.shutdown(wait=False, cancel_futures=True)
         if self.enabled:
             try:
                 self.client.close()
             except Exception:
                 pass
 
+    async def aclose(self):
+        """Close the async client and its connection pool (call from the owning loop)"""
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        if self._async_client is not None:
+            try:
+                await self._async_client.aclose()
+            except Exception:
+                pass
+            self._async_client = None
+            self._async_client_loop = None
+
 
 # Global cache instance
 _cache_instance: RedisCache | None = None
@@ -0,0 +1,169 @@
+"""
+Cache Payload Codec
+
+Serializes values stored in Redis. Every payload starts with a two-byte header:
+
+    byte 0: codec version (CODEC_VERSION)
+    byte 1: format flags (serializer id, plus FLAG_ZSTD when compressed)
+
+Entries written by another codec version (including the raw pickles written
+before this header existed) and corrupt payloads fail to decode with CodecError
+and are treated as cache misses, so a deploy never has to flush Redis.
+
+- JSON via orjson (stdlib json if orjson is not installed) for API payloads
+- Pickle fallback for values JSON cannot represent faithfully (non-str keys,
+  datetimes, NaN/infinity, custom objects); tuples come back as lists
+- zstd compression above a size threshold (skipped if zstandard is not installed)
+"""
+
+import json
+import math
+import pickle
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None  # type: ignore
+    ZSTD_AVAILABLE = False
+
+# Bump when the payload layout changes; older entries then read as misses
+CODEC_VERSION = 1
+
+FORMAT_JSON = 0x01
+FORMAT_PICKLE = 0x02
+FLAG_ZSTD = 0x80
+
+SERIALIZERS = ("json", "pickle")
+
+
+class CodecError(ValueError):
+    """Raised when a payload was not written by this codec version or is corrupt."""
+
+
+def _reject(value: Any) -> Any:
+    """orjson `default` hook: refuse anything JSON would not round-trip."""
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _has_non_finite(value: Any) -> bool:
+    """True if a NaN or infinity is nested anywhere in dicts/lists/tuples."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+class CacheCodec:
+    """Versioned, optionally compressed encoder for cache payloads."""
+
+    def __init__(
+        self,
+        serializer: str = "json",
+        compress_min_bytes: int = 4096,
+        compression_level: int = 3,
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            serializer: "json" (pickle only as fallback) or "pickle"
+            compress_min_bytes: Compress payloads at least this large (0 disables compression)
+            compression_level: zstd compression level
+        """
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}. Use one of {SERIALIZERS}")
+
+        self.serializer = serializer
+        self.compress_min_bytes = compress_min_bytes if ZSTD_AVAILABLE else 0
+        self._compressor = None
+        self._decompressor = None
+        if ZSTD_AVAILABLE:
+            self._compressor = zstandard.ZstdCompressor(level=compression_level)
+            self._decompressor = zstandard.ZstdDecompressor()
+
+    def _dumps_json(self, value: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            # Datetimes and dataclasses would come back as str/dict: let them fall back to pickle
+            body = orjson.dumps(
+                value,
+                default=_reject,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+            # orjson writes NaN/infinity as null; only payloads with a null can hide one
+            if b"null" in body and _has_non_finite(value):
+                raise ValueError("Out of range float values are not JSON compliant")
+            return body
+        return json.dumps(value, separators=(",", ":"), allow_nan=False).encode()
+
+    @staticmethod
+    def _loads_json(body: bytes | memoryview) -> Any:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(body)
+        return json.loads(bytes(body))
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value into a versioned payload."""
+        body = None
+        fmt = FORMAT_PICKLE
+        if self.serializer == "json":
+            try:
+                body = self._dumps_json(value)
+                fmt = FORMAT_JSON
+            except (TypeError, ValueError):
+                pass
+        if body is None:
+            body = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if self.compress_min_bytes and len(body) >= self.compress_min_bytes:
+            compressed = self._compressor.compress(body)
+            if len(compressed) < len(body):
+                body = compressed
+                fmt |= FLAG_ZSTD
+
+        return bytes((CODEC_VERSION, fmt)) + body
+
+    def decode(self, payload: bytes) -> Any:
+        """
+        Deserialize a payload produced by `encode`.
+
+        Raises:
+            CodecError: Payload has another version, an unknown/unsupported format,
+                or does not decompress/deserialize
+        """
+        if len(payload) < 2 or payload[0] != CODEC_VERSION:
+            raise CodecError("Cache payload version mismatch")
+
+        fmt = payload[1]
+        body = memoryview(payload)[2:]
+        if fmt & FLAG_ZSTD:
+            if self._decompressor is None:
+                raise CodecError("Cache payload is zstd-compressed but zstandard is not installed")
+            try:
+                body = self._decompressor.decompress(body)
+            except zstandard.ZstdError as e:
+                raise CodecError(f"Corrupt compressed cache payload: {e}") from e
+            fmt &= ~FLAG_ZSTD
+
+        if fmt not in (FORMAT_JSON, FORMAT_PICKLE):
+            raise CodecError(f"Unknown cache payload format: {fmt:#x}")
+        try:
+            if fmt == FORMAT_JSON:
+                return self._loads_json(body)
+            return pickle.loads(body)
+        except Exception as e:
+            # Truncated/corrupt bodies, or pickles of classes that no longer import
+            raise CodecError(f"Corrupt cache payload: {e}") from e
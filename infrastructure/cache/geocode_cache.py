@@ -0,0 +1,199 @@
+"""
+Reverse Geocoding Cache
+
+GPS chat turns reverse-geocode the user's coordinates through Nominatim, and
+nearby coordinates keep resolving to the same place. Results are cached under
+the geohash of the coordinates, so every point in a cell shares one entry:
+
+- "city" lookups (AirQo's city-level search, Nominatim zoom 10) use
+  5-character cells (~5 km)
+- "address" lookups (the reverse_geocode tool) use 7-character cells (~150 m)
+
+Entries live in the shared cache (memory / Redis, with single-flight on
+misses) for REVERSE_GEOCODE_CACHE_TTL_SECONDS. When
+REVERSE_GEOCODE_SQLITE_PATH is set they are also written to a SQLite file,
+which survives restarts and answers before Nominatim is asked again; its
+expired rows are purged when the cache starts. Fetch errors are never cached.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from infrastructure.cache.cache_service import get_cache
+from shared.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash(latitude: float, longitude: float, precision: int) -> str:
+    """Standard base-32 geohash of a point."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+class SQLiteStore:
+    """Tiny persistent key/value table with per-entry expiry."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reverse_geocode "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM reverse_geocode WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reverse_geocode (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl),
+            )
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM reverse_geocode WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+
+
+class ReverseGeocodeCache:
+    """Geohash-keyed reverse geocoding results over the shared cache and optional SQLite."""
+
+    NAMESPACE = "geocode:reverse"
+    # Geohash length per lookup kind
+    PRECISION = {"city": 5, "address": 7}
+
+    def __init__(self, ttl: int | None = None, sqlite_path: str | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Entry lifetime in seconds (default: REVERSE_GEOCODE_CACHE_TTL_SECONDS)
+            sqlite_path: SQLite file for persistence (default: REVERSE_GEOCODE_SQLITE_PATH,
+                empty disables)
+        """
+        settings = get_settings()
+        self.ttl = ttl or settings.REVERSE_GEOCODE_CACHE_TTL_SECONDS
+        sqlite_path = settings.REVERSE_GEOCODE_SQLITE_PATH if sqlite_path is None else sqlite_path
+        self.store: SQLiteStore | None = None
+        if sqlite_path:
+            try:
+                self.store = SQLiteStore(sqlite_path)
+                # Reads skip expired rows; drop the ones left from earlier runs
+                purged = self.store.purge_expired()
+                if purged:
+                    logger.info(f"Purged {purged} expired reverse geocode entries")
+            except sqlite3.Error as e:
+                logger.error(f"Reverse geocode SQLite store unavailable ({sqlite_path}): {e}")
+        self.metrics = {"persistent_hits": 0, "fetches": 0}
+
+    def key(self, kind: str, latitude: float, longitude: float) -> str:
+        return f"{kind}:{geohash(latitude, longitude, self.PRECISION[kind])}"
+
+    def _persistent_get(self, key: str) -> Any | None:
+        if self.store is None:
+            return None
+        try:
+            value = self.store.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Reverse geocode SQLite read failed: {e}")
+            return None
+        if value is not None:
+            self.metrics["persistent_hits"] += 1
+        return value
+
+    def _persistent_set(self, key: str, value: Any) -> None:
+        if self.store is None or value is None:
+            return
+        try:
+            self.store.set(key, value, self.ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"Reverse geocode SQLite write failed: {e}")
+
+    def get_or_fetch(
+        self, kind: str, latitude: float, longitude: float, fetch: Callable[[], Any]
+    ) -> Any:
+        """
+        Cached result for the cell containing the coordinates, or `fetch()` on a miss.
+
+        `fetch` should raise on transport errors so they are not cached.
+        """
+        key = self.key(kind, latitude, longitude)
+
+        def load() -> Any:
+            value = self._persistent_get(key)
+            if value is None:
+                self.metrics["fetches"] += 1
+                value = fetch()
+                self._persistent_set(key, value)
+            return value
+
+        return get_cache().get_or_fetch(self.NAMESPACE, key, load, self.ttl)
+
+    async def get_or_fetch_async(
+        self,
+        kind: str,
+        latitude: float,
+        longitude: float,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Async twin of `get_or_fetch` (SQLite access runs in a worker thread)."""
+        key = self.key(kind, latitude, longitude)
+
+        async def load() -> Any:
+            value = await asyncio.to_thread(self._persistent_get, key)
+            if value is None:
+                self.metrics["fetches"] += 1
+                value = await fetch()
+                await asyncio.to_thread(self._persistent_set, key, value)
+            return value
+
+        return await get_cache().get_or_fetch_async(self.NAMESPACE, key, load, self.ttl)
+
+
+_reverse_geocode_cache: ReverseGeocodeCache | None = None
+
+
+def get_reverse_geocode_cache() -> ReverseGeocodeCache:
+    """Get or create the global reverse geocoding cache"""
+    global _reverse_geocode_cache
+    if _reverse_geocode_cache is None:
+        _reverse_geocode_cache = ReverseGeocodeCache()
+    return _reverse_geocode_cache
@@ -0,0 +1,149 @@
+"""
+In-Process LRU Cache with TTL
+
+Bounded memory cache used by RedisCache when Redis is disabled or unreachable,
+and as a short-lived L1 tier in front of Redis.
+
+- Values stored pickled, so callers never share (and mutate) a cached object
+- Per-entry TTL (expired entries are dropped lazily on access and by purge_expired)
+- Max-entries and max-bytes budgets
+- O(1) get/set/LRU eviction (OrderedDict)
+- Hit/miss/eviction/expiration counters
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class MemoryCache:
+    """Thread-safe LRU cache with per-entry TTL and a size budget."""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            max_bytes: Maximum total pickled payload size before LRU eviction
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (pickled value, expires_at); order is least -> most recently used
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and release its bytes (caller holds the lock)."""
+        payload, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def get(self, key: str) -> Any | None:
+        """
+        Get a value, refreshing its LRU position.
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            payload, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return pickle.loads(payload)
+
+    def set(self, key: str, value: Any, ttl: float) -> bool:
+        """
+        Store a value for `ttl` seconds, evicting least recently used entries as needed.
+
+        Returns:
+            False if the value cannot be pickled or alone exceeds the byte budget
+        """
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        if len(payload) > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (payload, time.monotonic() + ttl)
+            self._bytes += len(payload)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Delete a key. Returns True if it was present."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with `prefix`. Returns the number removed."""
+        with self._lock:
+            keys = [k for k in self._entries if k.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries. Returns the number removed."""
+        now = time.monotonic()
+        with self._lock:
+            keys = [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for key in keys:
+                self._remove(key)
+            self.expirations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction counters and current usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,59 @@
+"""
+Schema migrations for existing databases.
+
+`Base.metadata.create_all` creates missing tables with their indexes, but it
+never alters a table that already exists. This module creates indexes declared
+on the models that an existing database lacks. It runs at startup, is
+idempotent, and works on SQLite and PostgreSQL.
+"""
+
+import logging
+
+from sqlalchemy import Index, inspect, text
+from sqlalchemy.engine import Engine
+
+from infrastructure.database import models  # noqa: F401  (registers the tables)
+from infrastructure.database.database import Base
+
+logger = logging.getLogger(__name__)
+
+
+def apply_migrations(engine: Engine) -> list[str]:
+    """
+    Create declared indexes missing from existing tables.
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        Names of the indexes created
+    """
+    inspector = inspect(engine)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue  # create_all builds it with all its indexes
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name not in existing:
+                _create_index(engine, index)
+                created.append(index.name)
+    return created
+
+
+def _create_index(engine: Engine, index: Index) -> None:
+    """
+    Create one index. On PostgreSQL it is built CONCURRENTLY so writes to a
+    large table are not blocked while it builds (this needs autocommit).
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    concurrently = "CONCURRENTLY " if engine.dialect.name == "postgresql" else ""
+    unique = "UNIQUE " if index.unique else ""
+    columns = ", ".join(quote(column.name) for column in index.columns)
+    statement = (
+        f"CREATE {unique}INDEX {concurrently}IF NOT EXISTS {quote(index.name)} "
+        f"ON {quote(index.table.name)} ({columns})"
+    )
+    logger.info(f"Creating index {index.name} on {index.table.name}...")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(statement))
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from infrastructure.database.database import Base
@@ -14,6 +14,9 @@ class ChatSession(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
+    summary = relationship(
+        "SessionSummary", back_populates="session", cascade="all, delete-orphan", uselist=False
+    )
 
 
 class ChatMessage(Base):
@@ -26,3 +29,23 @@ class ChatMessage(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
 
     session = relationship("ChatSession", back_populates="messages")
+
+    __table_args__ = (
+        # Serves every history query: one session's messages in (timestamp, id) order,
+        # including keyset pagination (existing databases get it from migrations.py)
+        Index("ix_chat_messages_session_timestamp_id", "session_id", "timestamp", "id"),
+    )
+
+
+class SessionSummary(Base):
+    """Running summary of a session's older messages (see ConversationSummarizer)."""
+
+    __tablename__ = "session_summaries"
+
+    session_id = Column(String, ForeignKey("chat_sessions.id"), primary_key=True)
+    summary = Column(Text, nullable=False)
+    # Id of the last message folded into the summary; history starts after it
+    summarized_until = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    session = relationship("ChatSession", back_populates="summary")
@@ -3,11 +3,13 @@ Database repository for chat sessions and messages.
 Provides efficient, production-ready data access patterns.
 """
 
+import base64
 from datetime import datetime, timedelta
 
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
-from infrastructure.database.models import ChatMessage, ChatSession
+from infrastructure.database.models import ChatMessage, ChatSession, SessionSummary
 
 
 def get_session(db: Session, session_id: str) -> ChatSession | None:
@@ -71,7 +73,7 @@ def get_session_history(
     query = (
         db.query(ChatMessage)
         .filter(ChatMessage.session_id == session_id)
-        .order_by(ChatMessage.timestamp)
+        .order_by(ChatMessage.timestamp, ChatMessage.id)
     )
 
     if offset > 0:
@@ -83,6 +85,62 @@ def get_session_history(
     return query.all()
 
 
+def encode_message_cursor(message: ChatMessage) -> str:
+    """Opaque pagination cursor pointing just past a message"""
+    raw = f"{message.timestamp.isoformat()}|{message.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_message_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor from `encode_message_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, message_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(message_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def get_session_history_page(
+    db: Session, session_id: str, limit: int = 100, cursor: str | None = None
+) -> tuple[list[ChatMessage], str | None]:
+    """
+    Get one page of a session's history using keyset (cursor) pagination.
+
+    Each page is an index range scan starting after the cursor's
+    (timestamp, id), so deep pages cost the same as the first one, unlike
+    OFFSET, which reads and discards every skipped row.
+
+    Args:
+        db: Database session
+        session_id: Session identifier
+        limit: Maximum number of messages to return
+        cursor: `next_cursor` of the previous page (None for the first page)
+
+    Returns:
+        Messages ordered by timestamp, and the cursor of the next page (None on the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = db.query(ChatMessage).filter(ChatMessage.session_id == session_id)
+    if cursor:
+        timestamp, message_id = decode_message_cursor(cursor)
+        query = query.filter(
+            tuple_(ChatMessage.timestamp, ChatMessage.id) > tuple_(timestamp, message_id)
+        )
+
+    messages = query.order_by(ChatMessage.timestamp, ChatMessage.id).limit(limit + 1).all()
+    if len(messages) > limit:
+        return messages[:limit], encode_message_cursor(messages[limit - 1])
+    return messages, None
+
+
 def get_session_message_count(db: Session, session_id: str) -> int:
     """
     Get the total number of messages in a session.
@@ -99,7 +157,7 @@ def get_session_message_count(db: Session, session_id: str) -> int:
 
 
 def get_recent_session_history(
-    db: Session, session_id: str, max_messages: int = 20
+    db: Session, session_id: str, max_messages: int = 20, after_id: int | None = None
 ) -> list[ChatMessage]:
     """
     Get the most recent N messages from a session for context.
@@ -109,14 +167,16 @@ def get_recent_session_history(
         db: Database session
         session_id: Session identifier
         max_messages: Maximum number of recent messages (default: 20)
+        after_id: Only messages after this message id (the session summary's watermark)
 
     Returns:
         List of recent ChatMessage objects ordered by timestamp
     """
+    query = db.query(ChatMessage).filter(ChatMessage.session_id == session_id)
+    if after_id is not None:
+        query = query.filter(ChatMessage.id > after_id)
     messages = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.session_id == session_id)
-        .order_by(ChatMessage.timestamp.desc())
+        query.order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc())
         .limit(max_messages)
         .all()
     )
@@ -125,6 +185,71 @@ def get_recent_session_history(
     return list(reversed(messages))
 
 
+def get_session_messages_after(
+    db: Session, session_id: str, after_id: int = 0
+) -> list[ChatMessage]:
+    """
+    Get all messages of a session after a message id, in chronological order.
+
+    Args:
+        db: Database session
+        session_id: Session identifier
+        after_id: Last message id to skip (0 for the whole session)
+
+    Returns:
+        List of ChatMessage objects ordered by timestamp
+    """
+    return (
+        db.query(ChatMessage)
+        .filter(ChatMessage.session_id == session_id, ChatMessage.id > after_id)
+        .order_by(ChatMessage.timestamp, ChatMessage.id)
+        .all()
+    )
+
+
+def get_session_summary(db: Session, session_id: str) -> SessionSummary | None:
+    """Get the running summary of a session, if one has been written"""
+    return db.query(SessionSummary).filter(SessionSummary.session_id == session_id).first()
+
+
+def save_session_summary(
+    db: Session, session_id: str, summary: str, summarized_until: int
+) -> SessionSummary | None:
+    """
+    Store a session's running summary.
+
+    The watermark only moves forward: a summary covering fewer messages than
+    the stored one (e.g. from a slower concurrent run) is discarded.
+
+    Args:
+        db: Database session
+        session_id: Session identifier
+        summary: Summary text
+        summarized_until: Id of the last message the summary covers
+
+    Returns:
+        The stored SessionSummary, or None if the session no longer exists
+    """
+    if not get_session(db, session_id):
+        return None
+
+    existing = get_session_summary(db, session_id)
+    if existing is None:
+        existing = SessionSummary(
+            session_id=session_id, summary=summary, summarized_until=summarized_until
+        )
+        db.add(existing)
+    elif summarized_until > existing.summarized_until:
+        existing.summary = summary
+        existing.summarized_until = summarized_until
+    else:
+        return existing
+
+    db.commit()
+    db.refresh(existing)
+    return existing
+
+
 def delete_session(db: Session, session_id: str) -> bool:
     """
     Delete a session and all its messages (CASCADE delete).
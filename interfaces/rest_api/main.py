@@ -10,11 +10,14 @@ from fastapi.staticfiles import StaticFiles
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from infrastructure.cache.cache_service import get_cache
 from infrastructure.database.database import Base, engine, ensure_database_directory
+from infrastructure.database.migrations import apply_migrations
 from interfaces.rest_api.error_handlers import register_error_handlers
 from interfaces.rest_api.routes import router
 from shared.config.settings import get_settings
 from shared.monitoring.health_monitor import get_health_monitor
+from shared.utils.http_client import close_shared_client
 
 
 # Configure logging based on environment
@@ -87,14 +90,77 @@ async def lifespan(app: FastAPI):
         # Create tables if they don't exist
         Base.metadata.create_all(bind=engine, checkfirst=True)
         logger.info("✓ Database tables initialized successfully")
+
+        # Add indexes introduced since existing tables were created
+        created_indexes = apply_migrations(engine)
+        if created_indexes:
+            logger.info(f"✓ Database migrations applied: {', '.join(created_indexes)}")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         # Don't crash the app, continue with degraded functionality
 
+    # Build the static system prompts before the first chat turn needs one
+    try:
+        from core.memory.prompts import precompile_system_instructions
+
+        prompt_tokens = precompile_system_instructions()
+        logger.info(
+            f"✓ Precompiled {len(prompt_tokens)} system prompts "
+            f"({min(prompt_tokens.values())}-{max(prompt_tokens.values())} tokens)"
+        )
+    except Exception as e:
+        logger.error(f"Failed to precompile system prompts: {e}")
+
+    # Keep hot cities' air quality and forecasts warm in the cache
+    app.state.cache_warmer = None
+    if settings.CACHE_WARMUP_ENABLED:
+        try:
+            from core.agent.cache_warmer import CacheWarmer
+            from interfaces.rest_api import routes
+
+            app.state.cache_warmer = CacheWarmer(routes.get_agent().tool_executor)
+            app.state.cache_warmer.start()
+        except Exception as e:
+            logger.error(f"Failed to start cache warmer: {e}")
+
+    # Nearest-station index for coordinate lookups, rebuilt in the background
+    app.state.station_index_refresher = None
+    if settings.STATION_INDEX_ENABLED:
+        try:
+            from core.agent.station_index_refresher import StationIndexRefresher
+            from interfaces.rest_api import routes
+
+            app.state.station_index_refresher = StationIndexRefresher(
+                routes.get_agent().tool_executor
+            )
+            app.state.station_index_refresher.start()
+        except Exception as e:
+            logger.error(f"Failed to start station index refresher: {e}")
+
+    # Share circuit-breaker state with the other workers through Redis
+    app.state.circuit_breaker_sync = None
+    if settings.CIRCUIT_BREAKER_SHARED and get_cache().enabled:
+        from shared.utils.circuit_breaker import CircuitBreakerSync
+
+        app.state.circuit_breaker_sync = CircuitBreakerSync()
+        app.state.circuit_breaker_sync.start()
+
     yield
 
     # Shutdown: Cleanup resources
     logger.info("Shutting down...")
+    from interfaces.rest_api import routes
+
+    if app.state.cache_warmer is not None:
+        await app.state.cache_warmer.stop()
+    if app.state.station_index_refresher is not None:
+        await app.state.station_index_refresher.stop()
+    if app.state.circuit_breaker_sync is not None:
+        await app.state.circuit_breaker_sync.stop()
+    if routes._agent_instance is not None:
+        await routes._agent_instance.cleanup()
+    await close_shared_client()
+    await get_cache().aclose()
 
 
 app = FastAPI(
@@ -1,17 +1,30 @@
+import asyncio
 import json
 import logging
 import os
 import re
-import time
+import secrets
 import uuid
 from io import BytesIO
 from typing import Any
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.orm import Session
 
+from core.providers.token_stream import TokenStream
 from domain.models.schemas import (
     AirQualityQueryRequest,
     ChatResponse,
@@ -24,7 +37,8 @@ from domain.services.agent_service import AgentService
 from infrastructure.api.airqo import AirQoService
 from infrastructure.api.openmeteo import OpenMeteoService
 from infrastructure.api.waqi import WAQIService
-from infrastructure.database.database import get_db
+from infrastructure.cache.cache_service import get_cache
+from infrastructure.database.database import SessionLocal, get_db
 from infrastructure.database.repository import (
     add_message,
     delete_session,
@@ -32,6 +46,7 @@ from infrastructure.database.repository import (
     get_recent_session_history,
     get_session,
     get_session_message_count,
+    get_session_summary,
 )
 from shared.config.settings import get_settings
 from shared.utils.markdown_formatter import MarkdownFormatter
@@ -40,7 +55,7 @@ from shared.utils.provider_errors import (
     aeris_unavailable_message,
     provider_unavailable_message,
 )
-from shared.utils.security import ResponseFilter, validate_request_data
+from shared.utils.security import ResponseFilter, StreamingResponseFilter, validate_request_data
 from shared.utils.token_counter import get_token_counter
 
 limiter = Limiter(key_func=get_remote_address)
@@ -257,15 +272,25 @@ async def delete_chat_session(session_id: str, db: Session = Depends(get_db)):
 
 @router.get("/sessions/{session_id}/messages")
 async def get_session_messages(
-    session_id: str, limit: int = 100, offset: int = 0, db: Session = Depends(get_db)
+    session_id: str,
+    limit: int = Query(100, ge=1),
+    offset: int = 0,
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
 ):
     """
     Get paginated message history for a session.
 
+    Pages are fetched by cursor: pass the `next_cursor` of one response as
+    `cursor` to get the next page; it is null on the last page. Cursor pages
+    cost the same however deep they are. `offset` is still accepted for
+    existing clients, but it reads every skipped message.
+
     Args:
         session_id: Session identifier
         limit: Maximum messages to return (default: 100)
-        offset: Number of messages to skip (default: 0)
+        offset: Number of messages to skip (default: 0; ignored with `cursor`)
+        cursor: `next_cursor` from the previous page
 
     Returns:
         Paginated list of messages
@@ -273,19 +298,31 @@ async def get_session_messages(
     from sqlalchemy.exc import OperationalError
     from sqlalchemy.exc import TimeoutError as SQLAlchemyTimeoutError
 
-    from infrastructure.database.repository import get_session_history
+    from infrastructure.database.repository import get_session_history, get_session_history_page
 
     try:
-        messages = get_session_history(db, session_id, limit=limit, offset=offset)
+        if cursor or offset <= 0:
+            try:
+                messages, next_cursor = get_session_history_page(
+                    db, session_id, limit=limit, cursor=cursor
+                )
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid pagination cursor") from None
+        else:
+            messages = get_session_history(db, session_id, limit=limit, offset=offset)
+            next_cursor = None
 
         return {
             "session_id": session_id,
             "count": len(messages),
-            "offset": offset,
+            "offset": 0 if cursor else offset,
+            "next_cursor": next_cursor,
             "messages": [
                 {"role": m.role, "content": m.content, "timestamp": m.timestamp} for m in messages
             ],
         }
+    except HTTPException:
+        raise
     except SQLAlchemyTimeoutError as e:
         logger.error(f"Database timeout while fetching messages for session {session_id}: {e}")
         raise HTTPException(
@@ -303,6 +340,431 @@ async def get_session_messages(
         )
 
 
+# Upper bound on agent processing for one chat turn
+CHAT_TIMEOUT_SECONDS = 120.0
+
+# Keeps streaming turns alive (and persisted) if the client disconnects early
+_background_turns: set[asyncio.Task] = set()
+
+
+async def _prepare_chat_turn(
+    request: Request,
+    message: str,
+    session_id: str | None,
+    file: UploadFile | None,
+    latitude: float | None,
+    longitude: float | None,
+    db: Session,
+) -> dict[str, Any]:
+    """
+    Validate a chat request and gather everything the agent needs for one turn.
+
+    Shared by the JSON and streaming chat endpoints. Saves the user message and
+    raises HTTPException for invalid input, bad documents or exhausted sessions.
+    """
+    document_data: list[dict[str, Any]] | None = None
+    document_filename: str | None = None
+    MAX_FILE_SIZE = 8 * 1024 * 1024  # 8MB limit
+
+    # Validate and sanitize input data
+    try:
+        request_data = {"message": message, "session_id": session_id, "file": file}
+        sanitized_data = validate_request_data(request_data)
+        message = sanitized_data["message"]
+        session_id = sanitized_data["session_id"]
+    except ValueError as e:
+        logger.warning(f"Input validation failed: {e}")
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid input. Please check your request and try again.",
+        )
+
+    # Generate or use provided session ID
+    session_id = session_id if session_id and session_id.strip() else str(uuid.uuid4())
+
+    # Handle document upload if provided (in-memory processing)
+    if file and file.filename:
+        document_filename = file.filename
+
+        # Validate file type
+        allowed_extensions = {".pdf", ".csv", ".xlsx", ".xls"}
+        file_ext = os.path.splitext(file.filename)[1].lower()
+
+        if file_ext not in allowed_extensions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported file type: {file_ext}. Allowed: PDF, CSV, Excel (.xlsx, .xls)",
+            )
+
+        try:
+            # Read file content in memory with size validation
+            file_content = BytesIO()
+            chunk_size = 1024 * 1024  # 1MB chunks
+            total_size = 0
+
+            # Stream file in chunks to avoid memory spike
+            while chunk := await file.read(chunk_size):
+                total_size += len(chunk)
+                if total_size > MAX_FILE_SIZE:
+                    # Clean up memory before raising error
+                    file_content.close()
+                    del file_content
+                    raise HTTPException(
+                        status_code=413,
+                        detail="File size exceeds 8MB limit. Please upload a smaller file.",
+                    )
+                file_content.write(chunk)
+
+            # Reset position for reading
+            file_content.seek(0)
+
+            # Process document in memory
+            from core.tools.document_scanner import DocumentScanner
+
+            scanner = DocumentScanner()
+            scan_result = scanner.scan_document_from_bytes(file_content, file.filename)
+
+            # Clean up file buffer immediately after processing
+            file_content.close()
+            del file_content
+
+            if not scan_result.get("success"):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Failed to process document: {scan_result.get('error', 'Unknown error')}",
+                )
+
+            # Wrap in list for agent processing (expects list of documents)
+            document_data = [scan_result]
+            logger.info(
+                f"Document scanned successfully: {file.filename}, type: {scan_result.get('file_type')}, size: {scan_result.get('full_length', 0)} chars"
+            )
+
+            # CRITICAL FIX: Prepend document context to user message so AI KNOWS a document was uploaded
+            # This ensures the AI doesn't ask "where's the document" when it's already provided
+            if not message.strip().lower().startswith(
+                "analyze"
+            ) and not message.strip().lower().startswith("scan"):
+                message = f"[DOCUMENT UPLOADED: {file.filename}] {message}"
+                logger.info(f"Prepended document context to user message: {message[:100]}...")
+
+        except HTTPException:
+            raise  # Re-raise HTTP exceptions
+        except Exception as e:
+            logger.error(f"Document processing failed: {str(e)}", exc_info=True)
+            raise HTTPException(
+                status_code=500,
+                detail={"message": "Failed to process document.", "detail": aeris_unavailable_message()},
+            ) from e
+
+    # Get conversation history BEFORE adding new message
+    # Limit to recent messages for performance (streaming needs to be fast)
+    # Messages covered by the session's rolling summary are sent as that summary
+    try:
+        summary = (
+            get_session_summary(db, session_id) if settings.CONVERSATION_SUMMARY_ENABLED else None
+        )
+        history_objs = get_recent_session_history(
+            db,
+            session_id,
+            max_messages=20,
+            after_id=summary.summarized_until if summary else None,
+        )
+        # Convert ORM objects to dicts
+        history = [
+            {"role": msg.role, "content": msg.content}
+            for msg in history_objs
+        ]
+        if len(history) > 0:
+            logger.info(
+                f"Retrieved {len(history)} messages from session history for context"
+            )
+    except Exception as db_error:
+        logger.warning(
+            f"Failed to fetch session history for {session_id}, starting with empty history: {db_error}"
+        )
+        summary = None
+        history_objs = []
+        history = []
+
+    # Check session message limit - CRITICAL: Stop processing if limit exceeded
+    # This must be OUTSIDE the try-except to prevent catching HTTPException
+    # Can be disabled for testing via DISABLE_SESSION_LIMIT=True in config
+    message_count = get_session_message_count(db, session_id)
+    session_warning = None
+
+    # Only enforce session limits if not disabled (useful for comprehensive tests)
+    if not settings.DISABLE_SESSION_LIMIT:
+        if message_count >= settings.MAX_MESSAGES_PER_SESSION:
+            # STOP PROCESSING - Session limit reached
+            logger.error(f"Session {session_id} has exceeded limit: {message_count} messages")
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "error": "session_limit_exceeded",
+                    "message": (
+                        f"Session limit reached ({message_count}/{settings.MAX_MESSAGES_PER_SESSION} messages). "
+                        f"Please start a new session to continue. Long sessions affect performance and cost. "
+                        f"Use DELETE /sessions/{session_id} to close this session, then start a fresh conversation."
+                    ),
+                    "session_id": session_id,
+                    "message_count": message_count,
+                    "max_messages": settings.MAX_MESSAGES_PER_SESSION,
+                    "action_required": "start_new_session"
+                }
+            )
+        elif message_count >= settings.SESSION_LIMIT_WARNING_THRESHOLD:
+            session_warning = (
+                f"ℹ️ **Approaching Session Limit** ({message_count}/{settings.MAX_MESSAGES_PER_SESSION} messages) - "
+                "Consider starting a new session soon for better performance."
+            )
+            logger.info(f"Session {session_id} approaching limit: {message_count} messages")
+    else:
+        # Session limits disabled - log for debugging
+        if message_count >= settings.MAX_MESSAGES_PER_SESSION:
+            logger.warning(
+                f"Session {session_id} has {message_count} messages (exceeds limit of {settings.MAX_MESSAGES_PER_SESSION}), "
+                "but DISABLE_SESSION_LIMIT=True"
+            )
+
+    # Convert to format expected by agent
+    history: list[dict[str, str]] = [
+        {"role": str(m.role), "content": str(m.content)} for m in history_objs
+    ]
+
+    # Add GPS context to history if available
+    if latitude is not None and longitude is not None:
+        gps_context = f"SYSTEM: GPS coordinates are available ({latitude:.4f}, {longitude:.4f}). The user has already consented to location sharing by providing GPS data. Use get_location_from_ip tool immediately for air quality data."
+        history.insert(0, {"role": "system", "content": gps_context})
+        logger.info(f"Added GPS context to conversation history: {gps_context}")
+
+    # Save user message to database AFTER getting history
+    try:
+        add_message(db, session_id, "user", message)
+    except Exception as db_error:
+        logger.error(f"Failed to save user message to database: {db_error}")
+        # Continue processing even if db save fails
+
+    # Modify message if GPS is available and user is asking about THEIR location
+    # BUT: Don't modify if they're asking about a specific named location
+    original_message = message
+    if latitude is not None and longitude is not None:
+        # Check if message mentions a specific city/location name
+        # If it does, DON'T override with GPS - user wants that specific place
+        import re
+        has_specific_location = bool(re.search(
+            r'\b(in|at|for|near)\s+[A-Z][a-z]+|\b(New York|Los Angeles|London|Tokyo|Beijing|'  
+            r'Paris|Berlin|Rome|Madrid|Sydney|Melbourne|Toronto|Montreal|Mumbai|Delhi|'  
+            r'Shanghai|Seoul|Singapore|Bangkok|Dubai|Cairo|Lagos|Nairobi|Kampala|'  
+            r'Johannesburg|Cape Town|Accra|Kigali|Addis Ababa)\b',
+            message,
+            re.IGNORECASE
+        ))
+
+        # Check if message is about current/user's location (not a specific named place)
+        location_keywords = [
+            "my location",
+            "current location",
+            "here",
+            "this location",
+            "where i am",
+            "my area",
+            "local",
+        ]
+        is_about_user_location = any(keyword in message.lower() for keyword in location_keywords)
+
+        # Only inject GPS if asking about "my location" AND not asking about a specific city
+        if is_about_user_location and not has_specific_location:
+            message = f"Get air quality data for GPS coordinates {latitude:.4f}, {longitude:.4f} (user has already consented by providing GPS data)"
+            logger.info(
+                f"Modified location query with GPS coordinates: '{original_message}' -> '{message}'"
+            )
+        elif has_specific_location:
+            logger.info(
+                f"User asked about specific location '{original_message}' - not overriding with GPS"
+            )
+
+    # Prepare location data - prefer GPS over IP
+    location_data = None
+    client_ip = request.client.host if request.client else None
+    if latitude is not None and longitude is not None:
+        # Validate GPS coordinates
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            location_data = {"source": "gps", "latitude": latitude, "longitude": longitude}
+            logger.info(f"Using GPS coordinates: {latitude}, {longitude}")
+        else:
+            logger.warning(f"Invalid GPS coordinates provided: {latitude}, {longitude}")
+    elif client_ip:
+        location_data = {"source": "ip", "ip_address": client_ip}
+        logger.info(f"Using IP address for location: {client_ip}")
+
+    return {
+        "message": message,
+        "session_id": session_id,
+        "history": history,
+        "conversation_summary": summary.summary if summary else None,
+        "document_data": document_data,
+        "document_filename": document_filename,
+        "session_warning": session_warning,
+        "client_ip": client_ip,
+        "location_data": location_data,
+    }
+
+
+def _agent_request(turn: dict[str, Any], role: str | None) -> dict[str, Any]:
+    """Keyword arguments for AgentService.process_message for a prepared turn."""
+    return {
+        "message": turn["message"],
+        "history": turn["history"],
+        "document_data": turn["document_data"],
+        "style": role or settings.AI_RESPONSE_STYLE,
+        "temperature": settings.AI_RESPONSE_TEMPERATURE,
+        "top_p": settings.AI_RESPONSE_TOP_P,
+        "client_ip": turn["client_ip"],
+        "location_data": turn["location_data"],
+        "session_id": turn["session_id"],
+        "conversation_summary": turn["conversation_summary"],
+    }
+
+
+def _clean_response_text(text: str) -> str:
+    """Redact keys and hide implementation details in response text (streamed or final)."""
+    return ResponseFilter.clean_response(sanitize_response(text))
+
+
+def _finalize_chat_turn(db: Session, turn: dict[str, Any], result: dict[str, Any]) -> ChatResponse:
+    """Format, persist and count tokens for the agent's reply to one chat turn."""
+    message = turn["message"]
+    session_id = turn["session_id"]
+    history = turn["history"]
+    document_data = turn["document_data"]
+    document_filename = turn["document_filename"]
+    session_warning = turn["session_warning"]
+
+    final_response = _clean_response_text(result["response"])
+    # Apply professional markdown formatting
+    final_response = MarkdownFormatter.format_response(final_response)
+
+    # Extract truncation and continuation flags from agent result
+    is_truncated = result.get("truncated", False)
+    requires_continuation = result.get("requires_continuation", False)
+    finish_reason = result.get("finish_reason", "stop")
+
+    tools_used = result.get("tools_used", [])
+
+    # Add document processing tool to tools_used if document was processed
+    if document_data:
+        if "document_scanner" not in tools_used:
+            tools_used.append("document_scanner")
+
+    # Save assistant response to database
+    try:
+        add_message(db, session_id, "assistant", final_response)
+        # Roll older turns into the session summary without holding up this response
+        get_agent().summarizer.schedule(session_id)
+    except Exception as db_error:
+        logger.error(f"Failed to save assistant response to database: {db_error}")
+        # Continue to return response to user even if db save fails
+
+    # Accurate token counting using tiktoken (world-standard precision)
+    token_counter = get_token_counter(settings.AI_PROVIDER)
+
+    # Count tokens accurately for each component
+    message_tokens = token_counter.count_tokens(message)
+    response_tokens = token_counter.count_tokens(final_response)
+    history_tokens = token_counter.count_messages_tokens(history)
+
+    # Extract document filenames and count tokens
+    document_filenames = []
+    document_tokens = 0
+    if document_data:
+        for doc in document_data:
+            if isinstance(doc, dict):
+                document_tokens += token_counter.count_document_tokens(doc)
+                # Track filenames
+                filename = doc.get("filename")
+                if filename:
+                    document_filenames.append(filename)
+
+    # Total with accurate counting (no estimation multiplier needed)
+    tokens_used = message_tokens + response_tokens + history_tokens + document_tokens
+
+    logger.info(
+        f"Accurate token count - Message: {message_tokens}, Response: {response_tokens}, "
+        f"History: {history_tokens}, Documents: {document_tokens}, Total: {tokens_used}"
+    )
+
+    # Get total message count for this session
+    try:
+        all_messages = get_recent_session_history(db, session_id, max_messages=1000)
+        message_count = len(all_messages)
+    except Exception as db_error:
+        logger.warning(f"Failed to get message count: {db_error}")
+        message_count = len(history) + 2  # Estimate based on history + new messages
+
+    # Extract chart data if present in result
+    # Chart data is now embedded in markdown response, no separate fields needed
+
+    # Prepend session warning to response if needed
+    if session_warning:
+        final_response = f"{session_warning}\n\n{final_response}"
+
+    # Handle reasoning_content - convert dict to JSON string if needed
+    reasoning_content = result.get("reasoning_content")
+    if isinstance(reasoning_content, dict):
+        reasoning_content = json.dumps(reasoning_content)
+
+    return ChatResponse(
+        response=final_response,
+        session_id=session_id,
+        tools_used=tools_used,
+        tokens_used=tokens_used,
+        cached=result.get("cached", False),
+        tool_memo_hits=result.get("tool_memo_hits"),
+        message_count=message_count,
+        document_processed=bool(document_filenames or document_filename),
+        document_filename=document_filenames[0] if document_filenames else document_filename,
+        reasoning_content=reasoning_content,
+        # Truncation and continuation flags - critical for Continue button
+        truncated=is_truncated,
+        requires_continuation=requires_continuation,
+        finish_reason=finish_reason,
+    )
+
+
+def _chat_error(
+    e: Exception, session_id: str | None, message: str | None, has_document: bool
+) -> HTTPException:
+    """Log an unexpected chat failure and build the HTTP error returned to the client."""
+    from shared.monitoring.error_logger import get_error_logger
+
+    error_logger = get_error_logger()
+    error_data = error_logger.log_error(
+        e,
+        context={
+            "endpoint": "/agent/chat",
+            "session_id": session_id,
+            "message_length": len(message) if message else 0,
+            "has_document": has_document,
+            "error_category": "chat_processing",
+        },
+        user_message="Unable to process your message. Please try again.",
+    )
+
+    # Clean up any lingering resources
+    try:
+        get_agent()._manage_memory()  # Force memory cleanup after error
+    except Exception as cleanup_error:
+        logger.warning(f"Memory cleanup failed after error: {cleanup_error}")
+
+    return HTTPException(status_code=500, detail=error_data["message"])
+
+
+def _sse_event(event: str, data: dict[str, Any]) -> str:
+    """Encode one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.post("/agent/chat", response_model=ChatResponse)
 # @limiter.limit("30/minute", key_func=get_remote_address)  # Stricter limit for AI chat - disabled due to compat issues
 async def chat(
@@ -401,257 +863,18 @@ async def chat(
     curl -X DELETE http://localhost:8000/api/v1/sessions/abc-123
     ```
     """
-    # Initialize variables at the start to prevent UnboundLocalError
-    document_data: list[dict[str, Any]] | None = None
-    document_filename: str | None = None
-    file_content: BytesIO | None = None
-    document_filenames: list[str] = []
-    MAX_FILE_SIZE = 8 * 1024 * 1024  # 8MB limit
-
     try:
-        # Validate and sanitize input data
-        try:
-            request_data = {"message": message, "session_id": session_id, "file": file}
-            sanitized_data = validate_request_data(request_data)
-            message = sanitized_data["message"]
-            session_id = sanitized_data["session_id"]
-        except ValueError as e:
-            logger.warning(f"Input validation failed: {e}")
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid input. Please check your request and try again.",
-            )
-
-        # Generate or use provided session ID
-        session_id = session_id if session_id and session_id.strip() else str(uuid.uuid4())
-
-        # Handle document upload if provided (in-memory processing)
-        if file and file.filename:
-            document_filename = file.filename
-
-            # Validate file type
-            allowed_extensions = {".pdf", ".csv", ".xlsx", ".xls"}
-            file_ext = os.path.splitext(file.filename)[1].lower()
-
-            if file_ext not in allowed_extensions:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unsupported file type: {file_ext}. Allowed: PDF, CSV, Excel (.xlsx, .xls)",
-                )
-
-            try:
-                # Read file content in memory with size validation
-                file_content = BytesIO()
-                chunk_size = 1024 * 1024  # 1MB chunks
-                total_size = 0
-
-                # Stream file in chunks to avoid memory spike
-                while chunk := await file.read(chunk_size):
-                    total_size += len(chunk)
-                    if total_size > MAX_FILE_SIZE:
-                        # Clean up memory before raising error
-                        file_content.close()
-                        del file_content
-                        raise HTTPException(
-                            status_code=413,
-                            detail="File size exceeds 8MB limit. Please upload a smaller file.",
-                        )
-                    file_content.write(chunk)
-
-                # Reset position for reading
-                file_content.seek(0)
-
-                # Process document in memory
-                from core.tools.document_scanner import DocumentScanner
-
-                scanner = DocumentScanner()
-                scan_result = scanner.scan_document_from_bytes(file_content, file.filename)
-
-                # Clean up file buffer immediately after processing
-                file_content.close()
-                del file_content
-
-                if not scan_result.get("success"):
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Failed to process document: {scan_result.get('error', 'Unknown error')}",
-                    )
-
-                # Wrap in list for agent processing (expects list of documents)
-                document_data = [scan_result]
-                logger.info(
-                    f"Document scanned successfully: {file.filename}, type: {scan_result.get('file_type')}, size: {scan_result.get('full_length', 0)} chars"
-                )
-
-                # CRITICAL FIX: Prepend document context to user message so AI KNOWS a document was uploaded
-                # This ensures the AI doesn't ask "where's the document" when it's already provided
-                if not message.strip().lower().startswith(
-                    "analyze"
-                ) and not message.strip().lower().startswith("scan"):
-                    message = f"[DOCUMENT UPLOADED: {file.filename}] {message}"
-                    logger.info(f"Prepended document context to user message: {message[:100]}...")
-
-            except HTTPException:
-                raise  # Re-raise HTTP exceptions
-            except Exception as e:
-                logger.error(f"Document processing failed: {str(e)}", exc_info=True)
-                raise HTTPException(
-                    status_code=500,
-                    detail={"message": "Failed to process document.", "detail": aeris_unavailable_message()},
-                ) from e
-
-        # Get conversation history BEFORE adding new message
-        # Limit to recent messages for performance (streaming needs to be fast)
-        try:
-            history_objs = get_recent_session_history(db, session_id, max_messages=20)
-            # Convert ORM objects to dicts
-            history = [
-                {"role": msg.role, "content": msg.content}
-                for msg in history_objs
-            ]
-            if len(history) > 0:
-                logger.info(
-                    f"Retrieved {len(history)} messages from session history for context"
-                )
-        except Exception as db_error:
-            logger.warning(
-                f"Failed to fetch session history for {session_id}, starting with empty history: {db_error}"
-            )
-            history = []
-
-        # Check session message limit - CRITICAL: Stop processing if limit exceeded
-        # This must be OUTSIDE the try-except to prevent catching HTTPException
-        # Can be disabled for testing via DISABLE_SESSION_LIMIT=True in config
-        message_count = get_session_message_count(db, session_id)
-        session_warning = None
-
-        # Only enforce session limits if not disabled (useful for comprehensive tests)
-        if not settings.DISABLE_SESSION_LIMIT:
-            if message_count >= settings.MAX_MESSAGES_PER_SESSION:
-                # STOP PROCESSING - Session limit reached
-                logger.error(f"Session {session_id} has exceeded limit: {message_count} messages")
-                raise HTTPException(
-                    status_code=429,
-                    detail={
-                        "error": "session_limit_exceeded",
-                        "message": (
-                            f"Session limit reached ({message_count}/{settings.MAX_MESSAGES_PER_SESSION} messages). "
-                            f"Please start a new session to continue. Long sessions affect performance and cost. "
-                            f"Use DELETE /sessions/{session_id} to close this session, then start a fresh conversation."
-                        ),
-                        "session_id": session_id,
-                        "message_count": message_count,
-                        "max_messages": settings.MAX_MESSAGES_PER_SESSION,
-                        "action_required": "start_new_session"
-                    }
-                )
-            elif message_count >= settings.SESSION_LIMIT_WARNING_THRESHOLD:
-                session_warning = (
-                    f"ℹ️ **Approaching Session Limit** ({message_count}/{settings.MAX_MESSAGES_PER_SESSION} messages) - "
-                    "Consider starting a new session soon for better performance."
-                )
-                logger.info(f"Session {session_id} approaching limit: {message_count} messages")
-        else:
-            # Session limits disabled - log for debugging
-            if message_count >= settings.MAX_MESSAGES_PER_SESSION:
-                logger.warning(
-                    f"Session {session_id} has {message_count} messages (exceeds limit of {settings.MAX_MESSAGES_PER_SESSION}), "
-                    "but DISABLE_SESSION_LIMIT=True"
-                )
-
-        # Convert to format expected by agent
-        history: list[dict[str, str]] = [
-            {"role": str(m.role), "content": str(m.content)} for m in history_objs
-        ]
-
-        # Add GPS context to history if available
-        if latitude is not None and longitude is not None:
-            gps_context = f"SYSTEM: GPS coordinates are available ({latitude:.4f}, {longitude:.4f}). The user has already consented to location sharing by providing GPS data. Use get_location_from_ip tool immediately for air quality data."
-            history.insert(0, {"role": "system", "content": gps_context})
-            logger.info(f"Added GPS context to conversation history: {gps_context}")
-
-        # Save user message to database AFTER getting history
-        try:
-            add_message(db, session_id, "user", message)
-        except Exception as db_error:
-            logger.error(f"Failed to save user message to database: {db_error}")
-            # Continue processing even if db save fails
-
-        # Modify message if GPS is available and user is asking about THEIR location
-        # BUT: Don't modify if they're asking about a specific named location
-        original_message = message
-        if latitude is not None and longitude is not None:
-            # Check if message mentions a specific city/location name
-            # If it does, DON'T override with GPS - user wants that specific place
-            import re
-            has_specific_location = bool(re.search(
-                r'\b(in|at|for|near)\s+[A-Z][a-z]+|\b(New York|Los Angeles|London|Tokyo|Beijing|'  
-                r'Paris|Berlin|Rome|Madrid|Sydney|Melbourne|Toronto|Montreal|Mumbai|Delhi|'  
-                r'Shanghai|Seoul|Singapore|Bangkok|Dubai|Cairo|Lagos|Nairobi|Kampala|'  
-                r'Johannesburg|Cape Town|Accra|Kigali|Addis Ababa)\b',
-                message,
-                re.IGNORECASE
-            ))
-            
-            # Check if message is about current/user's location (not a specific named place)
-            location_keywords = [
-                "my location",
-                "current location",
-                "here",
-                "this location",
-                "where i am",
-                "my area",
-                "local",
-            ]
-            is_about_user_location = any(keyword in message.lower() for keyword in location_keywords)
-            
-            # Only inject GPS if asking about "my location" AND not asking about a specific city
-            if is_about_user_location and not has_specific_location:
-                message = f"Get air quality data for GPS coordinates {latitude:.4f}, {longitude:.4f} (user has already consented by providing GPS data)"
-                logger.info(
-                    f"Modified location query with GPS coordinates: '{original_message}' -> '{message}'"
-                )
-            elif has_specific_location:
-                logger.info(
-                    f"User asked about specific location '{original_message}' - not overriding with GPS"
-                )
-
-        # Prepare location data - prefer GPS over IP
-        location_data = None
-        client_ip = request.client.host if request.client else None
-        if latitude is not None and longitude is not None:
-            # Validate GPS coordinates
-            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
-                location_data = {"source": "gps", "latitude": latitude, "longitude": longitude}
-                logger.info(f"Using GPS coordinates: {latitude}, {longitude}")
-            else:
-                logger.warning(f"Invalid GPS coordinates provided: {latitude}, {longitude}")
-        elif client_ip:
-            location_data = {"source": "ip", "ip_address": client_ip}
-            logger.info(f"Using IP address for location: {client_ip}")
+        turn = await _prepare_chat_turn(request, message, session_id, file, latitude, longitude, db)
+        session_id = turn["session_id"]
 
         # Initialize Agent Service
         agent = get_agent()
 
-        # Process message with timing for cost tracking and timeout protection
-        start_time = time.time()
-
         # Add timeout protection for agent processing (120 seconds for comprehensive processing)
         try:
-            import asyncio
             result = await asyncio.wait_for(
-                agent.process_message(
-                    message,
-                    history,
-                    document_data=document_data,
-                    style=role or settings.AI_RESPONSE_STYLE,
-                    temperature=settings.AI_RESPONSE_TEMPERATURE,
-                    top_p=settings.AI_RESPONSE_TOP_P,
-                    client_ip=client_ip,
-                    location_data=location_data,
-                    session_id=session_id,
-                ),
-                timeout=120.0  # 120 second timeout for comprehensive processing
+                agent.process_message(**_agent_request(turn, role)),
+                timeout=CHAT_TIMEOUT_SECONDS,
             )
         except asyncio.TimeoutError:
             logger.error(f"Agent processing timed out after 120 seconds for message: {message[:100]}")
@@ -660,144 +883,121 @@ async def chat(
                 detail="Request processing timed out after 120 seconds. Please try a simpler query or smaller document."
             )
 
-        processing_time = time.time() - start_time
-
-        final_response = sanitize_response(result["response"])
-        # Apply response filtering to hide implementation details
-        final_response = ResponseFilter.clean_response(final_response)
-        # Apply professional markdown formatting
-        final_response = MarkdownFormatter.format_response(final_response)
-
-        # Extract truncation and continuation flags from agent result
-        is_truncated = result.get("truncated", False)
-        requires_continuation = result.get("requires_continuation", False)
-        finish_reason = result.get("finish_reason", "stop")
-        
-        tools_used = result.get("tools_used", [])
-
-        # Add document processing tool to tools_used if document was processed
-        if document_data:
-            if "document_scanner" not in tools_used:
-                tools_used.append("document_scanner")
+        return _finalize_chat_turn(db, turn, result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _chat_error(e, session_id, message, bool(file and file.filename)) from e
 
-        # Save assistant response to database
-        try:
-            add_message(db, session_id, "assistant", final_response)
-        except Exception as db_error:
-            logger.error(f"Failed to save assistant response to database: {db_error}")
-            # Continue to return response to user even if db save fails
-
-        # Accurate token counting using tiktoken (world-standard precision)
-        token_counter = get_token_counter(settings.AI_PROVIDER)
-
-        # Count tokens accurately for each component
-        message_tokens = token_counter.count_tokens(message)
-        response_tokens = token_counter.count_tokens(final_response)
-        history_tokens = token_counter.count_messages_tokens(history)
-
-        # Extract document filenames and count tokens
-        document_filenames = []
-        document_tokens = 0
-        if document_data:
-            for doc in document_data:
-                if isinstance(doc, dict):
-                    document_tokens += token_counter.count_document_tokens(doc)
-                    # Track filenames
-                    filename = doc.get("filename")
-                    if filename:
-                        document_filenames.append(filename)
-
-        # Total with accurate counting (no estimation multiplier needed)
-        tokens_used = message_tokens + response_tokens + history_tokens + document_tokens
-
-        logger.info(
-            f"Accurate token count - Message: {message_tokens}, Response: {response_tokens}, "
-            f"History: {history_tokens}, Documents: {document_tokens}, Total: {tokens_used}"
-        )
 
-        # Get total message count for this session
-        try:
-            all_messages = get_recent_session_history(db, session_id, max_messages=1000)
-            message_count = len(all_messages)
-        except Exception as db_error:
-            logger.warning(f"Failed to get message count: {db_error}")
-            message_count = len(history) + 2  # Estimate based on history + new messages
-
-        # Clean up document data from memory
-        if document_data:
-            del document_data
-
-        # Extract chart data if present in result
-        # Chart data is now embedded in markdown response, no separate fields needed
-
-        # Prepend session warning to response if needed
-        if session_warning:
-            final_response = f"{session_warning}\n\n{final_response}"
-
-        # Handle reasoning_content - convert dict to JSON string if needed
-        reasoning_content = result.get("reasoning_content")
-        if isinstance(reasoning_content, dict):
-            reasoning_content = json.dumps(reasoning_content)
-
-        return ChatResponse(
-            response=final_response,
-            session_id=session_id,
-            tools_used=tools_used,
-            tokens_used=tokens_used,
-            cached=result.get("cached", False),
-            message_count=message_count,
-            document_processed=bool(document_filenames or document_filename),
-            document_filename=document_filenames[0] if document_filenames else document_filename,
-            reasoning_content=reasoning_content,
-            # Truncation and continuation flags - critical for Continue button
-            truncated=is_truncated,
-            requires_continuation=requires_continuation,
-            finish_reason=finish_reason,
-        )
+@router.post("/agent/chat/stream")
+async def chat_stream(
+    request: Request,
+    message: str = Form(..., description="User message text"),
+    session_id: str | None = Form(
+        None, description="Optional session ID for conversation continuity"
+    ),
+    file: UploadFile | None = File(None, description="Optional file upload (PDF, CSV, Excel)"),
+    latitude: float | None = Form(
+        None, description="Optional GPS latitude for location-based queries"
+    ),
+    longitude: float | None = Form(
+        None, description="Optional GPS longitude for location-based queries"
+    ),
+    role: str | None = Form(
+        None, description="Optional agent role/style: general, executive, technical, simple, policy"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Streaming variant of `/agent/chat` using Server-Sent Events.
+
+    Accepts the same multipart form fields as `/agent/chat`. Validation, session
+    limit and document errors are returned as normal HTTP errors before the
+    stream opens. After that the response is `text/event-stream` with events:
+
+    - `token`: `{"content": "..."}` - model text as the provider generates it, released
+      a sentence or line at a time after the same key redaction and filtering as the
+      final response (tool requests written as text are not streamed)
+    - `reset`: `{}` - a model call failed part way and is being retried; discard the
+      text streamed so far
+    - `done`: the full `ChatResponse` payload. `response` holds the final text after
+      response filtering and markdown formatting; clients should replace the
+      streamed draft with it
+    - `error`: `{"message": "..."}` if processing fails after the stream opened
+
+    The assistant message is saved when generation finishes, even if the client
+    disconnects before the `done` event.
+
+    **Example:**
+    ```bash
+    curl -N -X POST http://localhost:8000/api/v1/agent/chat/stream \\
+      -F "message=What's the air quality in Kampala?"
+    ```
+    """
+    try:
+        turn = await _prepare_chat_turn(request, message, session_id, file, latitude, longitude, db)
     except HTTPException:
         raise
     except Exception as e:
-        # Log error with context for monitoring
-        from shared.monitoring.error_logger import get_error_logger
-
-        error_logger = get_error_logger()
-        error_data = error_logger.log_error(
-            e,
-            context={
-                "endpoint": "/agent/chat",
-                "session_id": session_id,
-                "message_length": len(message) if message else 0,
-                "has_document": document_filename is not None,
-                "error_category": "chat_processing",
-            },
-            user_message="Unable to process your message. Please try again.",
-        )
+        raise _chat_error(e, session_id, message, bool(file and file.filename)) from e
+
+    agent = get_agent()
+    token_stream = TokenStream()
 
-        # Clean up any lingering resources
-        if "agent" in locals():
+    async def run_turn() -> ChatResponse:
+        with token_stream.bind():
             try:
-                agent._manage_memory()  # Force memory cleanup after error
-            except Exception as cleanup_error:
-                logger.warning(f"Memory cleanup failed after error: {cleanup_error}")
+                result = await asyncio.wait_for(
+                    agent.process_message(**_agent_request(turn, role)),
+                    timeout=CHAT_TIMEOUT_SECONDS,
+                )
+            finally:
+                token_stream.close()
 
-        raise HTTPException(status_code=500, detail=error_data["message"]) from e
-    finally:
-        # Always attempt cleanup of document data from memory
+        # The request-scoped session is closed once streaming starts
+        stream_db = SessionLocal()
         try:
-            if "document_data" in locals() and document_data is not None:
-                del document_data
-        except Exception:
-            pass
+            return _finalize_chat_turn(stream_db, turn, result)
+        finally:
+            stream_db.close()
+
+    async def event_stream():
+        turn_task = asyncio.create_task(run_turn())
+        _background_turns.add(turn_task)
+        turn_task.add_done_callback(_background_turns.discard)
+
+        stream_filter = StreamingResponseFilter(clean=_clean_response_text)
+        async for delta in token_stream:
+            if delta is TokenStream.RESET:
+                stream_filter.reset()
+                yield _sse_event("reset", {})
+            elif text := stream_filter.feed(delta):
+                yield _sse_event("token", {"content": text})
+        if text := stream_filter.flush():
+            yield _sse_event("token", {"content": text})
         try:
-            if "file_content" in locals() and file_content is not None:
-                file_content.close()
-                del file_content
-        except Exception:
-            pass
+            response = await turn_task
+        except asyncio.TimeoutError:
+            logger.error(f"Streaming agent processing timed out for message: {message[:100]}")
+            yield _sse_event(
+                "error",
+                {"message": "Request processing timed out after 120 seconds. Please try a simpler query or smaller document."},
+            )
+            return
+        except Exception as e:
+            error = _chat_error(e, turn["session_id"], message, turn["document_filename"] is not None)
+            yield _sse_event("error", {"message": error.detail})
+            return
+        yield _sse_event("done", response.model_dump(exclude_none=True))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-# Streaming endpoint removed - industry best practice is to use observability tools
-# (like LangSmith, OpenTelemetry) for agent reasoning traces, not user-facing streams
 
 
 @router.post("/air-quality/query")
@@ -1062,6 +1262,67 @@ async def disconnect_mcp_server(name: str):
         raise HTTPException(status_code=500, detail={"message": aeris_unavailable_message()})
 
 
+# ============================================================================
+# ADMIN ENDPOINTS
+# ============================================================================
+
+
+def require_admin(x_admin_key: str | None = Header(default=None)) -> None:
+    """Allow the request only with a matching X-Admin-Key (admin API is off when unset)."""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+
+
+@router.delete("/admin/cache/{namespace}", dependencies=[Depends(require_admin)])
+async def clear_cache_namespace(namespace: str):
+    """
+    Invalidate every cached entry in a namespace.
+
+    Uses incremental SCAN + UNLINK on Redis, so it is safe to call on a shared
+    instance. Other workers' in-process L1 copies expire within CACHE_L1_TTL_SECONDS.
+
+    Args:
+        namespace: Cache namespace, e.g. "api:waqi", "api:airqo", "analysis"
+
+    Returns:
+        Confirmation message
+    """
+    cleared = await asyncio.to_thread(get_cache().clear_namespace, namespace)
+    if not cleared:
+        raise HTTPException(status_code=503, detail={"message": aeris_unavailable_message()})
+
+    logger.info(f"Cleared cache namespace {namespace}")
+    return {
+        "status": "success",
+        "message": f"Cache namespace {namespace} has been cleared",
+        "namespace": namespace,
+    }
+
+
+@router.get("/admin/cache/stats", dependencies=[Depends(require_admin)])
+async def get_cache_stats(request: Request):
+    """
+    Cache, cache-warmup, station-index and semantic response cache metrics.
+
+    Returns:
+        Backend stats (hit rates, circuit state), warmup counters, station
+        index counts and paraphrase hits; warmup / station_index are null when
+        disabled, semantic is null before the agent is created
+    """
+    warmer = getattr(request.app.state, "cache_warmer", None)
+    refresher = getattr(request.app.state, "station_index_refresher", None)
+    return {
+        "cache": get_cache().stats(),
+        "warmup": warmer.stats() if warmer is not None else None,
+        "station_index": refresher.stats() if refresher is not None else None,
+        "semantic": (
+            _agent_instance.semantic_cache.stats() if _agent_instance is not None else None
+        ),
+    }
+
+
 # ============================================================================
 # VISUALIZATION ENDPOINTS
 # ============================================================================
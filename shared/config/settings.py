@@ -14,6 +14,8 @@ class Settings(BaseSettings):
     AI_MODEL: str = "gemini-1.5-flash"
     AI_PROVIDER: str = "gemini"
     AI_MAX_TOKENS: int = 2048
+    # Prompt budget for the model's context window (0 = known limit for AI_MODEL)
+    CONTEXT_WINDOW_TOKENS: int = 0
     AI_RESPONSE_TEMPERATURE: float = 0.3
     AI_RESPONSE_TOP_P: float = 0.9
     AI_RESPONSE_STYLE: str = "general"
@@ -46,11 +48,18 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Aeris-AQ - Air Quality AI Assistant API"
     ENVIRONMENT: str = "development"
+    # Shared secret for /admin endpoints (sent as X-Admin-Key); empty disables them
+    ADMIN_API_KEY: str = ""
 
     # Session Configuration
     MAX_MESSAGES_PER_SESSION: int = 100
     SESSION_LIMIT_WARNING_THRESHOLD: int = 90
     DISABLE_SESSION_LIMIT: bool = True
+    # Rolling LLM summary of older turns, written in the background after each response
+    CONVERSATION_SUMMARY_ENABLED: bool = True
+    # Unsummarized messages that trigger a summary run / messages it leaves verbatim
+    CONVERSATION_SUMMARY_TRIGGER_MESSAGES: int = 12
+    CONVERSATION_SUMMARY_KEEP_RECENT: int = 6
 
     @field_validator("DISABLE_SESSION_LIMIT", mode="before")
     @classmethod
@@ -70,6 +79,36 @@ class Settings(BaseSettings):
     # Cache
     CACHE_TTL_SECONDS: int = 3600
     CACHE_RESPONSE_TTL_SECONDS: int = 3600
+    CACHE_MEMORY_MAX_ENTRIES: int = 10000
+    CACHE_MEMORY_MAX_BYTES: int = 100 * 1024 * 1024  # 100MB
+    # Short-lived in-process tier in front of Redis (0 TTL disables it)
+    CACHE_L1_TTL_SECONDS: int = 30
+    CACHE_L1_MAX_ENTRIES: int = 2000
+    # Redis payload codec: "json" (orjson, pickle fallback) or "pickle"
+    CACHE_SERIALIZER: str = "json"
+    CACHE_COMPRESSION_MIN_BYTES: int = 4096  # zstd above this size, 0 disables
+    # Stale-while-revalidate per data source as "source:soft/hard" seconds: past the soft TTL
+    # cached data is served (flagged stale) while it refreshes; past the hard TTL it is refetched
+    CACHE_SWR_TTLS: str = "airqo:600/3600,waqi:600/3600,openmeteo:1800/3600,defra:3600/7200"
+    # Background warmup of current conditions and forecasts for hot cities
+    CACHE_WARMUP_ENABLED: bool = False
+    CACHE_WARMUP_CITIES: str = "kampala,nairobi,lagos,accra,kigali,dar es salaam,addis ababa,johannesburg,cairo,london,new york,delhi"
+    CACHE_WARMUP_INTERVAL_SECONDS: int = 300
+    CACHE_WARMUP_JITTER: float = 0.2  # +/- fraction of the interval
+    CACHE_WARMUP_CONCURRENCY: int = 4
+    CACHE_WARMUP_PROVIDER_BUDGETS: str = "airqo:20,waqi:30"  # Warm calls per minute
+    # Nearest-station index of the providers' site lists, rebuilt in the background
+    STATION_INDEX_ENABLED: bool = True
+    STATION_INDEX_REFRESH_SECONDS: int = 21600
+    STATION_INDEX_MAX_DISTANCE_KM: float = 25.0  # Farther stations fall back to site search
+    # Network geocoding results (cities missing from the bundled gazetteer) are cached this long
+    GEOCODE_CACHE_TTL_SECONDS: int = 2592000
+    # Reverse geocoding results per geohash cell; optional SQLite file persists them
+    REVERSE_GEOCODE_CACHE_TTL_SECONDS: int = 2592000
+    REVERSE_GEOCODE_SQLITE_PATH: str = ""  # Empty keeps them in the shared cache only
+    # Paraphrases of answered questions reuse the cached response (see core.agent.semantic_cache)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.7  # Minimum Jaccard similarity of the query tokens
 
     # Style Presets (per role)
     MAX_TOKENS_EXECUTIVE: int = 1000
@@ -112,12 +151,39 @@ class Settings(BaseSettings):
     DOCUMENT_PREVIEW_ROWS_EXCEL: int = 100
     AGENT_MAX_DOC_LENGTH: int = 100000
 
+    # Upstream rate limits as "provider:requests_per_second/burst"; requests wait up to
+    # UPSTREAM_RATE_LIMIT_MAX_WAIT_SECONDS for a token before being rejected locally
+    UPSTREAM_RATE_LIMITS: str = "waqi:10/20,airqo:5/10,openmeteo:10/20,defra:5/10,uba:5/10,nsw:5/10,carbon_intensity:5/10,nominatim:1/1,ip_geolocation:1/5"
+    UPSTREAM_RATE_LIMIT_MAX_WAIT_SECONDS: float = 5.0
+
+    @field_validator("UPSTREAM_RATE_LIMITS")
+    @classmethod
+    def validate_upstream_rate_limits(cls, v):
+        """Fail at startup on a rate limit the token buckets cannot use."""
+        cls.parse_rate_limits(v)
+        return v
+
+    # Circuit breakers for upstream services, tools and search providers. A breaker opens
+    # after CIRCUIT_BREAKER_FAILURE_THRESHOLD consecutive failures (calls slower than
+    # CIRCUIT_BREAKER_SLOW_CALL_SECONDS count as failures; 0 disables), then lets one probe
+    # through after CIRCUIT_BREAKER_RESET_SECONDS. CIRCUIT_BREAKER_SHARED shares the open
+    # state across workers through Redis (when enabled)
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_SECONDS: int = 60
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS: float = 20.0
+    CIRCUIT_BREAKER_SHARED: bool = True
+
     # Redis
     REDIS_ENABLED: bool = False
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
+    REDIS_MAX_CONNECTIONS: int = 50  # Async connection pool size
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 1.0  # Async client connect/read timeout
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
+    REDIS_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive errors before bypassing Redis
+    REDIS_CIRCUIT_RESET_SECONDS: int = 30
 
     # Cloudinary (for chart storage)
     CLOUDINARY_CLOUD_NAME: str = ""
@@ -173,6 +239,37 @@ class Settings(BaseSettings):
     def allowed_image_formats_list(self) -> list[str]:
         return [fmt.strip().lower() for fmt in self.ALLOWED_IMAGE_FORMATS.split(",") if fmt.strip()]
 
+    def cache_ttls(self, source: str) -> tuple[int, int | None]:
+        """(soft, hard) cache TTLs for a source; hard is None without stale-while-revalidate."""
+        for item in self.CACHE_SWR_TTLS.split(","):
+            name, _, ttls = item.strip().partition(":")
+            if name.strip().lower() == source.lower() and "/" in ttls:
+                soft, _, hard = ttls.partition("/")
+                return int(soft), int(hard)
+        return self.CACHE_TTL_SECONDS, None
+
+    @staticmethod
+    def parse_rate_limits(value: str) -> dict[str, tuple[float, int]]:
+        """Parse "provider:rate/burst" items, rejecting non-positive rates and bursts."""
+        limits = {}
+        for item in value.split(","):
+            name, _, limit = item.strip().partition(":")
+            rate, _, burst = limit.partition("/")
+            if name.strip() and rate.strip():
+                rate = float(rate)
+                burst = int(burst) if burst.strip() else max(1, int(rate))
+                if not rate > 0 or burst < 1:
+                    raise ValueError(
+                        f"Invalid upstream rate limit {item.strip()!r}: "
+                        "rate and burst must be positive"
+                    )
+                limits[name.strip().lower()] = (rate, burst)
+        return limits
+
+    def upstream_rate_limits(self) -> dict[str, tuple[float, int]]:
+        """Provider -> (requests per second, burst) from UPSTREAM_RATE_LIMITS."""
+        return self.parse_rate_limits(self.UPSTREAM_RATE_LIMITS)
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 
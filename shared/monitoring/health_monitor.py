@@ -21,6 +21,9 @@ from typing import Any, Dict, List, Optional
 
 import psutil
 
+from shared.utils.circuit_breaker import circuit_breaker_stats
+from shared.utils.rate_limiter import upstream_rate_limit_stats
+
 logger = logging.getLogger(__name__)
 
 
@@ -547,7 +550,11 @@ class HealthMonitor:
                     "p95_ms": sorted(times)[int(len(times) * 0.95)] if len(times) > 0 else 0,
                     "p99_ms": sorted(times)[int(len(times) * 0.99)] if len(times) > 0 else 0,
                 }
-        
+
+        # Remaining budget and 429 counters per upstream data provider
+        metrics["upstream_rate_limits"] = upstream_rate_limit_stats()
+        metrics["circuit_breakers"] = circuit_breaker_stats()
+
         return metrics
 
 
@@ -25,6 +25,8 @@ from urllib.parse import quote_plus, urlparse
 
 import httpx
 
+from shared.utils.circuit_breaker import CircuitBreaker, get_circuit_breaker
+
 logger = logging.getLogger(__name__)
 
 # Try to import DuckDuckGo search
@@ -90,8 +92,8 @@ class EnhancedSearchService:
     def __init__(
         self,
         cache_ttl: int = 3600,  # 1 hour cache
-        circuit_breaker_threshold: int = 5,
-        circuit_breaker_timeout: int = 300,  # 5 minutes
+        circuit_breaker_threshold: Optional[int] = None,
+        circuit_breaker_timeout: Optional[int] = None,
         max_results: int = 10,
         timeout: int = 30
     ):
@@ -100,8 +102,8 @@ class EnhancedSearchService:
         
         Args:
             cache_ttl: Cache time-to-live in seconds
-            circuit_breaker_threshold: Failures before circuit opens
-            circuit_breaker_timeout: Seconds before circuit reset attempt
+            circuit_breaker_threshold: Failures before circuit opens (default from settings)
+            circuit_breaker_timeout: Seconds before circuit reset attempt (default from settings)
             max_results: Maximum results to return
             timeout: Request timeout in seconds
         """
@@ -114,7 +116,7 @@ class EnhancedSearchService:
         # Initialize providers
         self.providers = self._initialize_providers()
         
-        # Circuit breaker state
+        # Provider health (circuit state itself lives in the shared breakers)
         self.provider_status: Dict[str, SearchProviderStatus] = {}
         for provider_name in self.providers.keys():
             self.provider_status[provider_name] = SearchProviderStatus(
@@ -224,6 +226,7 @@ class EnhancedSearchService:
                 continue
             
             # Attempt search
+            started = time.monotonic()
             try:
                 logger.info(f"Attempting search with {provider_name}: {query[:50]}")
                 
@@ -237,7 +240,7 @@ class EnhancedSearchService:
                 
                 if results:
                     # Success!
-                    self._record_success(provider_name)
+                    self._record_success(provider_name, time.monotonic() - started)
                     
                     # Score and filter results
                     scored_results = self._score_results(results, query)
@@ -459,27 +462,19 @@ class EnhancedSearchService:
         # Default order: prioritize by reliability
         return available_providers
     
+    def _breaker(self, provider: str) -> CircuitBreaker:
+        return get_circuit_breaker(
+            f"search:{provider}", self.circuit_breaker_threshold, self.circuit_breaker_timeout
+        )
+
     def _is_circuit_open(self, provider: str) -> bool:
-        """Check if circuit breaker is open for provider."""
+        """Check if circuit breaker is open for provider (lets one probe through when half-open)."""
         if provider not in self.provider_status:
             return False
         
-        status = self.provider_status[provider]
-        
-        if not status.circuit_open:
-            return False
-        
-        # Check if timeout has elapsed
-        if status.last_failure:
-            elapsed = (datetime.now(timezone.utc) - status.last_failure).total_seconds()
-            if elapsed >= self.circuit_breaker_timeout:
-                # Reset circuit breaker
-                status.circuit_open = False
-                status.failure_count = 0
-                logger.info(f"Circuit breaker reset for {provider}")
-                return False
-        
-        return True
+        is_open = not self._breaker(provider).allow_request()
+        self.provider_status[provider].circuit_open = is_open
+        return is_open
     
     def _is_rate_limited(self, provider: str) -> bool:
         """Check if provider is rate limited."""
@@ -497,13 +492,15 @@ class EnhancedSearchService:
         # Check limit
         return len(self.rate_limits[provider]) >= self.max_requests_per_minute
     
-    def _record_success(self, provider: str):
-        """Record successful search."""
+    def _record_success(self, provider: str, latency: Optional[float] = None):
+        """Record successful search (one slower than the slow-call limit counts as failed)."""
         if provider in self.provider_status:
+            breaker = self._breaker(provider)
+            breaker.record_success(latency)
             status = self.provider_status[provider]
             status.last_success = datetime.now(timezone.utc)
-            status.failure_count = 0
-            status.circuit_open = False
+            status.failure_count = breaker.failures
+            status.circuit_open = breaker.is_open()
         
         # Record for rate limiting
         if provider not in self.rate_limits:
@@ -515,14 +512,12 @@ class EnhancedSearchService:
         if provider not in self.provider_status:
             return
         
+        breaker = self._breaker(provider)
+        breaker.record_failure()
         status = self.provider_status[provider]
-        status.failure_count += 1
+        status.failure_count = breaker.failures
         status.last_failure = datetime.now(timezone.utc)
-        
-        # Open circuit breaker if threshold reached
-        if status.failure_count >= self.circuit_breaker_threshold:
-            status.circuit_open = True
-            logger.warning(f"Circuit breaker opened for {provider} after {status.failure_count} failures")
+        status.circuit_open = breaker.is_open()
     
     def _get_cache_key(
         self,
@@ -571,7 +566,8 @@ class EnhancedSearchService:
         return {
             name: {
                 "available": status.is_available,
-                "circuit_open": status.circuit_open,
+                "circuit_open": self._breaker(name).is_open(),
+                "circuit_state": self._breaker(name).state,
                 "failure_count": status.failure_count,
                 "last_success": status.last_success.isoformat() if status.last_success else None,
                 "last_failure": status.last_failure.isoformat() if status.last_failure else None
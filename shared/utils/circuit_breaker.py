@@ -0,0 +1,339 @@
+"""
+Circuit Breaker
+
+One breaker per named dependency (a data-source service, an orchestrated tool,
+a search provider), shared process-wide through `get_circuit_breaker()`:
+
+- CLOSED: calls flow. Consecutive failures, and successes slower than
+  CIRCUIT_BREAKER_SLOW_CALL_SECONDS, count towards
+  CIRCUIT_BREAKER_FAILURE_THRESHOLD.
+- OPEN: calls are rejected for CIRCUIT_BREAKER_RESET_SECONDS.
+- HALF_OPEN: a single probe call is let through; its success closes the
+  breaker, its failure opens it again.
+
+With CIRCUIT_BREAKER_SHARED and Redis enabled, `CircuitBreakerSync` shares
+the open state and the probe slot through Redis in the background, so every
+worker stops calling a dead provider within a sync interval of one of them
+tripping, and a worker does not probe while another holds the slot. Breakers
+only ever read and write local state on the request path; Redis problems
+leave them running on per-process state (the cache has its own breaker).
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+import uuid
+from typing import Any
+
+from shared.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Identifies this process as the holder of a shared probe slot
+WORKER_ID = uuid.uuid4().hex
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one dependency."""
+
+    KEY_PREFIX = "airquality:circuit:"
+    # A probe that never reports back frees its slot after this long
+    PROBE_TIMEOUT_SECONDS = 30
+    # How often CircuitBreakerSync exchanges breaker state with other workers
+    SHARED_SYNC_SECONDS = 2.0
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60,
+        slow_call_seconds: float | None = None,
+        shared: bool = False,
+    ):
+        """
+        Initialize a breaker.
+
+        Args:
+            name: Dependency name (also the Redis key suffix)
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before probing
+            slow_call_seconds: Successes slower than this count as failures (None disables)
+            shared: Share open state and the probe slot through Redis
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.shared = shared
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_until = 0.0  # Wall clock, comparable across workers
+        self._probe_started: float | None = None
+        # Holder ID written to the shared probe slot
+        self.worker_id = WORKER_ID
+        # Another worker's probe slot, as last seen by the shared sync
+        self._probe_elsewhere_until = 0.0
+        # State changes waiting for the shared sync: "open" / "close" / "probe"
+        self._unpublished: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.metrics = {"opened": 0, "rejected": 0, "slow_calls": 0, "probes": 0}
+
+    @property
+    def _key(self) -> str:
+        return f"{self.KEY_PREFIX}{self.name}"
+
+    def _queue(self, op: str, value: float) -> None:
+        """Queue a Redis update for the shared sync; a newer state supersedes older ones."""
+        if not self.shared:
+            return
+        if op == "close":
+            self._unpublished.clear()
+        elif op == "open":
+            self._unpublished.pop("close", None)
+            self._unpublished.pop("probe", None)
+        self._unpublished[op] = value
+
+    def _claim_probe(self, now: float) -> bool:
+        """Take the half-open probe slot unless a probe is already out here or elsewhere."""
+        if self._probe_started is not None and now - self._probe_started < self.PROBE_TIMEOUT_SECONDS:
+            return False
+        if now < self._probe_elsewhere_until:
+            return False
+        self._probe_started = now
+        self._queue("probe", now)
+        self.metrics["probes"] += 1
+        logger.info(f"Circuit breaker HALF-OPEN for {self.name}: sending one probe")
+        return True
+
+    def allow_request(self) -> bool:
+        """
+        Whether a call may go ahead.
+
+        In the half-open state this claims the single probe slot, so call it
+        once per actual call and report the outcome with `record_success` or
+        `record_failure`.
+        """
+        with self._lock:
+            now = time.time()
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and now >= self.opened_until:
+                self.state = HALF_OPEN
+                self._probe_started = None
+            if self.state == HALF_OPEN and self._claim_probe(now):
+                return True
+            self.metrics["rejected"] += 1
+            return False
+
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected, without claiming a probe."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.time() < self.opened_until
+            return self.state == HALF_OPEN and self._probe_started is not None
+
+    def record_success(self, latency: float | None = None) -> None:
+        """Record a successful call (a slow one counts as a failure)."""
+        if self.slow_call_seconds and latency is not None and latency > self.slow_call_seconds:
+            self.metrics["slow_calls"] += 1
+            logger.warning(f"Slow call to {self.name}: {latency:.1f}s")
+            self.record_failure()
+            return
+        with self._lock:
+            self.failures = 0
+            if self.state == CLOSED:
+                return
+            self.state = CLOSED
+            self._probe_started = None
+            self._queue("close", time.time())
+            logger.info(f"Circuit breaker CLOSED for {self.name}")
+
+    def record_failure(self) -> None:
+        """Record a failed call; opens the breaker at the threshold or on a failed probe."""
+        with self._lock:
+            self.failures += 1
+            if self.state == OPEN:
+                return
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+            else:
+                logger.warning(f"Service failure recorded for {self.name}: {self.failures} failures")
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_until = time.time() + self.reset_timeout
+        self._probe_started = None
+        self.metrics["opened"] += 1
+        self._queue("open", self.opened_until)
+        logger.warning(
+            f"Circuit breaker OPEN for {self.name} after {self.failures} failures "
+            f"(retry in {self.reset_timeout:.0f}s)"
+        )
+
+    async def sync_shared(self, cache) -> bool:
+        """
+        Publish this worker's state changes to Redis and adopt other workers'.
+
+        Called by `CircuitBreakerSync`; all Redis I/O happens here, on the async
+        client and outside the lock.
+
+        Args:
+            cache: RedisCache whose async client to use
+
+        Returns:
+            False when Redis was unavailable (the changes are kept for the next sync)
+        """
+        with self._lock:
+            pending, self._unpublished = self._unpublished, {}
+        probe_key = f"{self._key}:probe"
+
+        async def op(r):
+            pipe = r.pipeline()
+            for action, value in pending.items():
+                if action == "close":
+                    pipe.delete(self._key, probe_key)
+                elif action == "open" and value > time.time():
+                    pipe.set(self._key, str(value), ex=max(1, math.ceil(value - time.time())))
+                    pipe.delete(probe_key)
+                elif action == "probe":
+                    pipe.set(probe_key, self.worker_id, nx=True, ex=self.PROBE_TIMEOUT_SECONDS)
+            pipe.get(self._key)
+            pipe.get(probe_key)
+            return await pipe.execute()
+
+        results = await cache.run_async(op)
+        with self._lock:
+            if results is None:
+                newer, self._unpublished = self._unpublished, {}
+                for action, value in [*pending.items(), *newer.items()]:
+                    self._queue(action, value)
+                return False
+            self._adopt_shared(*results[-2:], time.time())
+        return True
+
+    def _adopt_shared(self, opened_until: Any, prober: Any, now: float) -> None:
+        """Open locally while another worker has the breaker open; note its probe."""
+        if isinstance(prober, bytes):
+            prober = prober.decode()
+        self._probe_elsewhere_until = (
+            now + self.PROBE_TIMEOUT_SECONDS if prober and prober != self.worker_id else 0.0
+        )
+        try:
+            opened_until = float(opened_until) if opened_until else 0.0
+        except (TypeError, ValueError):
+            return
+        if opened_until <= now or (self.state == OPEN and opened_until <= self.opened_until):
+            return
+        if self.state != OPEN:
+            logger.warning(f"Circuit breaker OPEN for {self.name} (tripped by another worker)")
+        self.state = OPEN
+        self.opened_until = opened_until
+        self._probe_started = None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "open_for_seconds": round(max(self.opened_until - time.time(), 0.0), 1)
+                if self.state == OPEN
+                else 0.0,
+                **self.metrics,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    name: str, failure_threshold: int | None = None, reset_timeout: float | None = None
+) -> CircuitBreaker:
+    """
+    The process-wide breaker for a dependency, created from settings on first use.
+
+    Args:
+        name: Dependency name, e.g. "waqi", "tool:search_web", "search:duckduckgo"
+        failure_threshold: Override CIRCUIT_BREAKER_FAILURE_THRESHOLD (first use only)
+        reset_timeout: Override CIRCUIT_BREAKER_RESET_SECONDS (first use only)
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                settings = get_settings()
+                breaker = _breakers[name] = CircuitBreaker(
+                    name,
+                    failure_threshold=failure_threshold or settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                    reset_timeout=reset_timeout or settings.CIRCUIT_BREAKER_RESET_SECONDS,
+                    slow_call_seconds=settings.CIRCUIT_BREAKER_SLOW_CALL_SECONDS or None,
+                    shared=settings.CIRCUIT_BREAKER_SHARED,
+                )
+    return breaker
+
+
+def circuit_breaker_stats() -> dict[str, dict[str, Any]]:
+    """State and counters of every breaker created in this process."""
+    return {name: breaker.stats() for name, breaker in list(_breakers.items())}
+
+
+class CircuitBreakerSync:
+    """In-process task that shares the shared breakers' state through Redis."""
+
+    def __init__(self, interval: float | None = None):
+        """
+        Initialize the sync (call start() to begin syncing).
+
+        Args:
+            interval: Seconds between syncs (default: CircuitBreaker.SHARED_SYNC_SECONDS)
+        """
+        self.interval = interval or CircuitBreaker.SHARED_SYNC_SECONDS
+        self._task: asyncio.Task | None = None
+        self.metrics = {"syncs": 0, "failed_syncs": 0}
+
+    async def sync(self) -> None:
+        """Exchange state for every shared breaker created in this process."""
+        from infrastructure.cache.cache_service import get_cache
+
+        cache = get_cache()
+        if not cache.enabled:
+            return
+        for breaker in list(_breakers.values()):
+            if breaker.shared and not await breaker.sync_shared(cache):
+                self.metrics["failed_syncs"] += 1
+        self.metrics["syncs"] += 1
+
+    def start(self) -> None:
+        """Start syncing in the background on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Circuit breaker sync failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict[str, Any]:
+        return dict(self.metrics)
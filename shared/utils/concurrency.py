@@ -0,0 +1,89 @@
+"""Bounded concurrent execution of independent calls.
+
+Multi-entity work (several cities, several forecasts) fans out through these
+helpers instead of a serial loop: at most `limit` calls run at once, each call
+can be given its own timeout, and an overall deadline returns whatever
+finished in time so callers can answer with partial results.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+async def gather_bounded(
+    calls: dict[K, Callable[[], Awaitable[T]]],
+    limit: int,
+    call_timeout: float | None = None,
+    deadline: float | None = None,
+) -> dict[K, T | BaseException]:
+    """Run async calls concurrently under a semaphore.
+
+    Args:
+        calls: Key -> zero-argument coroutine factory.
+        limit: Maximum calls in flight.
+        call_timeout: Seconds allowed per call (timeouts surface as TimeoutError).
+        deadline: Seconds allowed overall; unfinished calls are cancelled.
+
+    Returns:
+        Key -> result or raised exception, for the calls that finished before
+        the deadline (missing keys did not). A call cancelled from inside maps
+        to a CancelledError instance.
+    """
+    if not calls:
+        return {}
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await asyncio.wait_for(call(), call_timeout)
+
+    tasks = {key: asyncio.ensure_future(run(call)) for key, call in calls.items()}
+    try:
+        done, _ = await asyncio.wait(tasks.values(), timeout=deadline)
+    finally:
+        pending = [task for task in tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    return {key: _outcome(task) for key, task in tasks.items() if task in done}
+
+
+def _outcome(task: asyncio.Future[T]) -> T | BaseException:
+    """Result or exception of a finished task, without raising either."""
+    if task.cancelled():
+        return asyncio.CancelledError()
+    return task.exception() or task.result()
+
+
+def run_bounded(
+    calls: dict[K, Callable[[], T]],
+    limit: int,
+    deadline: float | None = None,
+) -> dict[K, T | BaseException]:
+    """Thread-pool twin of `gather_bounded` for blocking calls.
+
+    Threads cannot be interrupted, so there is no per-call timeout (rely on the
+    client's own socket timeouts); calls still running at the deadline are
+    abandoned and their results discarded.
+    """
+    if not calls:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=min(limit, len(calls)))
+    try:
+        futures = {key: executor.submit(call) for key, call in calls.items()}
+        done, _ = wait(futures.values(), timeout=deadline)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return {
+        key: future.exception() or future.result()
+        for key, future in futures.items()
+        if future in done
+    }
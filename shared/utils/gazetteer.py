@@ -0,0 +1,350 @@
+"""
+Offline city gazetteer.
+
+First resolution tier for city-name geocoding: the cities we serve (the ones
+QueryAnalyzer detects, the hot-city and regional-network cities, and major
+world cities) are bundled here with their coordinates, so resolving them
+needs no Nominatim / Open-Meteo call. Network geocoding stays as the (cached)
+fallback for everything else.
+
+Rows are parsed once into parallel arrays (names, countries, `array("d")`
+coordinates) plus a dict from normalized name or alias to row. Lookups
+accept "City" and "City, Country" forms, ignore case, accents and
+punctuation, and tolerate small typos in longer names.
+"""
+
+import difflib
+import re
+import unicodedata
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+
+# name|country|country code|latitude|longitude|aliases (comma separated)
+# Order matters for ambiguous names: the first row wins without a country.
+_CITIES = """\
+Kampala|Uganda|UG|0.3476|32.5825|
+Gulu|Uganda|UG|2.7746|32.2990|
+Jinja|Uganda|UG|0.4244|33.2042|
+Mbale|Uganda|UG|1.0827|34.1750|
+Mbarara|Uganda|UG|-0.6072|30.6545|
+Nakasero|Uganda|UG|0.3240|32.5800|
+Entebbe|Uganda|UG|0.0512|32.4637|
+Fort Portal|Uganda|UG|0.6710|30.2750|
+Nairobi|Kenya|KE|-1.2921|36.8219|
+Mombasa|Kenya|KE|-4.0435|39.6682|
+Kisumu|Kenya|KE|-0.0917|34.7680|
+Nakuru|Kenya|KE|-0.3031|36.0800|
+Eldoret|Kenya|KE|0.5143|35.2698|
+Dar es Salaam|Tanzania|TZ|-6.7924|39.2083|dar
+Dodoma|Tanzania|TZ|-6.1630|35.7516|
+Mwanza|Tanzania|TZ|-2.5164|32.9175|
+Arusha|Tanzania|TZ|-3.3869|36.6830|
+Mbeya|Tanzania|TZ|-8.9094|33.4608|
+Kigali|Rwanda|RW|-1.9441|30.0619|
+Butare|Rwanda|RW|-2.5967|29.7394|huye
+Musanze|Rwanda|RW|-1.4998|29.6350|ruhengeri
+Gisenyi|Rwanda|RW|-1.7023|29.2564|rubavu
+Addis Ababa|Ethiopia|ET|9.0054|38.7636|addis
+Accra|Ghana|GH|5.6037|-0.1870|
+Kumasi|Ghana|GH|6.6885|-1.6244|
+Lagos|Nigeria|NG|6.5244|3.3792|
+Abuja|Nigeria|NG|9.0765|7.3986|
+Kano|Nigeria|NG|12.0022|8.5920|
+Ibadan|Nigeria|NG|7.3775|3.9470|
+Cairo|Egypt|EG|30.0444|31.2357|
+Alexandria|Egypt|EG|31.2001|29.9187|
+Johannesburg|South Africa|ZA|-26.2041|28.0473|joburg,jozi
+Cape Town|South Africa|ZA|-33.9249|18.4241|
+Durban|South Africa|ZA|-29.8587|31.0218|
+Pretoria|South Africa|ZA|-25.7479|28.2293|tshwane
+Kinshasa|DR Congo|CD|-4.4419|15.2663|
+Lubumbashi|DR Congo|CD|-11.6647|27.4794|
+Goma|DR Congo|CD|-1.6792|29.2228|
+Luanda|Angola|AO|-8.8390|13.2894|
+Abidjan|Côte d'Ivoire|CI|5.3600|-4.0083|
+Dakar|Senegal|SN|14.7167|-17.4677|
+Casablanca|Morocco|MA|33.5731|-7.5898|
+Rabat|Morocco|MA|34.0209|-6.8416|
+Algiers|Algeria|DZ|36.7538|3.0588|
+Tunis|Tunisia|TN|36.8065|10.1815|
+Tripoli|Libya|LY|32.8872|13.1913|
+Khartoum|Sudan|SD|15.5007|32.5599|
+Mogadishu|Somalia|SO|2.0469|45.3182|
+Juba|South Sudan|SS|4.8594|31.5713|
+Harare|Zimbabwe|ZW|-17.8252|31.0335|
+Bulawayo|Zimbabwe|ZW|-20.1325|28.6265|
+Lusaka|Zambia|ZM|-15.3875|28.3228|
+Maputo|Mozambique|MZ|-25.9692|32.5732|
+Windhoek|Namibia|NA|-22.5609|17.0658|
+Gaborone|Botswana|BW|-24.6282|25.9231|
+Lilongwe|Malawi|MW|-13.9626|33.7741|
+Blantyre|Malawi|MW|-15.7861|35.0058|
+Bujumbura|Burundi|BI|-3.3614|29.3599|
+Bamako|Mali|ML|12.6392|-8.0029|
+Ouagadougou|Burkina Faso|BF|12.3714|-1.5197|
+Niamey|Niger|NE|13.5116|2.1254|
+N'Djamena|Chad|TD|12.1348|15.0557|
+Bangui|Central African Republic|CF|4.3947|18.5582|
+Libreville|Gabon|GA|0.4162|9.4673|
+Brazzaville|Republic of the Congo|CG|-4.2634|15.2429|
+Yaoundé|Cameroon|CM|3.8480|11.5021|
+Douala|Cameroon|CM|4.0511|9.7679|
+Malabo|Equatorial Guinea|GQ|3.7504|8.7371|
+Monrovia|Liberia|LR|6.3156|-10.8074|
+Freetown|Sierra Leone|SL|8.4657|-13.2317|
+Conakry|Guinea|GN|9.6412|-13.5784|
+Bissau|Guinea-Bissau|GW|11.8817|-15.6178|
+Praia|Cabo Verde|CV|14.9330|-23.5133|
+Banjul|Gambia|GM|13.4549|-16.5790|
+Nouakchott|Mauritania|MR|18.0735|-15.9582|
+Lomé|Togo|TG|6.1256|1.2254|
+Cotonou|Benin|BJ|6.3703|2.3912|
+Antananarivo|Madagascar|MG|-18.8792|47.5079|tana
+Asmara|Eritrea|ER|15.3229|38.9251|
+Djibouti|Djibouti|DJ|11.5721|43.1456|
+Port Louis|Mauritius|MU|-20.1609|57.5012|
+Maseru|Lesotho|LS|-29.3151|27.4869|
+Mbabane|Eswatini|SZ|-26.3054|31.1367|
+London|United Kingdom|GB|51.5074|-0.1278|
+Manchester|United Kingdom|GB|53.4808|-2.2426|
+Birmingham|United Kingdom|GB|52.4862|-1.8904|
+Leeds|United Kingdom|GB|53.8008|-1.5491|
+Glasgow|United Kingdom|GB|55.8642|-4.2518|
+Sheffield|United Kingdom|GB|53.3811|-1.4701|
+Bradford|United Kingdom|GB|53.7960|-1.7594|
+Liverpool|United Kingdom|GB|53.4084|-2.9916|
+Edinburgh|United Kingdom|GB|55.9533|-3.1883|
+Leicester|United Kingdom|GB|52.6369|-1.1398|
+Bristol|United Kingdom|GB|51.4545|-2.5879|
+Cardiff|United Kingdom|GB|51.4816|-3.1791|
+Newcastle upon Tyne|United Kingdom|GB|54.9783|-1.6178|newcastle
+Nottingham|United Kingdom|GB|52.9548|-1.1581|
+Belfast|United Kingdom|GB|54.5973|-5.9301|
+Paris|France|FR|48.8566|2.3522|
+Lyon|France|FR|45.7640|4.8357|
+Marseille|France|FR|43.2965|5.3698|
+Berlin|Germany|DE|52.5200|13.4050|
+Munich|Germany|DE|48.1351|11.5820|münchen,muenchen
+Hamburg|Germany|DE|53.5511|9.9937|
+Frankfurt|Germany|DE|50.1109|8.6821|frankfurt am main
+Cologne|Germany|DE|50.9375|6.9603|köln,koeln
+Stuttgart|Germany|DE|48.7758|9.1829|
+Düsseldorf|Germany|DE|51.2277|6.7735|duesseldorf
+Rome|Italy|IT|41.9028|12.4964|roma
+Milan|Italy|IT|45.4642|9.1900|milano
+Madrid|Spain|ES|40.4168|-3.7038|
+Barcelona|Spain|ES|41.3874|2.1686|
+Lisbon|Portugal|PT|38.7223|-9.1393|lisboa
+Amsterdam|Netherlands|NL|52.3676|4.9041|
+Brussels|Belgium|BE|50.8503|4.3517|bruxelles
+Vienna|Austria|AT|48.2082|16.3738|wien
+Zurich|Switzerland|CH|47.3769|8.5417|
+Warsaw|Poland|PL|52.2297|21.0122|warszawa
+Prague|Czechia|CZ|50.0755|14.4378|praha
+Stockholm|Sweden|SE|59.3293|18.0686|
+Oslo|Norway|NO|59.9139|10.7522|
+Copenhagen|Denmark|DK|55.6761|12.5683|
+Dublin|Ireland|IE|53.3498|-6.2603|
+Athens|Greece|GR|37.9838|23.7275|
+Istanbul|Turkey|TR|41.0082|28.9784|
+Moscow|Russia|RU|55.7558|37.6173|
+New York|United States|US|40.7128|-74.0060|new york city,nyc
+Los Angeles|United States|US|34.0522|-118.2437|
+Chicago|United States|US|41.8781|-87.6298|
+Houston|United States|US|29.7604|-95.3698|
+Phoenix|United States|US|33.4484|-112.0740|
+San Francisco|United States|US|37.7749|-122.4194|
+Washington|United States|US|38.9072|-77.0369|washington dc
+Boston|United States|US|42.3601|-71.0589|
+Seattle|United States|US|47.6062|-122.3321|
+Miami|United States|US|25.7617|-80.1918|
+Denver|United States|US|39.7392|-104.9903|
+Atlanta|United States|US|33.7490|-84.3880|
+Toronto|Canada|CA|43.6532|-79.3832|
+Vancouver|Canada|CA|49.2827|-123.1207|
+Montreal|Canada|CA|45.5017|-73.5673|
+Mexico City|Mexico|MX|19.4326|-99.1332|ciudad de mexico,cdmx
+São Paulo|Brazil|BR|-23.5505|-46.6333|
+Rio de Janeiro|Brazil|BR|-22.9068|-43.1729|
+Buenos Aires|Argentina|AR|-34.6037|-58.3816|
+Lima|Peru|PE|-12.0464|-77.0428|
+Bogotá|Colombia|CO|4.7110|-74.0721|
+Santiago|Chile|CL|-33.4489|-70.6693|
+Tokyo|Japan|JP|35.6762|139.6503|
+Osaka|Japan|JP|34.6937|135.5023|
+Kyoto|Japan|JP|35.0116|135.7681|
+Beijing|China|CN|39.9042|116.4074|peking
+Shanghai|China|CN|31.2304|121.4737|
+Guangzhou|China|CN|23.1291|113.2644|canton
+Shenzhen|China|CN|22.5431|114.0579|
+Hong Kong|Hong Kong|HK|22.3193|114.1694|
+Seoul|South Korea|KR|37.5665|126.9780|
+Delhi|India|IN|28.7041|77.1025|new delhi
+Mumbai|India|IN|19.0760|72.8777|bombay
+Bangalore|India|IN|12.9716|77.5946|bengaluru
+Chennai|India|IN|13.0827|80.2707|madras
+Kolkata|India|IN|22.5726|88.3639|calcutta
+Hyderabad|India|IN|17.3850|78.4867|
+Karachi|Pakistan|PK|24.8607|67.0011|
+Lahore|Pakistan|PK|31.5204|74.3587|
+Dhaka|Bangladesh|BD|23.8103|90.4125|
+Kathmandu|Nepal|NP|27.7172|85.3240|
+Bangkok|Thailand|TH|13.7563|100.5018|
+Jakarta|Indonesia|ID|-6.2088|106.8456|
+Manila|Philippines|PH|14.5995|120.9842|
+Singapore|Singapore|SG|1.3521|103.8198|
+Kuala Lumpur|Malaysia|MY|3.1390|101.6869|
+Hanoi|Vietnam|VN|21.0278|105.8342|
+Ho Chi Minh City|Vietnam|VN|10.8231|106.6297|saigon
+Dubai|United Arab Emirates|AE|25.2048|55.2708|
+Riyadh|Saudi Arabia|SA|24.7136|46.6753|
+Tehran|Iran|IR|35.6892|51.3890|
+Sydney|Australia|AU|-33.8688|151.2093|
+Melbourne|Australia|AU|-37.8136|144.9631|
+Brisbane|Australia|AU|-27.4698|153.0251|
+Perth|Australia|AU|-31.9505|115.8605|
+Adelaide|Australia|AU|-34.9285|138.6007|
+Canberra|Australia|AU|-35.2809|149.1300|
+Newcastle|Australia|AU|-32.9283|151.7817|
+Wollongong|Australia|AU|-34.4278|150.8931|
+Auckland|New Zealand|NZ|-36.8485|174.7633|
+Wellington|New Zealand|NZ|-41.2866|174.7756|
+"""
+
+# Country qualifiers that differ from the bundled country names
+_COUNTRY_ALIASES = {
+    "uk": "GB",
+    "england": "GB",
+    "scotland": "GB",
+    "wales": "GB",
+    "northern ireland": "GB",
+    "great britain": "GB",
+    "usa": "US",
+    "united states of america": "US",
+    "america": "US",
+    "drc": "CD",
+    "democratic republic of the congo": "CD",
+    "congo": "CG",
+    "ivory coast": "CI",
+    "uae": "AE",
+    "korea": "KR",
+    "czech republic": "CZ",
+    "cape verde": "CV",
+    "swaziland": "SZ",
+    "the gambia": "GM",
+}
+
+# Fuzzy matching only for names this long, at this similarity (one typo in 7+ letters)
+_FUZZY_MIN_LENGTH = 5
+_FUZZY_CUTOFF = 0.85
+
+
+def normalize(text: str) -> str:
+    """Casefold, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = re.sub(r"[^\w\s]", " ", text.replace("'", ""))
+    text = " ".join(text.split())
+    return text.removeprefix("city of ")
+
+
+@dataclass(frozen=True)
+class GazetteerMatch:
+    """A city resolved from the gazetteer."""
+
+    name: str
+    country: str
+    country_code: str
+    latitude: float
+    longitude: float
+    fuzzy: bool = False
+
+
+class Gazetteer:
+    """Bundled cities with normalized, country-qualified and fuzzy name lookup."""
+
+    def __init__(self, data: str = _CITIES):
+        self.names: list[str] = []
+        self.countries: list[str] = []
+        self.country_codes: list[str] = []
+        self.latitudes = array("d")
+        self.longitudes = array("d")
+        # Normalized name or alias -> row numbers, in data order
+        self._keys: dict[str, tuple[int, ...]] = {}
+        self._country_codes_by_name = {normalize(k): v for k, v in _COUNTRY_ALIASES.items()}
+
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            name, country, code, lat, lon, aliases = line.split("|")
+            row = len(self.names)
+            self.names.append(name)
+            self.countries.append(country)
+            self.country_codes.append(code)
+            self.latitudes.append(float(lat))
+            self.longitudes.append(float(lon))
+            self._country_codes_by_name[normalize(country)] = code
+            self._country_codes_by_name[code.lower()] = code
+            for key in {normalize(name), *(normalize(a) for a in aliases.split(",") if a)}:
+                self._keys[key] = self._keys.get(key, ()) + (row,)
+
+        # Fuzzy candidates bucketed by first letter
+        self._fuzzy_buckets: dict[str, list[str]] = {}
+        for key in self._keys:
+            if len(key) >= _FUZZY_MIN_LENGTH:
+                self._fuzzy_buckets.setdefault(key[0], []).append(key)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _match(self, row: int, fuzzy: bool) -> GazetteerMatch:
+        return GazetteerMatch(
+            self.names[row],
+            self.countries[row],
+            self.country_codes[row],
+            self.latitudes[row],
+            self.longitudes[row],
+            fuzzy,
+        )
+
+    def _rows(self, key: str) -> tuple[tuple[int, ...], bool]:
+        rows = self._keys.get(key)
+        if rows:
+            return rows, False
+        if len(key) >= _FUZZY_MIN_LENGTH:
+            close = difflib.get_close_matches(
+                key, self._fuzzy_buckets.get(key[0], ()), n=1, cutoff=_FUZZY_CUTOFF
+            )
+            if close:
+                return self._keys[close[0]], True
+        return (), False
+
+    def lookup(self, query: str) -> GazetteerMatch | None:
+        """
+        Resolve a city name, e.g. "Kampala", "kampala, uganda", "Sao Paulo".
+
+        Anything after the first comma must name the city's country (or its
+        ISO code); queries that look like street addresses or name unknown
+        places return None.
+        """
+        if not query:
+            return None
+        name, _, qualifier = query.partition(",")
+        rows, fuzzy = self._rows(normalize(name))
+        if not rows:
+            return None
+
+        qualifier = normalize(qualifier)
+        if qualifier:
+            code = self._country_codes_by_name.get(qualifier)
+            rows = tuple(row for row in rows if self.country_codes[row] == code)
+            if not rows:
+                return None
+        return self._match(rows[0], fuzzy)
+
+
+@lru_cache
+def get_gazetteer() -> Gazetteer:
+    """The bundled gazetteer, parsed on first use."""
+    return Gazetteer()
@@ -8,6 +8,7 @@ Provides resilient HTTP requests with:
 - Connection pooling
 """
 
+import asyncio
 import logging
 from typing import Any
 
@@ -20,6 +21,8 @@ from tenacity import (  # type: ignore[import-untyped]
     wait_exponential,
 )
 
+from shared.utils.rate_limiter import RateLimitedAsyncTransport
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +58,17 @@ DEFAULT_TIMEOUT = httpx.Timeout(
     pool=2.0,  # Time to get connection from pool - reduced from 5s
 )
 
+# Connection pool for the data-source clients
+DATA_SOURCE_POOL_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+
+# Connection pool for the LLM provider clients. Completions hold a connection
+# for seconds at a time, so keep more keep-alive slots than the data-source pool.
+LLM_POOL_LIMITS = httpx.Limits(
+    max_connections=200, max_keepalive_connections=50, keepalive_expiry=60.0
+)
+
 
 # Retry configuration
 @retry(
@@ -219,20 +233,66 @@ async def resilient_post(
         raise HTTPClientError("An unexpected error occurred while contacting the service.") from e
 
 
-def create_client(timeout: httpx.Timeout | None = None) -> httpx.AsyncClient:
+def create_client(
+    timeout: httpx.Timeout | None = None, rate_limited: bool = False
+) -> httpx.AsyncClient:
     """
     Create a configured async HTTP client with connection pooling.
 
     Args:
         timeout: Custom timeout configuration
+        rate_limited: Send requests to known upstream providers through their
+            shared token buckets (see shared.utils.rate_limiter)
 
     Returns:
         Configured httpx.AsyncClient
     """
+    # httpx ignores the client's `limits` when a transport is passed, so the
+    # pool limits are set on the transport itself
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(limits=DATA_SOURCE_POOL_LIMITS)
+    if rate_limited:
+        transport = RateLimitedAsyncTransport(transport)
     return httpx.AsyncClient(
         timeout=timeout or DEFAULT_TIMEOUT,
-        limits=httpx.Limits(
-            max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
-        ),
+        transport=transport,
         follow_redirects=True,
     )
+
+
+# Shared pooled client for the async-native data-source clients. httpx binds
+# pooled connections to the event loop that opened them, so the client is
+# rebuilt transparently if it is first used from a different loop (e.g. tests).
+_shared_client: httpx.AsyncClient | None = None
+_shared_client_loop = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled async HTTP client.
+
+    All data-source services share this client so keep-alive connections are
+    reused across tool calls instead of opening a new pool per request. Its
+    requests are rate limited per upstream provider.
+
+    Returns:
+        Shared httpx.AsyncClient bound to the running event loop
+    """
+    global _shared_client, _shared_client_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _shared_client is None or _shared_client.is_closed or _shared_client_loop is not loop:
+        _shared_client = create_client(rate_limited=True)
+        _shared_client_loop = loop
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    """Close the shared async HTTP client (called on application shutdown)."""
+    global _shared_client, _shared_client_loop
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+    _shared_client = None
+    _shared_client_loop = None
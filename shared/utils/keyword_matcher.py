@@ -0,0 +1,89 @@
+"""
+Multi-pattern keyword matcher.
+
+Matches many labelled terms against a text in one pass. Terms are compiled
+into a character trie, and since every term is word-bounded, a match can
+only begin where a word begins: the scan walks the trie from each word
+start (found by one C-level regex pass) instead of testing every term
+against the whole text, so cost grows with the text, not the vocabulary.
+
+Matching is case-insensitive and respects word boundaries on both sides,
+so "air" does not match inside "repair". A term ending in "*" is a stem
+and only needs the left boundary ("trend*" matches "trends").
+"""
+
+import re
+from collections.abc import Iterable, Mapping
+
+_WORD_START = re.compile(r"\b\w")
+_END = ""  # Trie key marking a complete term (characters are never empty)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """Compiled trie over labelled terms; `scan` returns the matches per label."""
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        """
+        Compile the matcher.
+
+        Args:
+            groups: Label -> terms. A term may appear under several labels.
+
+        Raises:
+            ValueError: If a term does not start with a word character
+        """
+        self._root: dict = {}
+        self._labels: list[str] = list(groups)
+        terms: dict[str, list[str]] = {}
+        for label, group_terms in groups.items():
+            for term in group_terms:
+                terms.setdefault(term.lower(), []).append(label)
+
+        for term, labels in terms.items():
+            stem = term.endswith("*")
+            text = term[:-1] if stem else term
+            if not text or not _is_word_char(text[0]):
+                raise ValueError(f"Keyword must start with a word character: {term!r}")
+            node = self._root
+            for char in text:
+                node = node.setdefault(char, {})
+            # Stems and terms ending in punctuation need no boundary on the right
+            bounded = not stem and _is_word_char(text[-1])
+            node[_END] = (text, bounded, tuple(dict.fromkeys(labels)))
+
+    def scan(self, text: str) -> dict[str, list[str]]:
+        """
+        Find every term in `text`.
+
+        Returns:
+            Label -> matched terms (stems without "*"), deduplicated, in order of
+            first occurrence. Every label is present, matched or not.
+        """
+        text = text.lower()
+        length = len(text)
+        root = self._root
+        found: dict[str, list[str]] = {label: [] for label in self._labels}
+        seen: set[str] = set()
+
+        for start in _WORD_START.finditer(text):
+            node = root
+            i = start.start()
+            while i < length:
+                node = node.get(text[i])
+                if node is None:
+                    break
+                i += 1
+                entry = node.get(_END)
+                if entry is None:
+                    continue
+                term, bounded, labels = entry
+                if term in seen or (bounded and i < length and _is_word_char(text[i])):
+                    continue
+                seen.add(term)
+                for label in labels:
+                    found[label].append(term)
+        return found
@@ -0,0 +1,285 @@
+"""
+Token-budgeted prompt assembly.
+
+Decides what goes into the model's context window for a chat turn. The system
+prompt and the user's message are always sent; what is left of the window
+after the response reserve is shared between uploaded documents, proactive
+tool results and conversation history:
+
+- Each section may claim its share of the space (SECTION_SHARES); space a
+  section does not need goes to the others, in that order.
+- Documents and tool results that do not fit are cut at a line boundary.
+- History keeps the most recent exchanges, then fills the rest of its budget
+  with older messages chosen by a 0/1 knapsack over importance
+  (`TokenManager._score_message_importance`, weighted towards recent turns)
+  and token cost.
+
+Counts come from TokenCounter, which caches them per content hash, so an
+unchanged history costs one hash per message instead of an encode.
+"""
+
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+from shared.config.settings import get_settings
+from shared.utils.token_counter import get_token_counter
+from shared.utils.token_manager import TokenManager, get_context_window
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_MARKER = "\n[... truncated to fit the context window]"
+
+
+@dataclass(frozen=True)
+class AssembledPrompt:
+    """Optional prompt sections, each fitted to its budget."""
+
+    documents: str
+    tool_results: str
+    history: list[dict[str, Any]]
+    report: dict[str, Any] = field(default_factory=dict)
+
+
+class PromptBudget:
+    """Token budgets within one model's context window."""
+
+    # Share of the optional space each section may claim (in priority order)
+    SECTION_SHARES = {"documents": 0.5, "tool_results": 0.25, "history": 0.25}
+    # Kept even when the required parts already fill the window
+    MIN_SECTION_TOKENS = {"documents": 2000, "tool_results": 1000}
+    # Last two exchanges (user + assistant), kept whenever they fit
+    RECENT_MESSAGES = 4
+    # Per-message formatting tokens (role, separators)
+    MESSAGE_OVERHEAD = 4
+    SAFETY_BUFFER = 500
+    # Knapsack capacity resolution (the history budget is split into this many units)
+    KNAPSACK_UNITS = 256
+
+    def __init__(self, model: str, context_window: int | None = None):
+        """
+        Initialize the budget.
+
+        Args:
+            model: Model identifier (selects the encoding and the default window)
+            context_window: Default: CONTEXT_WINDOW_TOKENS, else the model's known limit
+        """
+        settings = get_settings()
+        self.model = model
+        self.counter = get_token_counter(model)
+        self.context_window = (
+            context_window or settings.CONTEXT_WINDOW_TOKENS or get_context_window(model)
+        )
+        self.response_tokens = settings.AI_MAX_TOKENS
+
+    def message_tokens(self, message: dict[str, Any]) -> int:
+        """Tokens of one chat message, including formatting overhead."""
+        return self.counter.count_tokens(str(message.get("content") or "")) + self.MESSAGE_OVERHEAD
+
+    def assemble(
+        self,
+        system: str,
+        message: str,
+        history: list[dict[str, Any]],
+        documents: str = "",
+        tool_results: str = "",
+        response_tokens: int | None = None,
+        static_tokens: int = 0,
+    ) -> AssembledPrompt:
+        """
+        Fit a turn's optional sections around its required ones.
+
+        Args:
+            system: System prompt sent in full (session context; also the static
+                prompt unless it is precounted in `static_tokens`)
+            message: Current user message, sent in full
+            history: Conversation history, oldest first
+            documents: Uploaded document context
+            tool_results: Proactive tool results injected into the system prompt
+            response_tokens: Tokens reserved for the answer (default: AI_MAX_TOKENS)
+            static_tokens: Precounted tokens of a static prompt sent ahead of `system`
+
+        Returns:
+            AssembledPrompt with the fitted sections and a token report
+        """
+        required = (
+            static_tokens
+            + self.counter.count_tokens(system)
+            + self.counter.count_tokens(message)
+            + 2 * self.MESSAGE_OVERHEAD
+        )
+        reserve = (response_tokens or self.response_tokens) + self.SAFETY_BUFFER
+        available = max(self.context_window - reserve - required, 0)
+        demand = {
+            "documents": self.counter.count_tokens(documents),
+            "tool_results": self.counter.count_tokens(tool_results),
+            "history": sum(self.message_tokens(m) for m in history),
+        }
+        report = {
+            "context_window": self.context_window,
+            "required": required,
+            "available": available,
+            "requested": demand,
+        }
+
+        if sum(demand.values()) <= available:
+            report["trimmed"] = []
+            return AssembledPrompt(documents, tool_results, list(history), report)
+
+        budgets = self._allocate(demand, available)
+        fitted = AssembledPrompt(
+            documents=self.fit_text(documents, budgets["documents"]),
+            tool_results=self.fit_text(tool_results, budgets["tool_results"]),
+            history=self.fit_history(history, budgets["history"]),
+            report={
+                **report,
+                "budgets": budgets,
+                "trimmed": [name for name, need in demand.items() if need > budgets[name]],
+            },
+        )
+        logger.info(
+            f"Prompt over budget ({sum(demand.values())} > {available} tokens): trimmed "
+            f"{', '.join(fitted.report['trimmed'])}; kept {len(fitted.history)}/{len(history)} "
+            "history messages"
+        )
+        return fitted
+
+    def _allocate(self, demand: dict[str, int], available: int) -> dict[str, int]:
+        """Split the optional space by share, then hand out what is left over."""
+        budgets = {
+            name: min(demand[name], int(available * share))
+            for name, share in self.SECTION_SHARES.items()
+        }
+        spare = available - sum(budgets.values())
+        for name in self.SECTION_SHARES:
+            extra = min(spare, demand[name] - budgets[name])
+            budgets[name] += extra
+            spare -= extra
+        for name, floor in self.MIN_SECTION_TOKENS.items():
+            budgets[name] = max(budgets[name], min(demand[name], floor))
+        return budgets
+
+    def fit_text(self, text: str, budget: int) -> str:
+        """Cut text to at most `budget` tokens, at a line boundary where possible."""
+        if not text:
+            return text
+        tokens = self.counter.count_tokens(text)
+        if tokens <= budget:
+            return text
+
+        target = budget - self.counter.count_tokens(TRUNCATION_MARKER)
+        cut = len(text) * max(target, 0) // tokens
+        while cut > 0:
+            candidate = text[:cut]
+            newline = candidate.rfind("\n")
+            if newline > cut // 2:
+                candidate = candidate[:newline]
+            # Candidates are never sent again: count them without filling the cache
+            if self.counter.count_tokens(candidate, cache=False) <= target:
+                return candidate + TRUNCATION_MARKER
+            cut = cut * 9 // 10
+        return ""
+
+    def fit_history(self, history: list[dict[str, Any]], budget: int) -> list[dict[str, Any]]:
+        """
+        Choose the history messages to send within `budget` tokens.
+
+        The most recent exchanges are kept first; older messages are then picked
+        by importance per token. Tool results stay with the message that
+        requested them, and the chosen messages keep their original order.
+        """
+        groups: list[list[dict[str, Any]]] = []
+        for message in history:
+            if message.get("role") in ("tool", "function") and groups:
+                groups[-1].append(message)
+            else:
+                groups.append([message])
+        costs = [sum(self.message_tokens(m) for m in group) for group in groups]
+
+        kept: set[int] = set()
+        used = recent = 0
+        for index in reversed(range(len(groups))):
+            if recent >= self.RECENT_MESSAGES or used + costs[index] > budget:
+                break
+            kept.add(index)
+            used += costs[index]
+            recent += len(groups[index])
+
+        older = [index for index in range(len(groups)) if index not in kept]
+        values = [
+            sum(
+                TokenManager._score_message_importance(m, is_first=index == 0)
+                for m in groups[index]
+            )
+            * (1 + index / len(groups))
+            for index in older
+        ]
+        chosen = self._knapsack([costs[index] for index in older], values, budget - used)
+        kept.update(older[position] for position in chosen)
+        return [message for index in sorted(kept) for message in groups[index]]
+
+    def _knapsack(self, weights: list[int], values: list[float], capacity: int) -> list[int]:
+        """Positions of the most valuable items that fit (weights rounded up to units)."""
+        if capacity <= 0 or not weights:
+            return []
+        if sum(weights) <= capacity:
+            return list(range(len(weights)))
+
+        unit = max(1, math.ceil(capacity / self.KNAPSACK_UNITS))
+        slots = capacity // unit
+        scaled = [math.ceil(weight / unit) for weight in weights]
+        best = [0.0] * (slots + 1)
+        taken = [[False] * (slots + 1) for _ in weights]
+        for item, (weight, value) in enumerate(zip(scaled, values)):
+            for slot in range(slots, weight - 1, -1):
+                if best[slot - weight] + value > best[slot]:
+                    best[slot] = best[slot - weight] + value
+                    taken[item][slot] = True
+
+        chosen, slot = [], slots
+        for item in reversed(range(len(weights))):
+            if taken[item][slot]:
+                chosen.append(item)
+                slot -= scaled[item]
+        return chosen
+
+    def fit_messages(
+        self, messages: list[dict[str, Any]], budget: int | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Fit a provider message list: the leading system message and the final
+        message are kept, the history between them is refit.
+
+        Args:
+            messages: Provider messages (system first, current message last)
+            budget: Token budget (default: the window minus the response reserve)
+        """
+        if len(messages) <= 2:
+            return list(messages)
+        head = messages[:1] if messages[0].get("role") == "system" else []
+        last = messages[-1]
+        if budget is None:
+            budget = self.context_window - self.response_tokens - self.SAFETY_BUFFER
+        remaining = budget - sum(self.message_tokens(m) for m in (*head, last))
+        return [*head, *self.fit_history(messages[len(head) : -1], remaining), last]
+
+
+# Global instances (one per model)
+_budgets: dict[str, PromptBudget] = {}
+
+
+def get_prompt_budget(model: str) -> PromptBudget:
+    """
+    Get or create the prompt budget for a model.
+
+    Args:
+        model: Model identifier
+
+    Returns:
+        PromptBudget instance
+    """
+    budget = _budgets.get(model)
+    if budget is None:
+        budget = _budgets[model] = PromptBudget(model)
+    return budget
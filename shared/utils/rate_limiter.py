@@ -0,0 +1,263 @@
+"""
+Upstream Rate Limiting
+
+One token bucket per upstream provider, shared by every data-source request
+in the process (sync `requests` sessions and the pooled async httpx client):
+
+- Requests take a token; when none is left they queue (FIFO reservations)
+  for up to UPSTREAM_RATE_LIMIT_MAX_WAIT_SECONDS instead of bursting into the
+  provider's limit.
+- A 429 halves the provider's rate and blocks it until Retry-After (AIMD);
+  each successful response adds back a twentieth of the configured rate.
+- Requests that cannot get a token in time are answered locally with a
+  synthetic 429 (marked X-RateLimit-Local), so clients take their usual error
+  path without an upstream call. `is_local_rejection` tells these apart, so
+  callers do not count them as provider failures.
+
+Providers are recognised by request host, so clients only need to send
+through `rate_limited_session()` / the shared httpx client.
+"""
+
+import asyncio
+import email.utils
+import logging
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from shared.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Upstream hosts -> provider whose budget they draw from
+PROVIDER_HOSTS = {
+    "api.waqi.info": "waqi",
+    "api.airqo.net": "airqo",
+    "air-quality-api.open-meteo.com": "openmeteo",
+    "api.open-meteo.com": "openmeteo",
+    "geocoding-api.open-meteo.com": "openmeteo",
+    "uk-air.defra.gov.uk": "defra",
+    "www.umweltbundesamt.de": "uba",
+    "data.airquality.nsw.gov.au": "nsw",
+    "api.carbonintensity.org.uk": "carbon_intensity",
+    "nominatim.openstreetmap.org": "nominatim",
+    "freeipapi.com": "ip_geolocation",
+}
+
+# Header marking a 429 produced by the local budget, not by the provider
+LOCAL_REJECTION_HEADER = "X-RateLimit-Local"
+
+# AIMD tuning: multiplicative decrease on 429, additive increase per success
+DECREASE_FACTOR = 0.5
+INCREASE_FRACTION = 0.05
+MIN_RATE_FRACTION = 0.05
+
+
+def _retry_after_seconds(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket with AIMD rate adjustment for one provider."""
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        # Tokens accrue from here on; set into the future while paused by Retry-After
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.metrics = {"requests": 0, "queued": 0, "rejected": 0, "throttled": 0}
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self, max_wait: float) -> float | None:
+        """
+        Reserve a token.
+
+        Returns:
+            Seconds to wait before sending, or None if the token would not be
+            available within `max_wait` (nothing is reserved then)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(self._updated - now, 0.0)
+            if self.tokens < 1:
+                wait += (1 - self.tokens) / self.rate
+            if wait > max_wait:
+                self.metrics["rejected"] += 1
+                return None
+            self.tokens -= 1
+            self.metrics["requests"] += 1
+            if wait > 0:
+                self.metrics["queued"] += 1
+            return wait
+
+    def record_response(self, status_code: int, retry_after: str | None = None) -> None:
+        """Adapt the rate to an upstream response."""
+        with self._lock:
+            if status_code == 429 or (status_code == 503 and retry_after):
+                now = time.monotonic()
+                self._refill(now)
+                if status_code == 429:
+                    self.metrics["throttled"] += 1
+                    self.rate = max(self.rate * DECREASE_FACTOR, self.max_rate * MIN_RATE_FRACTION)
+                delay = _retry_after_seconds(retry_after)
+                if delay is None:
+                    delay = 1 / self.rate
+                self.tokens = min(self.tokens, 0.0)
+                self._updated = max(self._updated, now + delay)
+                logger.warning(
+                    f"{self.name} rate limited upstream ({status_code}); "
+                    f"rate now {self.rate:.2f}/s, paused {delay:.1f}s"
+                )
+            elif status_code < 400 and self.rate < self.max_rate:
+                self.rate = min(self.rate + self.max_rate * INCREASE_FRACTION, self.max_rate)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate_per_second": round(self.rate, 3),
+                "max_rate_per_second": self.max_rate,
+                "burst": self.burst,
+                "available_tokens": round(max(self.tokens, 0.0), 2),
+                "blocked_for_seconds": round(max(self._updated - now, 0.0), 2),
+                **self.metrics,
+            }
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(provider: str) -> TokenBucket | None:
+    """The shared bucket for a provider, or None if it is not rate limited."""
+    bucket = _buckets.get(provider)
+    if bucket is None:
+        limits = get_settings().upstream_rate_limits()
+        if provider not in limits:
+            return None
+        with _buckets_lock:
+            bucket = _buckets.get(provider)
+            if bucket is None:
+                rate, burst = limits[provider]
+                bucket = _buckets[provider] = TokenBucket(provider, rate, burst)
+    return bucket
+
+
+def bucket_for_url(url: str) -> TokenBucket | None:
+    """The bucket a request URL draws from, by host."""
+    provider = PROVIDER_HOSTS.get(urlsplit(str(url)).hostname or "")
+    return get_bucket(provider) if provider else None
+
+
+def upstream_rate_limit_stats() -> dict[str, dict[str, Any]]:
+    """Remaining budget and throttling counters for every configured provider."""
+    return {
+        provider: bucket.stats()
+        for provider in get_settings().upstream_rate_limits()
+        if (bucket := get_bucket(provider)) is not None
+    }
+
+
+def _max_wait() -> float:
+    return get_settings().UPSTREAM_RATE_LIMIT_MAX_WAIT_SECONDS
+
+
+def _local_rejection_headers(bucket: TokenBucket) -> dict[str, str]:
+    return {"Retry-After": str(max(1, round(1 / bucket.rate))), LOCAL_REJECTION_HEADER: "1"}
+
+
+def is_local_rejection(error: BaseException | None) -> bool:
+    """True if `error`, or an error it was raised from, is a local synthetic 429."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers is not None and headers.get(LOCAL_REJECTION_HEADER):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """`requests` adapter that sends through the provider token buckets."""
+
+    def send(self, request, **kwargs):
+        bucket = bucket_for_url(request.url)
+        if bucket is None:
+            return super().send(request, **kwargs)
+
+        wait = bucket.reserve(_max_wait())
+        if wait is None:
+            logger.warning(f"{bucket.name} rate limit budget exhausted, rejecting request locally")
+            response = requests.Response()
+            response.status_code = 429
+            response.reason = "Too Many Requests"
+            response.headers.update(_local_rejection_headers(bucket))
+            response.url = request.url
+            response.request = request
+            response._content = b""
+            return response
+        if wait:
+            time.sleep(wait)
+        response = super().send(request, **kwargs)
+        bucket.record_response(response.status_code, response.headers.get("Retry-After"))
+        return response
+
+
+def rate_limited_session(**adapter_kwargs: Any) -> requests.Session:
+    """A `requests.Session` whose requests to known providers are rate limited."""
+    session = requests.Session()
+    adapter = RateLimitedAdapter(**adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class RateLimitedAsyncTransport(httpx.AsyncBaseTransport):
+    """httpx transport wrapper that sends through the provider token buckets."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        bucket = bucket_for_url(request.url)
+        if bucket is None:
+            return await self._transport.handle_async_request(request)
+
+        wait = bucket.reserve(_max_wait())
+        if wait is None:
+            logger.warning(f"{bucket.name} rate limit budget exhausted, rejecting request locally")
+            return httpx.Response(429, headers=_local_rejection_headers(bucket), request=request)
+        if wait:
+            await asyncio.sleep(wait)
+        response = await self._transport.handle_async_request(request)
+        bucket.record_response(response.status_code, response.headers.get("Retry-After"))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -12,6 +12,7 @@ Provides comprehensive protection against:
 import html
 import re
 import unicodedata
+from collections.abc import Callable
 from typing import Any
 
 # CRITICAL patterns that MUST be blocked (only direct server attacks)
@@ -423,6 +424,93 @@ class ResponseFilter:
             return data
 
 
+class StreamingResponseFilter:
+    """
+    Clean a response that arrives as text deltas (the SSE chat stream).
+
+    Text is held back until a sentence or line ends and is then cleaned as
+    one piece, so a key or tool name split across deltas is still caught.
+    Unclosed code fences and JSON objects are held until they close, and
+    tool requests written as text (models driven by the ModelAdapter) are
+    dropped instead of being shown.
+    """
+
+    # Release points: end of a sentence (with the whitespace after it) or of a line
+    BOUNDARY = re.compile(r"[.!?]\s+|\n")
+    # Tool requests written as text: fenced JSON, or bare {"tool": ..., "args": {...}}
+    TOOL_REQUEST = re.compile(
+        r"```(?:json|tool)?\s*\{.*?\}\s*```"
+        r'|\{\s*"(?:tool|name)"\s*:\s*"[^"]+"\s*,\s*"(?:args|arguments)"\s*:\s*\{[^{}]*\}\s*\}',
+        re.DOTALL,
+    )
+    # Held text is released even without a boundary past this size
+    MAX_HELD_CHARS = 4000
+
+    def __init__(self, clean: Callable[[str], str] = ResponseFilter.clean_response):
+        """
+        Initialize the filter.
+
+        Args:
+            clean: Cleaner applied to each released piece (the non-streaming one)
+        """
+        self.clean = clean
+        self._held = ""
+
+    def feed(self, delta: str) -> str:
+        """Add a delta; return the cleaned text that can be sent now (may be empty)."""
+        self._held += delta
+        end = self._release_point()
+        if end == 0:
+            return ""
+        text, self._held = self._held[:end], self._held[end:]
+        return self._clean(text)
+
+    def flush(self) -> str:
+        """Return the cleaned remainder at the end of the response."""
+        text, self._held = self._held, ""
+        return self._clean(text)
+
+    def reset(self) -> None:
+        """Drop held text (the response is being regenerated)."""
+        self._held = ""
+
+    def _release_point(self) -> int:
+        """End of the last boundary that is outside code fences and JSON objects."""
+        held = self._held
+        # safe[i]: whether the text can be cut before held[i]
+        safe = [True] * (len(held) + 1)
+        in_fence, depth, index = False, 0, 0
+        while index < len(held):
+            step = 1
+            if held.startswith("```", index):
+                in_fence, step = not in_fence, 3
+            elif not in_fence and held[index] == "{":
+                depth += 1
+            elif not in_fence and held[index] == "}" and depth:
+                depth -= 1
+            for position in range(index + 1, index + step + 1):
+                safe[position] = not in_fence and depth == 0
+            index += step
+
+        end = 0
+        for match in self.BOUNDARY.finditer(held):
+            if safe[match.end()]:
+                end = match.end()
+        if end == 0 and len(held) > self.MAX_HELD_CHARS:
+            end = len(held)
+        return end
+
+    def _clean(self, text: str) -> str:
+        text = self.TOOL_REQUEST.sub("", text)
+        # The cleaner strips surrounding whitespace; keep it so pieces join up
+        body = text.strip()
+        if not body:
+            return text if "\n" in text else ""
+        leading = text[: len(text) - len(text.lstrip())]
+        trailing = text[len(text.rstrip()) :]
+        return leading + self.clean(body) + trailing
+
+
 def validate_request_data(data: dict[str, Any]) -> dict[str, Any]:
     """
     Validate and sanitize request data.
@@ -0,0 +1,174 @@
+"""
+Monitoring-station spatial index.
+
+Coordinate queries resolve to the nearest monitoring stations locally instead
+of reverse-geocoding and searching sites by name. Stations are held in a
+static k-d tree over unit-sphere (x, y, z) points, one tree per source, so
+nearest-neighbour order matches great-circle distance and lookups cost a few
+dozen node visits.
+
+An index is immutable once built. `StationIndexRefresher` builds a new one in
+the background and swaps it in with `set_station_index()`, so readers never
+see a half-loaded index and need no locking.
+"""
+
+import heapq
+import math
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+EARTH_RADIUS_KM = 6371.0
+
+
+@dataclass(frozen=True, slots=True)
+class Station:
+    """A monitoring station of one data source."""
+
+    source: str  # "airqo", "waqi", "uba", "nsw", ...
+    station_id: str
+    name: str
+    latitude: float
+    longitude: float
+
+
+def _unit_vector(latitude: float, longitude: float) -> tuple[float, float, float]:
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+
+def _km_to_chord(km: float) -> float:
+    return 2 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+class _KDTree:
+    """Implicit k-d tree: points reordered so each slice's median is its node."""
+
+    def __init__(self, stations: list[Station]):
+        items = [(_unit_vector(s.latitude, s.longitude), s) for s in stations]
+        self._build(items, 0, len(items), 0)
+        self.points = [p for p, _ in items]
+        self.stations = [s for _, s in items]
+
+    @classmethod
+    def _build(cls, items: list, lo: int, hi: int, axis: int) -> None:
+        if hi - lo <= 1:
+            return
+        items[lo:hi] = sorted(items[lo:hi], key=lambda item: item[0][axis])
+        mid = (lo + hi) // 2
+        cls._build(items, lo, mid, (axis + 1) % 3)
+        cls._build(items, mid + 1, hi, (axis + 1) % 3)
+
+    def nearest(
+        self, target: tuple[float, float, float], k: int, max_sq: float
+    ) -> list[tuple[float, Station]]:
+        """Up to k (squared chord distance, station) pairs within max_sq, nearest first."""
+        best: list[tuple[float, int]] = []  # Max-heap of (-distance, index)
+        points = self.points
+        tx, ty, tz = target
+        # Slices still to search, with the squared distance to their splitting plane
+        stack = [(0, len(points), 0, 0.0)]
+        while stack:
+            lo, hi, axis, plane_sq = stack.pop()
+            bound = -best[0][0] if len(best) == k else max_sq
+            if lo >= hi or plane_sq > bound:
+                continue
+            mid = (lo + hi) // 2
+            px, py, pz = point = points[mid]
+            d = (px - tx) ** 2 + (py - ty) ** 2 + (pz - tz) ** 2
+            if d <= bound:
+                if len(best) < k:
+                    heapq.heappush(best, (-d, mid))
+                else:
+                    heapq.heapreplace(best, (-d, mid))
+            delta = target[axis] - point[axis]
+            next_axis = (axis + 1) % 3
+            if delta < 0:
+                stack.append((mid + 1, hi, next_axis, delta * delta))
+                stack.append((lo, mid, next_axis, plane_sq))
+            else:
+                stack.append((lo, mid, next_axis, delta * delta))
+                stack.append((mid + 1, hi, next_axis, plane_sq))
+        return [(-d, self.stations[i]) for d, i in sorted(best, reverse=True)]
+
+
+class StationIndex:
+    """Nearest-station lookup over the stations of every loaded source."""
+
+    def __init__(self, stations: Iterable[Station] = ()):
+        by_source: dict[str, list[Station]] = {}
+        for station in stations:
+            if -90 <= station.latitude <= 90 and -180 <= station.longitude <= 180:
+                by_source.setdefault(station.source, []).append(station)
+        self._stations = by_source
+        self._trees = {source: _KDTree(items) for source, items in by_source.items()}
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._stations.values())
+
+    @property
+    def sources(self) -> list[str]:
+        return list(self._stations)
+
+    def stations(self, source: str) -> list[Station]:
+        """Every indexed station of a source."""
+        return list(self._stations.get(source, ()))
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 1,
+        sources: Iterable[str] | None = None,
+        max_distance_km: float | None = None,
+    ) -> list[tuple[Station, float]]:
+        """
+        The k stations nearest to a point.
+
+        Args:
+            latitude: Query latitude
+            longitude: Query longitude
+            k: Number of stations to return
+            sources: Only consider these sources (default: all)
+            max_distance_km: Ignore stations farther than this
+
+        Returns:
+            (station, great-circle distance in km) pairs, nearest first
+        """
+        target = _unit_vector(latitude, longitude)
+        max_sq = 4.0 if max_distance_km is None else _km_to_chord(max_distance_km) ** 2
+        candidates = []
+        for source in self._trees if sources is None else sources:
+            tree = self._trees.get(source)
+            if tree is not None:
+                candidates.extend(tree.nearest(target, k, max_sq))
+        candidates.sort(key=lambda item: item[0])
+        return [
+            (station, round(_chord_to_km(math.sqrt(sq)), 3)) for sq, station in candidates[:k]
+        ]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "stations": {source: len(items) for source, items in self._stations.items()},
+            "age_seconds": round(time.time() - self.built_at, 1),
+        }
+
+
+_current_index = StationIndex()
+
+
+def get_station_index() -> StationIndex:
+    """The current station index (empty until the first refresh)."""
+    return _current_index
+
+
+def set_station_index(index: StationIndex) -> None:
+    """Swap in a freshly built index."""
+    global _current_index
+    _current_index = index
@@ -5,7 +5,11 @@ Provides precise token counting for different models to ensure accurate cost tra
 and prevent token limit issues.
 """
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 
 try:
@@ -18,6 +22,35 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Token counts by (encoding, content hash), shared by every counter: history
+# messages, documents and static prompts are counted once, not on every turn
+TOKEN_CACHE_SIZE = 8192
+_token_cache: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _load_encoding(encoding_name: str):
+    """tiktoken encoding, loaded once per process (None if it cannot be loaded)."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(f"Failed to initialize tiktoken encoding: {e}")
+        return None
+
+
+def _encoding_name(model: str) -> str:
+    """Map model names to encodings."""
+    model_lower = model.lower()
+    if "gpt-4" in model_lower or "gpt-3.5" in model_lower:
+        return "cl100k_base"
+    if "gpt-3" in model_lower:
+        return "p50k_base"
+    # Gemini uses similar tokenization to GPT-4; default to cl100k_base for unknown models
+    return "cl100k_base"
+
 
 class TokenCounter:
     """
@@ -30,47 +63,51 @@ class TokenCounter:
     - Ollama: Falls back to word-based estimation
     """
 
-    def __init__(self, model: str = "gpt-4"):
+    def __init__(self, model: str = "gpt-4", encoding_name: str | None = None):
         """
         Initialize token counter.
 
         Args:
             model: Model name for encoding selection
+            encoding_name: Explicit tiktoken encoding (overrides the model mapping)
         """
         self.model = model
-        self.encoding = None
+        self.encoding_name = encoding_name or _encoding_name(model)
+        self.encoding = _load_encoding(self.encoding_name)
 
-        if TIKTOKEN_AVAILABLE:
-            try:
-                # Map model names to encodings
-                if "gpt-4" in model.lower() or "gpt-3.5" in model.lower():
-                    self.encoding = tiktoken.get_encoding("cl100k_base")
-                elif "gpt-3" in model.lower():
-                    self.encoding = tiktoken.get_encoding("p50k_base")
-                elif "gemini" in model.lower():
-                    # Gemini uses similar tokenization to GPT-4
-                    self.encoding = tiktoken.get_encoding("cl100k_base")
-                else:
-                    # Default to cl100k_base for unknown models
-                    self.encoding = tiktoken.get_encoding("cl100k_base")
-                    logger.debug(f"Using default cl100k_base encoding for model: {model}")
-            except Exception as e:
-                logger.warning(f"Failed to initialize tiktoken encoding: {e}")
-                self.encoding = None
-
-    def count_tokens(self, text: str) -> int:
+    def count_tokens(self, text: str, cache: bool = True) -> int:
         """
         Count tokens in text with high accuracy.
 
         Args:
             text: Text to count tokens for
+            cache: Remember the count; pass False for one-off texts (e.g. truncation
+                candidates) so they do not evict counts that get reused
 
         Returns:
             Number of tokens
         """
         if not text:
             return 0
-
+        if not cache:
+            return self._encode_count(text)
+
+        key = (self.encoding_name, hashlib.blake2b(text.encode(), digest_size=16).digest())
+        with _token_cache_lock:
+            cached = _token_cache.get(key)
+            if cached is not None:
+                _token_cache.move_to_end(key)
+                return cached
+
+        # Encode outside the lock; a concurrent miss on the same text just counts it twice
+        tokens = self._encode_count(text)
+        with _token_cache_lock:
+            _token_cache[key] = tokens
+            if len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+        return tokens
+
+    def _encode_count(self, text: str) -> int:
         if self.encoding and TIKTOKEN_AVAILABLE:
             try:
                 tokens = self.encoding.encode(text)
@@ -249,8 +286,8 @@ class TokenCounter:
         return analysis
 
 
-# Global instance for easy access
-_default_counter = None
+# Global instances for easy access (one per model)
+_counters: dict[str, TokenCounter] = {}
 
 
 def get_token_counter(model: str = "gpt-4") -> TokenCounter:
@@ -263,10 +300,10 @@ def get_token_counter(model: str = "gpt-4") -> TokenCounter:
     Returns:
         TokenCounter instance
     """
-    global _default_counter
-    if _default_counter is None or _default_counter.model != model:
-        _default_counter = TokenCounter(model)
-    return _default_counter
+    counter = _counters.get(model)
+    if counter is None:
+        counter = _counters[model] = TokenCounter(model)
+    return counter
 
 
 def count_tokens(text: str, model: str = "gpt-4") -> int:
@@ -17,7 +17,7 @@ from collections import deque
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
-import tiktoken
+from shared.utils.token_counter import TokenCounter
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +41,8 @@ class TokenManager:
         "gpt-4-32k": 32768,
         "gpt-4-turbo": 128000,
         "gpt-4o": 128000,
+        "gpt-4.1": 1047576,
+        "gpt-5": 400000,
         "gpt-3.5-turbo": 16385,
         "gpt-3.5-turbo-16k": 16385,
         
@@ -49,6 +51,7 @@ class TokenManager:
         "gemini-1.5-pro": 1000000,  # 1M tokens!
         "gemini-1.5-flash": 1000000,
         "gemini-2.0-flash": 1000000,
+        "gemini-2.5": 1000000,
         
         # Anthropic models
         "claude-3-opus": 200000,
@@ -60,6 +63,11 @@ class TokenManager:
         "ollama": 8192,  # Default for most Ollama models
         "llama2": 4096,
         "mistral": 8192,
+        "llama3": 8192,
+        "llama3.1": 131072,
+        "llama3.2": 131072,
+        "qwen2.5": 32768,
+        "deepseek-r1": 131072,
         
         # Default fallback
         "default": 8192
@@ -81,13 +89,9 @@ class TokenManager:
         self.model = model
         self.token_limit = self._get_model_limit(model)
         
-        # Initialize tokenizer
-        try:
-            self.encoding = tiktoken.get_encoding(encoding_name)
-        except Exception as e:
-            logger.warning(f"Failed to load tiktoken encoding {encoding_name}: {e}")
-            logger.warning("Falling back to approximate token counting")
-            self.encoding = None
+        # Initialize tokenizer (encodings and counts are cached by TokenCounter)
+        self.counter = TokenCounter(model, encoding_name=encoding_name)
+        self.encoding = self.counter.encoding
         
         # Calculate available budget for conversation history
         self.history_budget = (
@@ -112,20 +116,7 @@ class TokenManager:
         Returns:
             Token limit integer
         """
-        model_lower = model.lower()
-        
-        # Check exact matches
-        if model_lower in self.MODEL_LIMITS:
-            return self.MODEL_LIMITS[model_lower]
-        
-        # Check partial matches
-        for key, limit in self.MODEL_LIMITS.items():
-            if key in model_lower:
-                return limit
-        
-        # Default fallback
-        logger.warning(f"Unknown model {model}, using default limit {self.MODEL_LIMITS['default']}")
-        return self.MODEL_LIMITS["default"]
+        return get_context_window(model)
     
     def count_tokens(self, text: str) -> int:
         """
@@ -137,17 +128,7 @@ class TokenManager:
         Returns:
             Token count
         """
-        if not text:
-            return 0
-        
-        if self.encoding:
-            try:
-                return len(self.encoding.encode(text))
-            except Exception as e:
-                logger.warning(f"Token encoding error: {e}, falling back to approximation")
-        
-        # Fallback: approximate token count (1 token ≈ 4 chars for English)
-        return len(text) // 4
+        return self.counter.count_tokens(text)
     
     def count_messages(self, messages: List[Dict[str, str]]) -> int:
         """
@@ -247,10 +228,9 @@ class TokenManager:
         """
         Smart truncation that preserves important context.
         
-        Strategy:
-        1. Always keep last 3 turns (user + assistant + user)
-        2. Keep first message if it contains user info
-        3. Fill remaining budget with semantically important messages
+        Delegates to the shared prompt budget: the last exchanges are kept,
+        then older messages are chosen by importance (see
+        `_score_message_importance`) against their token cost.
         
         Args:
             messages: Full message list
@@ -259,92 +239,14 @@ class TokenManager:
         Returns:
             Truncated message list
         """
-        if not messages:
-            return []
-        
-        # Reserve tokens for recency (last 3 turns = ~6 messages)
-        recency_messages = messages[-6:] if len(messages) > 6 else messages
-        recency_tokens = self.count_messages(recency_messages)
-        
-        # If recency alone exceeds budget, truncate even recent messages
-        if recency_tokens > budget:
-            logger.warning("Even recent messages exceed budget, applying aggressive truncation")
-            return self._aggressive_truncate(recency_messages, budget)
-        
-        # Budget for historical messages
-        history_budget = budget - recency_tokens
-        
-        # Get older messages (everything except recent)
-        older_messages = messages[:-6] if len(messages) > 6 else []
-        
-        if not older_messages:
-            # No older messages to add
-            return recency_messages
-        
-        # Score and select important older messages
-        selected_older = self._select_important_messages(older_messages, history_budget)
-        
-        # Combine: selected older + recent
-        final_messages = selected_older + recency_messages
-        
-        logger.info(
-            f"Smart truncation: kept {len(selected_older)} older + "
-            f"{len(recency_messages)} recent = {len(final_messages)} total"
+        from shared.utils.prompt_budget import PromptBudget
+
+        return PromptBudget(self.model, context_window=self.token_limit).fit_history(
+            messages, budget
         )
-        
-        return final_messages
-    
-    def _select_important_messages(
-        self,
-        messages: List[Dict[str, str]],
-        budget: int
-    ) -> List[Dict[str, str]]:
-        """
-        Select most important messages within budget.
-        
-        Importance factors:
-        - Contains user name/location (personalization)
-        - Contains data/numbers (factual)
-        - User questions (vs small talk)
-        - Assistant responses with citations
-        
-        Args:
-            messages: Message list to score
-            budget: Token budget
-            
-        Returns:
-            Selected important messages
-        """
-        # Score each message
-        scored_messages = []
-        for i, msg in enumerate(messages):
-            score = self._score_message_importance(msg, i == 0)
-            tokens = self.count_tokens(msg.get("content", ""))
-            scored_messages.append({
-                "message": msg,
-                "score": score,
-                "tokens": tokens,
-                "index": i
-            })
-        
-        # Sort by score (descending)
-        scored_messages.sort(key=lambda x: x["score"], reverse=True)
-        
-        # Greedily select messages within budget
-        selected = []
-        used_tokens = 0
-        
-        for item in scored_messages:
-            if used_tokens + item["tokens"] <= budget:
-                selected.append(item)
-                used_tokens += item["tokens"]
-        
-        # Sort selected by original index to maintain order
-        selected.sort(key=lambda x: x["index"])
-        
-        return [item["message"] for item in selected]
     
-    def _score_message_importance(self, message: Dict[str, str], is_first: bool) -> float:
+    @staticmethod
+    def _score_message_importance(message: Dict[str, str], is_first: bool) -> float:
         """
         Score message importance (0-10).
         
@@ -469,6 +371,30 @@ class TokenManager:
         return True, None
 
 
+def get_context_window(model: str) -> int:
+    """
+    Input context window of a model.
+    
+    Args:
+        model: Model identifier
+        
+    Returns:
+        Token limit (the longest matching MODEL_LIMITS key wins, so "gpt-4o-mini"
+        resolves to "gpt-4o" rather than "gpt-4")
+    """
+    limits = TokenManager.MODEL_LIMITS
+    model_lower = model.lower()
+    if model_lower in limits:
+        return limits[model_lower]
+    
+    matches = [key for key in limits if key in model_lower]
+    if matches:
+        return limits[max(matches, key=len)]
+    
+    logger.warning(f"Unknown model {model}, using default limit {limits['default']}")
+    return limits["default"]
+
+
 # Global instance
 _token_manager_instance = None
 
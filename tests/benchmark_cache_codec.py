@@ -0,0 +1,152 @@
+"""
+Cache Codec Benchmark
+=====================
+
+Compares the Redis payload codec against plain pickle on response shapes
+modelled after the AirQo, WAQI and Open-Meteo APIs: encode time, decode time
+and stored size.
+
+Not collected by pytest. Run from the repository root:
+
+    python -m tests.benchmark_cache_codec [--iterations N]
+"""
+
+import argparse
+import pickle
+import random
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from infrastructure.cache.codec import CacheCodec
+
+
+def airqo_measurements(count: int = 500) -> dict[str, Any]:
+    """Shape of /devices/measurements/grids/{id} (hourly, many devices)."""
+    rng = random.Random(1)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    measurements = []
+    for i in range(count):
+        pm25 = round(rng.uniform(5, 120), 2)
+        measurements.append(
+            {
+                "device": f"aq_g5{i % 40:02d}",
+                "device_id": f"{rng.getrandbits(96):024x}",
+                "site_id": f"{rng.getrandbits(96):024x}",
+                "time": (start + timedelta(hours=i // 40)).isoformat(),
+                "frequency": "hourly",
+                "pm2_5": {"value": pm25, "calibratedValue": round(pm25 * 0.92, 2)},
+                "pm10": {"value": round(pm25 * 1.6, 2), "calibratedValue": None},
+                "aqi_category": "Moderate" if pm25 < 35 else "Unhealthy",
+                "aqi_color": "ffff00",
+                "aqi_color_name": "Yellow",
+                "siteDetails": {
+                    "name": f"Kampala Site {i % 40}",
+                    "formatted_name": f"Plot {i}, Kampala, Uganda",
+                    "city": "Kampala",
+                    "country": "Uganda",
+                    "approximate_latitude": 0.3476 + rng.uniform(-0.1, 0.1),
+                    "approximate_longitude": 32.5825 + rng.uniform(-0.1, 0.1),
+                },
+            }
+        )
+    return {"success": True, "message": "successfully returned the measurements", "measurements": measurements}
+
+
+def waqi_city_feed() -> dict[str, Any]:
+    """Shape of /feed/{city}/ with daily forecasts."""
+    rng = random.Random(2)
+    day = datetime(2025, 1, 1)
+
+    def daily() -> list[dict[str, Any]]:
+        return [
+            {
+                "avg": rng.randint(20, 160),
+                "day": (day + timedelta(days=d)).strftime("%Y-%m-%d"),
+                "max": rng.randint(60, 200),
+                "min": rng.randint(5, 40),
+            }
+            for d in range(9)
+        ]
+
+    return {
+        "status": "ok",
+        "data": {
+            "aqi": 87,
+            "idx": 8670,
+            "attributions": [
+                {"url": "https://www.airqo.net/", "name": "AirQo", "logo": "Uganda-AirQo.png"},
+                {"url": "https://waqi.info/", "name": "World Air Quality Index Project"},
+            ],
+            "city": {"geo": [0.3476, 32.5825], "name": "Kampala, Uganda", "url": "https://aqicn.org/city/uganda/kampala"},
+            "dominentpol": "pm25",
+            "iaqi": {k: {"v": rng.uniform(1, 100)} for k in ("co", "h", "no2", "o3", "p", "pm10", "pm25", "so2", "t", "w")},
+            "time": {"s": "2025-01-01 12:00:00", "tz": "+03:00", "v": 1735732800, "iso": "2025-01-01T12:00:00+03:00"},
+            "forecast": {"daily": {p: daily() for p in ("o3", "pm10", "pm25", "uvi")}},
+        },
+    }
+
+
+def openmeteo_hourly(days: int = 7) -> dict[str, Any]:
+    """Shape of /v1/air-quality with a week of hourly variables."""
+    rng = random.Random(3)
+    hours = days * 24
+    start = datetime(2025, 1, 1)
+    variables = ("pm10", "pm2_5", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide", "ozone", "european_aqi", "us_aqi")
+    return {
+        "latitude": 0.35,
+        "longitude": 32.58,
+        "generationtime_ms": 0.41,
+        "utc_offset_seconds": 10800,
+        "timezone": "Africa/Kampala",
+        "timezone_abbreviation": "EAT",
+        "elevation": 1190.0,
+        "hourly_units": {"time": "iso8601", **{v: "μg/m³" for v in variables}},
+        "hourly": {
+            "time": [(start + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M") for h in range(hours)],
+            **{v: [round(rng.uniform(0, 150), 1) for _ in range(hours)] for v in variables},
+        },
+    }
+
+
+def _time_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Best-of-3 mean seconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def run(iterations: int) -> None:
+    payloads = {
+        "airqo measurements": airqo_measurements(),
+        "waqi city feed": waqi_city_feed(),
+        "openmeteo hourly": openmeteo_hourly(),
+    }
+    codecs: dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+        "pickle (old)": (pickle.dumps, pickle.loads),
+        "json": (CacheCodec(compress_min_bytes=0).encode, CacheCodec().decode),
+        "json+zstd": (CacheCodec().encode, CacheCodec().decode),
+    }
+
+    print(f"{'payload':<20} {'codec':<13} {'size (B)':>10} {'encode (µs)':>12} {'decode (µs)':>12}")
+    for payload_name, value in payloads.items():
+        for codec_name, (encode, decode) in codecs.items():
+            blob = encode(value)
+            assert decode(blob) == value
+            encode_s = _time_per_call(lambda encode=encode, value=value: encode(value), iterations)
+            decode_s = _time_per_call(lambda decode=decode, blob=blob: decode(blob), iterations)
+            print(
+                f"{payload_name:<20} {codec_name:<13} {len(blob):>10} "
+                f"{encode_s * 1e6:>12.1f} {decode_s * 1e6:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    run(parser.parse_args().iterations)
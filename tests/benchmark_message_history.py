@@ -0,0 +1,149 @@
+"""
+Message History Benchmark
+=========================
+
+Times the chat history queries on a synthetic SQLite database, first with the
+schema as it was before the composite index (no index on `session_id`), then
+after `apply_migrations` has added `ix_chat_messages_session_timestamp_id`:
+
+- recent history (the latest 20 messages of a session, loaded every chat turn)
+- a deep page of `/sessions/{id}/messages` by OFFSET and by cursor
+
+Messages of all sessions are interleaved, as they arrive in production. The
+database is built once and reused on later runs with the same --path.
+
+Not collected by pytest. Run from the repository root:
+
+    python -m tests.benchmark_message_history [--messages N] [--sessions N] [--path FILE]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.database.database import Base
+from infrastructure.database.migrations import apply_migrations
+from infrastructure.database.repository import (
+    encode_message_cursor,
+    get_recent_session_history,
+    get_session_history,
+    get_session_history_page,
+)
+
+INDEX = "ix_chat_messages_session_timestamp_id"
+PAGE_SIZE = 100
+BATCH_SIZE = 100_000
+START = datetime(2025, 1, 1)
+
+
+def build(path: str, messages: int, sessions: int) -> None:
+    """Create the tables and bulk insert the synthetic history (old schema)."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX IF EXISTS {INDEX}"))
+    engine.dispose()
+
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=OFF")
+    connection.executemany(
+        "INSERT INTO chat_sessions (id, created_at, updated_at) VALUES (?, ?, ?)",
+        [(f"session-{s}", str(START), str(START)) for s in range(sessions)],
+    )
+    started = time.perf_counter()
+    for first in range(0, messages, BATCH_SIZE):
+        rows = [
+            (
+                f"session-{n % sessions}",
+                "user" if n // sessions % 2 == 0 else "assistant",
+                f"Synthetic message {n} about PM2.5 levels",
+                # SQLAlchemy's SQLite DateTime format; one message per second
+                (START + timedelta(seconds=n)).strftime("%Y-%m-%d %H:%M:%S.%f"),
+            )
+            for n in range(first, min(first + BATCH_SIZE, messages))
+        ]
+        connection.executemany(
+            "INSERT INTO chat_messages (session_id, role, content, timestamp) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        connection.commit()
+    connection.close()
+    print(
+        f"Built {messages:,} messages in {sessions:,} sessions in "
+        f"{time.perf_counter() - started:.1f}s"
+    )
+
+
+def timed(call: Callable[[], Any], repeat: int) -> float:
+    """Median milliseconds of `repeat` calls."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def measure(db: Any, session_id: str, depth: int, cursor: str, repeat: int) -> dict[str, float]:
+    return {
+        "recent history (20)": timed(
+            lambda: get_recent_session_history(db, session_id, max_messages=20), repeat
+        ),
+        f"page at offset {depth:,}": timed(
+            lambda: get_session_history(db, session_id, limit=PAGE_SIZE, offset=depth), repeat
+        ),
+        f"page after cursor ({depth:,})": timed(
+            lambda: get_session_history_page(db, session_id, limit=PAGE_SIZE, cursor=cursor),
+            repeat,
+        ),
+    }
+
+
+def run(messages: int, sessions: int, path: str, repeat: int) -> None:
+    if not os.path.exists(path):
+        build(path, messages, sessions)
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX IF EXISTS {INDEX}"))
+    db = sessionmaker(bind=engine)()
+
+    session_id = f"session-{sessions // 2}"
+    depth = max(messages // sessions * 9 // 10 - PAGE_SIZE, 0)
+    # Cursor of the page that starts at `depth` (the row before it)
+    anchor = get_session_history(db, session_id, limit=1, offset=max(depth - 1, 0))
+    cursor = encode_message_cursor(anchor[0]) if anchor else ""
+
+    before = measure(db, session_id, depth, cursor, repeat)
+    started = time.perf_counter()
+    apply_migrations(engine)
+    build_seconds = time.perf_counter() - started
+    after = measure(db, session_id, depth, cursor, repeat)
+    db.close()
+
+    print(f"\n{messages:,} messages, {sessions:,} sessions; median of {repeat} runs")
+    print(f"Index build (apply_migrations): {build_seconds:.1f}s\n")
+    print(f"{'query':<32}{'no index':>12}{'composite':>12}{'speedup':>10}")
+    for name, old in before.items():
+        new = after[name]
+        print(f"{name:<32}{old:>10.2f}ms{new:>10.2f}ms{old / new:>9.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10_000_000)
+    parser.add_argument("--sessions", type=int, default=1_000)
+    parser.add_argument("--path", default="./data/benchmark_message_history.db")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.messages, args.sessions, args.path, args.repeat)
@@ -0,0 +1,131 @@
+"""
+Query Analyzer Benchmark
+========================
+
+Compares keyword detection through the compiled matcher (one scan per
+message shared by all detectors) against the previous approach, where each
+detector ran `term in message_lower` over its own lists (with the duplicated
+African cities) and re-searched its regex patterns one by one.
+
+The legacy path below reproduces that scanning work with the same keyword
+lists; it is not the old classification logic verbatim.
+
+Not collected by pytest. Run from the repository root:
+
+    python -m tests.benchmark_query_analyzer [--iterations N]
+"""
+
+import argparse
+import re
+import time
+from collections.abc import Callable
+from typing import Any
+
+from core.agent.query_analyzer import QueryAnalyzer
+
+MESSAGES = {
+    "short city": "Air quality in Kampala?",
+    "forecast": "Will the air quality in Nairobi be better tomorrow than today? I want to go running",
+    "data request": "Show me a chart of PM2.5 trends and mortality statistics in Delhi for 2025",
+    "educational": "What is the difference between PM2.5 and PM10 and how does it affect health?",
+    "long no match": (
+        "Hello there, I was hoping you could help me plan a weekend trip with my family. "
+        "We like hiking, museums and food markets and would prefer somewhere not too far. "
+    )
+    * 3,
+}
+
+
+def _plain(terms: list[str]) -> list[str]:
+    return [term.rstrip("*") for term in terms]
+
+
+# The old lists, including the duplicated tail of AFRICAN_CITIES
+QA = QueryAnalyzer
+LEGACY_CITIES = QA.AFRICAN_CITIES + QA.AFRICAN_CITIES[1:18] + QA.GLOBAL_CITIES
+LEGACY_LISTS = {
+    name: _plain(terms)
+    for name, terms in {
+        "complex": QA.COMPLEX_SCIENTIFIC_INDICATORS,
+        "data": QA.DATA_INDICATORS,
+        "research": QA.RESEARCH_INDICATORS,
+        "topic": QA.COMPLEX_TOPICS,
+        "location": QA.LOCATION_INDICATORS,
+        "aq": QA.AIR_QUALITY_KEYWORDS,
+        "search": QA.SEARCH_TEMPORAL_KEYWORDS
+        + QA.SEARCH_POLICY_KEYWORDS
+        + QA.SEARCH_RESEARCH_KEYWORDS
+        + QA.SEARCH_DATA_KEYWORDS,
+        "analysis": QA.ANALYSIS_DATA_KEYWORDS,
+        "viz": QA.VISUALIZATION_KEYWORDS,
+        "time": QA.TIME_PERIOD_KEYWORDS,
+        "forecast": list(QA.FORECAST_INDICATORS),
+        "activity": QA.ACTIVITY_TERMS + QA.COMPARATIVE_TERMS + QA.FORECAST_AIR_QUALITY_TERMS,
+    }.items()
+}
+LEGACY_PATTERNS = [
+    QA.PERSONAL_INFO_PATTERNS,
+    QA.GENERAL_KNOWLEDGE_PATTERNS,
+    QA.EDUCATIONAL_PATTERNS,
+    QA.SEARCH_EDUCATIONAL_PATTERNS,
+]
+LEGACY_TIME_PATTERNS = [rf"\b{reference}\b" for reference in QA.FORECAST_TIME_REFERENCES]
+
+
+def legacy_detect(message: str) -> Any:
+    """Substring and per-pattern scans as the five detectors used to run them."""
+    message_lower = message.lower()
+    found = {
+        name: [term for term in terms if term in message_lower]
+        for name, terms in LEGACY_LISTS.items()
+    }
+    # The city list was scanned up to three times by classify_query_type, then once
+    # each by detect_air_quality_query and detect_forecast_query
+    for _ in range(5):
+        found["cities"] = [city for city in LEGACY_CITIES if city in message_lower]
+    for patterns in LEGACY_PATTERNS:
+        found[patterns[0]] = any(re.search(pattern, message_lower) for pattern in patterns)
+    found["time"] = [p for p in LEGACY_TIME_PATTERNS if re.search(p, message_lower)]
+    return found
+
+
+def matcher_detect(message: str) -> Any:
+    """The compiled matcher plus the remaining phrase regexes, uncached."""
+    QueryAnalyzer.scan_message.cache_clear()
+    message_lower = message.lower()
+    scan = QueryAnalyzer.scan_message(message)
+    patterns = [
+        QA._PERSONAL_INFO_RE.search(message_lower),
+        QA._GENERAL_KNOWLEDGE_RE.search(message_lower),
+        QA._EDUCATIONAL_RE.search(message_lower),
+        QA._SEARCH_EDUCATIONAL_RE.search(message_lower),
+    ]
+    return scan, patterns
+
+
+def _time_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Best-of-3 mean seconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def run(iterations: int) -> None:
+    print(f"{'message':<15} {'chars':>6} {'legacy (µs)':>12} {'matcher (µs)':>13} {'speedup':>8}")
+    for name, message in MESSAGES.items():
+        legacy_s = _time_per_call(lambda message=message: legacy_detect(message), iterations)
+        matcher_s = _time_per_call(lambda message=message: matcher_detect(message), iterations)
+        print(
+            f"{name:<15} {len(message):>6} {legacy_s * 1e6:>12.1f} "
+            f"{matcher_s * 1e6:>13.1f} {legacy_s / matcher_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    run(parser.parse_args().iterations)
@@ -0,0 +1,17 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from infrastructure.cache.cache_service import RedisCache
+from shared.config.settings import get_settings
+
+
+@pytest.fixture
+def memory_backed_cache(monkeypatch):
+    """RedisCache running on its in-process tier (no Redis server needed)."""
+    monkeypatch.setenv("REDIS_ENABLED", "false")
+    get_settings.cache_clear()
+    try:
+        yield RedisCache()
+    finally:
+        get_settings.cache_clear()
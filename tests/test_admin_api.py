@@ -0,0 +1,82 @@
+"""
+Admin API Tests
+===============
+
+Covers the X-Admin-Key gate on the admin cache endpoints: the admin API is
+hidden (404) while ADMIN_API_KEY is unset, a missing or wrong key is refused
+(401), and a valid key clears only the requested namespace.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from interfaces.rest_api import routes
+
+ADMIN_KEY = "admin-test-key"
+
+
+@pytest.fixture
+def cache(memory_backed_cache, monkeypatch):
+    """In-process RedisCache served to the routes by get_cache()."""
+    monkeypatch.setattr(routes, "get_cache", lambda: memory_backed_cache)
+    return memory_backed_cache
+
+
+@pytest.fixture
+def admin_client(cache, monkeypatch):
+    """TestClient for the router; takes the ADMIN_API_KEY to configure."""
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api/v1")
+    monkeypatch.setattr(routes, "_agent_instance", None)
+
+    def client(admin_key=ADMIN_KEY):
+        monkeypatch.setattr(routes.settings, "ADMIN_API_KEY", admin_key)
+        return TestClient(app)
+
+    return client
+
+
+class TestAdminAuth:
+    """require_admin on the admin endpoints."""
+
+    def test_admin_api_is_hidden_when_no_key_is_configured(self, admin_client):
+        client = admin_client(admin_key="")
+
+        assert client.delete("/api/v1/admin/cache/api:waqi").status_code == 404
+        response = client.get("/api/v1/admin/cache/stats", headers={"X-Admin-Key": ""})
+        assert response.status_code == 404
+
+    def test_missing_or_wrong_key_is_unauthorized(self, admin_client, cache):
+        cache.set("api:waqi", "kampala", {"pm25": 41})
+        client = admin_client()
+
+        assert client.delete("/api/v1/admin/cache/api:waqi").status_code == 401
+        response = client.delete(
+            "/api/v1/admin/cache/api:waqi", headers={"X-Admin-Key": "wrong-key"}
+        )
+        assert response.status_code == 401
+        assert cache.get("api:waqi", "kampala") == {"pm25": 41}
+
+    def test_valid_key_clears_the_namespace(self, admin_client, cache):
+        cache.set("api:waqi", "kampala", {"pm25": 41})
+        cache.set("api:airqo", "kampala", {"pm25": 38})
+        client = admin_client()
+
+        response = client.delete(
+            "/api/v1/admin/cache/api:waqi", headers={"X-Admin-Key": ADMIN_KEY}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["namespace"] == "api:waqi"
+        assert cache.get("api:waqi", "kampala") is None
+        assert cache.get("api:airqo", "kampala") == {"pm25": 38}
+
+    def test_stats_with_valid_key(self, admin_client):
+        response = admin_client().get(
+            "/api/v1/admin/cache/stats", headers={"X-Admin-Key": ADMIN_KEY}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["semantic"] is None
+        assert "cache" in response.json()
@@ -0,0 +1,491 @@
+"""
+Cache Tests
+===========
+
+Covers the in-process cache tier used when Redis is unavailable:
+- TTL expiry
+- LRU eviction by entry count and byte budget
+- Hit/miss/eviction counters
+
+RedisCache single-flight (concurrent misses share one fetch),
+stale-while-revalidate serving, namespace invalidation with SCAN/UNLINK,
+the async API and its Redis circuit breaker, the versioned Redis payload codec, and the
+hot-city cache warmer.
+"""
+
+import asyncio
+import math
+import pickle
+import re
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from core.agent.cache_warmer import CacheWarmer
+from infrastructure.cache.codec import FLAG_ZSTD, ZSTD_AVAILABLE, CacheCodec, CodecError
+from infrastructure.cache.memory_cache import MemoryCache
+
+
+class TestMemoryCache:
+    """Test the bounded LRU+TTL memory cache."""
+
+    def test_get_returns_stored_value(self):
+        cache = MemoryCache()
+        cache.set("k", {"pm25": 12}, ttl=60)
+        assert cache.get("k") == {"pm25": 12}
+        assert cache.get("missing") is None
+
+    def test_entry_expires_after_ttl(self):
+        cache = MemoryCache()
+        with patch("infrastructure.cache.memory_cache.time.monotonic", return_value=100.0):
+            cache.set("k", "v", ttl=10)
+        with patch("infrastructure.cache.memory_cache.time.monotonic", return_value=109.0):
+            assert cache.get("k") == "v"
+        with patch("infrastructure.cache.memory_cache.time.monotonic", return_value=111.0):
+            assert cache.get("k") is None
+        assert len(cache) == 0
+        assert cache.stats()["expirations"] == 1
+
+    def test_evicts_least_recently_used_entry(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3, ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_budget_is_enforced(self):
+        cache = MemoryCache(max_bytes=1000)
+        for i in range(10):
+            cache.set(f"k{i}", "x" * 200, ttl=60)
+
+        stats = cache.stats()
+        assert stats["bytes"] <= 1000
+        assert stats["evictions"] > 0
+        assert cache.get("k9") is not None
+
+    def test_oversized_value_is_not_cached(self):
+        cache = MemoryCache(max_bytes=100)
+        assert cache.set("big", "x" * 1000, ttl=60) is False
+        assert cache.get("big") is None
+
+    def test_delete_prefix_and_purge_expired(self):
+        cache = MemoryCache()
+        cache.set("airquality:waqi:1", 1, ttl=60)
+        cache.set("airquality:waqi:2", 2, ttl=60)
+        cache.set("airquality:airqo:1", 3, ttl=0)
+
+        assert cache.delete_prefix("airquality:waqi:") == 2
+        assert cache.purge_expired() == 1
+        assert len(cache) == 0
+
+    def test_hit_and_miss_counters(self):
+        cache = MemoryCache()
+        cache.set("k", "v", ttl=60)
+        cache.get("k")
+        cache.get("k")
+        cache.get("nope")
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == round(2 / 3, 4)
+
+
+class TestSingleFlight:
+    """Concurrent misses for one key produce a single upstream fetch."""
+
+    def test_concurrent_threads_share_one_fetch(self, memory_backed_cache):
+        calls = 0
+        barrier = threading.Barrier(8)
+        results = []
+
+        def fetch():
+            nonlocal calls
+            calls += 1
+            time.sleep(0.1)
+            return {"city": "Kampala", "pm25": 41}
+
+        def worker():
+            barrier.wait()
+            results.append(memory_backed_cache.get_or_fetch("api:airqo", "kampala", fetch))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert calls == 1
+        assert results == [{"city": "Kampala", "pm25": 41}] * 8
+        assert memory_backed_cache.get("api:airqo", "kampala") == {"city": "Kampala", "pm25": 41}
+
+    def test_concurrent_tasks_share_one_fetch(self, memory_backed_cache):
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"pm25": 41}
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    memory_backed_cache.get_or_fetch_async("api:airqo", "kampala", fetch)
+                    for _ in range(10)
+                )
+            )
+
+        results = asyncio.run(run())
+        assert calls == 1
+        assert results == [{"pm25": 41}] * 10
+
+    def test_errors_reach_waiters_and_are_not_cached(self, memory_backed_cache):
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    memory_backed_cache.get_or_fetch_async("api:waqi", "k", fetch)
+                    for _ in range(3)
+                ),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert memory_backed_cache.get("api:waqi", "k") is None
+        assert memory_backed_cache.get_or_fetch("api:waqi", "k", lambda: "ok") == "ok"
+
+    def test_cancelled_leader_does_not_cancel_waiters(self, memory_backed_cache):
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return {"pm25": 41}
+
+        async def run():
+            leader = asyncio.create_task(
+                memory_backed_cache.get_or_fetch_async("api:airqo", "gulu", fetch)
+            )
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(
+                memory_backed_cache.get_or_fetch_async("api:airqo", "gulu", fetch)
+            )
+            await asyncio.sleep(0.01)
+            leader.cancel()  # e.g. the leader's deadline fired
+            return leader, await waiter
+
+        leader, result = asyncio.run(run())
+        assert leader.cancelled()
+        assert result == {"pm25": 41}
+        assert memory_backed_cache.get("api:airqo", "gulu") == {"pm25": 41}
+
+    def test_fetch_is_cancelled_when_every_caller_is(self, memory_backed_cache):
+        events = []
+
+        async def fetch():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                events.append("fetch cancelled")
+                raise
+
+        async def run():
+            callers = [
+                asyncio.create_task(memory_backed_cache.get_or_fetch_async("api:waqi", "k", fetch))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        assert events == ["fetch cancelled"]
+        assert memory_backed_cache._async_flights == {}
+
+
+class TestStaleWhileRevalidate:
+    """Entries past the soft TTL are served stale while one refresh runs."""
+
+    def test_stale_value_is_flagged_and_refreshed_once(self, memory_backed_cache):
+        cache = memory_backed_cache
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return {"pm25": 10 * len(calls)}
+
+        assert cache.get_or_fetch("api:airqo", "k", fetch, ttl=60, hard_ttl=600) == {"pm25": 10}
+
+        later = time.time() + 120
+        with patch("infrastructure.cache.cache_service.time.time", return_value=later):
+            stale = [cache.get_or_fetch("api:airqo", "k", fetch, 60, 600) for _ in range(3)]
+            cache._refresh_executor.shutdown(wait=True)  # Let the refresh finish
+            fresh = cache.get_or_fetch("api:airqo", "k", fetch, 60, 600)
+
+        assert stale[0] == {"pm25": 10, "cache_stale": True, "cache_age_seconds": 120}
+        assert fresh == {"pm25": 20}
+        assert len(calls) == 2
+
+    def test_batch_reads_serve_and_refresh_stale_entries(self, memory_backed_cache):
+        cache = memory_backed_cache
+        cache.set_api_responses("waqi", [("feed/kampala/", {}, {"aqi": 80})], ttl=60, hard_ttl=600)
+        fetched = []
+
+        def fetch(endpoint, params):
+            fetched.append(endpoint)
+            return {"aqi": 90}
+
+        requests = [("feed/kampala/", {}), ("feed/lagos/", {})]
+        assert cache.get_api_responses("waqi", requests, fetch, 60, 600) == [{"aqi": 80}, None]
+
+        later = time.time() + 120
+        with patch("infrastructure.cache.cache_service.time.time", return_value=later):
+            stale = cache.get_api_responses("waqi", requests, fetch, 60, 600)
+            cache._refresh_executor.shutdown(wait=True)
+            fresh = cache.get_api_responses("waqi", requests, fetch, 60, 600)
+
+        assert stale[0] == {"aqi": 80, "cache_stale": True, "cache_age_seconds": 120}
+        assert fresh == [{"aqi": 90}, None]
+        assert fetched == ["feed/kampala/"]
+
+    def test_async_batch_reads_refresh_stale_entries(self, memory_backed_cache):
+        cache = memory_backed_cache
+        fetched = []
+
+        async def fetch(key):
+            fetched.append(key)
+            return {"aqi": 90}
+
+        async def scenario():
+            await cache.set_many_async("api:waqi", {"kampala": {"aqi": 80}}, 60, hard_ttl=600)
+            later = time.time() + 120
+            with patch("infrastructure.cache.cache_service.time.time", return_value=later):
+                stale = await cache.get_many_async("api:waqi", ["kampala"], fetch, 60, 600)
+                await asyncio.gather(*cache._refresh_tasks)
+                fresh = await cache.get_many_async("api:waqi", ["kampala"], fetch, 60, 600)
+            return stale, fresh
+
+        stale, fresh = asyncio.run(scenario())
+
+        assert stale["kampala"]["cache_stale"] is True
+        assert fresh == {"kampala": {"aqi": 90}}
+        assert fetched == ["kampala"]
+
+
+class TestBatchOperations:
+    """get_many/set_many on the in-process tier."""
+
+    def test_set_many_with_per_key_ttl_and_get_many(self, memory_backed_cache):
+        with patch("infrastructure.cache.memory_cache.time.monotonic", return_value=100.0):
+            memory_backed_cache.set_many(
+                "tool:african_city", {"kampala": {"pm25": 41}, "nairobi": {"pm25": 18}}, {"nairobi": 10}
+            )
+        with patch("infrastructure.cache.memory_cache.time.monotonic", return_value=120.0):
+            found = memory_backed_cache.get_many("tool:african_city", ["kampala", "nairobi", "lagos"])
+
+        assert found == {"kampala": {"pm25": 41}}
+
+
+class FakeRedis:
+    """Sync Redis double supporting just SCAN (with glob escapes) and UNLINK."""
+
+    def __init__(self, keys):
+        self.keys = set(keys)
+        self.scans = []
+        self.unlinked = []
+
+    @staticmethod
+    def glob_to_regex(pattern):
+        out, i = [], 0
+        while i < len(pattern):
+            c = pattern[i]
+            if c == "\\" and i + 1 < len(pattern):
+                i += 1
+                out.append(re.escape(pattern[i]))
+            elif c == "*":
+                out.append(".*")
+            elif c == "?":
+                out.append(".")
+            else:
+                out.append(re.escape(c))
+            i += 1
+        return re.compile("".join(out) + r"\Z", re.S)
+
+    def scan_iter(self, match, count):
+        self.scans.append((match, count))
+        regex = self.glob_to_regex(match)
+        return iter(sorted(k for k in self.keys if regex.match(k)))
+
+    def unlink(self, *keys):
+        self.unlinked.append(keys)
+        self.keys.difference_update(keys)
+
+
+class TestClearNamespace:
+    """Namespace invalidation with SCAN + batched UNLINK."""
+
+    def redis_backed(self, cache, keys):
+        cache.enabled = True
+        cache.client = FakeRedis(keys)
+        return cache.client
+
+    def test_keys_are_unlinked_in_batches(self, memory_backed_cache):
+        client = self.redis_backed(
+            memory_backed_cache,
+            [f"airquality:api:waqi:{i}" for i in range(5)] + ["airquality:api:airqo:1"],
+        )
+        memory_backed_cache.SCAN_BATCH_SIZE = 2
+
+        assert memory_backed_cache.clear_namespace("api:waqi") is True
+        assert client.scans == [("airquality:api:waqi:*", 2)]
+        assert [len(batch) for batch in client.unlinked] == [2, 2, 1]
+        assert client.keys == {"airquality:api:airqo:1"}
+
+    def test_glob_characters_in_the_namespace_match_literally(self, memory_backed_cache):
+        client = self.redis_backed(
+            memory_backed_cache,
+            ["airquality:api:*:1", "airquality:api:waqi:1", "airquality:api:[ab]:1"],
+        )
+
+        memory_backed_cache.clear_namespace("api:*")
+        memory_backed_cache.clear_namespace("api:[ab]")
+
+        assert client.scans[0][0] == r"airquality:api:\*:*"
+        assert client.scans[1][0] == r"airquality:api:\[ab\]:*"
+        assert client.keys == {"airquality:api:waqi:1"}
+
+    def test_redis_failure_reports_not_cleared(self, memory_backed_cache):
+        client = self.redis_backed(memory_backed_cache, ["airquality:api:waqi:1"])
+
+        def unavailable(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        client.scan_iter = unavailable
+        assert memory_backed_cache.clear_namespace("api:waqi") is False
+
+    def test_memory_tier_drops_only_the_namespace(self, memory_backed_cache):
+        memory_backed_cache.set("api:waqi", "k", 1)
+        memory_backed_cache.set("api:airqo", "k", 2)
+
+        assert memory_backed_cache.clear_namespace("api:waqi") is True
+        assert memory_backed_cache.get("api:waqi", "k") is None
+        assert memory_backed_cache.get("api:airqo", "k") == 2
+
+
+class TestAsyncCache:
+    """Async cache API and the Redis circuit breaker."""
+
+    def test_async_get_set_on_memory_tier(self, memory_backed_cache):
+        async def run():
+            await memory_backed_cache.set_async("agent", "k", {"response": "ok"})
+            return await memory_backed_cache.get_async("agent", "k")
+
+        assert asyncio.run(run()) == {"response": "ok"}
+
+    def test_circuit_opens_after_consecutive_failures(self, memory_backed_cache):
+        cache = memory_backed_cache
+        cache.enabled = True
+        calls = []
+
+        async def failing_get(r):
+            calls.append(1)
+            raise ConnectionError("redis down")
+
+        async def run():
+            with patch.object(cache, "_async_redis"):
+                for _ in range(cache.circuit_failure_threshold + 3):
+                    assert await cache.run_async(failing_get, "default") == "default"
+
+        asyncio.run(run())
+        assert len(calls) == cache.circuit_failure_threshold
+        assert cache.stats()["circuit_open"] is True
+
+
+class TestCacheCodec:
+    """Test the versioned Redis payload codec."""
+
+    def test_round_trips_json_and_pickle_fallback_values(self):
+        codec = CacheCodec()
+        for value in ({"pm25": [12.5, None], "city": "Kampala"}, {1: "non-str key"}, datetime(2025, 1, 1)):
+            assert codec.decode(codec.encode(value)) == value
+
+    @pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard not installed")
+    def test_large_payloads_are_compressed(self):
+        codec = CacheCodec(compress_min_bytes=1024)
+        value = {"measurements": [{"pm2_5": {"value": 12.5}, "site": "Kampala"}] * 200}
+        blob = codec.encode(value)
+
+        assert blob[1] & FLAG_ZSTD
+        assert codec.decode(blob) == value
+
+    def test_foreign_payloads_are_rejected(self):
+        codec = CacheCodec()
+        with pytest.raises(CodecError):
+            codec.decode(pickle.dumps({"pm25": 12}))  # Entry written before the codec existed
+        with pytest.raises(CodecError):
+            codec.decode(bytes((99, 1)) + b"{}")  # Future codec version
+
+    def test_non_finite_floats_survive_via_pickle(self):
+        codec = CacheCodec()
+        decoded = codec.decode(codec.encode({"pm25": [float("nan"), float("inf"), None]}))
+
+        assert math.isnan(decoded["pm25"][0])
+        assert decoded["pm25"][1:] == [float("inf"), None]
+
+    def test_corrupt_payloads_are_rejected(self):
+        codec = CacheCodec(compress_min_bytes=1024)
+        json_blob = codec.encode({"pm25": 12})
+        pickle_blob = codec.encode({1: "non-str key"})
+        with pytest.raises(CodecError):
+            codec.decode(json_blob[:-3])
+        with pytest.raises(CodecError):
+            codec.decode(pickle_blob[:-3])
+        if ZSTD_AVAILABLE:
+            zstd_blob = codec.encode({"measurements": [{"pm2_5": 12.5}] * 200})
+            with pytest.raises(CodecError):
+                codec.decode(zstd_blob[:2] + zstd_blob[12:])
+
+
+class TestCacheWarmer:
+    """Hot-city warmup jobs, budgets and circuit breaking."""
+
+    class FakeToolExecutor:
+        AFRICAN_FORECAST_INDICATORS = ["kampala"]
+
+        def __init__(self):
+            self.calls = []
+
+        async def execute_async(self, tool, args):
+            self.calls.append((tool, args))
+            return {"success": True}
+
+    def test_jobs_replay_proactive_calls_within_budget(self):
+        executor = self.FakeToolExecutor()
+        warmer = CacheWarmer(
+            executor, cities=["kampala", "London"], interval=300, jitter=0.2, budgets={"waqi": 1}
+        )
+
+        now = time.monotonic()
+        assert asyncio.run(warmer.run_due(now)) == 4
+
+        # London's current and forecast jobs share the one-call WAQI budget
+        assert executor.calls == [
+            ("get_african_city_air_quality", {"city": "Kampala"}),
+            ("get_air_quality_forecast", {"city": "Kampala"}),
+            ("get_city_air_quality", {"city": "London"}),
+        ]
+        assert warmer.stats()["warmed"] == 3
+        assert warmer.stats()["skipped_budget"] == 1
+        assert all(now + 240 <= job.next_run <= now + 360 for job in warmer.jobs[:3])
@@ -0,0 +1,195 @@
+"""
+Chat Stream Tests
+=================
+
+Covers the SSE chat endpoint (`/agent/chat/stream`) with a scripted agent:
+event order and the final payload, key redaction and tool-request removal
+in streamed tokens, `reset` events when a model call is retried, error
+events, and the streaming response filter on its own.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.providers.token_stream import get_token_stream
+from infrastructure.database.database import Base, get_db
+from infrastructure.database.repository import get_recent_session_history
+from interfaces.rest_api import routes
+from shared.utils.security import StreamingResponseFilter
+
+SECRET = "sk-" + "a1b2c3d4e5" * 3
+
+
+class ScriptedAgent:
+    """Agent double that streams scripted deltas, then returns a final response."""
+
+    def __init__(self, deltas, response="", error=None):
+        self.deltas = deltas
+        self.response = response
+        self.error = error
+        self.summarizer = SimpleNamespace(schedule=lambda session_id: None)
+
+    async def process_message(self, **kwargs):
+        stream = get_token_stream()
+        for delta in self.deltas:
+            if delta is None:
+                stream.reset()
+            else:
+                stream.publish(delta)
+            await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        return {"response": self.response, "tools_used": []}
+
+    def _manage_memory(self):
+        pass
+
+
+@pytest.fixture
+def database():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def stream_chat(database, monkeypatch):
+    """POST a message to the stream endpoint with a scripted agent; return its events."""
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api/v1")
+
+    def override_db():
+        db = database()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_db
+    monkeypatch.setattr(routes, "SessionLocal", database)
+
+    def post(agent, message="Air quality in Kampala?", session_id="stream-session"):
+        monkeypatch.setattr(routes, "_agent_instance", agent)
+        with TestClient(app) as client:
+            response = client.post(
+                "/api/v1/agent/chat/stream", data={"message": message, "session_id": session_id}
+            )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return parse_events(response.text)
+
+    return post
+
+
+def parse_events(body):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def streamed_text(events):
+    return "".join(data["content"] for name, data in events if name == "token")
+
+
+class TestChatStreamEndpoint:
+    """Event sequence of the SSE endpoint."""
+
+    def test_tokens_then_done_and_reply_is_saved(self, stream_chat, database):
+        agent = ScriptedAgent(
+            ["PM2.5 in Kampala ", "is 35 µg/m³. ", "Limit outdoor ", "exercise."],
+            response="PM2.5 in Kampala is 35 µg/m³. Limit outdoor exercise.",
+        )
+
+        events = stream_chat(agent)
+
+        assert [name for name, _ in events][-1] == "done"
+        assert streamed_text(events) == "PM2.5 in Kampala is 35 µg/m³. Limit outdoor exercise."
+        done = events[-1][1]
+        assert done["session_id"] == "stream-session"
+        assert "35 µg/m³" in done["response"]
+        db = database()
+        roles = [m.role for m in get_recent_session_history(db, "stream-session")]
+        db.close()
+        assert roles == ["user", "assistant"]
+
+    def test_streamed_tokens_are_redacted_like_the_final_response(self, stream_chat):
+        agent = ScriptedAgent(
+            ["Your key is ", SECRET[:12], SECRET[12:], " so keep it private.\n", "Done."],
+            response=f"Your key is {SECRET} so keep it private.\nDone.",
+        )
+
+        events = stream_chat(agent)
+
+        assert SECRET not in streamed_text(events)
+        assert SECRET[:12] not in streamed_text(events)
+        assert "Done." in streamed_text(events)
+
+    def test_tool_requests_written_as_text_are_not_streamed(self, stream_chat):
+        agent = ScriptedAgent(
+            [
+                "Checking.\n```json\n",
+                '{"name": "get_city_air_quality", ',
+                '"arguments": {"city": "Kampala"}}\n```\n',
+            ],
+            response="Checking.",
+        )
+
+        text = streamed_text(stream_chat(agent))
+
+        assert "get_city_air_quality" not in text
+        assert "Checking." in text
+
+    def test_retried_call_emits_reset(self, stream_chat):
+        agent = ScriptedAgent(
+            ["Half an answer. ", None, "Full answer."], response="Full answer."
+        )
+
+        events = stream_chat(agent)
+
+        names = [name for name, _ in events]
+        assert names == ["token", "reset", "token", "done"]
+        assert events[2][1]["content"] == "Full answer."
+
+    def test_failure_after_stream_opens_is_an_error_event(self, stream_chat):
+        agent = ScriptedAgent(["Partial. "], error=RuntimeError("provider down"))
+
+        events = stream_chat(agent)
+
+        assert events[-1][0] == "error"
+        assert "provider down" not in events[-1][1]["message"]
+
+
+class TestStreamingResponseFilter:
+    """Deltas are released at safe points and cleaned as whole pieces."""
+
+    def test_text_is_held_until_a_sentence_ends(self):
+        stream_filter = StreamingResponseFilter()
+
+        assert stream_filter.feed("The air is ") == ""
+        assert stream_filter.feed("moderate. Tomo") == "The air is moderate. "
+        assert stream_filter.flush() == "Tomo"
+
+    def test_fenced_blocks_are_held_until_closed(self):
+        stream_filter = StreamingResponseFilter()
+
+        assert stream_filter.feed("```python\nprint(1)\n") == ""
+        assert stream_filter.feed("```\n") == "```python\nprint(1)\n```\n"
+
+    def test_reset_drops_held_text(self):
+        stream_filter = StreamingResponseFilter()
+        stream_filter.feed("partial")
+        stream_filter.reset()
+
+        assert stream_filter.flush() == ""
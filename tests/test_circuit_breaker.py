@@ -0,0 +1,175 @@
+"""
+Circuit Breaker Tests
+=====================
+
+Covers the closed / open / half-open cycle with a single recovery probe,
+slow-call tripping, open state shared between workers by the
+background Redis sync, and the ToolOrchestrator's tool breakers.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from core.agent.orchestrator import ToolCall, ToolOrchestrator
+from shared.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def at(seconds):
+    return patch("shared.utils.circuit_breaker.time.time", return_value=seconds)
+
+
+class SharedCache:
+    """Just enough of RedisCache.run_async and a Redis pipeline over a dict."""
+
+    enabled = True
+
+    def __init__(self):
+        self.data = {}
+        self.available = True
+
+    async def run_async(self, op, default=None):
+        return await op(self) if self.available else default
+
+    def pipeline(self):
+        return Pipeline(self.data)
+
+
+class Pipeline:
+    def __init__(self, data):
+        self.data = data
+        self.commands = []
+
+    def get(self, key):
+        self.commands.append(lambda: self.data.get(key))
+
+    def set(self, key, value, nx=False, ex=None):
+        def run():
+            if nx and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+
+        self.commands.append(run)
+
+    def delete(self, *keys):
+        self.commands.append(lambda: [self.data.pop(key, None) for key in keys])
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+def sync(cache, *workers):
+    async def run():
+        for worker in workers:
+            await worker.sync_shared(cache)
+
+    asyncio.run(run())
+
+
+class TestCircuitBreaker:
+    """State transitions of a single breaker."""
+
+    def test_opens_then_lets_one_probe_through_and_closes(self):
+        breaker = CircuitBreaker("waqi", failure_threshold=3, reset_timeout=60)
+        with at(1000.0):
+            for _ in range(3):
+                assert breaker.allow_request()
+                breaker.record_failure()
+            assert breaker.state == OPEN
+            assert not breaker.allow_request()
+
+        with at(1061.0):
+            assert breaker.allow_request()  # The probe
+            assert breaker.state == HALF_OPEN
+            assert not breaker.allow_request()
+            assert breaker.is_open()
+            breaker.record_success(latency=0.2)
+            assert breaker.state == CLOSED
+            assert breaker.allow_request()
+
+    def test_failed_probe_and_slow_calls_reopen(self):
+        breaker = CircuitBreaker("airqo", failure_threshold=2, reset_timeout=60, slow_call_seconds=5)
+        with at(1000.0):
+            breaker.record_success(latency=9)
+            breaker.record_success(latency=12)
+            assert breaker.state == OPEN
+            assert breaker.stats()["slow_calls"] == 2
+
+        with at(1061.0):
+            assert breaker.allow_request()
+            breaker.record_failure()
+            assert breaker.state == OPEN
+            assert not breaker.allow_request()
+
+
+class TestSharedCircuitBreaker:
+    """Workers share open state and the probe slot through the background sync."""
+
+    def make_workers(self):
+        workers = [
+            CircuitBreaker("waqi", failure_threshold=1, reset_timeout=60, shared=True)
+            for _ in range(2)
+        ]
+        for i, worker in enumerate(workers):
+            worker.worker_id = f"worker-{i}"
+        return workers
+
+    def test_other_worker_learns_of_outage_and_probes_once(self):
+        cache = SharedCache()
+        workers = self.make_workers()
+        with at(1000.0):
+            assert workers[1].allow_request()
+            workers[0].record_failure()
+            sync(cache, *workers)
+        with at(1003.0):
+            assert not workers[1].allow_request()
+            assert workers[1].state == OPEN
+
+        with at(1061.0):
+            assert workers[0].allow_request()
+            sync(cache, *workers)
+            assert not workers[1].allow_request()  # Probe slot taken by worker 0
+            workers[0].record_success()
+            sync(cache, workers[0])
+            assert "airquality:circuit:waqi" not in cache.data
+
+    def test_updates_are_kept_while_redis_is_down(self):
+        cache = SharedCache()
+        cache.available = False
+        workers = self.make_workers()
+        with at(1000.0):
+            workers[0].record_failure()
+            assert not workers[0].allow_request()
+            sync(cache, *workers)
+            assert cache.data == {}
+
+            cache.available = True
+            sync(cache, *workers)
+            assert cache.data["airquality:circuit:waqi"] == "1060.0"
+            assert workers[1].state == OPEN
+
+
+class TestOrchestratorBreakers:
+    """Tool breakers keep the orchestrator's open window and see one attempt's latency."""
+
+    def test_success_after_retry_records_only_that_attempt(self):
+        outcomes = [{"success": False}, {"success": True}]
+
+        class Executor:
+            async def execute_async(self, name, args):
+                return outcomes.pop(0)
+
+        orchestrator = ToolOrchestrator(Executor(), max_retries=2, retry_delay=0.2)
+        breaker = orchestrator._breaker("orchestrator-latency-test")
+        latencies = []
+
+        with patch.object(breaker, "record_success", side_effect=latencies.append):
+            call = asyncio.run(
+                orchestrator._execute_single_tool_with_retry(
+                    ToolCall(name="orchestrator-latency-test", args={})
+                )
+            )
+
+        assert breaker.reset_timeout == ToolOrchestrator.CIRCUIT_RESET_SECONDS == 300
+        assert call.execution_time >= 0.2  # Includes the failed attempt and its backoff
+        assert latencies[0] < 0.1
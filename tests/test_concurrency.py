@@ -0,0 +1,137 @@
+"""
+Concurrency Helper Tests
+========================
+
+Covers gather_bounded and its thread-pool twin run_bounded:
+- At most `limit` calls in flight
+- Per-call timeouts and the overall deadline
+- Partial results: failed calls map to their exception, late calls are missing
+"""
+
+import asyncio
+import threading
+import time
+
+from shared.utils.concurrency import gather_bounded, run_bounded
+
+
+class TestGatherBounded:
+    """Async fan-out under a semaphore."""
+
+    def test_limit_caps_calls_in_flight(self):
+        in_flight = []
+        peak = []
+
+        async def call(key):
+            in_flight.append(key)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(key)
+            return key * 2
+
+        outcomes = asyncio.run(
+            gather_bounded({key: lambda key=key: call(key) for key in range(6)}, limit=2)
+        )
+
+        assert outcomes == {key: key * 2 for key in range(6)}
+        assert max(peak) == 2
+
+    def test_call_timeout_fails_only_the_slow_call(self):
+        async def answer(delay, value):
+            await asyncio.sleep(delay)
+            return value
+
+        outcomes = asyncio.run(
+            gather_bounded(
+                {"fast": lambda: answer(0, "ok"), "slow": lambda: answer(5, "late")},
+                limit=2,
+                call_timeout=0.05,
+            )
+        )
+
+        assert outcomes["fast"] == "ok"
+        assert isinstance(outcomes["slow"], TimeoutError)
+
+    def test_deadline_returns_partial_results_and_cancels_the_rest(self):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append("slow")
+                raise
+
+        async def broken():
+            raise ValueError("upstream down")
+
+        async def scenario():
+            return await gather_bounded(
+                {"fast": lambda: asyncio.sleep(0, "ok"), "broken": broken, "slow": slow},
+                limit=3,
+                deadline=0.05,
+            )
+
+        started = time.monotonic()
+        outcomes = asyncio.run(scenario())
+
+        assert time.monotonic() - started < 1
+        assert outcomes["fast"] == "ok"
+        assert isinstance(outcomes["broken"], ValueError)
+        assert "slow" not in outcomes
+        assert cancelled == ["slow"]
+
+    def test_call_cancelled_from_inside_maps_to_an_exception(self):
+        async def cancelled():
+            raise asyncio.CancelledError
+
+        outcomes = asyncio.run(
+            gather_bounded({"cancelled": cancelled, "fine": lambda: asyncio.sleep(0, 1)}, limit=2)
+        )
+
+        assert isinstance(outcomes["cancelled"], asyncio.CancelledError)
+        assert outcomes["fine"] == 1
+
+
+class TestRunBounded:
+    """Thread-pool fan-out for blocking calls."""
+
+    def test_limit_caps_threads_in_flight(self):
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def call(key):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            return key
+
+        outcomes = run_bounded({key: lambda key=key: call(key) for key in range(6)}, limit=2)
+
+        assert outcomes == {key: key for key in range(6)}
+        assert peak[0] == 2
+
+    def test_deadline_returns_partial_results(self):
+        release = threading.Event()
+
+        def broken():
+            raise ValueError("upstream down")
+
+        try:
+            started = time.monotonic()
+            outcomes = run_bounded(
+                {"fast": lambda: "ok", "broken": broken, "slow": lambda: release.wait(5)},
+                limit=3,
+                deadline=0.05,
+            )
+        finally:
+            release.set()
+
+        assert time.monotonic() - started < 1
+        assert outcomes["fast"] == "ok"
+        assert isinstance(outcomes["broken"], ValueError)
+        assert "slow" not in outcomes
@@ -0,0 +1,110 @@
+"""
+Conversation Summarizer Tests
+=============================
+
+Covers folding older messages into the stored session summary (watermark,
+verbatim tail, history loaded after the watermark) and background scheduling
+(one run per session in flight, a follow-up run for turns saved meanwhile).
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.memory.conversation_summarizer import ConversationSummarizer
+from infrastructure.database.database import Base
+from infrastructure.database.repository import (
+    add_message,
+    get_recent_session_history,
+    get_session_summary,
+    save_session_summary,
+)
+
+
+class FakeProvider:
+    """Records summarization prompts; optionally waits before answering."""
+
+    def __init__(self, delay: float = 0.0):
+        self.prompts = []
+        self.delay = delay
+
+    async def complete_text(self, prompt, system_instruction, max_tokens=512):
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.delay)
+        return f"summary {len(self.prompts)}"
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory database with the chat tables."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def _add_turns(session_factory, session_id: str, turns: int, start: int = 0) -> None:
+    db = session_factory()
+    try:
+        for i in range(start, start + turns):
+            add_message(db, session_id, "user", f"Question {i} about Kampala")
+            add_message(db, session_id, "assistant", f"Answer {i}")
+    finally:
+        db.close()
+
+
+class TestConversationSummarizer:
+    """Older turns become the summary; recent ones stay verbatim."""
+
+    def test_folds_older_messages_behind_a_watermark(self, session_factory):
+        provider = FakeProvider()
+        summarizer = ConversationSummarizer(
+            provider, session_factory, trigger_messages=12, keep_recent=6, enabled=True
+        )
+        _add_turns(session_factory, "s1", 5)
+
+        assert asyncio.run(summarizer.summarize("s1")) is False  # 10 messages: below trigger
+        _add_turns(session_factory, "s1", 2, start=5)
+        assert asyncio.run(summarizer.summarize("s1")) is True
+
+        db = session_factory()
+        try:
+            stored = get_session_summary(db, "s1")
+            history = get_recent_session_history(db, "s1", after_id=stored.summarized_until)
+            # An older summary never replaces a newer one
+            save_session_summary(db, "s1", "stale", stored.summarized_until - 1)
+            assert get_session_summary(db, "s1").summary == "summary 1"
+        finally:
+            db.close()
+
+        assert "Question 0 about Kampala" in provider.prompts[0]
+        assert "Question 5" not in provider.prompts[0]
+        assert [m.content for m in history] == [
+            "Question 4 about Kampala", "Answer 4", "Question 5 about Kampala", "Answer 5",
+            "Question 6 about Kampala", "Answer 6",
+        ]
+
+    def test_one_run_in_flight_per_session(self, session_factory):
+        provider = FakeProvider(delay=0.05)
+        summarizer = ConversationSummarizer(
+            provider, session_factory, trigger_messages=4, keep_recent=2, enabled=True
+        )
+        _add_turns(session_factory, "s2", 3)
+
+        async def scenario():
+            summarizer.schedule("s2")
+            await asyncio.sleep(0.02)  # First run is waiting on the provider
+            _add_turns(session_factory, "s2", 2, start=3)
+            summarizer.schedule("s2")  # Queued behind the first run
+            while summarizer._tasks:
+                await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+
+        assert len(provider.prompts) == 2
+        assert "summary 1" in provider.prompts[1]
+        assert summarizer.stats()["runs"] == 2
@@ -0,0 +1,52 @@
+"""
+Gazetteer Tests
+===============
+
+Covers offline city lookup (normalization, country qualifiers, fuzzy
+matching, rejection of unknown places) and its use as the first geocoding
+tier ahead of Nominatim.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from core.agent.query_analyzer import QueryAnalyzer
+from infrastructure.api.geocoding import GeocodingService
+from shared.utils.gazetteer import get_gazetteer
+
+
+class TestGazetteer:
+    """Name resolution against the bundled cities."""
+
+    def test_detected_cities_resolve_with_normalization_and_typos(self):
+        gazetteer = get_gazetteer()
+
+        detected = QueryAnalyzer.AFRICAN_CITIES + QueryAnalyzer.GLOBAL_CITIES
+        assert all(gazetteer.lookup(city) for city in detected)
+        assert gazetteer.lookup("  sao PAULO ").name == "São Paulo"
+        assert gazetteer.lookup("ndjamena").name == "N'Djamena"
+        assert gazetteer.lookup("Kampala, UG").country == "Uganda"
+        assert gazetteer.lookup("Newcastle, Australia").country_code == "AU"
+        assert gazetteer.lookup("Johanesburg").fuzzy is True
+
+    def test_unknown_places_and_mismatched_countries_are_left_to_the_network(self):
+        gazetteer = get_gazetteer()
+
+        assert gazetteer.lookup("Paris, Texas") is None
+        assert gazetteer.lookup("Plot 5, Kampala Road") is None
+        assert gazetteer.lookup("Gula") is None  # Too short to fuzzy-match Gulu
+
+
+class TestGeocodingTiers:
+    """Known cities never reach Nominatim."""
+
+    def test_known_city_is_geocoded_offline(self):
+        service = GeocodingService()
+        with patch.object(service.session, "get", side_effect=AssertionError("network call")):
+            result = service.geocode_address("Nairobi, Kenya")
+            async_result = asyncio.run(service.geocode_address_async("nairobi"))
+
+        assert result["success"] is True
+        assert result["source"] == "gazetteer"
+        assert (result["latitude"], result["longitude"]) == (-1.2921, 36.8219)
+        assert async_result == result
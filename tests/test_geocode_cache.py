@@ -0,0 +1,70 @@
+"""
+Reverse Geocode Cache Tests
+===========================
+
+Covers geohash keys (nearby GPS fixes share one Nominatim lookup, failures
+are not cached) and the SQLite store answering after a restart, with its
+expired rows purged on startup.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from infrastructure.cache.geocode_cache import ReverseGeocodeCache, geohash
+
+
+class TestReverseGeocodeCache:
+    """Geohash-quantized reverse geocoding results."""
+
+    def test_geohash_matches_reference_encoding(self):
+        assert geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+        assert geohash(0.3476, 32.5825, 5) == geohash(0.3480, 32.5830, 5)
+
+    def test_nearby_coordinates_share_one_fetch_and_errors_are_not_cached(self):
+        cache = ReverseGeocodeCache(ttl=60, sqlite_path="")
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return "Kampala"
+
+        assert cache.get_or_fetch("city", 0.31361, 32.58111, fetch) == "Kampala"
+        assert cache.get_or_fetch("city", 0.31402, 32.58150, fetch) == "Kampala"
+        assert len(calls) == 1
+
+        def failing():
+            raise ConnectionError("Nominatim down")
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_fetch("city", -1.2921, 36.8219, failing)
+        assert cache.get_or_fetch("city", -1.2921, 36.8219, lambda: "Nairobi") == "Nairobi"
+
+    def test_sqlite_store_survives_restart(self, tmp_path):
+        path = str(tmp_path / "geocode.db")
+        first = ReverseGeocodeCache(ttl=60, sqlite_path=path)
+        address = {"success": True, "display_name": "Makerere, Kampala"}
+
+        async def fetch():
+            return address
+
+        assert asyncio.run(first.get_or_fetch_async("address", 0.3337, 32.5681, fetch)) == address
+
+        restarted = ReverseGeocodeCache(ttl=60, sqlite_path=path)
+        assert restarted.store.get(restarted.key("address", 0.3337, 32.5681)) == address
+        assert restarted.store.get(restarted.key("address", 0.5, 32.5)) is None
+
+    def test_expired_sqlite_rows_are_purged_on_startup(self, tmp_path):
+        path = str(tmp_path / "geocode.db")
+        first = ReverseGeocodeCache(ttl=60, sqlite_path=path)
+        first.store.set("city:s0000", "Kampala", 60)
+        first.store.set("city:s0001", "Entebbe", 3600)
+
+        later = time.time() + 120
+        with patch("infrastructure.cache.geocode_cache.time.time", return_value=later):
+            restarted = ReverseGeocodeCache(ttl=60, sqlite_path=path)
+            keys = [row[0] for row in restarted.store._conn.execute("SELECT key FROM reverse_geocode")]
+
+        assert keys == ["city:s0001"]
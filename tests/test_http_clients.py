@@ -0,0 +1,247 @@
+"""
+Async Data-Source Client Tests
+==============================
+
+Covers the async-native data-source clients against a mocked upstream
+(`httpx.MockTransport` in place of the shared pooled client): the request
+each one sends, how the response is parsed, and that cached responses are
+served without a second request. Also checks the pool limits of the shared
+client.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from infrastructure.api import airqo, defra, geocoding, nsw, openmeteo, uba, waqi, weather
+from infrastructure.api.airqo import AirQoService
+from infrastructure.api.defra import DefraService
+from infrastructure.api.geocoding import GeocodingService
+from infrastructure.api.nsw import NSWService
+from infrastructure.api.openmeteo import OpenMeteoService
+from infrastructure.api.uba import UbaService
+from infrastructure.api.waqi import WAQIService
+from infrastructure.api.weather import WeatherService
+from infrastructure.cache.cache_service import RedisCache
+from shared.utils.http_client import DATA_SOURCE_POOL_LIMITS, create_client
+from shared.utils.provider_errors import ProviderServiceError
+from shared.utils.rate_limiter import RateLimitedAsyncTransport
+
+CLIENT_MODULES = (airqo, defra, geocoding, nsw, openmeteo, uba, waqi, weather)
+
+
+class Upstream:
+    """Mock upstream: records requests and answers from per-host handlers."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.handlers = {}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.handlers[request.url.host](request)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route every client's shared HTTP client to a mock transport."""
+    monkeypatch.setenv("REDIS_ENABLED", "false")
+    from shared.config.settings import get_settings
+
+    get_settings.cache_clear()
+    mock = Upstream()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(mock.handle))
+    for module in CLIENT_MODULES:
+        monkeypatch.setattr(module, "get_shared_client", lambda: client)
+    try:
+        yield mock
+    finally:
+        get_settings.cache_clear()
+
+
+def json_handler(payload, status=200):
+    return lambda request: httpx.Response(status, json=payload)
+
+
+def with_fresh_cache(service, attribute="cache_service"):
+    setattr(service, attribute, RedisCache())
+    return service
+
+
+class TestSharedClient:
+    """Pool limits apply on the rate-limited transport."""
+
+    def test_rate_limited_client_pool_has_the_limits(self):
+        client = create_client(rate_limited=True)
+
+        transport = client._transport
+        assert isinstance(transport, RateLimitedAsyncTransport)
+        pool = transport._transport._pool
+        assert pool._max_connections == DATA_SOURCE_POOL_LIMITS.max_connections
+        assert pool._max_keepalive_connections == DATA_SOURCE_POOL_LIMITS.max_keepalive_connections
+
+
+class TestWAQIClient:
+    def test_city_feed_is_fetched_once_and_cached(self, upstream):
+        upstream.handlers["api.waqi.info"] = json_handler(
+            {"status": "ok", "data": {"aqi": 57, "city": {"name": "Kampala"}, "iaqi": {}}}
+        )
+        service = with_fresh_cache(WAQIService(api_token="secret-token"))
+
+        async def scenario():
+            first = await service.get_city_feed_async("Kampala")
+            second = await service.get_city_feed_async("Kampala")
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert first["success"] and first["overall_aqi"] == 57
+        assert second["overall_aqi"] == 57
+        assert len(upstream.requests) == 1
+        request = upstream.requests[0]
+        assert request.url.path == "/feed/Kampala/"
+        assert request.url.params["token"] == "secret-token"
+
+    def test_upstream_error_is_wrapped(self, upstream):
+        upstream.handlers["api.waqi.info"] = json_handler({"status": "error"}, status=500)
+        service = with_fresh_cache(WAQIService(api_token="secret-token"))
+
+        with pytest.raises(ProviderServiceError) as excinfo:
+            asyncio.run(service.get_city_feed_async("Lagos"))
+
+        assert "secret-token" not in str(excinfo.value.public_message)
+
+
+class TestAirQoClient:
+    def test_site_measurements_are_parsed_and_token_redacted(self, upstream):
+        upstream.handlers["api.airqo.net"] = json_handler(
+            {
+                "success": True,
+                "measurements": [{"site_id": "s1", "pm2_5": {"value": 31.2}}],
+                "note": "token=secret-token",
+            }
+        )
+        service = with_fresh_cache(AirQoService(api_token="secret-token"))
+
+        result = asyncio.run(service.get_recent_measurements_async(site_id="s1", fetch_all=False))
+
+        assert result["success"]
+        assert "secret-token" not in str(result)
+        assert upstream.requests[0].url.path == "/api/v2/devices/measurements/sites/s1/recent"
+
+
+class TestOpenMeteoClient:
+    def test_current_air_quality_is_cached(self, upstream):
+        upstream.handlers["air-quality-api.open-meteo.com"] = json_handler(
+            {"current": {"pm2_5": 18.0, "us_aqi": 64}, "current_units": {"pm2_5": "μg/m³"}}
+        )
+        service = with_fresh_cache(OpenMeteoService())
+
+        async def scenario():
+            await service.get_current_air_quality_async(0.31, 32.58)
+            return await service.get_current_air_quality_async(0.31, 32.58)
+
+        result = asyncio.run(scenario())
+
+        assert result["success"]
+        assert len(upstream.requests) == 1
+        assert upstream.requests[0].url.params["latitude"] == "0.31"
+
+
+class TestDefraClient:
+    def test_station_data_is_fetched_and_cached(self, upstream):
+        upstream.handlers["uk-air.defra.gov.uk"] = json_handler(
+            {"data": [{"2026-01-01 12:00": ["PM25", 9.5], "site": "ABD"}]}
+        )
+        service = with_fresh_cache(DefraService(), attribute="cache")
+
+        async def scenario():
+            await service.get_station_data_async("ABD")
+            return await service.get_station_data_async("ABD")
+
+        result = asyncio.run(scenario())
+
+        assert "error" not in result
+        assert len(upstream.requests) == 1
+        assert upstream.requests[0].url.params["site_id"] == "ABD"
+
+    def test_upstream_failure_is_not_cached(self, upstream):
+        upstream.handlers["uk-air.defra.gov.uk"] = json_handler({}, status=503)
+        service = with_fresh_cache(DefraService(), attribute="cache")
+
+        async def scenario():
+            await service.get_station_data_async("ABD")
+            return await service.get_station_data_async("ABD")
+
+        assert "error" in asyncio.run(scenario())
+        assert len(upstream.requests) == 2
+
+
+class TestUbaClient:
+    def test_measures_are_formatted(self, upstream):
+        upstream.handlers["www.umweltbundesamt.de"] = json_handler(
+            {"data": {"DEBE010": {"2026-01-01 12:00:00": [6, 2, 21.0, "2026-01-01", 1]}}}
+        )
+        service = with_fresh_cache(UbaService(), attribute="cache")
+
+        result = asyncio.run(service.get_measures_async(component="PM10"))
+
+        assert result["total_stations"] == 1
+        assert result["stations"]["DEBE010"]["statistics"]["average"] == 21.0
+        assert upstream.requests[0].url.params["component"] == "6"
+
+
+class TestNSWClient:
+    def test_site_details_and_observations(self, upstream):
+        def handler(request):
+            if request.method == "POST":
+                return httpx.Response(200, json=[])
+            return httpx.Response(200, json=[{"Site_Id": 39, "SiteName": "Rozelle"}])
+
+        upstream.handlers["data.airquality.nsw.gov.au"] = handler
+        service = with_fresh_cache(NSWService())
+
+        async def scenario():
+            sites = await service.get_site_details_async()
+            await service.get_observations_async({"StartDate": "2026-01-01"})
+            return sites
+
+        sites = asyncio.run(scenario())
+
+        assert sites == [{"Site_Id": 39, "SiteName": "Rozelle"}]
+        assert [r.method for r in upstream.requests] == ["GET", "POST"]
+        assert upstream.requests[1].url.path == "/api/Data/get_Observations"
+
+
+class TestGeocodingClient:
+    def test_unknown_address_goes_to_nominatim_once(self, upstream):
+        upstream.handlers["nominatim.openstreetmap.org"] = json_handler(
+            [{"lat": "1.5", "lon": "32.1", "display_name": "Somewhere Road, Uganda"}]
+        )
+        service = with_fresh_cache(GeocodingService())
+
+        async def scenario():
+            await service.geocode_address_async("12 Somewhere Road, Gulu")
+            return await service.geocode_address_async("12 Somewhere Road, Gulu")
+
+        result = asyncio.run(scenario())
+
+        assert result["success"]
+        assert result["latitude"] == 1.5
+        assert len(upstream.requests) == 1
+        assert upstream.requests[0].headers["User-Agent"] == GeocodingService.HEADERS["User-Agent"]
+
+
+class TestWeatherClient:
+    def test_current_weather_for_a_bundled_city(self, upstream):
+        upstream.handlers["api.open-meteo.com"] = json_handler(
+            {"current": {"temperature_2m": 24.5}, "current_units": {"temperature_2m": "°C"}}
+        )
+        service = with_fresh_cache(WeatherService())
+
+        result = asyncio.run(service.get_current_weather_async("Kampala"))
+
+        # Coordinates come from the gazetteer, so only the forecast API is called
+        assert result["temperature"] == "24.5 °C"
+        assert [r.url.host for r in upstream.requests] == ["api.open-meteo.com"]
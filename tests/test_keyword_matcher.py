@@ -0,0 +1,52 @@
+"""
+Keyword Matcher Tests
+=====================
+
+Covers the compiled multi-pattern matcher (word boundaries, stems,
+overlapping terms, labels) and QueryAnalyzer detection built on it.
+"""
+
+from core.agent.query_analyzer import QueryAnalyzer
+from shared.utils.keyword_matcher import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    """One-pass matching of labelled terms."""
+
+    def test_word_boundaries_stems_and_overlaps(self):
+        matcher = KeywordMatcher(
+            {
+                "aq": ["air", "air quality", "pm2.5"],
+                "time": ["tomorrow", "day after tomorrow", "trend*"],
+                "chart": ["trend*"],
+            }
+        )
+
+        found = matcher.scan("Repair shop: AIR QUALITY and PM2.5 trends the day after tomorrow")
+
+        assert found["aq"] == ["air", "air quality", "pm2.5"]
+        assert found["time"] == ["trend", "day after tomorrow", "tomorrow"]
+        assert found["chart"] == ["trend"]
+        assert matcher.scan("impair airy chairs") == {"aq": [], "time": [], "chart": []}
+
+
+class TestQueryAnalyzerDetection:
+    """Detectors share one scan per message."""
+
+    def test_cities_and_intents_from_one_scan(self):
+        message = "Will the air in Kampala, Nairobi and kampala be worse tomorrow?"
+
+        aq = QueryAnalyzer.detect_air_quality_query(message)
+        forecast = QueryAnalyzer.detect_forecast_query(message)
+
+        assert aq["is_air_quality"] is True
+        assert aq["cities"] == ["Kampala", "Nairobi"]
+        assert forecast["cities"] == ["Kampala", "Nairobi"]
+        assert forecast["is_forecast"] is True
+        assert {"african_city", "forecast_time"} <= QueryAnalyzer.scan_message(message).intents
+
+    def test_substrings_inside_words_no_longer_match(self):
+        message = "Can you help me repair the graphics card on my phone?"
+
+        assert QueryAnalyzer.detect_air_quality_query(message)["is_air_quality"] is False
+        assert QueryAnalyzer.classify_query_type(message)["query_type"] == "general"
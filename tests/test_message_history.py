@@ -0,0 +1,124 @@
+"""
+Message History Tests
+=====================
+
+Covers keyset pagination over a session's messages (complete, ordered pages
+even when timestamps tie), the startup migration adding the composite index
+to existing databases, the history queries using that index, and the
+messages endpoint rejecting bad paging parameters.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from infrastructure.database.database import Base, get_db
+from infrastructure.database.migrations import apply_migrations
+from infrastructure.database.models import ChatMessage, ChatSession
+from infrastructure.database.repository import (
+    decode_message_cursor,
+    get_recent_session_history,
+    get_session_history_page,
+)
+from interfaces.rest_api import routes
+
+INDEX = "ix_chat_messages_session_timestamp_id"
+
+
+@pytest.fixture
+def engine():
+    """In-memory database with the chat tables."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    session.add_all([ChatSession(id="a"), ChatSession(id="b")])
+    for i in range(7):
+        # Pairs of messages share a timestamp; ids break the tie
+        timestamp = datetime(2026, 1, 1, 12, i // 2)
+        session.add(ChatMessage(session_id="a", role="user", content=f"a{i}", timestamp=timestamp))
+        session.add(ChatMessage(session_id="b", role="user", content=f"b{i}", timestamp=timestamp))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class TestKeysetPagination:
+    """Cursor pages walk a session in (timestamp, id) order."""
+
+    def test_pages_cover_the_session_once_in_order(self, db):
+        contents, cursor, pages = [], None, 0
+        while True:
+            messages, cursor = get_session_history_page(db, "a", limit=3, cursor=cursor)
+            contents += [m.content for m in messages]
+            pages += 1
+            if cursor is None:
+                break
+
+        assert contents == [f"a{i}" for i in range(7)]
+        assert pages == 3
+
+    def test_malformed_cursor_is_rejected(self):
+        with pytest.raises(ValueError):
+            decode_message_cursor("not-a-cursor")
+
+
+class TestMessagesEndpoint:
+    """GET /sessions/{id}/messages validates its paging parameters."""
+
+    @pytest.fixture
+    def client(self, db):
+        app = FastAPI()
+        app.include_router(routes.router, prefix="/api/v1")
+        app.dependency_overrides[get_db] = lambda: db
+        return TestClient(app)
+
+    def test_bad_cursor_and_limit_are_client_errors(self, client):
+        url = "/api/v1/sessions/a/messages"
+
+        assert client.get(url, params={"cursor": "not-a-cursor"}).status_code == 400
+        assert client.get(url, params={"limit": 0}).status_code == 422
+        response = client.get(url, params={"limit": 3})
+        assert response.status_code == 200
+        assert response.json()["count"] == 3
+
+
+class TestMigrations:
+    """Existing databases get the composite index at startup."""
+
+    def test_missing_index_is_created_once(self, engine):
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP INDEX {INDEX}"))
+
+        assert apply_migrations(engine) == [INDEX]
+        assert apply_migrations(engine) == []
+
+    def test_recent_history_uses_the_index(self, engine, db):
+        query = (
+            db.query(ChatMessage)
+            .filter(ChatMessage.session_id == "a")
+            .order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc())
+            .limit(20)
+        )
+        sql = str(query.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+        with engine.connect() as connection:
+            plan = " ".join(str(row) for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+        assert INDEX in plan
+        assert "TEMP B-TREE" not in plan  # Rows come out of the index already ordered
+        assert [m.content for m in get_recent_session_history(db, "a", max_messages=2)] == [
+            "a5", "a6"
+        ]
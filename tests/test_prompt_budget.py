@@ -0,0 +1,130 @@
+"""
+Prompt Budget Tests
+===================
+
+Covers token counts cached per content hash (and shared safely between
+threads), section budgets (documents and tool results cut to fit, the last
+exchange and important older messages kept in history, a precounted static
+prompt) and the provider retry path keeping tool results with their call.
+"""
+
+import threading
+
+from shared.utils import token_counter
+from shared.utils.prompt_budget import TRUNCATION_MARKER, PromptBudget
+from shared.utils.token_counter import TokenCounter
+from shared.utils.token_manager import get_context_window
+
+
+def _history(turns: int) -> list[dict[str, str]]:
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"Question {i} about air quality in city {i}?"})
+        history.append({"role": "assistant", "content": f"City {i} reading is moderate. " * 40})
+    return history
+
+
+class TestTokenCounting:
+    """Counts are computed once per distinct text."""
+
+    def test_counts_cached_per_content(self, monkeypatch):
+        calls = []
+        encode_count = TokenCounter._encode_count
+
+        def counting(self, text):
+            calls.append(text)
+            return encode_count(self, text)
+
+        monkeypatch.setattr(TokenCounter, "_encode_count", counting)
+        counter = TokenCounter("gpt-4o")
+        text = "PM2.5 in Kampala is 38 µg/m³ (budget cache test)"
+
+        assert counter.count_tokens(text) == TokenCounter("gpt-4o").count_tokens(text) > 0
+        assert calls == [text]
+
+    def test_cache_stays_bounded_under_concurrent_counting(self, monkeypatch):
+        monkeypatch.setattr(token_counter, "TOKEN_CACHE_SIZE", 64)
+        counter = TokenCounter("gpt-4o")
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(400):
+                    counter.count_tokens(f"Reading {(offset + i) % 150} in Kampala")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n * 17,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert len(token_counter._token_cache) <= 64
+
+    def test_context_window_prefers_longest_match(self):
+        assert get_context_window("gpt-4o-mini") == 128000
+        assert get_context_window("qwen2.5:3b") == 32768
+
+
+class TestPromptBudget:
+    """Optional sections are fitted around the required ones."""
+
+    def test_everything_sent_when_it_fits(self):
+        budget = PromptBudget("gpt-4o", context_window=100_000)
+        history = _history(3)
+
+        prompt = budget.assemble("system", "hello", history, documents="doc", tool_results="aq")
+
+        assert (prompt.documents, prompt.tool_results, prompt.history) == ("doc", "aq", history)
+        assert prompt.report["trimmed"] == []
+
+    def test_over_budget_sections_are_trimmed(self):
+        budget = PromptBudget("gpt-4o", context_window=6000)
+        history = [{"role": "user", "content": "My name is Amina and I live in Nairobi."}]
+        history += _history(12)
+        documents = "\n".join(f"row {i}: PM2.5 value {i}" for i in range(2000))
+
+        prompt = budget.assemble(
+            "system", "Summarise the file", history, documents=documents, response_tokens=1000
+        )
+
+        assert prompt.documents.endswith(TRUNCATION_MARKER)
+        assert set(prompt.report["trimmed"]) == {"documents", "history"}
+        assert prompt.history[-2:] == history[-2:]
+        assert prompt.history[0] == history[0]  # Personal details outrank filler
+        assert sum(budget.message_tokens(m) for m in prompt.history) <= (
+            prompt.report["budgets"]["history"]
+        )
+
+    def test_precounted_static_prompt_and_uncached_candidates(self):
+        budget = PromptBudget("gpt-4o", context_window=6000)
+        documents = "\n".join(f"row {i}: NO2 value {i} (static prompt test)" for i in range(2000))
+        cached_before = len(token_counter._token_cache)
+
+        prompt = budget.assemble(
+            "session context", "hi", [], documents=documents, response_tokens=1000,
+            static_tokens=1500,
+        )
+
+        assert prompt.report["required"] == (
+            1500 + budget.counter.count_tokens("session context")
+            + budget.counter.count_tokens("hi") + 2 * budget.MESSAGE_OVERHEAD
+        )
+        assert prompt.documents.endswith(TRUNCATION_MARKER)
+        # Only the full texts were cached, not the truncation candidates
+        assert len(token_counter._token_cache) - cached_before <= 4
+
+    def test_retry_fit_keeps_tool_results_with_their_call(self):
+        budget = PromptBudget("gpt-4o", context_window=100_000)
+        call = {"role": "assistant", "content": "Checking the monitors now."}
+        result = {"role": "tool", "content": "PM2.5 41"}
+        messages = [{"role": "system", "content": "system"}, *_history(6), call, result]
+        messages.append({"role": "user", "content": "And tomorrow?"})
+
+        fitted = budget.fit_messages(messages, budget=400)
+
+        assert fitted[0] == messages[0] and fitted[-1] == messages[-1]
+        assert fitted[-3:-1] == [call, result]
+        assert len(fitted) < len(messages)
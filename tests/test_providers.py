@@ -0,0 +1,196 @@
+"""
+Async Provider Tests
+====================
+
+Covers the async OpenAI-compatible and Ollama providers against mocked HTTP
+backends: streamed deltas reach the request's token stream and add up to
+the same result as a non-streaming call, usage chunks are only requested
+from the official OpenAI API, a call that fails part way resets the stream
+before it is retried, and cleanup closes the provider's own connection pool.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import ollama
+import openai
+import pytest
+
+from core.providers.ollama_provider import OllamaProvider
+from core.providers.openai_provider import OpenAIProvider
+from core.providers.token_stream import TokenStream
+
+MESSAGES = [{"role": "user", "content": "Air quality in Kampala?"}]
+
+
+@pytest.fixture(autouse=True)
+def _no_ollama_env(monkeypatch):
+    """The Ollama client reads its host and key from the environment as fallbacks."""
+    monkeypatch.delenv("OLLAMA_API_KEY", raising=False)
+    monkeypatch.delenv("OLLAMA_HOST", raising=False)
+
+
+def openai_chunk(content=None, finish_reason=None):
+    chunk = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 1,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {"index": 0, "delta": {"content": content}, "finish_reason": finish_reason}
+        ],
+    }
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+class BrokenStream(httpx.AsyncByteStream):
+    """Response body that sends its first bytes, then loses the connection."""
+
+    def __init__(self, first: bytes):
+        self.first = first
+
+    async def __aiter__(self):
+        yield self.first
+        raise httpx.ReadError("connection lost")
+
+
+def make_openai_provider(base_url, handler):
+    settings = SimpleNamespace(
+        AI_API_KEY="sk-test", OPENAI_BASE_URL=base_url, AI_MODEL="gpt-4o-mini"
+    )
+    provider = OpenAIProvider(settings, tool_executor=None)
+    provider.setup()
+    provider.client = openai.AsyncOpenAI(
+        api_key="sk-test",
+        base_url=base_url,
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return provider
+
+
+def collect(token_stream, coroutine_factory):
+    """Run a provider call with the stream bound; return (result or error, deltas)."""
+
+    async def scenario():
+        with token_stream.bind():
+            try:
+                result = await coroutine_factory()
+            except Exception as e:
+                result = e
+            finally:
+                token_stream.close()
+        return result, [delta async for delta in token_stream]
+
+    return asyncio.run(scenario())
+
+
+class TestOpenAIStreaming:
+    """Streamed completions publish deltas and aggregate into one completion."""
+
+    def sse_handler(self, requests):
+        def handler(request):
+            requests.append(json.loads(request.content))
+            body = openai_chunk("Good ") + openai_chunk("air.", "stop") + b"data: [DONE]\n\n"
+            return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body)
+
+        return handler
+
+    def test_deltas_are_published_and_aggregated(self):
+        requests = []
+        provider = make_openai_provider("https://api.openai.com/v1", self.sse_handler(requests))
+
+        completion, deltas = collect(
+            TokenStream(),
+            lambda: provider._create_completion(model="gpt-4o-mini", messages=MESSAGES),
+        )
+
+        assert deltas == ["Good ", "air."]
+        assert completion.choices[0].message.content == "Good air."
+        assert completion.choices[0].finish_reason == "stop"
+        assert requests[0]["stream_options"] == {"include_usage": True}
+
+    def test_compatible_backends_are_not_sent_stream_options(self):
+        requests = []
+        provider = make_openai_provider("https://openrouter.ai/api/v1", self.sse_handler(requests))
+
+        completion, _ = collect(
+            TokenStream(),
+            lambda: provider._create_completion(model="gpt-4o-mini", messages=MESSAGES),
+        )
+
+        assert completion.choices[0].message.content == "Good air."
+        assert "stream_options" not in requests[0]
+
+    def test_failed_stream_resets_published_text(self):
+        def handler(request):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                stream=BrokenStream(openai_chunk("Partial ")),
+            )
+
+        provider = make_openai_provider("https://api.openai.com/v1", handler)
+
+        error, deltas = collect(
+            TokenStream(),
+            lambda: provider._create_completion(model="gpt-4o-mini", messages=MESSAGES),
+        )
+
+        assert isinstance(error, Exception)
+        assert deltas == ["Partial ", TokenStream.RESET]
+
+
+def make_ollama_provider():
+    settings = SimpleNamespace(
+        OLLAMA_API_KEY=None, OLLAMA_BASE_URL="http://localhost:11434", AI_MODEL="qwen2.5:3b"
+    )
+    provider = OllamaProvider(settings, tool_executor=None)
+    provider.setup()
+    return provider
+
+
+class TestOllamaProvider:
+    """Streaming through the async Ollama client and pool cleanup."""
+
+    def test_stream_is_aggregated_into_one_response(self):
+        def handler(request):
+            lines = [
+                {"model": "qwen2.5:3b", "message": {"role": "assistant", "content": "Moderate "}},
+                {"model": "qwen2.5:3b", "message": {"role": "assistant", "content": "today."}},
+                {
+                    "model": "qwen2.5:3b",
+                    "message": {"role": "assistant", "content": ""},
+                    "done": True,
+                    "done_reason": "stop",
+                },
+            ]
+            body = "".join(json.dumps(line) + "\n" for line in lines).encode()
+            return httpx.Response(200, content=body)
+
+        provider = make_ollama_provider()
+        provider.client = ollama.AsyncClient(
+            host="http://localhost:11434", transport=httpx.MockTransport(handler)
+        )
+
+        response, deltas = collect(
+            TokenStream(), lambda: provider._chat(model="qwen2.5:3b", messages=MESSAGES)
+        )
+
+        assert deltas == ["Moderate ", "today."]
+        assert response.message.content == "Moderate today."
+        assert response.done_reason == "stop"
+
+    def test_cleanup_closes_the_owned_pool(self, monkeypatch):
+        provider = make_ollama_provider()
+        closed = []
+
+        async def aclose():
+            closed.append(True)
+
+        monkeypatch.setattr(provider.transport, "aclose", aclose)
+        asyncio.run(provider.cleanup())
+
+        assert closed == [True]
@@ -0,0 +1,108 @@
+"""
+Upstream Rate Limiter Tests
+===========================
+
+Covers the per-provider token bucket: queueing within the wait budget,
+local rejection beyond it, and AIMD adjustment with Retry-After pauses;
+validation of UPSTREAM_RATE_LIMITS, and keeping local rejections out of
+circuit-breaker failure counts.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from core.agent.tool_executor import ToolExecutor
+from shared.config.settings import Settings
+from shared.utils.circuit_breaker import get_circuit_breaker
+from shared.utils.provider_errors import ProviderServiceError
+from shared.utils.rate_limiter import RateLimitedAsyncTransport, TokenBucket, is_local_rejection
+
+
+def at(seconds):
+    return patch("shared.utils.rate_limiter.time.monotonic", return_value=seconds)
+
+
+class TestTokenBucket:
+    """Token reservations and rate adaptation."""
+
+    def test_requests_queue_then_are_rejected_past_max_wait(self):
+        with at(100.0):
+            bucket = TokenBucket("waqi", rate=2, burst=2)
+            assert bucket.reserve(max_wait=1) == 0
+            assert bucket.reserve(max_wait=1) == 0
+            assert bucket.reserve(max_wait=1) == 0.5  # Queued behind the refill
+            assert bucket.reserve(max_wait=1) == 1.0
+            assert bucket.reserve(max_wait=1) is None
+
+        assert bucket.stats()["rejected"] == 1
+
+    def test_429_halves_rate_and_pauses_until_retry_after(self):
+        with at(100.0):
+            bucket = TokenBucket("airqo", rate=4, burst=4)
+            bucket.record_response(429, retry_after="3")
+            assert bucket.rate == 2
+            assert bucket.reserve(max_wait=10) == 3.5  # Pause, then one token at 2/s
+
+        with at(110.0):
+            for _ in range(10):
+                bucket.record_response(200)
+        assert bucket.rate == 4
+
+
+class TestRateLimitSettings:
+    """Parsing and validation of UPSTREAM_RATE_LIMITS."""
+
+    def test_burst_defaults_to_the_rate(self):
+        limits = Settings.parse_rate_limits("waqi:10/20, Nominatim:0.5")
+
+        assert limits == {"waqi": (10.0, 20), "nominatim": (0.5, 1)}
+
+    @pytest.mark.parametrize("value", ["waqi:0/5", "waqi:-1/5", "waqi:2/0"])
+    def test_non_positive_limits_are_rejected(self, value):
+        with pytest.raises(ValueError):
+            Settings(UPSTREAM_RATE_LIMITS=value)
+
+
+def fetch_through_bucket(bucket, upstream_status):
+    """GET through the rate-limited transport; return the error a client would raise."""
+
+    async def fetch():
+        transport = RateLimitedAsyncTransport(
+            httpx.MockTransport(lambda request: httpx.Response(upstream_status))
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            try:
+                (await client.get("https://api.waqi.info/feed/kampala/")).raise_for_status()
+            except httpx.HTTPError as e:
+                raise ProviderServiceError(provider="waqi", public_message="unavailable") from e
+
+    with patch("shared.utils.rate_limiter.bucket_for_url", return_value=bucket):
+        try:
+            asyncio.run(fetch())
+        except ProviderServiceError as e:
+            return e
+
+
+class TestLocalRejection:
+    """Synthetic 429s are not provider failures."""
+
+    def test_local_rejection_is_recognised_through_wrapping_errors(self):
+        exhausted = TokenBucket("waqi", rate=1, burst=1)
+        exhausted.tokens = -100.0
+
+        assert is_local_rejection(fetch_through_bucket(exhausted, 200))
+        assert not is_local_rejection(fetch_through_bucket(TokenBucket("waqi", 1, 1), 429))
+
+    def test_local_rejection_does_not_count_towards_the_breaker(self):
+        exhausted = TokenBucket("waqi", rate=1, burst=1)
+        exhausted.tokens = -100.0
+        executor = ToolExecutor(*([None] * 12))
+        breaker = get_circuit_breaker("rate-limited-test")
+
+        executor._record_failure("rate-limited-test", fetch_through_bucket(exhausted, 200))
+        assert breaker.failures == 0
+        executor._record_failure("rate-limited-test", RuntimeError("upstream down"))
+        assert breaker.failures == 1
@@ -0,0 +1,124 @@
+"""
+Semantic Response Cache Tests
+=============================
+
+Covers query signatures (paraphrases share a frame and tokens, different
+cities / pollutants / forecast horizons never do), the paraphrase index
+mapping a new wording onto an answered question's cache key, and which
+agent turns may use it.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from core.agent.semantic_cache import SemanticResponseCache, similarity
+from domain.services.agent_service import AgentService
+from infrastructure.cache.cache_service import RedisCache
+
+
+class TestQuerySignature:
+    """Entities must match exactly; wording only needs to be similar."""
+
+    def test_paraphrases_share_a_signature(self):
+        first = SemanticResponseCache.signature("air quality in Kampala?")
+        second = SemanticResponseCache.signature("what's the AQI in kampala now")
+
+        assert first.frame == second.frame
+        assert similarity(first.tokens, second.tokens) == 1.0
+
+    def test_entities_and_horizon_separate_frames(self):
+        signature = SemanticResponseCache.signature
+        kampala = signature("air quality in Kampala?").frame
+
+        assert signature("air quality in Nairobi?").frame != kampala
+        assert signature("air quality in Kampala tomorrow").frame != kampala
+        assert signature("What is PM2.5?").frame != signature("What is PM10?").frame
+
+
+class TestSemanticResponseCache:
+    """Paraphrase lookups over stored variants."""
+
+    def test_paraphrase_finds_the_answered_key(self, memory_backed_cache):
+        semantic = SemanticResponseCache(memory_backed_cache, threshold=0.7, enabled=True)
+
+        async def scenario():
+            await semantic.remember("air quality in Kampala?", "ctx", "key-1", ttl=60)
+            await semantic.remember("What's the air quality?", "ctx", "key-2", ttl=60)
+            await semantic.remember("Is PM2.5 high where I am today?", "ctx", "key-3", ttl=60)
+            return (
+                await semantic.find("What's the AQI in kampala now", "ctx"),
+                await semantic.find("What's the AQI in kampala now", "other-model"),
+                await semantic.find("Is it safe to exercise in Kampala?", "ctx"),
+                await semantic.find("what is the air quality", "ctx"),
+                await semantic.find("is PM2.5 high where I am now", "ctx"),
+            )
+
+        hit, other_context, different_intent, no_place, pollutant_only = asyncio.run(scenario())
+
+        assert hit == "key-1"
+        assert other_context is None
+        assert different_intent is None
+        assert no_place is None  # Depends on the client's location
+        assert pollutant_only is None  # So does a pollutant without a place
+        assert semantic.stats()["hits"] == 1
+
+
+class TestAgentSemanticCache:
+    """Which chat turns may be answered from a paraphrase."""
+
+    IP_LOCATION = {"source": "ip", "ip_address": "41.210.150.2"}
+
+    def ask_twice(self, cache, first_kwargs, second_kwargs):
+        agent = AgentService()
+        agent.cache = cache
+        agent.semantic_cache = SemanticResponseCache(cache, threshold=0.7, enabled=True)
+        answer = {
+            "response": "PM2.5 in Kampala is 35 µg/m³ (Moderate).",
+            "tokens_used": 100,
+            "cost_estimate": 0.001,
+            "tools_used": ["get_african_city_air_quality"],
+            "finish_reason": "stop",
+        }
+
+        async def scenario():
+            with patch.object(
+                agent.provider, "process_message", new=AsyncMock(return_value=answer)
+            ) as provider, patch(
+                "domain.services.agent_service.QueryAnalyzer.proactively_call_tools",
+                new=AsyncMock(return_value={}),
+            ):
+                await agent.process_message(message="air quality in Kampala?", **first_kwargs)
+                provider.reset_mock()
+                second = await agent.process_message(
+                    message="what's the AQI in kampala now", **second_kwargs
+                )
+                return second, provider.await_count
+
+        return asyncio.run(scenario())
+
+    def test_paraphrase_with_ip_location_is_served_from_cache(self, memory_backed_cache):
+        result, provider_calls = self.ask_twice(
+            memory_backed_cache,
+            {"location_data": self.IP_LOCATION},
+            {"location_data": {"source": "ip", "ip_address": "102.85.3.9"}},
+        )
+
+        assert provider_calls == 0
+        assert result["semantic_cache_hit"] is True
+        assert "35 µg/m³" in result["response"]
+
+    def test_gps_location_and_conversation_context_skip_it(self, memory_backed_cache):
+        # memory_backed_cache only configures the in-process tier; each case gets its own
+        gps = {"source": "gps", "latitude": 0.3136, "longitude": 32.5811}
+        history = [
+            {"role": "user", "content": "I cycle to work"},
+            {"role": "assistant", "content": "Noted."},
+        ]
+        for second_kwargs in (
+            {"location_data": gps},
+            {"history": history},
+            {"conversation_summary": "The user has asthma."},
+        ):
+            _, provider_calls = self.ask_twice(RedisCache(), {}, second_kwargs)
+
+            assert provider_calls == 1
@@ -0,0 +1,203 @@
+"""
+Station Index Tests
+===================
+
+Covers nearest-station lookup (agreement with a brute-force great-circle
+search, source and distance filters), the background refresher keeping
+a failed source's stations from the previous build, and AirQo coordinate
+lookups through the nearest indexed sites.
+"""
+
+import asyncio
+import math
+import random
+import time
+
+from core.agent.station_index_refresher import StationIndexRefresher
+from infrastructure.api.airqo import AirQoService
+from shared.utils.provider_errors import ProviderServiceError
+from shared.utils.spatial_index import Station, StationIndex, get_station_index, set_station_index
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * 6371 * math.asin(math.sqrt(h))
+
+
+class TestStationIndex:
+    """k-nearest lookups over the per-source trees."""
+
+    def test_nearest_matches_brute_force(self):
+        rng = random.Random(7)
+        stations = [
+            Station(
+                rng.choice(["airqo", "waqi"]), str(i), f"s{i}", rng.uniform(-80, 80),
+                rng.uniform(-180, 180),
+            )
+            for i in range(2000)
+        ]
+        index = StationIndex(stations)
+
+        for _ in range(50):
+            lat, lon = rng.uniform(-80, 80), rng.uniform(-180, 180)
+            found = index.nearest(lat, lon, k=4)
+            by_distance = sorted(
+                stations, key=lambda s: haversine_km(lat, lon, s.latitude, s.longitude)
+            )
+            assert [station for station, _ in found] == by_distance[:4]
+            assert math.isclose(
+                found[0][1],
+                haversine_km(lat, lon, by_distance[0].latitude, by_distance[0].longitude),
+                abs_tol=0.01,
+            )
+
+    def test_source_and_distance_filters(self):
+        index = StationIndex(
+            [
+                Station("airqo", "a1", "Makerere", 0.3337, 32.5681),
+                Station("airqo", "a2", "Jinja", 0.4244, 33.2042),
+                Station("waqi", "w1", "US Embassy Kampala", 0.3000, 32.5900),
+            ]
+        )
+
+        nearest = index.nearest(0.3136, 32.5811, k=3, sources=["airqo"], max_distance_km=25)
+
+        assert [(station.station_id, round(km)) for station, km in nearest] == [("a1", 3)]
+
+
+class TestStationIndexRefresher:
+    """Background rebuilds from the providers' site lists."""
+
+    def test_failed_source_keeps_previous_stations(self):
+        class AirQo:
+            async def get_sites_summary_async(self):
+                site = {"_id": "s1", "name": "Makerere", "latitude": 0.33, "longitude": 32.57}
+                return {"sites": [site]}
+
+        class Waqi:
+            async def get_map_bounds_async(self, *bounds):
+                raise ConnectionError("WAQI down")
+
+        class Executor:
+            airqo, waqi, uba, nsw = AirQo(), Waqi(), None, None
+
+        previous = get_station_index()
+        set_station_index(StationIndex([Station("waqi", "1", "Kampala", 0.3, 32.6)]))
+        try:
+            refresher = StationIndexRefresher(Executor(), interval=60)
+            index = asyncio.run(refresher.refresh())
+        finally:
+            set_station_index(previous)
+
+        assert index.stats()["stations"] == {"airqo": 1, "waqi": 1}
+        assert refresher.stats()["failed_sources"] == {"waqi": 1}
+
+
+class OfflineSitesAirQo(AirQoService):
+    """AirQo client whose indexed sites answer from a table, with no search fallback."""
+
+    def __init__(self, site_data, delay=0.0):
+        super().__init__(api_token="test-token")
+        self.site_data = site_data
+        self.delay = delay
+        self.requested = []
+        self.searched = []
+
+    def site_answer(self, site_id):
+        answer = self.site_data[site_id]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    def get_recent_measurements(self, site_id=None, **kwargs):
+        self.requested.append(site_id)
+        return self.site_answer(site_id)
+
+    async def get_recent_measurements_async(self, site_id=None, **kwargs):
+        self.requested.append(site_id)
+        await asyncio.sleep(self.delay)
+        return self.site_answer(site_id)
+
+    def _reverse_geocode(self, latitude, longitude):
+        return None
+
+    async def _reverse_geocode_async(self, latitude, longitude):
+        return None
+
+    def get_sites_summary(self, **kwargs):
+        self.searched.append(kwargs.get("search"))
+        return {"success": False}
+
+    async def get_sites_summary_async(self, **kwargs):
+        self.searched.append(kwargs.get("search"))
+        return {"success": False}
+
+    def get_grids_summary(self, **kwargs):
+        return {"success": False}
+
+    async def get_grids_summary_async(self, **kwargs):
+        return {"success": False}
+
+
+KAMPALA_SITES = StationIndex(
+    [
+        Station("airqo", "a1", "Nakasero", 0.3163, 32.5822),
+        Station("airqo", "a2", "Makerere", 0.3337, 32.5681),
+        Station("airqo", "a3", "Ntinda", 0.3540, 32.6120),
+    ]
+)
+
+
+class TestAirQoNearestSites:
+    """Coordinate lookups read the nearest indexed sites before searching."""
+
+    def lookup(self, call):
+        previous = get_station_index()
+        set_station_index(KAMPALA_SITES)
+        try:
+            return call()
+        finally:
+            set_station_index(previous)
+
+    def test_sync_lookup_stops_after_repeated_misses(self):
+        offline = {"success": False}
+        airqo = OfflineSitesAirQo({"a1": offline, "a2": offline, "a3": {"success": True}})
+
+        self.lookup(lambda: airqo.get_air_quality_by_location(0.3136, 32.5811))
+
+        assert airqo.requested == ["a1", "a2"]
+
+    def test_failing_sites_are_misses_and_the_lookup_falls_through(self):
+        down = ProviderServiceError(provider="airqo", public_message="down", http_status=503)
+        measurements = {"success": True, "measurements": [{"pm2_5": {"value": 30.0}}]}
+        airqo = OfflineSitesAirQo({"a1": down, "a2": measurements, "a3": down})
+
+        result = self.lookup(lambda: airqo.get_air_quality_by_location(0.3136, 32.5811))
+        assert result["site_id_used"] == "a2"
+
+        airqo = OfflineSitesAirQo({"a1": down, "a2": down, "a3": down})
+        result = self.lookup(
+            lambda: asyncio.run(airqo.get_air_quality_by_location_async(0.3136, 32.5811))
+        )
+        assert airqo.searched == ["0.3136,32.5811"]  # Fell through to the site search
+        assert result["success"] is False
+
+    def test_async_lookup_fetches_sites_concurrently(self):
+        measurements = {"success": True, "measurements": [{"pm2_5": {"value": 30.0}}]}
+        airqo = OfflineSitesAirQo(
+            {"a1": {"success": False}, "a2": measurements, "a3": measurements}, delay=0.2
+        )
+
+        started = time.monotonic()
+        result = self.lookup(
+            lambda: asyncio.run(airqo.get_air_quality_by_location_async(0.3136, 32.5811))
+        )
+
+        assert time.monotonic() - started < 0.4
+        assert sorted(airqo.requested) == ["a1", "a2", "a3"]
+        assert result["site_id_used"] == "a2"
+        assert result["search_method"] == "nearest_site"
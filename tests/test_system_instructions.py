@@ -0,0 +1,53 @@
+"""
+System Instruction Tests
+========================
+
+Covers the precompiled static prompts: one build per style and tier, and a
+byte-identical prefix ahead of per-request content so provider prompt caches
+can reuse it.
+"""
+
+from core.memory.prompts import (
+    STYLE_PRESETS,
+    get_static_instruction,
+    get_system_instruction,
+    precompile_system_instructions,
+)
+
+
+class TestStaticInstruction:
+    """Static prompts are built once per style and tier."""
+
+    def test_built_once_per_style_and_tier(self):
+        first = get_static_instruction("technical", "large")
+
+        assert get_static_instruction("Technical", "large") is first
+        assert get_static_instruction("technical", "medium").text == first.text
+        # Unknown tiers (including the "standard" default) use the condensed prompt
+        assert get_static_instruction("technical", "standard") is get_static_instruction(
+            "technical", "small"
+        )
+        assert first.tokens > get_static_instruction("technical", "small").tokens > 0
+
+    def test_precompile_covers_every_style_and_tier(self):
+        tokens = precompile_system_instructions()
+
+        assert len(tokens) == len(STYLE_PRESETS) * 3
+        assert tokens["general/large"] == get_static_instruction("general", "large").tokens
+
+
+class TestSystemInstruction:
+    """Per-request content follows the stable prefix."""
+
+    def test_dynamic_content_follows_static_prefix(self):
+        static = get_static_instruction("general", "large").text
+
+        with_documents = get_system_instruction(
+            "general", "large", custom_prefix="DOCUMENT: report.pdf", custom_suffix="LOCATION: <suffix>"
+        )
+        plain = get_system_instruction("general", "large", custom_suffix="LOCATION: <other>")
+
+        assert with_documents.startswith(static)
+        assert plain.startswith(static)
+        assert with_documents.index("DOCUMENT: report.pdf") < with_documents.index("LOCATION: <suffix>")
+        assert get_system_instruction("general", "large") == static
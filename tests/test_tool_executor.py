@@ -0,0 +1,197 @@
+"""
+Tool Executor Tests
+===================
+
+Covers the hedged city air-quality lookup (staggered source racing,
+cancellation of stragglers, tiered source ranking with recovery, which errors
+count towards a source's circuit breaker), the bounded
+concurrent multi-city tool and the request-scoped tool memo.
+"""
+
+import asyncio
+import time
+
+from core.agent.tool_executor import ToolExecutor
+from core.agent.tool_memo import ToolMemo
+from shared.utils.circuit_breaker import get_circuit_breaker
+from shared.utils.provider_errors import ProviderServiceError
+
+
+class FakeSource:
+    """Async city source that answers after a delay and logs cancellation."""
+
+    def __init__(self, name, delay, success, events):
+        self.name = name
+        self.delay = delay
+        self.success = success
+        self.events = events
+
+    async def _answer(self, delay=None):
+        self.events.append(("start", self.name))
+        try:
+            await asyncio.sleep(self.delay if delay is None else delay)
+        except asyncio.CancelledError:
+            self.events.append(("cancelled", self.name))
+            raise
+        return {"success": self.success, "source": self.name}
+
+    async def get_recent_measurements_async(self, city, site_id=None):
+        return await self._answer()
+
+    async def get_city_feed_async(self, city):
+        return await self._answer()
+
+
+def make_executor(airqo, waqi):
+    executor = ToolExecutor(waqi, airqo, *([None] * 10))
+    executor.SOURCE_HEDGE_DELAY_SECONDS = 0.05
+    return executor
+
+
+class TestHedgedCityLookup:
+    """Sources race with staggered starts; losing sources drop back within their tier."""
+
+    def test_fast_hedge_wins_and_straggler_is_cancelled(self):
+        events = []
+        executor = make_executor(
+            airqo=FakeSource("airqo", 5, True, events), waqi=FakeSource("waqi", 0.01, True, events)
+        )
+
+        result = asyncio.run(executor._get_city_air_quality_with_fallback_async("Kampala"))
+
+        assert result["source"] == "waqi"
+        assert result["data_source"] == "WAQI"
+        assert events == [("start", "airqo"), ("start", "waqi"), ("cancelled", "airqo")]
+        # WAQI now leads for African cities
+        assert executor.source_scores["africa"]["waqi"] > 0.5
+        events.clear()
+        asyncio.run(executor._get_city_air_quality_with_fallback_async("Nairobi"))
+        assert events[0] == ("start", "waqi")
+
+    def test_failure_launches_next_source_without_waiting(self):
+        events = []
+        executor = make_executor(
+            airqo=FakeSource("airqo", 0, False, events), waqi=FakeSource("waqi", 0, True, events)
+        )
+        executor.SOURCE_HEDGE_DELAY_SECONDS = 60
+
+        result = asyncio.run(
+            asyncio.wait_for(executor._get_city_air_quality_with_fallback_async("Kampala"), 5)
+        )
+
+        assert result["source"] == "waqi"
+        assert executor.source_scores["africa"]["airqo"] < 0.5
+
+    def test_source_cancelled_from_inside_counts_as_failed(self):
+        events = []
+
+        class Cancelled(FakeSource):
+            async def get_recent_measurements_async(self, city, site_id=None):
+                raise asyncio.CancelledError
+
+        executor = make_executor(
+            airqo=Cancelled("airqo", 0, True, events), waqi=FakeSource("waqi", 0, True, events)
+        )
+
+        result = asyncio.run(executor._get_city_air_quality_with_fallback_async("Kampala"))
+
+        assert result["source"] == "waqi"
+        assert executor.source_scores["africa"]["airqo"] < 0.5
+
+    def test_no_data_is_a_ranking_loss_not_a_breaker_failure(self):
+        events = []
+        breaker = get_circuit_breaker("airqo")
+        failures = breaker.failures
+        executor = make_executor(
+            airqo=FakeSource("airqo", 0, False, events), waqi=FakeSource("waqi", 0, True, events)
+        )
+
+        result = asyncio.run(executor._get_city_air_quality_with_fallback_async("Kampala"))
+
+        assert result["source"] == "waqi"
+        assert executor.source_scores["africa"]["airqo"] < 0.5
+        assert breaker.failures == failures
+
+    def test_only_service_errors_count_towards_the_breaker(self):
+        executor = make_executor(airqo=None, waqi=None)
+        breaker = get_circuit_breaker("breaker-fault-test")
+
+        executor._record_failure("breaker-fault-test", ProviderServiceError("waqi", "x", None, 404))
+        assert breaker.failures == 0
+        executor._record_failure("breaker-fault-test", ProviderServiceError("waqi", "x", None, 503))
+        executor._record_failure("breaker-fault-test", ProviderServiceError("waqi", "x", None, 429))
+        assert breaker.failures == 2
+
+    def test_demoted_source_leads_again_once_its_score_decays(self):
+        events = []
+        airqo = FakeSource("airqo", 5, True, events)
+        executor = make_executor(airqo=airqo, waqi=FakeSource("waqi", 0.01, True, events))
+        executor.SOURCE_SCORE_HALF_LIFE_SECONDS = 0.02
+
+        asyncio.run(executor._get_city_air_quality_with_fallback_async("Kampala"))
+        airqo.delay = 0.01
+        time.sleep(0.2)
+        events.clear()
+        result = asyncio.run(executor._get_city_air_quality_with_fallback_async("Kampala"))
+
+        assert events[0] == ("start", "airqo")
+        assert result["source"] == "airqo"
+
+    def test_scores_never_rank_modeled_data_above_ground_sensors(self):
+        executor = make_executor(airqo=None, waqi=None)
+        executor.source_scores["africa"] = {"airqo": 0.0, "waqi": 0.1, "openmeteo": 1.0}
+        candidates = [("airqo",), ("waqi",), ("openmeteo",)]
+
+        ranked = executor._rank_sources("africa", candidates)
+
+        assert ranked == [("airqo",), ("waqi",), ("openmeteo",)]
+
+
+class TestMultiCityFanOut:
+    """Uncached cities are fetched concurrently and the deadline yields partial results."""
+
+    def test_slow_city_is_reported_unavailable_at_deadline(self):
+        events = []
+
+        class Cities(FakeSource):
+            async def get_recent_measurements_async(self, city, site_id=None):
+                return await self._answer(5 if city == "Slowtown" else 0.05)
+
+        executor = make_executor(airqo=Cities("airqo", 0, True, events), waqi=None)
+        executor.MULTI_CITY_DEADLINE_SECONDS = 0.5
+        cities = ["Fastville", "Slowtown", "Quickburg"]
+
+        started = time.monotonic()
+        result = asyncio.run(
+            executor.execute_async("get_multiple_african_cities_air_quality", {"cities": cities})
+        )
+
+        assert time.monotonic() - started < 2
+        assert result["partial"] is True
+        assert list(result["data"]) == cities
+        assert result["data"]["Fastville"]["success"] is True
+        assert result["data"]["Quickburg"]["success"] is True
+        assert result["data"]["Slowtown"]["success"] is False
+
+
+class TestToolMemo:
+    """Duplicate tool calls within one turn share a single upstream call."""
+
+    def test_duplicates_share_one_call_and_failures_are_retried(self):
+        events = []
+        waqi = FakeSource("waqi", 0.01, True, events)
+        executor = make_executor(airqo=None, waqi=waqi)
+
+        async def turn():
+            with ToolMemo().bind() as memo:
+                await asyncio.gather(
+                    executor.execute_async("get_city_air_quality", {"city": "London"}),
+                    executor.execute_async("get_city_air_quality", {"city": " london "}),
+                )
+                waqi.success = False
+                await executor.execute_async("get_city_air_quality", {"city": "Paris"})
+                await executor.execute_async("get_city_air_quality", {"city": "Paris"})
+                return memo.stats()
+
+        assert asyncio.run(turn()) == {"hits": 1, "misses": 3}
+        assert events.count(("start", "waqi")) == 3